@@ -1,7 +1,9 @@
+import argparse
 import sys
 import os
 import copy
 
+from src import startup_trace # First, so the startup timeline covers the imports below
 from PyQt5.QtWidgets import (
     QApplication, QColorDialog, QFileDialog, QMessageBox, QDialog, QStatusBar
 )
@@ -13,6 +15,16 @@ from PyQt5.sip import isdeleted
 
 from src.frameless_window import FramelessWindow
 from src import utils
+from src import config_format
+from src import image_tiles
+from src import render_profile
+from src import scaled_pixmap_cache
+from src import project_thumbnail
+from src import instrumentation
+from src import operation_trace
+from src import profiling
+from src import scene_cache
+from src import stall_watchdog
 from src.draggable_image_item import DraggableImageItem
 from src.info_area_item import InfoAreaItem
 from src.connection_line_item import ConnectionLineItem
@@ -20,11 +32,12 @@ from src.project_manager_dialog import ProjectManagerDialog
 from src.project_io import ProjectIO
 from src.ui_builder import UIBuilder
 from src.item_operations import ItemOperations
-from src.text_style_manager import TextStyleManager
-from src.line_style_manager import LineStyleManager
-from src.exporter import HtmlExporter # <--- NEW IMPORT
 from src.input_handler import InputHandler
 from src.canvas_manager import CanvasManager
+from src.file_copier import qt_progress_callback
+from src.image_store import ImageStore
+# The exporter, the dialogs, the HUD and the style managers are imported where first used to keep startup fast.
+startup_trace.mark("imports")
 # --- Main Application Window ---
 class InfoCanvasApp(FramelessWindow):
     MAX_UNDO_HISTORY = 100 # Maximum number of undo snapshots to keep
@@ -38,37 +51,38 @@ class InfoCanvasApp(FramelessWindow):
         self.config_snapshot_stack = []
         self.clipboard_data = None
         self.chronologically_first_selected_item = None
+        self.performance_hud = None
+        self.stall_watchdog = None
+        instrumentation.enable_from_environment()
+        if profiling.profiler() is None: # The --profile option takes precedence
+            profiling.enable_from_environment()
+        watchdog_threshold = stall_watchdog.threshold_from_environment()
+        if watchdog_threshold:
+            self.toggle_stall_watchdog(watchdog_threshold)
 
         self.apply_dark_palette()
 
         if not self._initial_project_setup():
             QTimer.singleShot(0, self.close)
             return
+        startup_trace.mark("project_setup")
 
         self.current_mode = "edit"
         self.selected_item = None
         self.item_map = {}
-        self.text_style_manager = TextStyleManager(self)
-        self.line_style_manager = LineStyleManager(self)
-        UIBuilder(self).build()
+        UIBuilder(self).build() # Property panels are filled in on first selection, see ensure_properties_panel
+        startup_trace.mark("ui_build")
 
         self.canvas_manager = CanvasManager(self)
         self.item_operations = ItemOperations(self)
         self.input_handler = InputHandler(self)
-        self.text_style_manager.load_styles_into_dropdown()
-        self.line_style_manager.load_styles_into_dropdown()
-
-        # Connect the new checkbox signal AFTER UI is built and element exists
-        if hasattr(self, 'rect_show_on_hover_connected_checkbox'):
-            self.rect_show_on_hover_connected_checkbox.stateChanged.connect(
-                self.update_selected_rect_show_on_hover_connected_state
-            )
-        # else: # This case should ideally not be hit if UIBuilder works as expected.
-            # print("DEBUG: rect_show_on_hover_connected_checkbox not found during app init for signal connection.")
 
         self.populate_controls_from_config()
         self.render_canvas_from_config()
         self.update_mode_ui()
+        startup_trace.mark("render")
+        if os.environ.get(operation_trace.ENV_VAR):
+            self.toggle_operation_trace(os.environ[operation_trace.ENV_VAR])
 
     def statusBar(self):
         """Return the QStatusBar instance for compatibility with QMainWindow."""
@@ -113,6 +127,7 @@ class InfoCanvasApp(FramelessWindow):
         self.item_map.clear()
         if hasattr(self, 'scene') and self.scene:
             self.scene.clear()
+            scaled_pixmap_cache.scaled_pixmap_cache().clear()
             # Optionally set a placeholder background or message on the scene
             self.scene.setBackgroundBrush(QBrush(QColor("#AAAAAA"))) 
         if hasattr(self, 'info_rect_properties_widget'): # Check if UI elements exist
@@ -155,7 +170,9 @@ class InfoCanvasApp(FramelessWindow):
     def _initial_project_setup(self):
         dialog = ProjectManagerDialog(self, self.current_project_name)
         dialog.project_deleted_signal.connect(self._handle_deleted_current_project)
-        if dialog.exec_() == QDialog.Accepted and dialog.selected_project_name:
+        with startup_trace.waiting("project_manager_dialog"):
+            accepted = dialog.exec_() == QDialog.Accepted
+        if accepted and dialog.selected_project_name:
             project_name = dialog.selected_project_name
             project_path = os.path.join(utils.PROJECTS_BASE_DIR, project_name)
             is_new = not os.path.exists(project_path)
@@ -194,7 +211,12 @@ class InfoCanvasApp(FramelessWindow):
                 QMessageBox.warning(self, "Project Switch Failed", f"Could not switch to project '{project_name}'.")
                 self._reset_application_to_no_project_state() # If switch fails, reset
 
+    @profiling.profiled("switch_to_project")
     def _switch_to_project(self, project_name, is_new_project=False):
+        self._save_stall_report()
+        self._save_scene_cache()
+        if operation_trace.recorder() is not None: # A trace covers a single project
+            self.toggle_operation_trace()
         success = self.project_io.switch_to_project(project_name, is_new_project)
         self.current_project_name = self.project_io.current_project_name
         self.current_project_path = self.project_io.current_project_path
@@ -203,10 +225,11 @@ class InfoCanvasApp(FramelessWindow):
             self._update_window_title()
             if hasattr(self, 'edit_mode_controls_widget'):
                 self.edit_mode_controls_widget.setEnabled(True)
-            if hasattr(self, 'text_style_manager') and self.text_style_manager:
+            if getattr(self, '_text_style_manager', None) is not None:
                 self.text_style_manager.load_styles_into_dropdown()
-            if hasattr(self, 'line_style_manager') and self.line_style_manager:
+            if getattr(self, '_line_style_manager', None) is not None:
                 self.line_style_manager.load_styles_into_dropdown()
+            self._update_config_format_actions()
             # Reset snapshot history to the loaded project's state
             self.config_snapshot_stack = [copy.deepcopy(self.config)]
             if hasattr(self, 'item_operations'):
@@ -216,6 +239,7 @@ class InfoCanvasApp(FramelessWindow):
     def _load_config_for_current_project(self):
         return self.project_io.load_config_for_current_project()
 
+    @instrumentation.timed("save_config")
     def save_config(self, config_data_to_save=None):
         config_to_save = config_data_to_save if config_data_to_save is not None else self.config
         
@@ -229,6 +253,11 @@ class InfoCanvasApp(FramelessWindow):
             current_project_name=self.current_project_name,
         )
 
+        if was_saved and self.current_project_path:
+            saved_config = self.project_io.last_saved_config or config_to_save
+            self.project_io.update_project_index(self.current_project_path, saved_config)
+            project_thumbnail.thumbnail_generator().schedule(self.current_project_path, saved_config)
+
         # Only update the snapshot stack if the config was actually saved
         if was_saved and (not self.config_snapshot_stack or config_to_save != self.config_snapshot_stack[-1]):
             self.config_snapshot_stack.append(copy.deepcopy(config_to_save))
@@ -237,6 +266,24 @@ class InfoCanvasApp(FramelessWindow):
         
         return was_saved
 
+    def set_config_format(self, fmt):
+        """Store the project's config in ``fmt`` (see src.config_format) and rewrite it now."""
+        if not self.current_project_path:
+            return False
+        self.project_io.set_config_format(fmt)
+        self._update_config_format_actions()
+        was_saved = self.save_config()
+        if was_saved:
+            self._show_temporary_message(f"Configuration saved as {config_format.FORMAT_LABELS[fmt]}.", 3000)
+        return was_saved
+
+    def _update_config_format_actions(self):
+        title_bar = getattr(self, 'title_bar', None)
+        for fmt, action in getattr(title_bar, 'config_format_actions', {}).items():
+            action.setChecked(fmt == self.project_io.config_format)
+
+    @operation_trace.recorded()
+    @profiling.profiled("undo")
     def undo_last_action(self):
         """Revert to the previous configuration state if available."""
         if len(self.config_snapshot_stack) <= 1:
@@ -250,9 +297,47 @@ class InfoCanvasApp(FramelessWindow):
     def setup_ui(self):
         UIBuilder(self).build()
 
+    def ensure_properties_panel(self, kind):
+        """Build the ``"image"``, ``"area"`` or ``"line"`` properties panel if it does not exist yet."""
+        UIBuilder(self).build_properties_panel(kind)
+
+    @property
+    def text_style_manager(self):
+        """Created on first use, like the area properties panel it serves."""
+        if getattr(self, '_text_style_manager', None) is None:
+            from src.text_style_manager import TextStyleManager
+            self._text_style_manager = TextStyleManager(self)
+        return self._text_style_manager
+
+    @text_style_manager.setter
+    def text_style_manager(self, manager):
+        self._text_style_manager = manager
+
+    @property
+    def line_style_manager(self):
+        """Created on first use, like the line properties panel it serves."""
+        if getattr(self, '_line_style_manager', None) is None:
+            from src.line_style_manager import LineStyleManager
+            self._line_style_manager = LineStyleManager(self)
+        return self._line_style_manager
+
+    @line_style_manager.setter
+    def line_style_manager(self, manager):
+        self._line_style_manager = manager
+
+    def ensure_web_view(self):
+        """The view mode web view, created on first use because QtWebEngine is slow to start."""
+        if getattr(self, "web_view", None) is None:
+            UIBuilder(self).build_web_view()
+        return self.web_view
+
     def populate_controls_from_config(self):
         if not self.config or not hasattr(self, 'bg_width_input'):
             return
+        if hasattr(self, 'use_image_store_checkbox'):
+            self.use_image_store_checkbox.blockSignals(True)
+            self.use_image_store_checkbox.setChecked(bool(self.config.get('use_image_store')))
+            self.use_image_store_checkbox.blockSignals(False)
         self.bg_width_input.blockSignals(True)
         self.bg_height_input.blockSignals(True)
         self.bg_width_input.setValue(self.config.get('background', {}).get('width', 800))
@@ -268,7 +353,9 @@ class InfoCanvasApp(FramelessWindow):
         self.update_mode_ui()
         self.render_canvas_from_config()
 
-        if self.current_mode == "view" and hasattr(self, "web_view"):
+        if self.current_mode == "view" and hasattr(self, "central_layout"):
+            from src.exporter import HtmlExporter
+            self.ensure_web_view()
             exporter = HtmlExporter(config=self.config, project_path=self.current_project_path)
             html_content = exporter._generate_html_content()
             base_url = QUrl.fromLocalFile(os.path.join(self.current_project_path, ""))
@@ -277,7 +364,7 @@ class InfoCanvasApp(FramelessWindow):
                 self.central_layout.setCurrentWidget(self.web_view)
             self.view.hide()
             self.web_view.show()
-        elif self.current_mode == "edit" and hasattr(self, "web_view"):
+        elif self.current_mode == "edit" and getattr(self, "web_view", None) is not None:
             if hasattr(self, "central_layout"):
                 self.central_layout.setCurrentWidget(self.view)
             self.web_view.hide()
@@ -366,6 +453,7 @@ class InfoCanvasApp(FramelessWindow):
             if hasattr(self, 'scene') and self.scene : self.scene.setBackgroundBrush(QBrush(color))
             self.save_config()
 
+    @operation_trace.recorded(inputs=("bg_width_input", "bg_height_input"))
     def update_bg_dimensions(self):
         if not self.config: return
         self.config['background']['width'] = self.bg_width_input.value()
@@ -386,6 +474,7 @@ class InfoCanvasApp(FramelessWindow):
         if hasattr(self, 'update_hover_connected_checkbox_visibility'):
             self.update_hover_connected_checkbox_visibility()
 
+    @instrumentation.timed("update_properties_panel")
     def update_properties_panel(self):
         # Call this at the beginning of updating properties panel as well,
         # as selection might make the checkbox (in)visible or change its state.
@@ -435,12 +524,14 @@ class InfoCanvasApp(FramelessWindow):
             return
 
         if isinstance(self.selected_item, DraggableImageItem):
+            self.ensure_properties_panel("image")
             img_conf = self.selected_item.config_data
             self.img_scale_input.blockSignals(True)
             self.img_scale_input.setValue(img_conf.get('scale', 1.0))
             self.img_scale_input.blockSignals(False)
             self.image_properties_widget.setVisible(True)
         elif isinstance(self.selected_item, InfoAreaItem):
+            self.ensure_properties_panel("area")
             rect_conf = self.selected_item.config_data
             self.info_rect_text_input.blockSignals(True)
             self.info_rect_width_input.blockSignals(True)
@@ -560,6 +651,7 @@ class InfoCanvasApp(FramelessWindow):
                 self.info_rect_detail_widget.setVisible(True)
             self.info_rect_properties_widget.setVisible(True)
         elif isinstance(self.selected_item, ConnectionLineItem):
+            self.ensure_properties_panel("line")
             line_conf = self.selected_item.config_data
             self.line_thickness_spin.blockSignals(True)
             self.line_z_index_spin.blockSignals(True)
@@ -614,6 +706,34 @@ class InfoCanvasApp(FramelessWindow):
     def upload_image(self):
         self.item_operations.upload_image()
 
+    def upload_images(self):
+        self.item_operations.upload_images()
+
+    def import_image_folder(self):
+        self.item_operations.import_image_folder()
+
+    def import_dropped_files(self, paths):
+        if self.current_mode == "edit":
+            self.item_operations.import_images(paths)
+
+    def set_use_image_store(self, enabled):
+        """Opt the project in or out of the shared image store.
+
+        Opting in moves the existing images into the store, which also merges
+        identical files; opting out keeps the files where they are.
+        """
+        if not self.config or bool(self.config.get('use_image_store')) == bool(enabled):
+            return
+        self.config['use_image_store'] = bool(enabled)
+        if enabled:
+            try:
+                adopted = ImageStore().adopt_project(self.current_project_path, self.config)
+            except OSError as e:
+                QMessageBox.warning(self, "Image Store Error", f"Could not move all images into the shared store: {e}")
+            else:
+                self.statusBar().showMessage(f"{adopted} images moved into the shared image store.", 3000)
+        self.save_config()
+
     def update_selected_image_scale(self):
         self.item_operations.update_selected_image_scale()
 
@@ -623,6 +743,7 @@ class InfoCanvasApp(FramelessWindow):
     def add_info_rectangle(self):
         self.item_operations.add_info_area()
 
+    @operation_trace.recorded(inputs=("info_rect_text_input",))
     def update_selected_rect_text(self):
         """Called when the text in the info_rect_text_input (QTextEdit) changes."""
         if isinstance(self.selected_item, InfoAreaItem):
@@ -634,6 +755,7 @@ class InfoCanvasApp(FramelessWindow):
                 self.selected_item.set_display_text(new_text) 
                 self.save_config() 
 
+    @operation_trace.recorded(inputs=("info_rect_width_input", "info_rect_height_input"))
     def update_selected_rect_dimensions(self):
         """Called when width/height spinboxes in the properties panel change."""
         if isinstance(self.selected_item, InfoAreaItem):
@@ -646,6 +768,7 @@ class InfoCanvasApp(FramelessWindow):
             
             self.selected_item.properties_changed.emit(self.selected_item)
 
+    @operation_trace.recorded()
     def update_selected_rect_show_on_hover(self, state):
         if isinstance(self.selected_item, InfoAreaItem):
             rect_conf = self.selected_item.config_data
@@ -655,6 +778,7 @@ class InfoCanvasApp(FramelessWindow):
             if hasattr(self, 'update_hover_connected_checkbox_visibility'):
                 self.update_hover_connected_checkbox_visibility()
 
+    @operation_trace.recorded()
     def update_selected_rect_show_on_hover_connected_state(self, state):
         if not hasattr(self, 'scene') or not self.scene or not self.selected_item:
             return
@@ -678,8 +802,8 @@ class InfoCanvasApp(FramelessWindow):
     def update_hover_connected_checkbox_visibility(self):
         if not hasattr(self, 'rect_show_on_hover_connected_checkbox') or \
            not hasattr(self, 'rect_show_on_hover_checkbox') or \
-           not hasattr(self, 'scene') or not self.scene:
-            # This can happen if called too early or if UI elements are missing
+           not hasattr(self, 'scene') or not self.scene or isdeleted(self.scene):
+            # This can happen if called too early, if UI elements are missing or during shutdown
             # print("DEBUG: update_hover_connected_checkbox_visibility prerequisites not met.")
             return
 
@@ -710,6 +834,7 @@ class InfoCanvasApp(FramelessWindow):
             self.rect_show_on_hover_connected_checkbox.setChecked(False) # Reset when hidden
             self.rect_show_on_hover_connected_checkbox.blockSignals(False)
 
+    @operation_trace.recorded()
     def update_selected_area_shape(self, shape_label):
         if isinstance(self.selected_item, InfoAreaItem):
             new_shape = 'ellipse' if shape_label.lower() == 'ellipse' else 'rectangle'
@@ -720,6 +845,7 @@ class InfoCanvasApp(FramelessWindow):
                 self.selected_item.update()
                 self.selected_item.properties_changed.emit(self.selected_item)
 
+    @operation_trace.recorded()
     def update_selected_item_angle(self, angle_value):
         if isinstance(self.selected_item, InfoAreaItem):
             self.selected_item.config_data['angle'] = angle_value
@@ -741,6 +867,7 @@ class InfoCanvasApp(FramelessWindow):
     def disconnect_selected_info_areas(self):
         self.item_operations.disconnect_selected_info_areas()
 
+    @operation_trace.recorded()
     def on_connect_disconnect_clicked(self):
         if not hasattr(self, 'scene') or not self.scene:
             return
@@ -767,6 +894,7 @@ class InfoCanvasApp(FramelessWindow):
                 return True
         return False
 
+    @operation_trace.recorded(inputs=("line_thickness_spin",))
     def update_selected_line_thickness(self):
         if isinstance(self.selected_item, ConnectionLineItem):
             val = self.line_thickness_spin.value()
@@ -774,6 +902,7 @@ class InfoCanvasApp(FramelessWindow):
             self.selected_item.set_thickness(val)
             self.save_config()
 
+    @operation_trace.recorded(inputs=("line_z_index_spin",))
     def update_selected_line_z_index(self):
         if isinstance(self.selected_item, ConnectionLineItem):
             val = self.line_z_index_spin.value()
@@ -781,6 +910,7 @@ class InfoCanvasApp(FramelessWindow):
             self.selected_item.set_z_index(val)
             self.save_config()
 
+    @operation_trace.recorded(inputs=("line_opacity_spin",))
     def update_selected_line_opacity(self):
         if isinstance(self.selected_item, ConnectionLineItem):
             val = self.line_opacity_spin.value()
@@ -809,6 +939,7 @@ class InfoCanvasApp(FramelessWindow):
                 self.selected_item.update_appearance(self.selected_item.isSelected(), self.current_mode == "view")
                 self.save_config()
 
+    @operation_trace.recorded(inputs=("rect_area_opacity_spin",))
     def update_selected_area_opacity(self):
         if isinstance(self.selected_item, InfoAreaItem):
             val = self.rect_area_opacity_spin.value()
@@ -832,8 +963,12 @@ class InfoCanvasApp(FramelessWindow):
     # --- Export functionality ---
     # def _generate_view_html(self): <--- THIS METHOD WILL BE ENTIRELY REMOVED
 
-    def export_to_html(self, filepath=None): # Argument can be bool due to signal connection
-        """Export the current project view to an HTML file."""
+    def export_to_html(self, filepath=None, single_file=False): # Argument can be bool due to signal connection
+        """Export the current project view to an HTML file.
+
+        With ``single_file`` the images are embedded in the HTML instead of being
+        copied to an ``images/`` folder next to it.
+        """
         if isinstance(filepath, bool) or filepath is None: # Handle signal default arg or no arg
             if not self.current_project_name: # Check if a project is loaded
                 QMessageBox.warning(self, "Export Error", "No project loaded to export.")
@@ -842,7 +977,7 @@ class InfoCanvasApp(FramelessWindow):
             default_name = f"{self.current_project_name}.html"
             filepath_tuple = QFileDialog.getSaveFileName(
                 self,
-                "Export to HTML",
+                "Export to Single HTML File" if single_file else "Export to HTML",
                 default_name,
                 "HTML Files (*.html)",
                 options=QFileDialog.Options()
@@ -868,9 +1003,15 @@ class InfoCanvasApp(FramelessWindow):
             QMessageBox.warning(self, "Export Error", "Current project path is not set. Cannot export.")
             return
 
+        from src.exporter import HtmlExporter
         try:
-            exporter = HtmlExporter(config=self.config, project_path=self.current_project_path)
-            success = exporter.export(str(filepath)) # Ensure filepath is a string
+            progress_dialog, on_progress = qt_progress_callback(self, "Copying images for export...")
+            try:
+                exporter = HtmlExporter(config=self.config, project_path=self.current_project_path,
+                                        progress_callback=on_progress)
+                success = exporter.export(str(filepath), single_file=single_file) # Ensure filepath is a string
+            finally:
+                progress_dialog.close()
 
             if success:
                 QMessageBox.information(self, "Export Complete", f"Exported to {filepath}")
@@ -883,11 +1024,129 @@ class InfoCanvasApp(FramelessWindow):
             QMessageBox.critical(self, "Export Error", f"An unexpected error occurred during export: {e}")
 
 
+    def show_image_integrity_dialog(self):
+        """Scan all projects for missing, orphaned and mis-sized images and offer cleanup."""
+        from src.integrity_dialog import ImageIntegrityDialog
+        dialog = ImageIntegrityDialog(self)
+        dialog.exec_()
+
+    def show_memory_report(self):
+        """Break down the open project's memory use and offer to trim caches and history."""
+        from src.memory_report_dialog import MemoryReportDialog
+        dialog = MemoryReportDialog(self)
+        dialog.exec_()
+
+    def toggle_performance_hud(self):
+        """Show or hide the latency overlay; recording runs while it is shown."""
+        if self.performance_hud is None:
+            from src.performance_hud import PerformanceHud
+            self.performance_hud = PerformanceHud(self.view)
+            self.performance_hud.move(8, 8)
+            self._hud_started_recording = False
+        if self.performance_hud.isVisible():
+            self.performance_hud.hide()
+            self._stop_recording_if_unused()
+        else:
+            self._hud_started_recording = not instrumentation.is_enabled()
+            instrumentation.enable()
+            self.performance_hud.show()
+            self.performance_hud.raise_()
+
+    def toggle_stall_watchdog(self, threshold_ms=stall_watchdog.DEFAULT_THRESHOLD_MS):
+        """Start or stop watching the GUI thread for stalls; returns whether it is now running."""
+        if self.stall_watchdog is not None and self.stall_watchdog.is_running():
+            self._save_stall_report()
+            self.stall_watchdog.stop()
+            self.stall_watchdog = None
+            self._stop_recording_if_unused()
+        else:
+            self._watchdog_started_recording = not instrumentation.is_enabled()
+            self.stall_watchdog = stall_watchdog.StallWatchdog(threshold_ms, parent=self)
+            self.stall_watchdog.start() # Turns recording on to name the operations that stall
+        running = self.stall_watchdog is not None
+        self.title_bar.stall_watchdog_action.setChecked(running)
+        return running
+
+    def _stop_recording_if_unused(self):
+        """Turn recording off once neither the HUD nor the watchdog needs it, if one of them turned it on."""
+        if self.performance_hud is not None and self.performance_hud.isVisible():
+            return
+        if self.stall_watchdog is not None and self.stall_watchdog.is_running():
+            return
+        if getattr(self, '_hud_started_recording', False) or getattr(self, '_watchdog_started_recording', False):
+            instrumentation.disable()
+        self._hud_started_recording = self._watchdog_started_recording = False
+
+    def toggle_operation_trace(self, path=None):
+        """Start or stop recording operations for replay; returns whether a recording is now running.
+
+        Traces go to ``path`` or, by default, to the project's ``.diagnostics`` folder.
+        """
+        if operation_trace.recorder() is not None:
+            finished = operation_trace.stop_recording()
+            self._show_temporary_message(f"Recorded {finished.operations} operations to '{finished.path}'.", 5000)
+        elif self.current_project_path:
+            path = path or operation_trace.default_trace_path(self.current_project_path)
+            try:
+                operation_trace.start_recording(path, self.current_project_name, self.config)
+            except OSError as e:
+                QMessageBox.warning(self, "Trace Error", f"Could not record to '{path}': {e}")
+            else:
+                self._show_permanent_message(f"Recording operations to '{path}'...")
+        recording = operation_trace.recorder() is not None
+        self.title_bar.operation_trace_action.setChecked(recording)
+        return recording
+
+    def _save_scene_cache(self):
+        """Keep what the current canvas needs for its first frame, so reopening the project is quick."""
+        if not self.current_project_path or not getattr(self, 'item_map', None):
+            return
+        canvas_manager = getattr(self, 'canvas_manager', None)
+        scene_cache.save(self.current_project_path, self.item_map,
+                         canvas_manager.scene_cache if canvas_manager is not None else None)
+
+    def _save_stall_report(self):
+        """Write the stalls seen in the current project under its folder and start afresh."""
+        if self.stall_watchdog is None or not self.current_project_path:
+            return
+        path = self.stall_watchdog.save_report(self.current_project_path)
+        if path:
+            print(f"Stall report saved to '{path}'.")
+        self.stall_watchdog.reset()
+
+    def show_render_profile_dialog(self):
+        """Let the user pick rendering options for the canvas; applied live and remembered."""
+        if not hasattr(self, 'view'):
+            return
+        from src.render_profile_dialog import RenderProfileDialog
+        dialog = RenderProfileDialog(self.render_profile, parent=self)
+        dialog.profile_changed.connect(self.set_render_profile)
+        original = self.render_profile
+        if dialog.exec_() == QDialog.Accepted:
+            render_profile.save_render_profile(self.render_profile)
+        else:
+            self.set_render_profile(original)
+
+    def set_render_profile(self, profile):
+        self.render_profile = profile
+        render_profile.apply_render_profile(self.view, self.scene, profile)
+        self.frame_stats_readout.set_enabled(profile.show_frame_stats)
+
     def keyPressEvent(self, a0):
         if not self.input_handler.handle_key_press(a0):
             super().keyPressEvent(a0)
 
     def closeEvent(self, a0):
+        operation_trace.stop_recording()
+        if self.stall_watchdog is not None:
+            self._save_stall_report()
+            self.stall_watchdog.stop()
+        self._save_scene_cache()
+        scene_cache.shutdown_scene_cache_writer()
+        scene_cache.shutdown_image_loader()
+        image_tiles.shutdown_tile_builder()
+        scaled_pixmap_cache.shutdown_scaled_pixmap_cache()
+        project_thumbnail.shutdown_thumbnail_generator()
         super().closeEvent(a0)
 
     # Placeholder methods for alignment
@@ -917,12 +1176,29 @@ class InfoCanvasApp(FramelessWindow):
         qapp.setPalette(palette)
 
 if __name__ == '__main__':
-    app = QApplication.instance() or QApplication(sys.argv)
-    
+    argument_parser = argparse.ArgumentParser(description="InfoCanvas editor.")
+    profiling.add_arguments(argument_parser)
+    startup_trace.add_arguments(argument_parser)
+    args, qt_arguments = argument_parser.parse_known_args()
+    try:
+        profiling.enable_from_arguments(args)
+    except ValueError as e:
+        argument_parser.error(str(e))
+    if args.startup_trace:
+        startup_trace.enable()
+    else:
+        startup_trace.enable_from_environment()
+    # Lets QtWebEngine be imported after the QApplication exists, when view mode is first opened
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication.instance() or QApplication(sys.argv[:1] + qt_arguments)
+    startup_trace.mark("qapplication")
+
     main_window = InfoCanvasApp()
     if main_window.current_project_name:
         main_window.setGeometry(100, 100, 1200, 700)
+        startup_trace.trace().watch_first_frame(main_window.view.viewport())
         main_window.show()
+        startup_trace.mark("shown")
         sys.exit(app.exec_())
     else:
         print("Application initialization failed: No project loaded or startup cancelled.")
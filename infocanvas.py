@@ -0,0 +1,49 @@
+"""Command-line tools for InfoCanvas projects.
+
+Usage:
+    python -m infocanvas export --all -o exported/
+    python -m infocanvas export intro_tour lab_safety -o exported/ --report report.json
+    python -m infocanvas store gc --dry-run
+    python -m infocanvas scan --all --remove-orphans
+    python -m infocanvas generate big_demo --areas 10000 --images 50
+    python -m infocanvas bench --areas 1000 10000 --output bench.json --baseline baseline.json
+    python -m infocanvas replay static/my_project/.diagnostics/trace_20250101_120000.jsonl --repeat 3
+"""
+import argparse
+import sys
+
+from src import batch_export
+from src import benchmark
+from src import image_store
+from src import integrity_scanner
+from src import operation_trace
+from src import synthetic_project
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="infocanvas", description="InfoCanvas command-line tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Export projects to HTML without opening the GUI.")
+    batch_export.add_arguments(export_parser)
+    export_parser.set_defaults(handler=batch_export.run)
+    store_parser = subparsers.add_parser("store", help="Inspect or garbage-collect the shared image store.")
+    image_store.add_arguments(store_parser)
+    store_parser.set_defaults(handler=image_store.run)
+    scan_parser = subparsers.add_parser("scan", help="Check project images for missing, orphaned and mis-sized files.")
+    integrity_scanner.add_arguments(scan_parser)
+    scan_parser.set_defaults(handler=integrity_scanner.run)
+    generate_parser = subparsers.add_parser("generate", help="Create a synthetic project of a given size.")
+    synthetic_project.add_arguments(generate_parser)
+    generate_parser.set_defaults(handler=synthetic_project.run)
+    bench_parser = subparsers.add_parser("bench", help="Time loading, rendering, exporting and undo on synthetic projects.")
+    benchmark.add_arguments(bench_parser)
+    bench_parser.set_defaults(handler=benchmark.run)
+    replay_parser = subparsers.add_parser("replay", help="Replay a recorded operation trace headlessly and time each operation.")
+    operation_trace.add_arguments(replay_parser)
+    replay_parser.set_defaults(handler=operation_trace.run)
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,6 +15,14 @@ class BaseDraggableItem(QGraphicsObject):
         self._has_moved = False
         super().mousePressEvent(event)
 
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemSceneHasChanged and value is not None:
+            profile = getattr(value, 'render_profile', None)
+            if profile is not None:
+                from .render_profile import apply_item_cache_mode
+                apply_item_cache_mode(self, profile)
+        return super().itemChange(change, value)
+
     def mouseReleaseEvent(self, event):
         super().mouseReleaseEvent(event)
         if event.button() == Qt.LeftButton and self._has_moved:
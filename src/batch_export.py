@@ -0,0 +1,163 @@
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import config_format
+from . import utils
+
+_worker_app = None
+
+
+def _ensure_gui_application():
+    """Create the offscreen QGuiApplication that QTextDocument needs in this process."""
+    global _worker_app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtGui import QGuiApplication
+    if QGuiApplication.instance() is None:
+        _worker_app = QGuiApplication([sys.argv[0] if sys.argv else "infocanvas"])
+
+
+def list_projects(base_dir=None):
+    """Return the names of the project folders under ``base_dir`` that have a config file."""
+    base_dir = base_dir or utils.PROJECTS_BASE_DIR
+    if not os.path.isdir(base_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(base_dir)
+        if os.path.isfile(os.path.join(base_dir, name, utils.PROJECT_CONFIG_FILENAME))
+    )
+
+
+def _directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def export_project(project_name, base_dir, output_root, options):
+    """Export one project to ``<output_root>/<project_name>/index.html`` and report on it.
+
+    Runs in worker processes, so all arguments and the returned dict are plain data.
+    Anything the exporter prints is captured into the report's ``messages``.
+    """
+    from .exporter import HtmlExporter
+
+    _ensure_gui_application()
+    started = time.perf_counter()
+    project_path = os.path.join(base_dir, project_name)
+    output_dir = os.path.join(output_root, project_name)
+    output_html_path = os.path.join(output_dir, "index.html")
+    report = {"project": project_name, "output": output_html_path, "ok": False}
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            config = config_format.load(os.path.join(project_path, utils.PROJECT_CONFIG_FILENAME))
+            exporter = HtmlExporter(
+                config=config,
+                project_path=project_path,
+                image_quality=options.get("image_quality", 85),
+                image_workers=1,  # The batch pool already uses every core
+            )
+            report["ok"] = exporter.export(
+                output_html_path,
+                incremental=options.get("incremental", False),
+                optimize_images=options.get("optimize_images", False),
+                single_file=options.get("single_file", False),
+            )
+        report["stats"] = exporter.last_export_stats
+        report["images"] = len(config.get("images", []))
+        report["info_areas"] = len(config.get("info_areas", []))
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+    report["seconds"] = round(time.perf_counter() - started, 4)
+    if os.path.exists(output_html_path):
+        report["html_bytes"] = os.path.getsize(output_html_path)
+    report["output_bytes"] = _directory_size(output_dir) if os.path.isdir(output_dir) else 0
+    report["messages"] = log.getvalue().splitlines()
+    return report
+
+
+def export_projects(project_names, output_root, options=None, base_dir=None, max_workers=None):
+    """Export several projects, in a process pool when more than one worker is useful.
+
+    Returns:
+        dict: ``{"projects": [per-project reports], "total_seconds", "workers"}``
+        with the project reports in the order they were requested.
+    """
+    options = options or {}
+    base_dir = base_dir or utils.PROJECTS_BASE_DIR
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(project_names) or 1))
+    started = time.perf_counter()
+    reports = {}
+    if max_workers == 1:
+        for name in project_names:
+            reports[name] = export_project(name, base_dir, output_root, options)
+    else:
+        # Qt is not fork-safe, so workers start from a fresh interpreter.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+            futures = {
+                pool.submit(export_project, name, base_dir, output_root, options): name
+                for name in project_names
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    reports[name] = future.result()
+                except Exception as e:  # The worker itself died
+                    reports[name] = {"project": name, "ok": False, "error": f"{type(e).__name__}: {e}"}
+    return {
+        "projects": [reports[name] for name in project_names],
+        "total_seconds": round(time.perf_counter() - started, 4),
+        "workers": max_workers,
+    }
+
+
+def add_arguments(parser):
+    parser.add_argument("projects", nargs="*", help="Project names under the projects folder.")
+    parser.add_argument("--all", action="store_true", help="Export every project.")
+    parser.add_argument("-o", "--output", required=True, help="Folder receiving one sub-folder per project.")
+    parser.add_argument("--projects-dir", default=utils.PROJECTS_BASE_DIR, help="Folder containing the projects.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--incremental", action="store_true", help="Only rewrite what changed since the last export.")
+    parser.add_argument("--optimize-images", action="store_true", help="Export images resampled to their displayed size.")
+    parser.add_argument("--quality", type=int, default=85, help="Encoder quality for resampled images.")
+    parser.add_argument("--single-file", action="store_true", help="Embed images in the HTML file.")
+    parser.add_argument("--report", help="Write the JSON report here instead of to stdout.")
+
+
+def run(args):
+    """Run a parsed ``export`` command. Returns the process exit code."""
+    available = list_projects(args.projects_dir)
+    names = available if args.all else list(dict.fromkeys(args.projects))
+    if not names:
+        print("Error: No projects to export. Name some projects or pass --all.", file=sys.stderr)
+        return 2
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        print(f"Error: Unknown project(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    options = {
+        "incremental": args.incremental,
+        "optimize_images": args.optimize_images,
+        "image_quality": args.quality,
+        "single_file": args.single_file,
+    }
+    result = export_projects(names, args.output, options, base_dir=args.projects_dir, max_workers=args.jobs)
+    report_json = json.dumps(result, indent=2)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            f.write(report_json)
+    else:
+        print(report_json)
+    return 0 if all(report.get("ok") for report in result["projects"]) else 1
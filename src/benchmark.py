@@ -0,0 +1,240 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from . import utils
+from . import synthetic_project
+
+SCENARIOS = (
+    "project_io_load", "project_io_save", "render_canvas", "selection_change",
+    "export_html_content", "export", "undo",
+)
+RESULTS_VERSION = 1
+MIN_REGRESSION_SECONDS = 0.002 # Smaller slowdowns are timer noise, whatever the ratio
+
+_bench_app = None
+
+
+def _ensure_application():
+    """Create the offscreen QApplication the canvas widgets need."""
+    global _bench_app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    if QApplication.instance() is None:
+        _bench_app = QApplication([sys.argv[0] if sys.argv else "infocanvas"])
+
+
+def _open_app(project_name):
+    """Open ``project_name`` in the real main window, skipping the project manager dialog."""
+    from app import InfoCanvasApp # The main window module lives next to infocanvas.py
+
+    class BenchmarkApp(InfoCanvasApp):
+        def _initial_project_setup(self):
+            return self._switch_to_project(project_name)
+
+    return BenchmarkApp()
+
+
+def _time(func, repeat, setup=None):
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - started)
+    return runs
+
+
+def _scenario_timers(project_path, config, app, output_dir):
+    """Return ``{scenario: (func, setup)}`` for one generated project."""
+    from PyQt5.QtWidgets import QApplication
+    from .exporter import HtmlExporter
+    from .info_area_item import InfoAreaItem
+    from .project_io import ProjectIO
+
+    loader = ProjectIO()
+    loader.current_project_path = project_path
+    saver = ProjectIO()
+    exporter = HtmlExporter(config=config, project_path=project_path)
+    selection = {"index": 0, "areas": []}
+
+    def find_areas():
+        # Rendering replaces every item, so look them up before each run
+        selection["areas"] = [item for item in app.item_map.values() if isinstance(item, InfoAreaItem)]
+
+    def select_next_area():
+        areas = selection["areas"]
+        if not areas:
+            return
+        app.scene.clearSelection()
+        areas[selection["index"] % len(areas)].setSelected(True)
+        selection["index"] += 1
+
+    def render_canvas():
+        app.render_canvas_from_config()
+        QApplication.processEvents() # Deferred work the render queued belongs to it
+
+    def make_undoable_change():
+        if app.config.get('info_areas'):
+            app.config['info_areas'][0]['center_x'] += 1
+        else:
+            app.config['background']['width'] += 1
+        app.save_config()
+
+    def forget_last_save():
+        saver.last_saved_config = None # Otherwise an unchanged config is not written again
+
+    return {
+        "project_io_load": (loader.load_config_for_current_project, None),
+        "project_io_save": (lambda: saver.save_config(project_path, config), forget_last_save),
+        "render_canvas": (render_canvas, None),
+        "selection_change": (select_next_area, find_areas),
+        "export_html_content": (exporter._generate_html_content, None),
+        "export": (lambda: exporter.export(os.path.join(output_dir, "index.html")), None),
+        "undo": (app.undo_last_action, make_undoable_change),
+    }
+
+
+def run_benchmarks(area_counts=(1000,), repeat=3, scenarios=SCENARIOS, generator_options=None, work_dir=None,
+                   progress=None):
+    """Time each scenario on a generated project per entry of ``area_counts``.
+
+    ``generator_options`` are passed on to :func:`synthetic_project.generate_config`.
+    ``progress(message)`` is called as work proceeds.
+
+    Returns:
+        dict: ``{"version", "environment", "results": [{"scenario", "info_areas", "images",
+        "connections", "runs", "min", "median", "mean"}]}``, times in seconds.
+    """
+    from PyQt5.QtCore import QT_VERSION_STR
+
+    _ensure_application()
+    generator_options = dict(generator_options or {})
+    results = []
+    original_base_dir = utils.PROJECTS_BASE_DIR
+    with tempfile.TemporaryDirectory(prefix="infocanvas-bench-", dir=work_dir) as base_dir:
+        utils.PROJECTS_BASE_DIR = base_dir
+        try:
+            for info_areas in area_counts:
+                name = f"bench_{info_areas}"
+                config = synthetic_project.generate_config(info_areas=info_areas, project_name=name, **generator_options)
+                project_path = synthetic_project.write_project(os.path.join(base_dir, name), config)
+                output_dir = os.path.join(base_dir, "_export", name)
+                if progress:
+                    progress(f"{info_areas} info areas: opening project")
+                with contextlib.redirect_stdout(io.StringIO()): # Status and warning prints
+                    app = _open_app(name)
+                    try:
+                        timers = _scenario_timers(project_path, config, app, output_dir)
+                        for scenario in scenarios:
+                            if progress:
+                                progress(f"{info_areas} info areas: {scenario}")
+                            func, setup = timers[scenario]
+                            runs = _time(func, repeat, setup)
+                            results.append({
+                                "scenario": scenario,
+                                "info_areas": info_areas,
+                                "images": len(config["images"]),
+                                "connections": len(config["connections"]),
+                                "runs": [round(run, 6) for run in runs],
+                                "min": round(min(runs), 6),
+                                "median": round(statistics.median(runs), 6),
+                                "mean": round(statistics.mean(runs), 6),
+                            })
+                    finally:
+                        app.close()
+                        app.deleteLater()
+        finally:
+            utils.PROJECTS_BASE_DIR = original_base_dir
+    return {
+        "version": RESULTS_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(current, baseline, tolerance=0.25):
+    """Compare median times with a stored result file's.
+
+    A scenario regressed when its median grew by more than ``tolerance`` (a
+    fraction) and by more than :data:`MIN_REGRESSION_SECONDS`.
+
+    Returns:
+        dict: ``{"compared": [...], "regressions": [...]}``, each entry with the
+        scenario, info area count, both medians and their ratio.
+    """
+    baseline_medians = {(r["scenario"], r["info_areas"]): r["median"] for r in baseline.get("results", [])}
+    compared, regressions = [], []
+    for result in current["results"]:
+        key = (result["scenario"], result["info_areas"])
+        if key not in baseline_medians:
+            continue
+        before, after = baseline_medians[key], result["median"]
+        entry = {
+            "scenario": key[0], "info_areas": key[1], "baseline": before, "current": after,
+            "ratio": round(after / before, 3) if before else None,
+        }
+        compared.append(entry)
+        if after > before * (1 + tolerance) and after - before > MIN_REGRESSION_SECONDS:
+            regressions.append(entry)
+    return {"compared": compared, "regressions": regressions}
+
+
+def add_arguments(parser):
+    parser.add_argument("--areas", type=int, nargs="+", default=[1000], help="Info area counts to benchmark.")
+    parser.add_argument("--images", type=int, default=20, help="Images per generated project.")
+    parser.add_argument("--connections", type=int, default=None, help="Connections per project (default: half the areas).")
+    parser.add_argument("--styles", type=int, default=5, help="Info area styles per project.")
+    parser.add_argument("--text-length", type=int, default=80, help="Characters of text per info area.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated projects.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per scenario.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), help="Scenarios to run.")
+    parser.add_argument("--output", help="Write the JSON results here instead of to stdout.")
+    parser.add_argument("--baseline", help="Results file to compare with; exits 1 on regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline, as a fraction.")
+    parser.add_argument("--work-dir", default=None, help="Folder for the temporary generated projects.")
+
+
+def run(args):
+    """Run a parsed ``bench`` command. Returns the process exit code."""
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot read baseline '{args.baseline}': {e}", file=sys.stderr)
+            return 2
+    generator_options = {
+        "images": args.images, "connections": args.connections, "styles": args.styles,
+        "text_length": args.text_length, "seed": args.seed,
+    }
+    result = run_benchmarks(args.areas, args.repeat, args.scenarios, generator_options, args.work_dir,
+                            progress=lambda message: print(message, file=sys.stderr))
+    exit_code = 0
+    if baseline is not None:
+        result["comparison"] = compare_to_baseline(result, baseline, args.tolerance)
+        for entry in result["comparison"]["regressions"]:
+            print(f"Regression: {entry['scenario']} at {entry['info_areas']} areas took {entry['current']:.4f}s "
+                  f"(baseline {entry['baseline']:.4f}s)", file=sys.stderr)
+        exit_code = 1 if result["comparison"]["regressions"] else 0
+    result_json = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(result_json)
+    else:
+        print(result_json)
+    return exit_code
@@ -4,8 +4,14 @@ from PyQt5.sip import isdeleted
 from PyQt5.QtGui import QColor, QBrush, QPixmap, QTransform
 from PyQt5.QtWidgets import QGraphicsScene, QMessageBox, QApplication
 
+from . import instrumentation
+from . import operation_trace
+from . import profiling
+from . import scene_cache
 from . import utils
 from .draggable_image_item import DraggableImageItem
+from .image_store import ImageStore
+from .scaled_pixmap_cache import scaled_pixmap_cache
 from .info_area_item import InfoAreaItem
 
 
@@ -18,10 +24,14 @@ class CanvasManager(QObject):
         super().__init__()
         self.app = app
         self.scene: QGraphicsScene = app.scene
+        self.scene_cache = None # Scene cache of the project last opened, see _take_scene_cache
+        self._scene_cache_project = None
         if self.scene:
             self.scene.selectionChanged.connect(self.on_scene_selection_changed)
 
     # ---- Rendering -----------------------------------------------------
+    @profiling.profiled("render")
+    @instrumentation.timed("render_canvas_from_config")
     def render_canvas_from_config(self):
         app = self.app
         config = app.config
@@ -37,6 +47,8 @@ class CanvasManager(QObject):
 
         self.scene.clear()
         app.item_map.clear()
+        scaled_pixmap_cache().clear() # Every image item is recreated with a new pixmap
+        cache = self._take_scene_cache()
 
         bg_conf = config.get('background', utils.get_default_config()['background'])
         self.scene.setBackgroundBrush(QBrush(QColor(bg_conf['color'])))
@@ -52,20 +64,30 @@ class CanvasManager(QObject):
             if not image_path:
                 continue
             image_full_path = os.path.join(current_images_folder, image_path)
-            pixmap = QPixmap(image_full_path)
-            if pixmap.isNull():
+            if img_conf.get('blob') and not os.path.exists(image_full_path):
+                try:
+                    ImageStore().restore_missing(current_images_folder, img_conf)
+                except OSError as e:
+                    print(f"Warning: Could not restore '{image_path}' from the image store: {e}")
+            # Very large images are painted from a tile pyramid instead of one pixmap
+            proxy = cache.image_proxy(image_full_path, img_conf) if cache is not None else None
+            item = DraggableImageItem.from_file(img_conf, image_full_path, app.current_project_path, proxy=proxy)
+            if item.tile_source is None and item.pixmap().isNull():
+                print(f"Warning: Image '{image_path}' could not be loaded and is shown as a placeholder. "
+                      f"File > Check Project Images lists missing files.")
                 pixmap = QPixmap(100, 100)
                 pixmap.fill(Qt.lightGray)
+                item.setPixmap(pixmap)
                 if not img_conf.get('original_width') or img_conf.get('original_width', 0) <= 0:
                     img_conf['original_width'] = 100
                 if not img_conf.get('original_height') or img_conf.get('original_height', 0) <= 0:
                     img_conf['original_height'] = 100
+            image_rect = item.boundingRect()
             if not img_conf.get('original_width') or img_conf.get('original_width', 0) <= 0:
-                img_conf['original_width'] = pixmap.width()
+                img_conf['original_width'] = int(image_rect.width())
             if not img_conf.get('original_height') or img_conf.get('original_height', 0) <= 0:
-                img_conf['original_height'] = pixmap.height()
+                img_conf['original_height'] = int(image_rect.height())
 
-            item = DraggableImageItem(pixmap, img_conf)
             scale = img_conf.get('scale', 1.0)
             transform = QTransform()
             transform.scale(scale, scale)
@@ -82,9 +104,10 @@ class CanvasManager(QObject):
 
         for rect_conf in config.get('info_areas', []):
             item = InfoAreaItem(rect_conf)
+            if cache is not None:
+                cache.apply_text_layout(item)
             item.item_selected.connect(self.on_graphics_item_selected)
             item.item_moved.connect(self.on_graphics_item_moved)
-            item.properties_changed.connect(self.on_graphics_item_properties_changed)
             self.scene.addItem(item)
             app.item_map[rect_conf['id']] = item
 
@@ -101,15 +124,16 @@ class CanvasManager(QObject):
                     print(
                         f"Warning: InfoRectangle {rect_conf.get('id')} references style '{style_name}' which was not found in info_area_styles."
                     )
+            # Connected after the style is applied: applying it emits properties_changed, which would save once per area
+            item.properties_changed.connect(self.on_graphics_item_properties_changed)
 
         from .connection_line_item import ConnectionLineItem
         for line_conf in config.get('connections', []):
-            line_item = ConnectionLineItem(line_conf, app.item_map)
+            points = cache.connection_points(line_conf, app.item_map) if cache is not None else None
+            line_item = ConnectionLineItem(line_conf, app.item_map, points=points)
             line_item.item_selected.connect(self.on_graphics_item_selected)
-            line_item.properties_changed.connect(self.on_graphics_item_properties_changed)
             self.scene.addItem(line_item)
             app.item_map[line_conf['id']] = line_item
-            line_item.update_position()
             if 'line_style_ref' in line_conf:
                 style_name = line_conf['line_style_ref']
                 found = None
@@ -123,6 +147,7 @@ class CanvasManager(QObject):
                     print(
                         f"Warning: Connection {line_conf.get('id')} references style '{style_name}' which was not found in line_styles."
                     )
+            line_item.properties_changed.connect(self.on_graphics_item_properties_changed)
 
         if selected_item_id and selected_item_id in app.item_map:
             app.selected_item = app.item_map[selected_item_id]
@@ -140,7 +165,21 @@ class CanvasManager(QObject):
             if app.view.horizontalScrollBar():
                 app.view.horizontalScrollBar().setValue(app.view.horizontalScrollBar().minimum())
 
+    def _take_scene_cache(self):
+        """The current project's scene cache on its first render after being opened, else None.
+
+        Later renders (undo, paste, ...) decode and lay out everything directly.
+        """
+        project_path = self.app.current_project_path
+        if not project_path or project_path == self._scene_cache_project:
+            return None
+        self._scene_cache_project = project_path
+        self.scene_cache = scene_cache.SceneCache.load(project_path)
+        return self.scene_cache
+
     # ---- Selection Handling -------------------------------------------
+    @operation_trace.recorded()
+    @instrumentation.timed("on_scene_selection_changed")
     def on_scene_selection_changed(self):
         app = self.app
         if not self.scene or isdeleted(self.scene):
@@ -174,6 +213,7 @@ class CanvasManager(QObject):
         app.update_properties_panel()
         self.selection_changed.emit()
 
+    @operation_trace.recorded()
     def on_graphics_item_selected(self, graphics_item):
         app = self.app
         if app.current_mode == "view":
@@ -227,11 +267,13 @@ class CanvasManager(QObject):
         app.update_properties_panel()
         self.selection_changed.emit()
 
+    @operation_trace.recorded()
     def on_graphics_item_moved(self, graphics_item):
         self.app.save_config()
         if isinstance(graphics_item, InfoAreaItem):
             self.update_connection_lines(graphics_item)
 
+    @operation_trace.recorded()
     def on_graphics_item_properties_changed(self, graphics_item):
         self.app.save_config()
         if isinstance(graphics_item, InfoAreaItem):
@@ -240,6 +282,7 @@ class CanvasManager(QObject):
             self.app.update_properties_panel()
 
     # ---- Alignment Helpers -------------------------------------------
+    @operation_trace.recorded()
     def align_selected_rects_horizontally(self):
         if not self.scene:
             return
@@ -262,6 +305,7 @@ class CanvasManager(QObject):
             if hasattr(rect, 'properties_changed') and hasattr(rect.properties_changed, 'emit'):
                 rect.properties_changed.emit(rect)
 
+    @operation_trace.recorded()
     def align_selected_rects_vertically(self):
         if not self.scene:
             return
@@ -284,6 +328,7 @@ class CanvasManager(QObject):
             if hasattr(rect, 'properties_changed') and hasattr(rect.properties_changed, 'emit'):
                 rect.properties_changed.emit(rect)
 
+    @instrumentation.timed("update_connection_lines")
     def update_connection_lines(self, changed_item=None):
         connections = self.app.config.get('connections', [])
         for line_conf in connections:
@@ -0,0 +1,103 @@
+import gzip
+import json
+import math
+import os
+import zlib
+
+try:
+    import orjson
+except ImportError: # Optional faster encoder and parser; the standard library is used without it
+    orjson = None
+
+PRETTY = "pretty" # Indented JSON, easy to read and edit by hand (the default)
+COMPACT = "compact" # JSON without whitespace
+GZIP = "gzip" # Compact JSON, gzip-compressed
+FORMATS = (PRETTY, COMPACT, GZIP)
+FORMAT_LABELS = {PRETTY: "Readable JSON", COMPACT: "Compact JSON", GZIP: "Compressed JSON (gzip)"}
+
+ENV_VAR = "INFOCANVAS_CONFIG_FORMAT" # Format of new projects
+GZIP_MAGIC = b"\x1f\x8b"
+GZIP_LEVEL = 1 # Configs are saved after every edit; higher levels cost several times longer for ~30% less
+
+
+def default_format():
+    """Format for new projects: ``INFOCANVAS_CONFIG_FORMAT`` if it names one, else :data:`PRETTY`."""
+    value = os.environ.get(ENV_VAR, "").strip().lower()
+    return value if value in FORMATS else PRETTY
+
+
+def _has_non_finite(value):
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(element) for element in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(element) for element in value)
+    return False
+
+
+def _encode_json(config, indent):
+    if orjson is not None:
+        try:
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError: # Non-string keys or integers beyond 64 bits; the standard encoder accepts these
+            data = None
+        # orjson writes NaN and Infinity as null; only look for them when there is a null at all
+        if data is not None and (b"null" not in data or not _has_non_finite(config)):
+            return data
+    if indent:
+        return json.dumps(config, indent=2).encode('utf-8')
+    return json.dumps(config, separators=(',', ':')).encode('utf-8')
+
+
+def encode(config, fmt=PRETTY):
+    """Serialize a config to bytes in ``fmt``."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown config format '{fmt}'")
+    data = _encode_json(config, indent=fmt == PRETTY)
+    if fmt == GZIP:
+        data = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return data
+
+
+def decode(data):
+    """Parse config bytes written in any of the formats.
+
+    Returns:
+        tuple: ``(config, format)``. Raises ValueError for malformed data.
+    """
+    if data[:2] == GZIP_MAGIC:
+        try:
+            data = gzip.decompress(data)
+        except (OSError, EOFError, zlib.error) as e:
+            raise ValueError(f"Corrupt compressed config: {e}")
+        fmt = GZIP
+    else:
+        # Compact JSON never contains a line break; anything else is kept readable
+        fmt = PRETTY if b"\n" in data.strip() else COMPACT
+    return _loads(data), fmt
+
+
+def _loads(data):
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError: # NaN, Infinity or integers beyond 64 bits, which the standard parser reads
+            pass
+    return json.loads(data)
+
+
+def load_with_format(path):
+    """Read a config file, detecting its format. Returns ``(config, format)``."""
+    with open(path, 'rb') as f:
+        return decode(f.read())
+
+
+def load(path):
+    return load_with_format(path)[0]
+
+
+def dump(config, path, fmt=PRETTY):
+    data = encode(config, fmt) # Encoded first, so a failure leaves the old file untouched
+    with open(path, 'wb') as f:
+        f.write(data)
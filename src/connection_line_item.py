@@ -11,7 +11,8 @@ class ConnectionLineItem(QGraphicsObject):
     item_selected = pyqtSignal(QGraphicsItem)
     properties_changed = pyqtSignal(QGraphicsItem)
 
-    def __init__(self, line_config, item_map, parent=None):
+    def __init__(self, line_config, item_map, parent=None, points=None):
+        """``points`` are known end points ``(x1, y1, x2, y2)``, e.g. from the scene cache."""
         super().__init__(parent)
         self.config_data = line_config
         self.config_data.setdefault('opacity', 1.0)
@@ -21,7 +22,10 @@ class ConnectionLineItem(QGraphicsObject):
         self._line = QLineF()
         self._pen = QPen()
         self._update_pen()
-        self.update_position()
+        if points is not None:
+            self._line = QLineF(*points)
+        else:
+            self.update_position()
 
     def _update_pen(self):
         color = QColor(self.config_data.get('line_color', '#00ffff'))
@@ -40,6 +44,9 @@ class ConnectionLineItem(QGraphicsObject):
             self._line = QLineF(QPointF(x1, y1), QPointF(x2, y2))
             self.update()
 
+    def end_points(self):
+        return (self._line.x1(), self._line.y1(), self._line.x2(), self._line.y2())
+
     def boundingRect(self):
         extra = self._pen.widthF() / 2
         return QRectF(self._line.p1(), self._line.p2()).normalized().adjusted(-extra, -extra, extra, extra)
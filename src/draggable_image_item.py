@@ -1,41 +1,211 @@
 from PyQt5.QtWidgets import QGraphicsItem, QApplication
-from PyQt5.QtCore import Qt, QRectF, pyqtSignal
+from PyQt5.QtCore import Qt, QRectF, QPointF, QTimer, pyqtSignal
+from PyQt5.QtGui import QImageReader, QPainter, QPixmap, QTransform
+from PyQt5.sip import isdeleted
 
+from . import instrumentation
 from . import utils
+from . import image_tiles
+from . import scene_cache
+from .scaled_pixmap_cache import scaled_pixmap_cache
 from .base_draggable_item import BaseDraggableItem
 
 
 class DraggableImageItem(BaseDraggableItem):
     item_selected = pyqtSignal(QGraphicsItem)
 
-    def __init__(self, pixmap, config_data, parent_item=None):
+    INTERACTIVE_SCALING_MS = 250 # Transformed painting continues this long after the last scale change
+
+    def __init__(self, pixmap, config_data, parent_item=None, tile_source=None, full_size=None):
         super().__init__(parent_item)
         self._pixmap = pixmap
+        # When set, _pixmap is a downscaled proxy drawn at this (width, height) until the full image is decoded
+        self._full_size = full_size
+        self._full_image_path = None
         self.config_data = config_data
+        # When set, the image is painted from a tile pyramid and _pixmap is only a preview
+        self.tile_source = tile_source
+        self.tile_error = None # Why the tile pyramid could not be built, shown in place of the image
+        self._source_path = None # File the pixmap was loaded from, for off-thread rescaling
+        self._interactive_scaling = False
+        self._interactive_scaling_timer = None
         self.setFlags(QGraphicsItem.ItemIsSelectable |
                       QGraphicsItem.ItemIsMovable |
                       QGraphicsItem.ItemSendsGeometryChanges)
+        if tile_source is not None:
+            # exposedRect is needed to paint only the visible tiles
+            self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+            image_tiles.tile_builder().pyramid_ready.connect(self._on_pyramid_ready)
+            image_tiles.tile_builder().pyramid_failed.connect(self._on_pyramid_failed)
         self.setAcceptHoverEvents(True)
         self.initial_pos = self.pos()
         # Set initial stacking value
         self.setZValue(self.config_data.get('z_index', utils.Z_VALUE_IMAGE))
 
+    @classmethod
+    def from_file(cls, config_data, image_full_path, project_path=None, decoded_image=None, proxy=None):
+        """Create an item for an image file, using a tile pyramid for very large images.
+
+        The pyramid is built in the background when missing or older than the
+        image; until then a grey box of the right size is shown, with the reason
+        if the pyramid cannot be built. ``decoded_image``
+        is a QImage of the file already read elsewhere, e.g. by an import worker.
+        ``proxy`` is a downscaled copy from the project's scene cache: it is shown
+        at full size while the full image is decoded in the background.
+        """
+        if proxy is not None:
+            item = cls(proxy, config_data, full_size=(config_data['original_width'], config_data['original_height']))
+            item._full_image_path = image_full_path
+            scene_cache.image_loader().load(image_full_path, item._on_full_image_loaded)
+            return item
+        size = QImageReader(image_full_path).size()
+        if project_path and image_tiles.is_tiling_candidate(size.width(), size.height()):
+            dzi_path = image_tiles.pyramid_path(project_path, image_full_path)
+            source = image_tiles.TiledImageSource(dzi_path, size.width(), size.height())
+            item = cls(source.preview_pixmap(), config_data, tile_source=source)
+            if not source.is_current(image_full_path):
+                builder = image_tiles.tile_builder()
+                item._show_tile_error(builder.failure(image_full_path, dzi_path))
+                builder.schedule(image_full_path, dzi_path)
+            return item
+        if decoded_image is not None:
+            pixmap = QPixmap.fromImage(decoded_image)
+        else:
+            with instrumentation.span("image_decode"):
+                pixmap = QPixmap(image_full_path)
+        item = cls(pixmap, config_data)
+        item._source_path = image_full_path
+        return item
+
+    def _on_pyramid_ready(self, dzi_path):
+        if self.tile_source is not None and dzi_path == self.tile_source.dzi_path:
+            self.tile_source.reload()
+            self._pixmap = self.tile_source.preview_pixmap()
+            self.update()
+
+    def _on_pyramid_failed(self, dzi_path, reason):
+        if self.tile_source is not None and dzi_path == self.tile_source.dzi_path:
+            self._show_tile_error(reason)
+
+    def _show_tile_error(self, reason):
+        self.tile_error = reason
+        self.setToolTip(f"This image cannot be displayed: {reason}" if reason else "")
+        self.update()
+
+    def _on_full_image_loaded(self, image):
+        if isdeleted(self) or self._full_image_path is None:
+            return # Removed from the canvas, or given another pixmap meanwhile
+        path, self._full_image_path = self._full_image_path, None
+        if image.isNull():
+            print(f"Warning: Image '{path}' could not be loaded; keeping its cached preview.")
+            return
+        self.setPixmap(QPixmap.fromImage(image))
+        self._source_path = path
+
+    def is_proxy(self):
+        """Whether a cached preview is shown while the full image loads."""
+        return self._full_size is not None
+
+    def _on_scaled_pixmap_ready(self):
+        if not isdeleted(self):
+            self.update()
+
+    def begin_interactive_scaling(self):
+        """Paint with the item transform until the scale has stopped changing for a moment."""
+        self._interactive_scaling = True
+        if self._interactive_scaling_timer is None:
+            self._interactive_scaling_timer = QTimer(self)
+            self._interactive_scaling_timer.setSingleShot(True)
+            self._interactive_scaling_timer.timeout.connect(self._end_interactive_scaling)
+        self._interactive_scaling_timer.start(self.INTERACTIVE_SCALING_MS)
+
+    def _end_interactive_scaling(self):
+        self._interactive_scaling = False
+        self.update()
+
     def pixmap(self):
         return self._pixmap
 
     def setPixmap(self, pixmap):
         self.prepareGeometryChange()
+        self._discard_scaled_copies()
         self._pixmap = pixmap
+        self._source_path = None
+        self._full_size = None
+        self._full_image_path = None
         self.update()
 
+    def _discard_scaled_copies(self):
+        if self.tile_source is None and not self._pixmap.isNull():
+            scaled_pixmap_cache().discard(self._pixmap.cacheKey())
+
     def boundingRect(self):
+        if self.tile_source is not None:
+            return QRectF(0, 0, self.tile_source.width, self.tile_source.height)
+        if self._full_size is not None:
+            return QRectF(0, 0, *self._full_size)
         if self._pixmap.isNull():
             return QRectF()
         return QRectF(0, 0, self._pixmap.width(), self._pixmap.height())
 
     def paint(self, painter, option, widget=None):
-        if not self._pixmap.isNull():
-            painter.drawPixmap(0, 0, self._pixmap)
+        if self.tile_source is not None:
+            if self.tile_source.is_ready():
+                lod = option.levelOfDetailFromTransform(painter.worldTransform())
+                self.tile_source.paint(painter, option.exposedRect, lod)
+            else:
+                painter.fillRect(self.boundingRect(), Qt.lightGray)
+                if self.tile_error:
+                    self._paint_tile_error(painter)
+            return
+        if self._pixmap.isNull():
+            return
+        if self._full_size is not None:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawPixmap(self.boundingRect(), self._pixmap, QRectF(self._pixmap.rect()))
+            return
+        if option is not None and not self._interactive_scaling and self._paint_prescaled(painter):
+            return
+        painter.drawPixmap(0, 0, self._pixmap)
+
+    def _paint_tile_error(self, painter):
+        """Write the build failure across the placeholder at screen size, whatever the zoom."""
+        rect = painter.worldTransform().mapRect(self.boundingRect()).adjusted(8, 8, -8, -8)
+        if rect.width() <= 0 or rect.height() <= 0:
+            return
+        painter.save()
+        painter.resetTransform()
+        painter.setPen(Qt.black)
+        painter.drawText(rect, Qt.AlignCenter | Qt.TextWordWrap, f"This image cannot be displayed: {self.tile_error}")
+        painter.restore()
+
+    def _paint_prescaled(self, painter):
+        """Draw a copy resampled to the on-screen size 1:1, if the cache has one ready.
+
+        Only plain scales qualify; rotated or mirrored transforms paint the full pixmap.
+        """
+        transform = painter.worldTransform()
+        if transform.type() > QTransform.TxScale or transform.m11() <= 0 or transform.m22() <= 0:
+            return False
+        device = painter.device()
+        dpr = device.devicePixelRatioF() if device is not None else 1.0
+        width = round(self._pixmap.width() * transform.m11() * dpr)
+        height = round(self._pixmap.height() * transform.m22() * dpr)
+        if width <= 0 or height <= 0 or (width, height) == (self._pixmap.width(), self._pixmap.height()):
+            return False
+        scaled = scaled_pixmap_cache().get(self._pixmap, width, height, self._source_path,
+                                           self._on_scaled_pixmap_ready)
+        if scaled is None:
+            return False
+        origin = transform.map(QPointF(0, 0))
+        scaled.setDevicePixelRatio(dpr)
+        painter.save()
+        # Snap to a device pixel so the copy is not resampled again
+        painter.setWorldTransform(QTransform.fromTranslate(round(origin.x() * dpr) / dpr,
+                                                           round(origin.y() * dpr) / dpr))
+        painter.drawPixmap(QPointF(0, 0), scaled)
+        painter.restore()
+        return True
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.ItemPositionHasChanged and self.scene():
@@ -49,6 +219,8 @@ class DraggableImageItem(BaseDraggableItem):
             self.config_data['center_x'] = new_center_x
             self.config_data['center_y'] = new_center_y
             self._has_moved = True
+        elif change == QGraphicsItem.ItemSceneHasChanged and value is None:
+            self._discard_scaled_copies() # Removed from the canvas
         return super().itemChange(change, value)
 
     def mousePressEvent(self, event):
@@ -1,14 +1,68 @@
 import os
-import shutil
+import json
 import html
+import base64
+import mimetypes
+import mmap
+import hashlib
+import posixpath
+import re
 from PyQt5.QtGui import QTextDocument
+from . import instrumentation
+from . import profiling
 from . import utils # Assuming utils.py is in the same src directory
+from .file_copier import FileCopier
+from .image_optimizer import ImageOptimizer
+from . import image_tiles
+
+class _InlineImage:
+    """An ``<img>`` tag whose source file is embedded as a streamed data URI."""
+
+    # A multiple of 3 bytes, so every chunk encodes without '=' padding.
+    CHUNK_SIZE = 3 * 256 * 1024
+
+    def __init__(self, path, tag_suffix):
+        self.path = path
+        self.tag_suffix = tag_suffix
+
+    def write_to(self, out):
+        mime = mimetypes.guess_type(self.path)[0] or 'application/octet-stream'
+        try:
+            src = open(self.path, 'rb')
+        except OSError as e:
+            print(f"Warning: Source image file not found: '{self.path}'. Embedding skipped: {e}")
+            out.write("<img src=''" + self.tag_suffix)
+            return
+        with src:
+            out.write(f"<img src='data:{mime};base64,")
+            size = os.fstat(src.fileno()).st_size
+            if size:
+                # The page cache backs the mapping; slices are copied one chunk at a time.
+                with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    for offset in range(0, size, self.CHUNK_SIZE):
+                        out.write(base64.b64encode(data[offset:offset + self.CHUNK_SIZE]).decode('ascii'))
+            out.write("'" + self.tag_suffix)
+
 
 class HtmlExporter:
-    def __init__(self, config, project_path):
+    def __init__(self, config, project_path, progress_callback=None, image_quality=85, device_pixel_ratios=(1, 2),
+                 image_workers=None):
         self.config = config
         self.project_path = project_path
+        # Called as progress_callback(copied_bytes, total_bytes) while images are copied
+        self.progress_callback = progress_callback
+        # Encoder quality and pixel ratios used when export(optimize_images=True)
+        self.image_quality = image_quality
+        self.device_pixel_ratios = device_pixel_ratios
+        self.image_workers = image_workers # Processes used to resample images (default: CPU count)
         self.default_text_config = utils.get_default_config()["defaults"]["info_rectangle_text_display"]
+        # Relative image path -> src written into the HTML (set by incremental exports)
+        self.image_src_map = {}
+        # (relative image path, scale) -> [(src or None for the original, dpr)] for resampled images
+        self.image_srcset_map = {}
+        # Relative image path -> (exported .dzi path, Deep Zoom info) for tiled images
+        self.image_tiles_map = {}
+        self.last_export_stats = {}
 
     def _replace_relative_font_sizes(self, html_fragment, base_font_px):
         """Convert CSS relative font sizes like 'xx-large' to pixel values."""
@@ -26,13 +80,68 @@ class HtmlExporter:
             html_fragment = html_fragment.replace(f"font-size:{name};", f"font-size:{px}px;")
         return html_fragment
 
+    def _area_style_rules(self, rect_conf):
+        """Return the shared CSS for an info area and its text, plus its base font size in px."""
+        font_color = rect_conf.get('font_color', self.default_text_config['font_color'])
+        font_size_str = rect_conf.get('font_size', self.default_text_config['font_size'])
+        if isinstance(font_size_str, (int, float)) or str(font_size_str).isdigit():
+            base_font_px = int(float(font_size_str))
+            font_size = f"{font_size_str}px"
+        else:
+            try:
+                base_font_px = int(str(font_size_str).replace('px', ''))
+            except ValueError:
+                base_font_px = int(str(self.default_text_config['font_size']).replace('px', ''))
+            font_size = font_size_str
+        padding_str = rect_conf.get('padding', self.default_text_config['padding'])
+        if isinstance(padding_str, (int, float)) or str(padding_str).isdigit(): padding = f"{padding_str}px"
+        else: padding = padding_str
+        h_align = rect_conf.get('horizontal_alignment', self.default_text_config['horizontal_alignment'])
+        v_align = rect_conf.get('vertical_alignment', self.default_text_config['vertical_alignment'])
+
+        area_defaults = utils.get_default_config()["defaults"].get("info_area_appearance", {})
+        fill_hex = rect_conf.get('fill_color', area_defaults.get("fill_color", "#007BFF"))
+        fill_alpha = rect_conf.get('fill_alpha', area_defaults.get("fill_alpha", 0.1))
+        try:
+            fill_alpha = float(fill_alpha)
+        except Exception:
+            fill_alpha = 0.1
+        if fill_alpha > 1:
+            fill_alpha = fill_alpha / 255.0
+        fill_alpha = max(0.0, min(fill_alpha, 1.0))
+        area_rule = f"background-color:{utils.hex_to_rgba(fill_hex, fill_alpha)};"
+        if rect_conf.get('shape', 'rectangle') == 'ellipse':
+            area_rule += "border-radius:50%;"
+        if v_align == "top": area_rule += "align-items:flex-start;"
+        elif v_align == "center" or v_align == "middle": area_rule += "align-items:center;"
+        elif v_align == "bottom": area_rule += "align-items:flex-end;"
+
+        text_rule = f"color:{font_color};font-size:{font_size};padding:{padding};text-align:{h_align};"
+        return area_rule, text_rule, base_font_px
+
+    def _unique_style_class_name(self, style_ref, taken_names):
+        """Build a CSS class name for a style, based on its ``style_ref`` when present."""
+        taken_names = set(taken_names)
+        if style_ref:
+            slug = re.sub(r'[^A-Za-z0-9_-]+', '-', str(style_ref)).strip('-') or 'style'
+            base = f"area-style-{slug}"
+        else:
+            base = "area-style"
+        candidate = base if style_ref else f"{base}-1"
+        counter = 1
+        while candidate in taken_names:
+            counter += 1
+            candidate = f"{base}-{counter}"
+        return candidate
+
     def _get_project_images_folder(self):
         if not self.project_path:
             print("Error: Project path is not set in HtmlExporter.")
             return None
         return os.path.join(self.project_path, utils.PROJECT_IMAGES_DIRNAME)
 
-    def _copy_project_images(self, output_dir):
+    @instrumentation.timed("export.copy_images")
+    def _copy_project_images(self, output_dir, skip_paths=()):
         if not self.config:
             print("Warning: No config loaded in HtmlExporter, cannot copy images.")
             return False
@@ -42,59 +151,355 @@ class HtmlExporter:
             return False
         dest_images_folder = os.path.join(output_dir, 'images')
         os.makedirs(dest_images_folder, exist_ok=True)
-        copied_any = False
         image_configs = self.config.get('images', [])
         if not image_configs:
             print("No images listed in config to copy.")
             return True # No images to copy, considered successful.
 
+        copy_pairs = {}  # destination -> source; images sharing a file are copied once
         for img_conf in image_configs:
             relative_image_path = img_conf.get('path', '')
             if not relative_image_path:
                 print(f"Warning: Image config missing path for ID '{img_conf.get('id', 'Unknown')}'. Skipping copy.")
                 continue
+            if relative_image_path in skip_paths:
+                continue # Only resampled variants of this image are referenced
             src_file_path = os.path.join(src_images_folder, relative_image_path)
             dest_file_path = os.path.join(dest_images_folder, relative_image_path)
-            os.makedirs(os.path.dirname(dest_file_path), exist_ok=True)
             if os.path.exists(src_file_path):
-                try:
-                    shutil.copy2(src_file_path, dest_file_path)
-                    copied_any = True # Mark true if at least one copy action is attempted
-                except Exception as e:
-                    print(f"Error copying image '{src_file_path}' to '{dest_file_path}': {e}")
-                    # Depending on desired behavior, you might want to return False here or collect errors.
+                copy_pairs[dest_file_path] = src_file_path
             else:
                 print(f"Warning: Source image file not found: '{src_file_path}'. Skipping copy.")
 
+        for src_file_path, dest_file_path, e in FileCopier().copy_files(
+                ((src, dst) for dst, src in copy_pairs.items()), self.progress_callback):
+            print(f"Error copying image '{src_file_path}' to '{dest_file_path}': {e}")
+
         # Return True if the process completed, even if some individual files were missing.
         # The calling function can check logs for specific errors if needed.
         return True
 
 
+    @instrumentation.timed("export.copy_tiles")
+    def _copy_tile_pyramids(self, output_dir):
+        """Copy the up-to-date tile pyramids of tiled images into ``tiles/``.
+
+        Returns the relative paths of the images that will be shown from tiles,
+        whose originals therefore do not need to be exported.
+        """
+        self.image_tiles_map = {}
+        if not self.project_path:
+            return set()
+        src_images_folder = self._get_project_images_folder()
+        copy_pairs = {}  # destination -> (source, relative image path)
+        for img_conf in (self.config or {}).get('images', []):
+            relative_image_path = img_conf.get('path', '')
+            if not relative_image_path or relative_image_path in self.image_tiles_map:
+                continue
+            dzi_path = image_tiles.pyramid_path(self.project_path, relative_image_path)
+            info = image_tiles.read_dzi(dzi_path)
+            try:
+                if not info or os.path.getmtime(dzi_path) < os.path.getmtime(
+                        os.path.join(src_images_folder, relative_image_path)):
+                    continue # Missing or outdated pyramid: export the original instead
+            except OSError:
+                continue
+            dzi_name = os.path.basename(dzi_path)
+            copy_pairs[os.path.join(output_dir, 'tiles', dzi_name)] = (dzi_path, relative_image_path)
+            files_dir = image_tiles.tiles_folder(dzi_path)
+            for root, _, files in os.walk(files_dir):
+                for name in files:
+                    tile_path = os.path.join(root, name)
+                    dest_file_path = os.path.join(output_dir, 'tiles', os.path.relpath(tile_path, os.path.dirname(files_dir)))
+                    copy_pairs[dest_file_path] = (tile_path, relative_image_path)
+            self.image_tiles_map[relative_image_path] = (posixpath.join('tiles', dzi_name), info)
+
+        errors = FileCopier().copy_files(((src, dst) for dst, (src, _) in copy_pairs.items()), self.progress_callback)
+        for src_file_path, dest_file_path, e in errors:
+            print(f"Error copying tile '{src_file_path}' to '{dest_file_path}': {e}")
+            # An incomplete pyramid is useless; that image falls back to its original
+            self.image_tiles_map.pop(copy_pairs[dest_file_path][1], None)
+        return set(self.image_tiles_map)
+
+    @instrumentation.timed("export.optimize_images")
+    def _optimize_project_images(self, output_dir, digests):
+        """Export images resampled to their displayed size, one variant per pixel ratio.
+
+        ``digests`` maps relative image paths to their SHA-256; variants are cached
+        per project under that digest and target size. Fills ``image_srcset_map``.
+
+        Returns:
+            tuple: ``(served_paths, variant_outputs, stats)`` where ``served_paths``
+            are images needing no original in the output and ``variant_outputs``
+            maps each relative path to the variant files written for it.
+        """
+        self.image_srcset_map = {}
+        stats = {"images_resampled": 0, "variants_cached": 0}
+        if not self.project_path:
+            return set(), {}, stats
+        optimizer = ImageOptimizer(
+            os.path.join(self.project_path, utils.EXPORT_CACHE_DIRNAME),
+            quality=self.image_quality,
+            device_pixel_ratios=self.device_pixel_ratios,
+            max_workers=self.image_workers,
+        )
+        src_images_folder = self._get_project_images_folder()
+        plans = []
+        jobs = []
+        for img_conf in (self.config or {}).get('images', []):
+            relative_image_path = img_conf.get('path', '')
+            if relative_image_path not in digests or not optimizer.can_resample(relative_image_path):
+                continue
+            scale = self._image_scale(img_conf)
+            try:
+                original_width = int(img_conf.get('original_width', 0))
+                original_height = int(img_conf.get('original_height', 0))
+            except (TypeError, ValueError):
+                continue
+            if scale <= 0 or original_width <= 0 or original_height <= 0:
+                continue
+            sizes = optimizer.target_sizes(original_width, original_height, scale)
+            if all(width is None for _, width, _ in sizes):
+                continue # Displayed at (or above) full resolution
+            src_file_path = os.path.join(src_images_folder, relative_image_path)
+            digest = digests[relative_image_path]
+            jobs.extend((src_file_path, digest, w, h) for _, w, h in sizes if w is not None)
+            plans.append((relative_image_path, scale, src_file_path, digest, sizes))
+
+        errors = optimizer.build(jobs, self.progress_callback)
+        failed = {cache_path for _, cache_path, _ in errors}
+        for src_file_path, _, e in errors:
+            print(f"Warning: Could not resample image '{src_file_path}', exporting the original instead: {e}")
+        stats["images_resampled"] = optimizer.encoded_count
+        stats["variants_cached"] = optimizer.cached_count
+        stats["variants_pruned"] = optimizer.prune(jobs)[0]
+
+        # Variants are linked from the cache into the output under content-derived names.
+        link_pairs = {}
+        planned_outputs = []
+        for relative_image_path, scale, src_file_path, digest, sizes in plans:
+            stem, ext = posixpath.splitext(relative_image_path.replace(os.sep, '/'))
+            outputs = []
+            for dpr, width, height in sizes:
+                cache_path = width and optimizer.cache_path(digest, width, height, ext)
+                if not cache_path or cache_path in failed:
+                    outputs.append((None, dpr))
+                    continue
+                output_rel = posixpath.join('images', f"{stem}.{digest[:12]}-{width}x{height}-q{optimizer.quality}{ext}")
+                link_pairs[os.path.join(output_dir, *output_rel.split('/'))] = cache_path
+                outputs.append((output_rel, dpr))
+            planned_outputs.append((relative_image_path, scale, outputs))
+        copy_errors = FileCopier().copy_files((src, dst) for dst, src in link_pairs.items())
+        for cache_path, dest_file_path, e in copy_errors:
+            print(f"Error copying image '{cache_path}' to '{dest_file_path}': {e}")
+        failed_outputs = {dst for _, dst, _ in copy_errors}
+
+        needs_original = set()
+        variant_outputs = {}
+        for relative_image_path, scale, outputs in planned_outputs:
+            srcset = []
+            for output_rel, dpr in outputs:
+                if output_rel and os.path.join(output_dir, *output_rel.split('/')) not in failed_outputs:
+                    variant_outputs.setdefault(relative_image_path, set()).add(output_rel)
+                    srcset.append((output_rel, dpr))
+                else:
+                    needs_original.add(relative_image_path)
+                    srcset.append((None, dpr))
+            self.image_srcset_map[(relative_image_path, scale)] = srcset
+        planned_paths = {plan[0] for plan in plans}
+        # An image shown at full size elsewhere on the canvas still needs its original.
+        for img_conf in (self.config or {}).get('images', []):
+            if (img_conf.get('path', ''), self._image_scale(img_conf)) not in self.image_srcset_map:
+                needs_original.add(img_conf.get('path', ''))
+        return planned_paths - needs_original, variant_outputs, stats
+
+    @staticmethod
+    def _image_scale(img_conf):
+        try:
+            return float(img_conf.get('scale', 1.0))
+        except (TypeError, ValueError):
+            return 1.0
+
+    def _load_export_manifest(self, output_dir):
+        manifest_path = os.path.join(output_dir, utils.EXPORT_MANIFEST_FILENAME)
+        manifest = {"version": 1, "images": {}, "html": {}}
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict) and loaded.get("version") == 1:
+                    manifest["images"] = loaded.get("images", {}) or {}
+                    manifest["html"] = loaded.get("html", {}) or {}
+            except (IOError, ValueError) as e:
+                print(f"Warning: Ignoring unreadable export manifest '{manifest_path}': {e}")
+        return manifest
+
+    def _save_export_manifest(self, output_dir, manifest):
+        manifest_path = os.path.join(output_dir, utils.EXPORT_MANIFEST_FILENAME)
+        try:
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            return True
+        except IOError as e:
+            print(f"Error writing export manifest '{manifest_path}': {e}")
+            return False
+
+    @instrumentation.timed("export.sync_images")
+    def _sync_project_images(self, output_dir, manifest, optimize_images=False):
+        """Copy images to content-hashed names, skipping those already exported.
+
+        Source files are only re-hashed when their size or mtime differ from the
+        manifest entry, so unchanged images cost a single ``os.stat``.
+        """
+        self.image_src_map = {}
+        self.image_srcset_map = {}
+        stats = {"images_copied": 0, "images_reused": 0, "images_removed": 0}
+        src_images_folder = self._get_project_images_folder()
+        old_images = manifest.get("images", {})
+        new_images = {}
+        for img_conf in (self.config or {}).get('images', []):
+            relative_image_path = img_conf.get('path', '')
+            if not relative_image_path or relative_image_path in new_images:
+                continue
+            src_file_path = os.path.join(src_images_folder or '', relative_image_path)
+            try:
+                st = os.stat(src_file_path)
+            except OSError:
+                print(f"Warning: Source image file not found: '{src_file_path}'. Skipping copy.")
+                continue
+            entry = old_images.get(relative_image_path)
+            if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                digest = entry["sha256"]
+            else:
+                digest = utils.file_sha256(src_file_path)
+            new_images[relative_image_path] = {
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "sha256": digest,
+            }
+
+        served_paths = self._copy_tile_pyramids(output_dir)
+        if optimize_images:
+            optimized_paths, variant_outputs, optimize_stats = self._optimize_project_images(
+                output_dir, {path: entry["sha256"] for path, entry in new_images.items() if path not in served_paths})
+            served_paths |= optimized_paths
+            stats.update(optimize_stats)
+            for relative_image_path, outputs in variant_outputs.items():
+                new_images[relative_image_path]["variants"] = sorted(outputs)
+
+        copy_pairs = []
+        for relative_image_path, entry in new_images.items():
+            if relative_image_path in served_paths:
+                continue # Only resampled variants of this image are referenced
+            src_file_path = os.path.join(src_images_folder or '', relative_image_path)
+            stem, ext = posixpath.splitext(relative_image_path.replace(os.sep, '/'))
+            output_rel = posixpath.join('images', f"{stem}.{entry['sha256'][:12]}{ext}")
+            dest_file_path = os.path.join(output_dir, *output_rel.split('/'))
+            if os.path.exists(dest_file_path):
+                stats["images_reused"] += 1
+            else:
+                copy_pairs.append((src_file_path, dest_file_path, relative_image_path))
+            entry["output"] = output_rel
+            self.image_src_map[relative_image_path] = output_rel
+
+        errors = FileCopier().copy_files([(src, dst) for src, dst, _ in copy_pairs], self.progress_callback)
+        failed = {dst for _, dst, _ in errors}
+        for src_file_path, dest_file_path, e in errors:
+            print(f"Error copying image '{src_file_path}' to '{dest_file_path}': {e}")
+        for _, dest_file_path, relative_image_path in copy_pairs:
+            if dest_file_path in failed:
+                new_images.pop(relative_image_path, None)
+                self.image_src_map.pop(relative_image_path, None)
+            else:
+                stats["images_copied"] += 1
+
+        # Remove hashed files from earlier exports that nothing references anymore.
+        live_outputs = set()
+        for entry in new_images.values():
+            live_outputs.update(self._manifest_entry_outputs(entry))
+        for entry in old_images.values():
+            for output_rel in self._manifest_entry_outputs(entry):
+                if output_rel in live_outputs:
+                    continue
+                stale_path = os.path.join(output_dir, *output_rel.split('/'))
+                try:
+                    if os.path.isfile(stale_path):
+                        os.remove(stale_path)
+                        stats["images_removed"] += 1
+                except OSError as e:
+                    print(f"Warning: Could not remove stale exported image '{stale_path}': {e}")
+        manifest["images"] = new_images
+        return stats
+
+    @staticmethod
+    def _manifest_entry_outputs(entry):
+        """Return the exported files recorded for one manifest image entry."""
+        if not isinstance(entry, dict):
+            return []
+        outputs = list(entry.get("variants") or [])
+        if entry.get("output"):
+            outputs.append(entry["output"])
+        return outputs
+
+    @instrumentation.timed("export.generate_html")
     def _generate_html_content(self):
-        # ... (previous implementation from step 2 - content is long, so omitted for brevity in this subtask description) ...
-        # For the subtask runner, assume this method is already correctly defined as per previous steps.
-        # Actual content of _generate_html_content:
+        return "\n".join(self._html_lines())
+
+    def _html_lines(self, embed_images=False):
+        """Return the document as a list of lines.
+
+        With ``embed_images`` each ``<img>`` is an :class:`_InlineImage` placeholder
+        whose data URI is only produced while :meth:`_write_single_file` streams it.
+        """
         project_name = self.config.get('project_name', 'Project')
         bg = self.config.get('background', {})
         lines = [
             "<!DOCTYPE html>", "<html>", "<head>", "<meta charset='utf-8'>",
             f"<title>{html.escape(project_name)}</title>",
-            "<style>", "#canvas{position:relative;}", ".hotspot{position:absolute;}",
+            "<style>", "#canvas{position:relative;}",
+            ".hotspot{position:absolute;display:flex;box-sizing:border-box;transform-origin:center center;}",
+            ".text-content{width:100%;box-sizing:border-box;overflow-wrap:break-word;word-wrap:break-word;background-color:transparent;}",
             ".tooltip{position:absolute;border:1px solid #333;padding:2px;background:rgba(255,255,255,0.9);display:none;z-index:1000;}",
             "</style>", "</head>", "<body>",
             f"<div id='canvas' style='width:{bg.get('width',800)}px;height:{bg.get('height',600)}px;background-color:{bg.get('color','#FFFFFF')};'>",
         ]
+        # Per-style classes are generated while walking the info areas and
+        # inserted just before the closing </style> tag.
+        style_insert_at = lines.index("</style>")
         for img_conf in self.config.get('images', []):
             scale = img_conf.get('scale', 1.0)
             width = img_conf.get('original_width', 0) * scale
             height = img_conf.get('original_height', 0) * scale
             left = img_conf.get('center_x', 0) - width / 2
             top = img_conf.get('center_y', 0) - height / 2
-            src = os.path.join('images', img_conf.get('path', ''))
-            lines.append(
-                f"<img src='{html.escape(src)}' style='position:absolute;left:{left}px;top:{top}px;width:{width}px;height:{height}px;'>"
-            )
+            src = self.image_src_map.get(img_conf.get('path', '')) or os.path.join('images', img_conf.get('path', ''))
+            srcset_attr = ""
+            variants = self.image_srcset_map.get((img_conf.get('path', ''), self._image_scale(img_conf)))
+            if variants:
+                # Entries without a variant fall back to the full-size original.
+                candidates = [(variant_src or src, dpr) for variant_src, dpr in variants]
+                src = candidates[0][0]
+                srcset = ", ".join(f"{candidate} {dpr:g}x" for candidate, dpr in candidates)
+                srcset_attr = f" srcset='{html.escape(srcset)}'"
+            img_style = f"position:absolute;left:{left}px;top:{top}px;width:{width}px;height:{height}px;"
+            tiles = self.image_tiles_map.get(img_conf.get('path', ''))
+            if tiles and not embed_images:
+                dzi_rel, info = tiles
+                lines.append(
+                    f"<div class='deepzoom' data-tiles='{html.escape(dzi_rel[:-len('.dzi')])}_files' "
+                    f"data-format='{info['format']}' data-tile-size='{info['tile_size']}' "
+                    f"data-full-width='{info['width']}' data-full-height='{info['height']}' "
+                    f"style='{img_style}overflow:hidden;'></div>"
+                )
+            elif embed_images:
+                lines.append(_InlineImage(
+                    os.path.join(self._get_project_images_folder() or '', img_conf.get('path', '')),
+                    f" style='{img_style}'>",
+                ))
+            else:
+                lines.append(f"<img src='{html.escape(src)}'{srcset_attr} style='{img_style}'>")
+        style_classes = {}
+        hotspot_lines = []
         for rect_conf in self.config.get('info_areas', []):
             rect_width = rect_conf.get('width', 0)
             rect_height = rect_conf.get('height', 0)
@@ -110,59 +515,30 @@ class HtmlExporter:
                 text_content = full_html[body_start:body_end]
             else:
                 text_content = full_html
-            font_color = rect_conf.get('font_color', self.default_text_config['font_color'])
-            font_size_str = rect_conf.get('font_size', self.default_text_config['font_size'])
-            if isinstance(font_size_str, (int, float)) or str(font_size_str).isdigit():
-                base_font_px = int(float(font_size_str))
-                font_size = f"{font_size_str}px"
-            else:
-                try:
-                    base_font_px = int(str(font_size_str).replace('px', ''))
-                except ValueError:
-                    base_font_px = int(str(self.default_text_config['font_size']).replace('px', ''))
-                font_size = font_size_str
+            area_rule, text_rule, base_font_px = self._area_style_rules(rect_conf)
             text_content = self._replace_relative_font_sizes(text_content, base_font_px)
-            padding_str = rect_conf.get('padding', self.default_text_config['padding'])
-            if isinstance(padding_str, (int, float)) or str(padding_str).isdigit(): padding = f"{padding_str}px"
-            else: padding = padding_str
-            h_align = rect_conf.get('horizontal_alignment', self.default_text_config['horizontal_alignment'])
-            v_align = rect_conf.get('vertical_alignment', self.default_text_config['vertical_alignment'])
+            style_key = (area_rule, text_rule)
+            if style_key not in style_classes:
+                style_classes[style_key] = self._unique_style_class_name(
+                    rect_conf.get('style_ref'), style_classes.values()
+                )
+            style_class = style_classes[style_key]
+
+            # Only per-element geometry and the initial visibility stay inline;
+            # everything shared between areas lives in the generated stylesheet.
             z_index = rect_conf.get('z_index', utils.Z_VALUE_INFO_RECT)
-            outer_style = f"position:absolute; left:{left}px; top:{top}px; width:{rect_width}px; height:{rect_height}px; display:flex; box-sizing: border-box; z-index:{z_index};"
-            fill_hex = rect_conf.get('fill_color', utils.get_default_config()["defaults"].get("info_area_appearance", {}).get("fill_color", "#007BFF"))
-            fill_alpha = rect_conf.get('fill_alpha', utils.get_default_config()["defaults"].get("info_area_appearance", {}).get("fill_alpha", 0.1))
-            try:
-                fill_alpha = float(fill_alpha)
-            except Exception:
-                fill_alpha = 0.1
-            if fill_alpha > 1:
-                fill_alpha = fill_alpha / 255.0
-            fill_alpha = max(0.0, min(fill_alpha, 1.0))
-            rgba_color = utils.hex_to_rgba(fill_hex, fill_alpha)
-            outer_style += f"background-color:{rgba_color};"
-            if rect_conf.get('shape', 'rectangle') == 'ellipse':
-                outer_style += "border-radius:50%;"
+            outer_style = f"left:{left}px;top:{top}px;width:{rect_width}px;height:{rect_height}px;z-index:{z_index};"
             angle = rect_conf.get('angle', 0)
             try:
                 angle = float(angle)
             except (ValueError, TypeError):
                 angle = 0
             if angle:
-                outer_style += f"transform-origin:center center; transform:rotate({angle}deg);"
-            if v_align == "top": outer_style += "align-items:flex-start;"
-            elif v_align == "center" or v_align == "middle": outer_style += "align-items:center;"
-            elif v_align == "bottom": outer_style += "align-items:flex-end;"
-            inner_style_list = [
-                "width:100%;", "box-sizing:border-box;", "overflow-wrap:break-word;", "word-wrap:break-word;",
-                f"color:{font_color};", f"font-size:{font_size};", "background-color:transparent;",
-                f"padding:{padding};", f"text-align:{h_align};"
-            ]
-            current_inner_style = "".join(inner_style_list)
+                outer_style += f"transform:rotate({angle}deg);"
             show_on_hover = rect_conf.get('show_on_hover', True)
             show_on_hover_connected = rect_conf.get('show_on_hover_connected', False) # New
             if show_on_hover or (not show_on_hover and show_on_hover_connected): # Updated logic
                 outer_style += "opacity:0;"
-            text_content_div_style = current_inner_style
             # Updated data_attr to include the new property
             data_attr = f"data-show-on-hover='{str(show_on_hover).lower()}' data-show-on-hover-connected='{str(show_on_hover_connected).lower()}'"
             extra_data = (
@@ -170,10 +546,15 @@ class HtmlExporter:
                 f"data-width='{rect_width}' data-height='{rect_height}' "
                 f"data-shape='{rect_conf.get('shape','rectangle')}'"
             )
-            lines.append(
-                f"<div class='hotspot info-rectangle-export' {extra_data} {data_attr} style='{outer_style}'>"
-                f"<div class='text-content' style='{text_content_div_style}'>{text_content}</div></div>"
+            hotspot_lines.append(
+                f"<div class='hotspot info-rectangle-export {style_class}' {extra_data} {data_attr} style='{outer_style}'>"
+                f"<div class='text-content'>{text_content}</div></div>"
             )
+        lines[style_insert_at:style_insert_at] = [
+            f".{name}{{{area_rule}}} .{name}>.text-content{{{text_rule}}}"
+            for (area_rule, text_rule), name in style_classes.items()
+        ]
+        lines.extend(hotspot_lines)
         for conn in self.config.get('connections', []):
             src = next((r for r in self.config.get('info_areas', []) if r.get('id') == conn.get('source')), None)
             dst = next((r for r in self.config.get('info_areas', []) if r.get('id') == conn.get('destination')), None)
@@ -410,14 +791,43 @@ class HtmlExporter:
 "updateAllVisibilities();",
 "</script>", "</body></html>",
         ])
-        return "\n".join(lines)
+        if self.image_tiles_map and not embed_images:
+            # Lay out the tiles of the smallest Deep Zoom level that is sharp at this size.
+            lines[lines.index("</script>"):lines.index("</script>")] = [
+"document.querySelectorAll('.deepzoom').forEach(function(dz){",
+"  var w=parseFloat(dz.style.width), h=parseFloat(dz.style.height);",
+"  var fw=+dz.dataset.fullWidth, fh=+dz.dataset.fullHeight, ts=+dz.dataset.tileSize;",
+"  var top=Math.ceil(Math.log2(Math.max(fw,fh)));",
+"  var need=Math.max(w/fw,h/fh)*(window.devicePixelRatio||1);",
+"  var level=Math.max(0,Math.min(top,Math.ceil(top+Math.log2(need))));",
+"  var f=Math.pow(2,top-level), lw=Math.ceil(fw/f), lh=Math.ceil(fh/f), sx=w/lw, sy=h/lh;",
+"  for(var r=0;r*ts<lh;r++){ for(var c=0;c*ts<lw;c++){",
+"    var img=document.createElement('img');",
+"    img.src=dz.dataset.tiles+'/'+level+'/'+c+'_'+r+'.'+dz.dataset.format;",
+"    img.style.cssText='position:absolute;left:'+(c*ts*sx)+'px;top:'+(r*ts*sy)+'px;width:'+(Math.min(ts,lw-c*ts)*sx)+'px;height:'+(Math.min(ts,lh-r*ts)*sy)+'px;';",
+"    dz.appendChild(img);",
+"  }}",
+"});",
+            ]
+        return lines
 
-    def export(self, output_html_path):
+    @profiling.profiled("export")
+    @instrumentation.timed("export")
+    def export(self, output_html_path, incremental=False, optimize_images=False, single_file=False):
         """
         Exports the project view to an HTML file and copies associated images.
 
         Args:
             output_html_path (str): The full path where the HTML file will be saved.
+            incremental (bool): Keep a manifest in the output directory, copy only
+                images whose content changed (under content-hashed file names) and
+                leave the HTML untouched when it is identical to the last export.
+            optimize_images (bool): Export JPEG/PNG images resampled to their
+                displayed size for each of ``device_pixel_ratios`` (referenced via
+                ``srcset``) instead of the full-resolution originals.
+            single_file (bool): Embed every image as a base64 data URI so the HTML
+                file is self-contained and no ``images/`` folder is written. The
+                other options do not apply in this mode.
 
         Returns:
             bool: True if export was successful (HTML written, images attempted to be copied),
@@ -427,22 +837,35 @@ class HtmlExporter:
             print("Error: Output HTML path is not provided to HtmlExporter.export().")
             return False
 
-        html_content = self._generate_html_content()
         output_dir = os.path.dirname(str(output_html_path))
 
         # Create output directory if it doesn't exist (e.g., if output_html_path is "new_folder/export.html")
         # This should usually be handled by QFileDialog or the caller, but good to ensure.
-        if not os.path.exists(output_dir):
+        if output_dir and not os.path.exists(output_dir):
             try:
                 os.makedirs(output_dir, exist_ok=True)
             except Exception as e:
                 print(f"Error creating output directory '{output_dir}': {e}")
                 return False # Cannot proceed if output directory cannot be created
 
+        if single_file:
+            return self._write_single_file(str(output_html_path))
+        if incremental:
+            return self._export_incremental(str(output_html_path), output_dir, optimize_images)
+
+        self.image_src_map = {}
+        self.image_srcset_map = {}
+        served_paths = self._copy_tile_pyramids(output_dir)
+        if optimize_images:
+            optimized_paths, _, self.last_export_stats = self._optimize_project_images(
+                output_dir, self._hash_project_images(skip_paths=served_paths))
+            served_paths |= optimized_paths
+        html_content = self._generate_html_content()
+
         # Copy images
         # The success of image copying might not necessarily halt the HTML export,
         # but errors/warnings will be printed by _copy_project_images.
-        self._copy_project_images(output_dir) # We can check its return value if needed
+        self._copy_project_images(output_dir, skip_paths=served_paths) # We can check its return value if needed
 
         # Write the HTML file
         try:
@@ -454,5 +877,66 @@ class HtmlExporter:
             print(f"Error writing HTML file to '{output_html_path}': {e}")
             return False
 
+    @instrumentation.timed("export.single_file")
+    def _write_single_file(self, output_html_path):
+        """Stream the document to disk, base64-encoding images straight from their files.
+
+        Only one encoded chunk is held in memory at a time, so peak memory does
+        not grow with the size of the embedded images.
+        """
+        self.image_src_map = {}
+        self.image_srcset_map = {}
+        self.image_tiles_map = {}
+        try:
+            with open(output_html_path, 'w', encoding='utf-8') as f:
+                for index, line in enumerate(self._html_lines(embed_images=True)):
+                    if index:
+                        f.write("\n")
+                    if isinstance(line, _InlineImage):
+                        line.write_to(f)
+                    else:
+                        f.write(line)
+            print(f"Single-file HTML successfully written to {output_html_path}")
+            return True
+        except Exception as e:
+            print(f"Error writing HTML file to '{output_html_path}': {e}")
+            return False
+
+    @instrumentation.timed("export.hash_images")
+    def _hash_project_images(self, skip_paths=()):
+        """Return ``{relative path: sha256}`` for the existing images in the config."""
+        src_images_folder = self._get_project_images_folder()
+        digests = {}
+        for img_conf in (self.config or {}).get('images', []):
+            relative_image_path = img_conf.get('path', '')
+            if not relative_image_path or relative_image_path in digests or relative_image_path in skip_paths:
+                continue
+            try:
+                digests[relative_image_path] = utils.file_sha256(os.path.join(src_images_folder or '', relative_image_path))
+            except OSError:
+                continue # Reported when the originals are copied
+        return digests
+
+    def _export_incremental(self, output_html_path, output_dir, optimize_images=False):
+        manifest = self._load_export_manifest(output_dir)
+        stats = self._sync_project_images(output_dir, manifest, optimize_images)
+        html_content = self._generate_html_content()
+        html_digest = hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+        html_name = os.path.basename(output_html_path)
+        stats["html_written"] = False
+        if manifest["html"].get(html_name) != html_digest or not os.path.exists(output_html_path):
+            try:
+                with open(output_html_path, 'w', encoding='utf-8') as f:
+                    f.write(html_content)
+            except Exception as e:
+                print(f"Error writing HTML file to '{output_html_path}': {e}")
+                return False
+            manifest["html"][html_name] = html_digest
+            stats["html_written"] = True
+        self.last_export_stats = stats
+        self._save_export_manifest(output_dir, manifest)
+        print(f"Incremental export to {output_html_path}: {stats}")
+        return True
+
 if __name__ == '__main__':
     print("HtmlExporter class defined. To be used by the main application.")
@@ -0,0 +1,159 @@
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+FICLONE = 0x40049409  # Linux ioctl request for copy-on-write clones (btrfs, XFS, ...)
+
+
+class FileCopier:
+    """Copies batches of files on a thread pool.
+
+    When source and destination share a filesystem, a reflink clone is tried
+    first and a hard link second, so large images are not duplicated on disk.
+    Anything else falls back to a chunked byte copy. Progress is reported on
+    the calling thread, which lets GUI callers keep their event loop running.
+    """
+
+    LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+
+    def __init__(self, max_workers=None, link_mode="auto", chunk_size=1024 * 1024):
+        if link_mode not in self.LINK_MODES:
+            raise ValueError(f"Unknown link mode '{link_mode}'. Expected one of {self.LINK_MODES}.")
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
+        self.link_mode = link_mode
+        self.chunk_size = chunk_size
+        self.copied_bytes = 0
+        self.total_bytes = 0
+        self.method_counts = {"reflink": 0, "hardlink": 0, "copy": 0}
+        self._lock = threading.Lock()
+
+    def copy_files(self, pairs, progress_callback=None, poll_interval=0.05):
+        """Copy every ``(src, dst)`` pair.
+
+        ``progress_callback(copied_bytes, total_bytes)`` is invoked on the calling
+        thread while the copies run and once more when they are done.
+
+        Returns:
+            list: ``(src, dst, exception)`` tuples for the copies that failed.
+        """
+        pairs = list(pairs)
+        sizes = []
+        for src, _ in pairs:
+            try:
+                sizes.append(os.path.getsize(src))
+            except OSError:
+                sizes.append(0)
+        self.copied_bytes = 0
+        self.total_bytes = sum(sizes)
+        errors = []
+        if pairs:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    pool.submit(self._copy_one, src, dst, size): (src, dst)
+                    for (src, dst), size in zip(pairs, sizes)
+                }
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        exc = future.exception()
+                        if exc is not None:
+                            src, dst = futures[future]
+                            errors.append((src, dst, exc))
+                    if progress_callback and pending:
+                        progress_callback(self.copied_bytes, self.total_bytes)
+        if progress_callback:
+            progress_callback(self.total_bytes, self.total_bytes)
+        return errors
+
+    def _add_progress(self, nbytes, method=None):
+        with self._lock:
+            self.copied_bytes += nbytes
+            if method:
+                self.method_counts[method] += 1
+
+    def _copy_one(self, src, dst, size):
+        dst_dir = os.path.dirname(dst)
+        if dst_dir:
+            os.makedirs(dst_dir, exist_ok=True)
+        if os.path.lexists(dst):
+            if os.path.exists(dst) and os.path.samefile(src, dst):
+                self._add_progress(size, "hardlink")
+                return
+            # Never write through an existing file: it may be a hard link shared
+            # with another project or an earlier export.
+            os.remove(dst)
+        if self.link_mode != "copy" and self._same_device(src, dst_dir or "."):
+            if self.link_mode in ("auto", "reflink") and self._try_reflink(src, dst):
+                self._add_progress(size, "reflink")
+                return
+            if self.link_mode in ("auto", "hardlink") and self._try_hardlink(src, dst):
+                self._add_progress(size, "hardlink")
+                return
+        self._chunked_copy(src, dst)
+        self._add_progress(0, "copy")
+
+    @staticmethod
+    def _same_device(src, dst_dir):
+        try:
+            return os.stat(src).st_dev == os.stat(dst_dir).st_dev
+        except OSError:
+            return False
+
+    @staticmethod
+    def _try_reflink(src, dst):
+        if fcntl is None:
+            return False
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+            return False
+        shutil.copystat(src, dst)
+        return True
+
+    @staticmethod
+    def _try_hardlink(src, dst):
+        try:
+            os.link(src, dst)
+            return True
+        except OSError:
+            return False
+
+    def _chunked_copy(self, src, dst):
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            for chunk in iter(lambda: fsrc.read(self.chunk_size), b''):
+                fdst.write(chunk)
+                self._add_progress(len(chunk))
+        shutil.copystat(src, dst)
+
+
+def qt_progress_callback(parent, label):
+    """Return ``(dialog, callback)`` showing copy progress in a modal QProgressDialog.
+
+    The callback also pumps the Qt event loop so the window keeps repainting
+    while :meth:`FileCopier.copy_files` waits for its workers.
+    """
+    from PyQt5.QtWidgets import QApplication, QProgressDialog
+    from PyQt5.QtCore import Qt
+
+    dialog = QProgressDialog(label, None, 0, 100, parent)
+    dialog.setWindowModality(Qt.WindowModal)
+    dialog.setMinimumDuration(500)
+    dialog.setAutoClose(True)
+
+    def on_progress(copied_bytes, total_bytes):
+        dialog.setValue(int(copied_bytes * 100 / total_bytes) if total_bytes else 100)
+        QApplication.processEvents()
+
+    return dialog, on_progress
@@ -1,8 +1,10 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QMenu, QAction
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QMenu, QAction, QActionGroup
 from PyQt5.QtCore import Qt, QPoint, QRect, QEvent
 from PyQt5.QtGui import QMouseEvent
 
+from . import config_format
+
 class CustomTitleBar(QWidget):
     """
     Custom Title Bar for the frameless window.
@@ -50,18 +52,54 @@ class CustomTitleBar(QWidget):
         manage_projects_action = QAction("Manage Projects", self)
         save_config_action = QAction("Save Configuration", self)
         export_html_action = QAction("Export to HTML", self)
+        export_single_html_action = QAction("Export to Single HTML File", self)
+        render_profile_action = QAction("Rendering Profile...", self)
+        check_images_action = QAction("Check Project Images...", self)
+        performance_hud_action = QAction("Performance HUD (Ctrl+Shift+P)", self)
+        memory_report_action = QAction("Memory Report...", self)
+        self.stall_watchdog_action = QAction("Stall Watchdog", self)
+        self.stall_watchdog_action.setCheckable(True)
+        self.operation_trace_action = QAction("Record Operation Trace", self)
+        self.operation_trace_action.setCheckable(True)
         exit_action = QAction("Exit", self)
+        self.config_format_menu = QMenu("Config File Format", self)
+        self.config_format_menu.setStyleSheet(self.file_menu.styleSheet())
+        self.config_format_actions = {}
+        config_format_group = QActionGroup(self)
+        for fmt, label in config_format.FORMAT_LABELS.items():
+            action = QAction(label, self)
+            action.setCheckable(True)
+            action.triggered.connect(lambda _checked=False, fmt=fmt: self.parent.set_config_format(fmt))
+            config_format_group.addAction(action)
+            self.config_format_menu.addAction(action)
+            self.config_format_actions[fmt] = action
 
         # Connect QActions (assuming parent has these methods)
         manage_projects_action.triggered.connect(self.parent._show_project_manager_dialog)
         save_config_action.triggered.connect(lambda: self.parent.save_config())
         export_html_action.triggered.connect(lambda: self.parent.export_to_html())
+        export_single_html_action.triggered.connect(lambda: self.parent.export_to_html(single_file=True))
+        render_profile_action.triggered.connect(lambda: self.parent.show_render_profile_dialog())
+        check_images_action.triggered.connect(lambda: self.parent.show_image_integrity_dialog())
+        performance_hud_action.triggered.connect(lambda: self.parent.toggle_performance_hud())
+        memory_report_action.triggered.connect(lambda: self.parent.show_memory_report())
+        self.stall_watchdog_action.triggered.connect(lambda: self.parent.toggle_stall_watchdog())
+        self.operation_trace_action.triggered.connect(lambda: self.parent.toggle_operation_trace())
         exit_action.triggered.connect(self.parent.close)
 
         self.file_menu.addAction(manage_projects_action)
         self.file_menu.addSeparator()
         self.file_menu.addAction(save_config_action)
+        self.file_menu.addMenu(self.config_format_menu)
         self.file_menu.addAction(export_html_action)
+        self.file_menu.addAction(export_single_html_action)
+        self.file_menu.addSeparator()
+        self.file_menu.addAction(render_profile_action)
+        self.file_menu.addAction(check_images_action)
+        self.file_menu.addAction(performance_hud_action)
+        self.file_menu.addAction(memory_report_action)
+        self.file_menu.addAction(self.stall_watchdog_action)
+        self.file_menu.addAction(self.operation_trace_action)
         self.file_menu.addSeparator()
         self.file_menu.addAction(exit_action)
 
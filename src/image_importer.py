@@ -0,0 +1,149 @@
+import math
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from . import instrumentation
+from . import utils
+from . import image_tiles
+
+FALLBACK_SIZE = (100, 100) # Used, as for single uploads, when an image's dimensions cannot be read
+
+
+def collect_image_files(paths):
+    """Expand ``paths`` (files and folders) into a sorted, de-duplicated list of importable images.
+
+    Folders are searched recursively; files with other extensions are skipped.
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+                found.extend(os.path.join(root, name) for name in sorted(files) if utils.allowed_file(name))
+        elif os.path.isfile(path) and utils.allowed_file(os.path.basename(path)):
+            found.append(path)
+    return list(dict.fromkeys(os.path.abspath(path) for path in found))
+
+
+def allocate_filenames(source_paths, images_folder):
+    """Return a collision-free target filename in ``images_folder`` for every source.
+
+    Names are reserved up front, so the copies can run in parallel.
+    """
+    try:
+        taken = {name.lower() for name in os.listdir(images_folder)}
+    except OSError:
+        taken = set()
+    names = []
+    for path in source_paths:
+        base, ext = os.path.splitext(os.path.basename(path))
+        candidate = base + ext
+        counter = 1
+        while candidate.lower() in taken:
+            candidate = f"{base}_{counter}{ext}"
+            counter += 1
+        taken.add(candidate.lower())
+        names.append(candidate)
+    return names
+
+
+def grid_layout(sizes, area_width, area_height, spacing=10):
+    """Place images of ``sizes`` in a near-square grid filling the area.
+
+    Returns ``[(center_x, center_y, scale)]``; images are only ever scaled down,
+    to fit their cell, and scales are rounded to the two decimals the editor shows.
+    """
+    count = len(sizes)
+    if not count:
+        return []
+    columns = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+    cell_w = max(1.0, (area_width - spacing * (columns + 1)) / columns)
+    cell_h = max(1.0, (area_height - spacing * (rows + 1)) / rows)
+    placements = []
+    for index, (width, height) in enumerate(sizes):
+        row, column = divmod(index, columns)
+        scale = min(1.0, cell_w / max(width, 1), cell_h / max(height, 1))
+        scale = max(0.01, math.floor(scale * 100) / 100)
+        center_x = spacing + column * (cell_w + spacing) + cell_w / 2
+        center_y = spacing + row * (cell_h + spacing) + cell_h / 2
+        placements.append((center_x, center_y, scale))
+    return placements
+
+
+class ImportedImage:
+    """The outcome of importing one file; ``image`` is the decoded QImage, if any."""
+
+    def __init__(self, source_path, filename, target_path):
+        self.source_path = source_path
+        self.filename = filename
+        self.target_path = target_path
+        self.width = 0
+        self.height = 0
+        self.image = None
+        self.blob = None
+        self.error = None
+
+
+class ImageImporter:
+    """Copies, measures and decodes a batch of images on a thread pool.
+
+    Only QImage is touched by the workers; turning the decoded images into
+    pixmaps and canvas items is left to the GUI thread. Very large images are
+    not decoded, since the canvas displays them from tile pyramids.
+    """
+
+    def __init__(self, max_workers=None, store=None):
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
+        self.store = store # An ImageStore to hash files into, linking them into the project
+
+    def import_files(self, source_paths, images_folder, progress_callback=None, poll_interval=0.05):
+        """Import ``source_paths`` into ``images_folder``.
+
+        ``progress_callback(done, total)`` is invoked on the calling thread.
+
+        Returns:
+            list: :class:`ImportedImage` results in the order of ``source_paths``.
+        """
+        os.makedirs(images_folder, exist_ok=True)
+        results = [
+            ImportedImage(path, name, os.path.join(images_folder, name))
+            for path, name in zip(source_paths, allocate_filenames(source_paths, images_folder))
+        ]
+        total = len(results)
+        if results:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as pool:
+                pending = {pool.submit(self._import_one, result, self.store) for result in results}
+                while pending:
+                    _, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    if progress_callback:
+                        progress_callback(total - len(pending), total)
+        elif progress_callback:
+            progress_callback(0, 0)
+        return results
+
+    @staticmethod
+    def _import_one(result, store=None):
+        from PyQt5.QtGui import QImageReader
+
+        try:
+            if store is not None:
+                result.blob = store.add_file(result.source_path)
+                store.materialize(result.blob, result.target_path)
+            else:
+                shutil.copy(result.source_path, result.target_path)
+        except Exception as e:
+            result.error = f"Could not copy image to '{result.target_path}': {e}"
+            return result
+        reader = QImageReader(result.target_path)
+        size = reader.size()
+        if size.width() > 0 and size.height() > 0:
+            result.width, result.height = size.width(), size.height()
+            if not image_tiles.is_tiling_candidate(result.width, result.height):
+                with instrumentation.span("image_decode"):
+                    image = reader.read()
+                result.image = image if not image.isNull() else None
+        else:
+            result.width, result.height = FALLBACK_SIZE
+        return result
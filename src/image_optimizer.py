@@ -0,0 +1,162 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# Extensions that are re-encoded; anything else (e.g. animated GIFs) is exported as-is.
+RESAMPLE_FORMATS = {'.jpg': b'jpg', '.jpeg': b'jpg', '.png': b'png'}
+
+
+def resample_image(src_path, dest_path, width, height, quality):
+    """Decode ``src_path`` at ``width`` x ``height`` and encode it to ``dest_path``.
+
+    Runs inside worker processes, so it only touches QtGui classes that work
+    without a QApplication. The file is written under a temporary name first
+    so an interrupted export never leaves a truncated image in the cache.
+    """
+    from PyQt5.QtCore import QSize
+    from PyQt5.QtGui import QImageReader, QImageWriter
+
+    ext = os.path.splitext(dest_path)[1].lower()
+    reader = QImageReader(src_path)
+    # JPEG decodes straight to the smaller size; other formats are smooth-scaled by Qt.
+    reader.setScaledSize(QSize(width, height))
+    image = reader.read()
+    if image.isNull():
+        raise OSError(f"Could not read '{src_path}': {reader.errorString()}")
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+    writer = QImageWriter(tmp_path, RESAMPLE_FORMATS.get(ext, b'png'))
+    writer.setQuality(int(quality))
+    if not writer.write(image):
+        error = writer.errorString()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise OSError(f"Could not write '{dest_path}': {error}")
+    os.replace(tmp_path, dest_path)
+    return dest_path
+
+
+class ImageOptimizer:
+    """Builds downscaled copies of project images for export.
+
+    Each variant is cached on disk under its source digest, target size and
+    quality, so re-exporting an unchanged project encodes nothing; variants no
+    export needs any more are removed with :meth:`prune`. Decoding and
+    scaling are CPU bound, so pending variants are encoded in a process pool.
+    """
+
+    def __init__(self, cache_dir, quality=85, device_pixel_ratios=(1, 2), max_workers=None):
+        self.cache_dir = cache_dir
+        self.quality = max(1, min(int(quality), 100))
+        self.device_pixel_ratios = sorted({float(r) for r in device_pixel_ratios if float(r) > 0}) or [1.0]
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.encoded_count = 0
+        self.cached_count = 0
+
+    @staticmethod
+    def can_resample(path):
+        return os.path.splitext(path)[1].lower() in RESAMPLE_FORMATS
+
+    def target_sizes(self, original_width, original_height, scale):
+        """Return ``[(dpr, width, height)]`` for each device pixel ratio.
+
+        ``width`` and ``height`` are None when the displayed size at that ratio
+        needs the full original, which is then served instead of a variant.
+        """
+        sizes = []
+        for dpr in self.device_pixel_ratios:
+            width = math.ceil(original_width * scale * dpr)
+            height = math.ceil(original_height * scale * dpr)
+            if width >= original_width or height >= original_height or width < 1 or height < 1:
+                sizes.append((dpr, None, None))
+            else:
+                sizes.append((dpr, width, height))
+        return sizes
+
+    def cache_path(self, digest, width, height, ext):
+        return os.path.join(self.cache_dir, f"{digest}_{width}x{height}_q{self.quality}{ext.lower()}")
+
+    def job_path(self, job):
+        src_path, digest, width, height = job
+        return self.cache_path(digest, width, height, os.path.splitext(src_path)[1])
+
+    def prune(self, jobs):
+        """Delete the cached variants none of ``jobs`` refers to, e.g. those of replaced images.
+
+        Returns:
+            tuple: ``(removed file count, freed bytes)``.
+        """
+        keep = {self.job_path(job) for job in jobs}
+        removed, freed = 0, 0
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return removed, freed
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            if path in keep or name.endswith(".tmp") or not os.path.isfile(path):
+                continue # Temporary files may belong to an export still running
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError as e:
+                print(f"Warning: Could not remove cached export image '{path}': {e}")
+                continue
+            removed += 1
+            freed += size
+        return removed, freed
+
+    def build(self, jobs, progress_callback=None, poll_interval=0.05):
+        """Make sure a cached variant exists for every ``(src_path, digest, width, height)`` job.
+
+        ``progress_callback(done, total)`` is invoked on the calling thread.
+
+        Returns:
+            list: ``(src_path, cache_path, exception)`` tuples for variants that failed.
+        """
+        self.encoded_count = 0
+        self.cached_count = 0
+        pending = {}
+        for job in jobs:
+            src_path, _, width, height = job
+            dest_path = self.job_path(job)
+            if dest_path in pending:
+                continue
+            if os.path.exists(dest_path):
+                self.cached_count += 1
+            else:
+                pending[dest_path] = (src_path, width, height)
+
+        errors = []
+        total = len(pending)
+        if len(pending) == 1 or (pending and self.max_workers == 1):
+            for done, (dest_path, (src_path, width, height)) in enumerate(pending.items()):
+                try:
+                    resample_image(src_path, dest_path, width, height, self.quality)
+                    self.encoded_count += 1
+                except Exception as e:
+                    errors.append((src_path, dest_path, e))
+                if progress_callback:
+                    progress_callback(done + 1, total)
+        elif pending:
+            # Qt is not fork-safe, so workers start from a fresh interpreter.
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, total), mp_context=context) as pool:
+                futures = {
+                    pool.submit(resample_image, src_path, dest_path, width, height, self.quality): (src_path, dest_path)
+                    for dest_path, (src_path, width, height) in pending.items()
+                }
+                not_done = set(futures)
+                while not_done:
+                    done, not_done = wait(not_done, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        exc = future.exception()
+                        if exc is None:
+                            self.encoded_count += 1
+                        else:
+                            src_path, dest_path = futures[future]
+                            errors.append((src_path, dest_path, exc))
+                    if progress_callback:
+                        progress_callback(total - len(not_done), total)
+        return errors
@@ -0,0 +1,194 @@
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import Counter
+
+from . import config_format
+from . import utils
+
+
+class ImageStore:
+    """Content-addressed image blobs shared by every project under ``static/``.
+
+    A blob is named after the SHA-256 of its bytes plus the image extension and
+    lives at ``<store>/<first two hex digits>/<blob>``. Projects that opt in keep
+    their ``images/`` files as hard links to the blobs (copies where the
+    filesystem cannot link), and record the blob name in each image entry's
+    ``"blob"`` key. Those entries are the reference counts: blobs that no
+    ``config.json`` mentions any more are removed by :meth:`collect_garbage`.
+    Blobs are never modified in place.
+    """
+
+    def __init__(self, root=None, base_dir=None):
+        self.base_dir = base_dir or utils.PROJECTS_BASE_DIR
+        self.root = root or os.path.join(self.base_dir, utils.IMAGE_STORE_DIRNAME)
+
+    def blob_path(self, blob):
+        return os.path.join(self.root, blob[:2], blob)
+
+    def has(self, blob):
+        return os.path.isfile(self.blob_path(blob))
+
+    @staticmethod
+    def blob_name(path):
+        return utils.file_sha256(path) + os.path.splitext(path)[1].lower()
+
+    def add_file(self, src_path, link=False):
+        """Store ``src_path`` unless identical bytes are already stored. Returns the blob name.
+
+        With ``link`` the blob becomes a hard link to ``src_path`` instead of a copy;
+        only use it for files owned by a project, never for files picked by the user.
+        """
+        blob = self.blob_name(src_path)
+        path = self.blob_path(blob)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._place(src_path, path, link)
+        return blob
+
+    def materialize(self, blob, dest_path):
+        """Make ``dest_path`` a hard link to ``blob`` (a copy when linking is unavailable)."""
+        src_path = self.blob_path(blob)
+        if os.path.exists(dest_path) and os.path.samefile(src_path, dest_path):
+            return dest_path
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        self._place(src_path, dest_path, link=True)
+        return dest_path
+
+    @staticmethod
+    def _place(src_path, dest_path, link):
+        # Write under a temporary name so readers never see a partial file
+        tmp_path = f"{dest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if not link:
+                shutil.copyfile(src_path, tmp_path)
+            else:
+                try:
+                    os.link(src_path, tmp_path)
+                except OSError:
+                    shutil.copyfile(src_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def adopt_project(self, project_path, config):
+        """Move a project's existing images into the store, deduplicating identical files.
+
+        Each image file is replaced by a link to its blob and its entry gets a
+        ``"blob"`` key. Returns the number of entries that were adopted.
+        """
+        images_folder = os.path.join(project_path, utils.PROJECT_IMAGES_DIRNAME)
+        adopted = 0
+        for img_conf in config.get('images', []):
+            if img_conf.get('blob') or not img_conf.get('path'):
+                continue
+            image_path = os.path.join(images_folder, img_conf['path'])
+            if not os.path.isfile(image_path):
+                continue
+            blob = self.add_file(image_path, link=True)
+            self.materialize(blob, image_path)
+            img_conf['blob'] = blob
+            adopted += 1
+        return adopted
+
+    def restore_missing(self, images_folder, img_conf):
+        """Recreate an image file from its blob, e.g. after undoing a delete. Returns True if it did."""
+        blob = img_conf.get('blob')
+        image_path = os.path.join(images_folder, img_conf.get('path', ''))
+        if not blob or not img_conf.get('path') or os.path.exists(image_path) or not self.has(blob):
+            return False
+        self.materialize(blob, image_path)
+        return True
+
+    # --- Reference counting and garbage collection ---
+
+    def reference_counts(self):
+        """Count the image entries referring to each blob across every project's config."""
+        counts = Counter()
+        if not os.path.isdir(self.base_dir):
+            return counts
+        for name in os.listdir(self.base_dir):
+            config_path = os.path.join(self.base_dir, name, utils.PROJECT_CONFIG_FILENAME)
+            if not os.path.isfile(config_path):
+                continue
+            try:
+                config = config_format.load(config_path)
+            except (OSError, ValueError) as e:
+                # An unreadable config could still reference blobs, so refuse to guess
+                raise OSError(f"Cannot read '{config_path}' to count image references: {e}")
+            for img_conf in config.get('images', []):
+                if img_conf.get('blob'):
+                    counts[img_conf['blob']] += 1
+        return counts
+
+    def blobs(self):
+        """Yield ``(blob, path)`` for every stored blob."""
+        if not os.path.isdir(self.root):
+            return
+        for shard in sorted(os.listdir(self.root)):
+            shard_path = os.path.join(self.root, shard)
+            if not os.path.isdir(shard_path):
+                continue
+            for blob in sorted(os.listdir(shard_path)):
+                if not blob.endswith('.tmp'):
+                    yield blob, os.path.join(shard_path, blob)
+
+    def collect_garbage(self, dry_run=False, grace_seconds=3600):
+        """Remove blobs no project references.
+
+        Blobs added in the last ``grace_seconds`` are kept, since an editor may
+        not have saved the config that refers to them yet.
+
+        Returns:
+            dict: ``{"removed": [blob names], "freed_bytes", "kept"}``
+        """
+        counts = self.reference_counts()
+        now = time.time()
+        removed, freed, kept = [], 0, 0
+        for blob, path in list(self.blobs()):
+            stat = os.stat(path)
+            if counts.get(blob) or now - max(stat.st_mtime, stat.st_ctime) < grace_seconds:
+                kept += 1
+                continue
+            if not dry_run:
+                os.remove(path)
+            removed.append(blob)
+            # Project files linked to the blob keep the bytes until they are deleted too
+            freed += stat.st_size if stat.st_nlink <= 1 else 0
+        return {"removed": removed, "freed_bytes": freed, "kept": kept}
+
+    def stats(self):
+        counts = self.reference_counts()
+        blobs = list(self.blobs())
+        return {
+            "blobs": len(blobs),
+            "bytes": sum(os.path.getsize(path) for _, path in blobs),
+            "references": sum(counts.values()),
+            "unreferenced": sum(1 for blob, _ in blobs if not counts.get(blob)),
+        }
+
+
+def add_arguments(parser):
+    parser.add_argument("action", choices=("stats", "gc"), help="Show store statistics or remove unreferenced blobs.")
+    parser.add_argument("--projects-dir", default=utils.PROJECTS_BASE_DIR, help="Folder containing the projects.")
+    parser.add_argument("--dry-run", action="store_true", help="List what gc would remove without removing it.")
+    parser.add_argument("--grace", type=int, default=3600, help="Keep blobs added within this many seconds.")
+
+
+def run(args):
+    """Run a parsed ``store`` command. Returns the process exit code."""
+    store = ImageStore(base_dir=args.projects_dir)
+    try:
+        if args.action == "gc":
+            result = store.collect_garbage(dry_run=args.dry_run, grace_seconds=args.grace)
+        else:
+            result = store.stats()
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
@@ -0,0 +1,412 @@
+import hashlib
+import math
+import os
+import re
+import shutil
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, QRect, QRectF, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QImageIOHandler, QImageReader, QPainter, QPixmap
+
+from . import utils
+
+TILE_SIZE = 256
+FULL_DECODE_MAX_PIXELS = 100_000_000  # ~400 MB decoded; larger images must be readable in bands
+DZI_NAMESPACE = "http://schemas.microsoft.com/deepzoom/2008"
+
+
+# --- Deep Zoom layout helpers ---
+
+def is_tiling_candidate(width, height):
+    """Return True when an image is large enough to be shown from a tile pyramid."""
+    return width > 0 and height > 0 and width * height >= utils.TILED_IMAGE_MIN_PIXELS
+
+
+def pyramid_path(project_path, image_filename):
+    """Return the ``.dzi`` path of an image's pyramid; its tiles live in ``<name>_files/``.
+
+    The name is the file name made readable plus a hash of the exact file name,
+    so ``a.b.png`` and ``a_b.png`` get separate pyramids.
+    """
+    basename = os.path.basename(image_filename)
+    readable = re.sub(r'[^A-Za-z0-9-]+', '_', basename)[:40]
+    digest = hashlib.sha1(basename.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(project_path, utils.PROJECT_TILES_DIRNAME, f"{readable}_{digest}.dzi")
+
+
+def tiles_folder(dzi_path):
+    return os.path.splitext(dzi_path)[0] + "_files"
+
+
+def max_level(width, height):
+    """Deep Zoom numbering: level 0 is 1x1 and the top level is full resolution."""
+    return max(0, math.ceil(math.log2(max(width, height, 1))))
+
+
+def level_size(width, height, level):
+    factor = 2 ** (max_level(width, height) - level)
+    return math.ceil(width / factor), math.ceil(height / factor)
+
+
+def read_dzi(dzi_path):
+    """Return ``{"width", "height", "tile_size", "overlap", "format"}`` or None if unreadable."""
+    try:
+        root = ET.parse(dzi_path).getroot()
+        size = root.find(f"{{{DZI_NAMESPACE}}}Size")
+        return {
+            "width": int(size.get("Width")),
+            "height": int(size.get("Height")),
+            "tile_size": int(root.get("TileSize")),
+            "overlap": int(root.get("Overlap", 0)),
+            "format": root.get("Format"),
+        }
+    except (OSError, ET.ParseError, AttributeError, TypeError, ValueError):
+        return None
+
+
+def _write_dzi(dzi_path, width, height, tile_size, fmt):
+    tmp_path = dzi_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<Image xmlns="{DZI_NAMESPACE}" TileSize="{tile_size}" Overlap="0" Format="{fmt}">'
+            f'<Size Width="{width}" Height="{height}"/></Image>\n'
+        )
+    os.replace(tmp_path, dzi_path)
+
+
+def _stack(upper, lower):
+    """Return a new image with ``lower`` appended below ``upper``."""
+    combined = QImage(upper.width(), upper.height() + lower.height(), upper.format())
+    painter = QPainter(combined)
+    painter.setCompositionMode(QPainter.CompositionMode_Source)
+    painter.drawImage(0, 0, upper)
+    painter.drawImage(0, upper.height(), lower)
+    painter.end()
+    return combined
+
+
+def build_pyramid(src_path, dzi_path, tile_size=TILE_SIZE, quality=90, cancel_event=None):
+    """Write a Deep Zoom pyramid for ``src_path`` next to ``dzi_path``.
+
+    The source is read in strips of up to :data:`FULL_DECODE_MAX_PIXELS` using
+    ``QImageReader.setClipRect`` (JPEG decodes up to the bottom of each strip, so
+    few large strips are much cheaper than many small ones). Each strip is cut
+    into rows of tiles that are tiled, halved and fed to the level below, so
+    beyond the strip only about one row per level is held in memory. Formats
+    whose Qt reader cannot clip (PNG) are decoded once and sliced, which Qt
+    cannot avoid, so those larger than :data:`FULL_DECODE_MAX_PIXELS` are refused with a
+    ValueError instead of exhausting memory. Tiles are written to a
+    ``.partial`` folder that replaces the old one when done, and the ``.dzi``
+    file is written last, so its presence means the pyramid is complete.
+
+    Returns:
+        bool: True when the pyramid was written, False if cancelled or unreadable.
+    """
+    reader = QImageReader(src_path)
+    size = reader.size()
+    width, height = size.width(), size.height()
+    if width <= 0 or height <= 0:
+        return False
+    can_clip = reader.supportsOption(QImageIOHandler.ClipRect)
+    if not can_clip and width * height > FULL_DECODE_MAX_PIXELS:
+        raise ValueError(f"{width}x{height} is too large to decode at once and this format cannot be read "
+                         f"in bands; save the image as JPEG to display it")
+    ext = os.path.splitext(src_path)[1].lower()
+    fmt = "jpg" if ext in ('.jpg', '.jpeg') else "png"
+    image_format = QImage.Format_RGB32 if fmt == "jpg" else QImage.Format_ARGB32
+    top = max_level(width, height)
+    files_dir = tiles_folder(dzi_path)
+    partial_dir = files_dir + ".partial"
+    shutil.rmtree(partial_dir, ignore_errors=True)
+    for level in range(top + 1):
+        os.makedirs(os.path.join(partial_dir, str(level)), exist_ok=True)
+
+    pending = {}  # level -> rows received but not yet written as a full tile row
+    next_row = {}  # level -> index of the next tile row to write
+
+    def emit(level, band):
+        row = next_row.get(level, 0)
+        next_row[level] = row + 1
+        for col in range(math.ceil(band.width() / tile_size)):
+            tile = band.copy(col * tile_size, 0, min(tile_size, band.width() - col * tile_size), band.height())
+            tile_path = os.path.join(partial_dir, str(level), f"{col}_{row}.{fmt}")
+            if not tile.save(tile_path, fmt.upper(), quality):
+                raise OSError(f"Could not write tile '{tile_path}'")
+        if level > 0:
+            push(level - 1, band.scaled(math.ceil(band.width() / 2), math.ceil(band.height() / 2),
+                                        Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+
+    def push(level, band):
+        buffered = pending.pop(level, None)
+        band = _stack(buffered, band) if buffered is not None else band
+        while band.height() >= tile_size:
+            emit(level, band.copy(0, 0, band.width(), tile_size))
+            band = band.copy(0, tile_size, band.width(), band.height() - tile_size)
+        if band.height():
+            pending[level] = band
+
+    try:
+        full_image = None
+        if not can_clip:
+            full_image = reader.read()
+            if full_image.isNull():
+                return False
+        # Qt's JPEG reader decodes every row above a clip rect, so the source is
+        # read in as few strips as the memory budget allows and tiled from those.
+        strip_rows = height if full_image is not None else max(
+            tile_size, FULL_DECODE_MAX_PIXELS // width // tile_size * tile_size)
+        for strip_y in range(0, height, strip_rows):
+            if cancel_event is not None and cancel_event.is_set():
+                return False
+            strip_height = min(strip_rows, height - strip_y)
+            if full_image is not None:
+                strip = full_image
+            else:
+                strip_reader = QImageReader(src_path)
+                strip_reader.setClipRect(QRect(0, strip_y, width, strip_height))
+                strip = strip_reader.read()
+                if strip.isNull():
+                    raise OSError(f"Could not read '{src_path}': {strip_reader.errorString()}")
+            for y in range(0, strip_height, tile_size):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                band = strip.copy(0, y, width, min(tile_size, strip_height - y))
+                push(top, band.convertToFormat(image_format))
+            strip = None
+        full_image = None
+        # Flush the partial bottom rows, top level first so each flush feeds the next.
+        for level in range(top, -1, -1):
+            if level in pending:
+                emit(level, pending.pop(level))
+        if os.path.exists(dzi_path):
+            os.remove(dzi_path)  # The old pyramid stops being "complete" before it is replaced
+        shutil.rmtree(files_dir, ignore_errors=True)
+        os.replace(partial_dir, files_dir)
+        _write_dzi(dzi_path, width, height, tile_size, fmt)
+        return True
+    finally:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+
+
+# --- Display ---
+
+class TileCache:
+    """Least-recently-used cache of decoded tile pixmaps, bounded by their pixel bytes."""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._tiles = OrderedDict()
+
+    def get(self, path):
+        pixmap = self._tiles.get(path)
+        if pixmap is not None:
+            self._tiles.move_to_end(path)
+            return pixmap
+        pixmap = QPixmap(path)
+        if pixmap.isNull():
+            return None
+        self._tiles[path] = pixmap
+        self.current_bytes += self._cost(pixmap)
+        while self.current_bytes > self.max_bytes and len(self._tiles) > 1:
+            _, evicted = self._tiles.popitem(last=False)
+            self.current_bytes -= self._cost(evicted)
+        return pixmap
+
+    def discard_prefix(self, prefix):
+        """Drop every cached tile whose path starts with ``prefix`` (e.g. a rebuilt pyramid)."""
+        for path in [p for p in self._tiles if p.startswith(prefix)]:
+            self.current_bytes -= self._cost(self._tiles.pop(path))
+
+    def clear(self):
+        self._tiles.clear()
+        self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    @staticmethod
+    def _cost(pixmap):
+        return pixmap.width() * pixmap.height() * 4
+
+
+_shared_cache = None
+
+
+def shared_tile_cache():
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TileCache()
+    return _shared_cache
+
+
+class TiledImageSource:
+    """Paints a full-resolution image from its Deep Zoom pyramid.
+
+    Coordinates are full-resolution image pixels, matching an untransformed
+    ``DraggableImageItem``; the item's scale is part of the painter transform.
+    """
+
+    def __init__(self, dzi_path, width, height, cache=None):
+        self.dzi_path = dzi_path
+        self.width = width
+        self.height = height
+        self.cache = cache or shared_tile_cache()
+        self.info = None
+        self.reload()
+
+    def reload(self):
+        self.info = read_dzi(self.dzi_path)
+        if self.info and (self.info["width"], self.info["height"]) != (self.width, self.height):
+            self.info = None  # Built for a different image
+        self.cache.discard_prefix(tiles_folder(self.dzi_path) + os.sep)
+
+    def is_ready(self):
+        return self.info is not None
+
+    def is_current(self, src_path):
+        """Return True when the pyramid exists and is newer than ``src_path``."""
+        try:
+            return self.is_ready() and os.path.getmtime(self.dzi_path) >= os.path.getmtime(src_path)
+        except OSError:
+            return False
+
+    def level_for_scale(self, device_pixels_per_image_pixel):
+        top = max_level(self.width, self.height)
+        if device_pixels_per_image_pixel <= 0:
+            return 0
+        return max(0, min(top, math.ceil(top + math.log2(device_pixels_per_image_pixel) - 1e-9)))
+
+    def tile_path(self, level, col, row):
+        return os.path.join(tiles_folder(self.dzi_path), str(level), f"{col}_{row}.{self.info['format']}")
+
+    def preview_pixmap(self):
+        """Return the single tile of the largest level that fits in one tile."""
+        if not self.is_ready():
+            return QPixmap()
+        tile_size = self.info["tile_size"]
+        level = max_level(self.width, self.height)
+        while level > 0 and max(level_size(self.width, self.height, level)) > tile_size:
+            level -= 1
+        return QPixmap(self.tile_path(level, 0, 0))
+
+    def paint(self, painter, exposed_rect, device_pixels_per_image_pixel):
+        """Draw the tiles intersecting ``exposed_rect`` at the level matching the zoom."""
+        if not self.is_ready():
+            return 0
+        tile_size = self.info["tile_size"]
+        level = self.level_for_scale(device_pixels_per_image_pixel)
+        factor = 2 ** (max_level(self.width, self.height) - level)
+        level_width, level_height = level_size(self.width, self.height, level)
+        span = tile_size * factor  # Full-resolution pixels covered by one tile
+        visible = exposed_rect.intersected(QRectF(0, 0, self.width, self.height))
+        if visible.isEmpty():
+            return 0
+        first_col = max(0, int(visible.left() // span))
+        last_col = min(math.ceil(level_width / tile_size) - 1, int(visible.right() // span))
+        first_row = max(0, int(visible.top() // span))
+        last_row = min(math.ceil(level_height / tile_size) - 1, int(visible.bottom() // span))
+        drawn = 0
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                pixmap = self.cache.get(self.tile_path(level, col, row))
+                if pixmap is None:
+                    continue
+                target = QRectF(col * span, row * span, pixmap.width() * factor, pixmap.height() * factor)
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+                drawn += 1
+        return drawn
+
+
+# --- Background building ---
+
+class TilePyramidBuilder(QObject):
+    """Builds pyramids on a worker thread and announces them on the GUI thread.
+
+    A build that fails is remembered with the source file's modification time
+    and size, and is not retried until the file changes.
+    """
+
+    pyramid_ready = pyqtSignal(str)  # dzi path
+    pyramid_failed = pyqtSignal(str, str)  # dzi path, reason
+
+    def __init__(self, max_workers=1):
+        super().__init__()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tile-pyramid")
+        self._cancel = threading.Event()
+        self._futures = {}
+        self._failed = {}  # dzi path -> (source signature, reason)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(src_path):
+        try:
+            stat = os.stat(src_path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def failure(self, src_path, dzi_path):
+        """Return why the last build of ``dzi_path`` failed, or None if it has not failed for this file."""
+        with self._lock:
+            failed = self._failed.get(dzi_path)
+        if failed is None or failed[0] != self._signature(src_path):
+            return None
+        return failed[1]
+
+    def schedule(self, src_path, dzi_path):
+        """Queue a build unless one for ``dzi_path`` is pending or has failed. Returns its future."""
+        if self.failure(src_path, dzi_path) is not None:
+            future = Future()
+            future.set_result(False)
+            return future
+        with self._lock:
+            future = self._futures.get(dzi_path)
+            if future is None or future.done():
+                future = self._executor.submit(self._build, src_path, dzi_path)
+                self._futures[dzi_path] = future
+            return future
+
+    def _build(self, src_path, dzi_path):
+        signature = self._signature(src_path)
+        try:
+            os.makedirs(os.path.dirname(dzi_path), exist_ok=True)
+            built = build_pyramid(src_path, dzi_path, cancel_event=self._cancel)
+        except Exception as e:
+            print(f"Error building tile pyramid for '{src_path}': {e}")
+            with self._lock:
+                self._failed[dzi_path] = (signature, str(e))
+            self.pyramid_failed.emit(dzi_path, str(e))
+            return False
+        if built:
+            with self._lock:
+                self._failed.pop(dzi_path, None)
+            self.pyramid_ready.emit(dzi_path)
+        return built
+
+    def shutdown(self):
+        """Cancel queued and running builds without waiting for them."""
+        self._cancel.set()
+        self._executor.shutdown(wait=False)
+
+
+_builder = None
+
+
+def tile_builder():
+    global _builder
+    if _builder is None:
+        _builder = TilePyramidBuilder()
+    return _builder
+
+
+def shutdown_tile_builder():
+    """Cancel pending pyramid builds, e.g. when the application closes."""
+    global _builder
+    if _builder is not None:
+        _builder.shutdown()
+        _builder = None
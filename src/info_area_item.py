@@ -1,13 +1,26 @@
+import hashlib
+import json
 import math
 from PyQt5.QtWidgets import QGraphicsItem, QGraphicsTextItem, QApplication
 
 from .base_draggable_item import BaseDraggableItem
-from PyQt5.QtCore import Qt, QRectF, QPointF, pyqtSignal, QRect
+from PyQt5.QtCore import Qt, QRectF, QPointF, pyqtSignal, QRect, QTimer
 from PyQt5.QtGui import QColor, QBrush, QPen, QCursor, QTextOption, QPainterPath
 
 from . import utils
 
 
+class _LodTextItem(QGraphicsTextItem):
+    """Text child that skips painting while its info area is too small on screen to read."""
+
+    def paint(self, painter, option, widget=None):
+        area = self.parentItem()
+        if area is not None and option is not None and not area.is_text_legible(
+                option.levelOfDetailFromTransform(painter.worldTransform())):
+            return # The area paints greeked lines instead
+        super().paint(painter, option, widget)
+
+
 class InfoAreaItem(BaseDraggableItem):
     item_selected = pyqtSignal(QGraphicsItem)
     properties_changed = pyqtSignal(QGraphicsItem)
@@ -17,6 +30,8 @@ class InfoAreaItem(BaseDraggableItem):
     MIN_HEIGHT = 20
     ROTATE_HANDLE_OFFSET = 15
     ROTATE_HANDLE_RADIUS = 4
+    # Text whose font is smaller than this many device pixels is drawn as greeked lines
+    text_lod_threshold_px = 6
 
     class ResizeHandle:
         NONE = 0
@@ -60,9 +75,14 @@ class InfoAreaItem(BaseDraggableItem):
         # Set initial stacking value
         self.setZValue(self.config_data.get('z_index', utils.Z_VALUE_INFO_RECT))
 
-        self.text_item = QGraphicsTextItem('', self)
-        # Default text color will be set in update_text_from_config
-        # self.text_item.setDefaultTextColor(QColor("#000000")) # Removed, handled by update_text_from_config
+        # The text child and its markdown document are created on first use (see text_item)
+        self._text_item = None
+        self._text_item_scheduled = False
+        self._text_visible = True
+        self._font_px = 14
+        self._font_color = "#000000"
+        self._greek_path = None # Cached low-detail placeholder for the text
+        self._cached_text_layout = None # (text_layout_key, line boxes) from the project's scene cache
 
         self._current_resize_handle = self.ResizeHandle.NONE
         self._resizing_initial_mouse_pos = QPointF()
@@ -87,6 +107,27 @@ class InfoAreaItem(BaseDraggableItem):
         self._resizing_initial_width = self._w
         self._resizing_initial_height = self._h
 
+    @property
+    def text_item(self):
+        """The area's text child; creating it lays out the markdown document."""
+        if self._text_item is None:
+            self._text_item = _LodTextItem('', self)
+            self._text_item.setCacheMode(self.cacheMode())
+            self._apply_text_config()
+        return self._text_item
+
+    @text_item.setter
+    def text_item(self, value):
+        self._text_item = value
+
+    def _ensure_text_item(self):
+        self._text_item_scheduled = False
+        return self.text_item
+
+    def is_text_legible(self, level_of_detail):
+        """Return True when text drawn at ``level_of_detail`` is large enough to read."""
+        return self._font_px * level_of_detail >= self.text_lod_threshold_px
+
     def boundingRect(self):
         rect = QRectF(0, 0, self._w, self._h)
         return rect.united(self._get_rotation_handle_rect())
@@ -107,12 +148,98 @@ class InfoAreaItem(BaseDraggableItem):
         else:
             painter.drawRect(inner_rect)
 
+        if self._text_visible and option is not None:
+            if not self.is_text_legible(option.levelOfDetailFromTransform(painter.worldTransform())):
+                self._paint_greeked_text(painter)
+            elif self._text_item is None:
+                # Lay the document out after this frame rather than while painting
+                self._paint_greeked_text(painter)
+                if not self._text_item_scheduled:
+                    self._text_item_scheduled = True
+                    QTimer.singleShot(0, self._ensure_text_item)
+
         if self.isSelected():
             handle_rect = self._get_rotation_handle_rect()
             painter.setPen(QPen(Qt.yellow))
             painter.setBrush(QBrush(Qt.yellow))
             painter.drawEllipse(handle_rect)
 
+    def _paint_greeked_text(self, painter):
+        if self._greek_path is None:
+            self._greek_path = self._build_greek_path()
+        if self._greek_path.isEmpty():
+            return
+        color = QColor(self._font_color)
+        color.setAlphaF(0.35)
+        painter.fillPath(self._greek_path, color)
+
+    def text_layout_key(self):
+        """Identifies everything the layout of the text depends on."""
+        text = str(self._get_style_value('text', self.config_data.get('text', '')) or '')
+        key = [text, self._w, self._h, self._font_px, self._padding_px(),
+               self.vertical_alignment, self.horizontal_alignment]
+        return hashlib.sha1(json.dumps(key).encode('utf-8')).hexdigest()
+
+    def text_line_rects(self):
+        """Boxes ``[x, y, w, h]`` of the laid-out text lines in item coordinates, or None if not laid out yet."""
+        if self._text_item is None:
+            return None
+        origin = self._text_item.pos()
+        rects = []
+        block = self._text_item.document().begin()
+        while block.isValid():
+            layout = block.layout()
+            for index in range(layout.lineCount()):
+                rect = layout.lineAt(index).naturalTextRect().translated(layout.position() + origin)
+                if rect.width() > 0:
+                    rects.append([round(rect.x(), 1), round(rect.y(), 1), round(rect.width(), 1), round(rect.height(), 1)])
+            block = block.next()
+        return rects
+
+    def set_cached_text_layout(self, key, line_rects):
+        """Use line boxes saved by an earlier session for the greeked text while they still match."""
+        self._cached_text_layout = (key, line_rects)
+        self._greek_path = None
+
+    def _build_greek_path(self):
+        """Approximate the text block with one bar per expected line of text."""
+        path = QPainterPath()
+        if self._cached_text_layout is not None:
+            key, line_rects = self._cached_text_layout
+            if key == self.text_layout_key():
+                bar_h = self._font_px * 0.6
+                for x, y, w, h in line_rects:
+                    path.addRect(QRectF(x, y + (h - bar_h) / 2, w, bar_h))
+                return path
+            self._cached_text_layout = None # Stale: the text or box has changed
+        text = str(self._get_style_value('text', self.config_data.get('text', '')) or '')
+        paragraphs = [line.strip() for line in text.splitlines() if line.strip()]
+        padding = self._padding_px()
+        available_w = self._w - 2 * padding
+        line_h = self._font_px * 1.4
+        if not paragraphs or available_w <= 0 or line_h <= 0:
+            return path
+        chars_per_line = max(1, int(available_w / (self._font_px * 0.55)))
+        line_count = sum(math.ceil(len(line) / chars_per_line) for line in paragraphs)
+        line_count = max(1, min(line_count, int((self._h - 2 * padding) / line_h)))
+        block_h = line_count * line_h
+        if self.vertical_alignment == "top":
+            top = padding
+        elif self.vertical_alignment == "bottom":
+            top = self._h - padding - block_h
+        else:
+            top = (self._h - block_h) / 2
+        for index in range(line_count):
+            bar_w = available_w if index < line_count - 1 else available_w * 0.6
+            if self.horizontal_alignment == "center":
+                left = padding + (available_w - bar_w) / 2
+            elif self.horizontal_alignment == "right":
+                left = padding + available_w - bar_w
+            else:
+                left = padding
+            path.addRect(QRectF(left, top + index * line_h + line_h * 0.3, bar_w, self._font_px * 0.6))
+        return path
+
     def _get_resize_handle_at(self, pos):
         r = QRectF(0, 0, self._w, self._h)
         m = self.RESIZE_MARGIN
@@ -306,7 +433,9 @@ class InfoAreaItem(BaseDraggableItem):
             self._h = new_h
             self.setTransformOriginPoint(self._w / 2, self._h / 2) # Update origin before setting position
             self.setPos(new_pos_scene)
-            self.text_item.setTextWidth(self._w)
+            self._greek_path = None
+            if self._text_item is not None:
+                self._text_item.setTextWidth(self._w)
             self._center_text()
             self.update()
             event.accept()
@@ -358,7 +487,9 @@ class InfoAreaItem(BaseDraggableItem):
         center_y = self.config_data.get('center_y', 0)
         self.setPos(center_x - self._w / 2, center_y - self._h / 2)
 
-        self.text_item.setTextWidth(self._w)
+        self._greek_path = None
+        if self._text_item is not None:
+            self._text_item.setTextWidth(self._w)
         self._center_text()
 
         # Update origin point in case width/height changed
@@ -374,19 +505,22 @@ class InfoAreaItem(BaseDraggableItem):
             return self._style_config_ref[key]
         return self.config_data.get(key, default_value)
 
+    def _padding_px(self):
+        padding_str = self._get_style_value("padding", "5px")
+        try:
+            return int(padding_str.lower().replace("px", "")) if "px" in padding_str.lower() else 5
+        except ValueError:
+            return 5
+
     def _center_text(self):
-        if not self.text_item: return
+        if not self._text_item: return # Not created yet; positioned when it is
         self.text_item.setPos(0,0) # Reset position, alignment handles actual placement
 
         # Use the text item's own bounding rect for height calculation,
         # as it's more accurate for final positioning than font_metrics alone.
         text_height = self.text_item.boundingRect().height()
 
-        padding_str = self._get_style_value("padding", "5px")
-        try:
-            padding_val = int(padding_str.lower().replace("px", "")) if "px" in padding_str.lower() else 5
-        except ValueError:
-            padding_val = 5
+        padding_val = self._padding_px()
 
         if self.vertical_alignment == "top":
             text_y_offset = padding_val
@@ -410,14 +544,13 @@ class InfoAreaItem(BaseDraggableItem):
 
     def set_display_text(self, text):
         self.config_data['text'] = text
-        self.text_item.document().setMarkdown(text)
+        self._greek_path = None
+        if self._text_item is not None:
+            self._text_item.document().setMarkdown(text)
         self._center_text()
         self.update()
 
     def update_text_from_config(self):
-        default_text = self.config_data.get('text', '')
-        self.text_item.document().setMarkdown(self._get_style_value('text', default_text))
-
         text_format_defaults = utils.get_default_config()["defaults"]["info_rectangle_text_display"]
 
         self.vertical_alignment = self._get_style_value('vertical_alignment', text_format_defaults['vertical_alignment'])
@@ -434,30 +567,43 @@ class InfoAreaItem(BaseDraggableItem):
             except ValueError:
                 font_size = 14
 
-        font = self.text_item.font()
-        font.setPixelSize(font_size)
+        self._font_px = font_size
+        self._font_color = font_color
+        self._greek_path = None
+        if self._text_item is not None:
+            self._apply_text_config()
+        self.update()
 
-        self.text_item.setFont(font)
-        self.text_item.setDefaultTextColor(QColor(font_color))
+    def _apply_text_config(self):
+        """Push the current text, font, colour and alignment into the text child."""
+        text_item = self._text_item
+        default_text = self.config_data.get('text', '')
+        text_item.document().setMarkdown(self._get_style_value('text', default_text))
 
-        current_doc_option = self.text_item.document().defaultTextOption()
+        font = text_item.font()
+        font.setPixelSize(self._font_px)
+
+        text_item.setFont(font)
+        text_item.setDefaultTextColor(QColor(self._font_color))
+
+        current_doc_option = text_item.document().defaultTextOption()
         h_align_map = {
             "left": Qt.AlignLeft, "center": Qt.AlignCenter, "right": Qt.AlignRight
         }
         alignment_flag = h_align_map.get(self.horizontal_alignment, Qt.AlignLeft)
         current_doc_option.setAlignment(alignment_flag)
-        self.text_item.document().setDefaultTextOption(current_doc_option)
-        self.text_item.setTextWidth(self._w)
+        text_item.document().setDefaultTextOption(current_doc_option)
+        text_item.setTextWidth(self._w)
+        text_item.setVisible(self._text_visible)
         self._center_text()
-        self.update()
 
     def update_appearance(self, is_selected=False, is_view_mode=False):
         if is_view_mode:
             self._pen = QPen(Qt.transparent)
             self._brush = QBrush(Qt.transparent)
-            self.text_item.setVisible(not self.config_data.get('show_on_hover', True))
+            self._text_visible = not self.config_data.get('show_on_hover', True)
         else:
-            self.text_item.setVisible(True)
+            self._text_visible = True
             pen_color = QColor(self.config_data.get('fill_color', '#007BFF'))
             fill_color = QColor(self.config_data.get('fill_color', '#007BFF'))
             fill_alpha = self.config_data.get('fill_alpha', 0.1)
@@ -476,6 +622,8 @@ class InfoAreaItem(BaseDraggableItem):
                 self._pen = QPen(pen_color, 2, Qt.DashLine)
 
             self._brush = QBrush(fill_color)
+        if self._text_item is not None:
+            self._text_item.setVisible(self._text_visible)
         self.update()
 
     def itemChange(self, change, value):
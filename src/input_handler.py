@@ -2,6 +2,7 @@
 from PyQt5.QtWidgets import QApplication, QLineEdit, QTextEdit, QSpinBox, QDoubleSpinBox
 from PyQt5.QtCore import Qt
 
+from . import operation_trace
 from . import utils
 
 
@@ -12,6 +13,7 @@ class InputHandler:
         self.app = app
 
     # -- Keyboard Shortcut Handling -------------------------------------
+    @operation_trace.recorded()
     def handle_key_press(self, event):
         """Process key press events. Returns True if the event was handled."""
         if event.isAutoRepeat():
@@ -46,6 +48,10 @@ class InputHandler:
                     self.app.undo_last_action()
                     event.accept()
                     return True
+        elif event.modifiers() == (Qt.ControlModifier | Qt.ShiftModifier) and event.key() == Qt.Key_P:
+            self.app.toggle_performance_hud()
+            event.accept()
+            return True
         elif event.key() in (Qt.Key_Delete, Qt.Key_Backspace):
             if (
                 self.app.current_mode == "edit"
@@ -0,0 +1,199 @@
+import csv
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from functools import wraps
+
+ENV_VAR = "INFOCANVAS_INSTRUMENT" # Set to 1 to record from startup
+WINDOW = 512 # Latest samples per operation used for the rolling percentiles
+MAX_TRACE_EVENTS = 200_000 # Oldest trace events are dropped beyond this
+
+_recorder = None
+_NULL_SPAN = nullcontext()
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Recorder:
+    """Collects durations and counts per named operation, from any thread.
+
+    Keeps a rolling window of samples per operation for percentiles, running
+    totals, a bounded list of trace events and, per thread, the stack of
+    operations in progress.
+    """
+
+    def __init__(self, window=WINDOW, max_events=MAX_TRACE_EVENTS):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._counts = defaultdict(int)
+        self._totals = defaultdict(float)
+        self._events = deque(maxlen=max_events)
+        self._stacks = defaultdict(list)
+        self.started = time.perf_counter()
+
+    def begin(self, name):
+        self._stacks[threading.get_ident()].append(name)
+        return time.perf_counter()
+
+    def end(self, name, started):
+        duration = time.perf_counter() - started
+        thread_id = threading.get_ident()
+        stack = self._stacks[thread_id]
+        if stack:
+            stack.pop()
+        with self._lock:
+            self._samples[name].append(duration)
+            self._counts[name] += 1
+            self._totals[name] += duration
+            self._events.append((name, started - self.started, duration, thread_id))
+
+    def add_count(self, name, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def current_operations(self, thread_id=None):
+        """Return the operations in progress on a thread, outermost first."""
+        return list(self._stacks.get(thread_id or threading.get_ident(), ()))
+
+    def summary(self):
+        """Return ``{name: {"count", "p50_ms", "p95_ms", "max_ms", "total_ms"}}``.
+
+        Percentiles and maximum cover the rolling window; count and total cover
+        everything since the last reset. Pure counters have no timings.
+        """
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+            counts = dict(self._counts)
+            totals = dict(self._totals)
+        result = {}
+        for name, count in counts.items():
+            values = samples.get(name, [])
+            result[name] = {
+                "count": count,
+                "p50_ms": round(_percentile(values, 0.5) * 1000, 3),
+                "p95_ms": round(_percentile(values, 0.95) * 1000, 3),
+                "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+                "total_ms": round(totals.get(name, 0.0) * 1000, 3),
+            }
+        return result
+
+    def events(self):
+        with self._lock:
+            return list(self._events)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._totals.clear()
+            self._events.clear()
+            self.started = time.perf_counter()
+
+    def export_trace(self, path):
+        """Write the trace events to ``path``: CSV for ``.csv``, otherwise Chrome trace JSON.
+
+        The JSON opens in chrome://tracing or Perfetto.
+        """
+        events = self.events()
+        if os.path.splitext(path)[1].lower() == ".csv":
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(["name", "start_ms", "duration_ms", "thread"])
+                for name, start, duration, thread_id in events:
+                    writer.writerow([name, round(start * 1000, 3), round(duration * 1000, 3), thread_id])
+        else:
+            trace = {
+                "traceEvents": [
+                    {"name": name, "ph": "X", "ts": round(start * 1e6, 1), "dur": round(duration * 1e6, 1),
+                     "pid": os.getpid(), "tid": thread_id}
+                    for name, start, duration, thread_id in events
+                ],
+                "summary": self.summary(),
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f)
+        return len(events)
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "started")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.started = self.recorder.begin(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder.end(self.name, self.started)
+        return False
+
+
+def enable():
+    """Start recording, keeping what was recorded so far. Returns the recorder."""
+    global _recorder
+    if _recorder is None:
+        _recorder = Recorder()
+    return _recorder
+
+
+def disable():
+    global _recorder
+    _recorder = None
+
+
+def is_enabled():
+    return _recorder is not None
+
+
+def recorder():
+    """The active :class:`Recorder`, or None while instrumentation is disabled."""
+    return _recorder
+
+
+def enable_from_environment():
+    if os.environ.get(ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on"):
+        enable()
+    return is_enabled()
+
+
+def timed(name):
+    """Decorator recording each call of the function as operation ``name``.
+
+    While disabled, the cost is one global lookup per call.
+    """
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            active = _recorder
+            if active is None:
+                return func(*args, **kwargs)
+            started = active.begin(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                active.end(name, started)
+        return wrapper
+    return decorate
+
+
+def span(name):
+    """Context manager recording the enclosed block as operation ``name``."""
+    active = _recorder
+    return _NULL_SPAN if active is None else _Span(active, name)
+
+
+def count(name, amount=1):
+    active = _recorder
+    if active is not None:
+        active.add_count(name, amount)
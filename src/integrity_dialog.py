@@ -0,0 +1,147 @@
+import os
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget,
+    QTreeWidgetItem, QMessageBox
+)
+
+from . import utils
+from .integrity_scanner import (
+    BackgroundScanner, clean_config, clean_project, clear_export_cache, has_issues, remove_orphans
+)
+
+
+class ImageIntegrityDialog(QDialog):
+    """Scans every project's images in the background and offers batch cleanup.
+
+    The open project is cleaned through the main window, so its in-memory
+    configuration, undo history and canvas stay in step with the files.
+    """
+
+    def __init__(self, parent=None, base_dir=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.base_dir = base_dir or utils.PROJECTS_BASE_DIR
+        self.reports = []
+        self.setWindowTitle("Check Project Images")
+        self.setMinimumSize(560, 380)
+
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel("Scanning projects...")
+        layout.addWidget(self.status_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Project / Issue", "Details"])
+        self.tree.setColumnWidth(0, 260)
+        layout.addWidget(self.tree)
+
+        buttons_layout = QHBoxLayout()
+        self.remove_orphans_button = QPushButton("Delete Orphaned Files")
+        self.remove_orphans_button.clicked.connect(lambda: self.clean(remove_orphaned=True))
+        buttons_layout.addWidget(self.remove_orphans_button)
+        self.fix_dimensions_button = QPushButton("Fix Dimensions")
+        self.fix_dimensions_button.clicked.connect(lambda: self.clean(fix_dimensions=True))
+        buttons_layout.addWidget(self.fix_dimensions_button)
+        self.drop_missing_button = QPushButton("Remove Missing Entries")
+        self.drop_missing_button.clicked.connect(lambda: self.clean(drop_missing=True))
+        buttons_layout.addWidget(self.drop_missing_button)
+        self.clear_cache_button = QPushButton("Clear Export Caches")
+        self.clear_cache_button.clicked.connect(self.clear_export_caches)
+        buttons_layout.addWidget(self.clear_cache_button)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        buttons_layout.addWidget(close_button)
+        layout.addLayout(buttons_layout)
+
+        self.scanner = BackgroundScanner(self)
+        self.scanner.finished.connect(self.show_reports)
+        self.finished.connect(lambda _: self.scanner.shutdown())
+        self.rescan()
+
+    def _project_paths(self):
+        from .batch_export import list_projects
+        return [os.path.join(self.base_dir, name) for name in list_projects(self.base_dir)]
+
+    def rescan(self):
+        self._set_buttons_enabled(False)
+        self.status_label.setText("Scanning projects...")
+        return self.scanner.start(self._project_paths())
+
+    def _set_buttons_enabled(self, enabled):
+        reports = self.reports if enabled else []
+        self.remove_orphans_button.setEnabled(any(r["orphaned"] for r in reports))
+        self.fix_dimensions_button.setEnabled(any(r["mismatched"] for r in reports))
+        self.drop_missing_button.setEnabled(any(r["missing"] for r in reports))
+        self.clear_cache_button.setEnabled(any(r.get("export_cache_bytes") for r in reports))
+
+    def show_reports(self, reports):
+        self.reports = reports
+        self.tree.clear()
+        with_issues = [report for report in reports if has_issues(report)]
+        for report in with_issues:
+            project_item = QTreeWidgetItem([report["project"], ""])
+            if report.get("error"):
+                QTreeWidgetItem(project_item, ["Error", report["error"]])
+            for entry in report["missing"]:
+                QTreeWidgetItem(project_item, ["Missing file", entry["path"]])
+            for entry in report["unreadable"]:
+                QTreeWidgetItem(project_item, ["Unreadable image", entry["path"]])
+            for entry in report["mismatched"]:
+                expected, actual = entry["expected"], entry["actual"]
+                QTreeWidgetItem(project_item, ["Wrong dimensions", f"{entry['path']}: {expected[0]}x{expected[1]} "
+                                                                   f"recorded, {actual[0]}x{actual[1]} on disk"])
+            for rel in report["orphaned"]:
+                QTreeWidgetItem(project_item, ["Orphaned file", rel])
+            self.tree.addTopLevelItem(project_item)
+            project_item.setExpanded(True)
+        orphaned_mb = sum(report["orphaned_bytes"] for report in reports) / (1024 * 1024)
+        cache_mb = sum(report.get("export_cache_bytes", 0) for report in reports) / (1024 * 1024)
+        if with_issues:
+            status = (f"{len(with_issues)} of {len(reports)} projects have image issues "
+                      f"({orphaned_mb:.1f} MB in orphaned files).")
+        else:
+            status = f"No image issues found in {len(reports)} projects."
+        if cache_mb:
+            status += f" Export caches use {cache_mb:.1f} MB."
+        self.status_label.setText(status)
+        self._set_buttons_enabled(True)
+
+    def clean(self, remove_orphaned=False, drop_missing=False, fix_dimensions=False):
+        if remove_orphaned:
+            count = sum(len(report["orphaned"]) for report in self.reports)
+            reply = QMessageBox.question(self, "Confirm Delete",
+                                         f"Permanently delete {count} orphaned image files?",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return None
+        app = self.parent_window
+        current = getattr(app, 'current_project_name', None)
+        errors = []
+        for report in self.reports:
+            if report.get("error") or not has_issues(report):
+                continue
+            project_path = os.path.join(self.base_dir, report["project"])
+            if report["project"] == current and getattr(app, 'config', None):
+                if clean_config(app.config, report, drop_missing, fix_dimensions):
+                    app.save_config()
+                    app.render_canvas_from_config()
+                if remove_orphaned:
+                    errors.extend(remove_orphans(project_path, report)[2])
+            else:
+                try:
+                    errors.extend(clean_project(project_path, report, remove_orphaned, drop_missing, fix_dimensions)["errors"])
+                except (OSError, ValueError) as e:
+                    errors.append(f"{report['project']}: {e}")
+        if errors:
+            QMessageBox.warning(self, "Cleanup Error", "Some items could not be cleaned up:\n" + "\n".join(errors[:10]))
+        return self.rescan()
+
+    def clear_export_caches(self):
+        """Delete every project's resampled export images; the next export of a project rebuilds its own."""
+        errors = []
+        for report in self.reports:
+            if report.get("export_cache_bytes"):
+                errors.extend(clear_export_cache(os.path.join(self.base_dir, report["project"]))[1])
+        if errors:
+            QMessageBox.warning(self, "Cleanup Error", "Some items could not be cleaned up:\n" + "\n".join(errors[:10]))
+        return self.rescan()
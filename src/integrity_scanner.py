@@ -0,0 +1,242 @@
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from . import config_format
+from . import utils
+
+
+def _image_files(images_folder):
+    """Return the paths of every file under ``images_folder``, relative and with '/' separators."""
+    found = []
+    for root, _, files in os.walk(images_folder):
+        for name in files:
+            rel = os.path.relpath(os.path.join(root, name), images_folder)
+            found.append(rel.replace(os.sep, '/'))
+    return sorted(found)
+
+
+def _probe_size(path):
+    """Read an image's dimensions from its header without decoding the pixels."""
+    from PyQt5.QtGui import QImageReader
+    size = QImageReader(path).size()
+    return (size.width(), size.height()) if size.isValid() and size.width() > 0 else None
+
+
+def _folder_bytes(folder):
+    total = 0
+    for root, _, files in os.walk(folder):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def scan_project(project_path):
+    """Reconcile a project's ``config['images']`` with the files in its ``images/`` folder.
+
+    Returns:
+        dict: ``missing`` and ``unreadable`` image entries, ``mismatched`` entries whose
+        ``original_width``/``original_height`` differ from the file, ``orphaned``
+        files no entry refers to (with ``orphaned_bytes``), or ``error`` if the
+        config cannot be read. ``export_cache_bytes`` is the size of the cache of
+        resampled export images, which is rebuilt on demand and safe to clear.
+    """
+    report = {
+        "project": os.path.basename(os.path.normpath(project_path)),
+        "missing": [], "unreadable": [], "mismatched": [], "orphaned": [], "orphaned_bytes": 0,
+        "export_cache_bytes": _folder_bytes(os.path.join(project_path, utils.EXPORT_CACHE_DIRNAME)),
+    }
+    try:
+        config = config_format.load(os.path.join(project_path, utils.PROJECT_CONFIG_FILENAME))
+    except (OSError, ValueError) as e:
+        report["error"] = f"Cannot read configuration: {e}"
+        return report
+
+    images_folder = os.path.join(project_path, utils.PROJECT_IMAGES_DIRNAME)
+    referenced = set()
+    probed = {}
+    for img_conf in config.get('images', []):
+        rel = img_conf.get('path')
+        if not rel:
+            continue
+        referenced.add(rel)
+        entry = {"id": img_conf.get('id'), "path": rel}
+        image_path = os.path.join(images_folder, rel)
+        if not os.path.isfile(image_path):
+            report["missing"].append(entry)
+            continue
+        if rel not in probed:
+            probed[rel] = _probe_size(image_path)
+        actual = probed[rel]
+        if actual is None:
+            report["unreadable"].append(entry)
+            continue
+        expected = (img_conf.get('original_width'), img_conf.get('original_height'))
+        if all(expected) and tuple(expected) != actual:
+            entry.update(expected=list(expected), actual=list(actual))
+            report["mismatched"].append(entry)
+
+    if os.path.isdir(images_folder):
+        for rel in _image_files(images_folder):
+            if rel not in referenced:
+                report["orphaned"].append(rel)
+                try:
+                    report["orphaned_bytes"] += os.path.getsize(os.path.join(images_folder, rel))
+                except OSError:
+                    pass
+    return report
+
+
+def has_issues(report):
+    return bool(report.get("error") or report["missing"] or report["unreadable"]
+                or report["mismatched"] or report["orphaned"])
+
+
+def scan_projects(project_paths, max_workers=None):
+    """Scan several projects on a thread pool; reports come back in the given order."""
+    project_paths = list(project_paths)
+    if not project_paths:
+        return []
+    workers = max(1, min(max_workers or min(8, (os.cpu_count() or 1) + 4), len(project_paths)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(scan_project, project_paths))
+
+
+def clean_config(config, report, drop_missing=False, fix_dimensions=False):
+    """Apply a report's fixes to a config dict in place. Returns the number of changes."""
+    changes = 0
+    if fix_dimensions:
+        actual_by_id = {entry["id"]: entry["actual"] for entry in report["mismatched"]}
+        for img_conf in config.get('images', []):
+            if img_conf.get('id') in actual_by_id:
+                img_conf['original_width'], img_conf['original_height'] = actual_by_id[img_conf['id']]
+                changes += 1
+    if drop_missing:
+        missing_ids = {entry["id"] for entry in report["missing"]}
+        kept = [img for img in config.get('images', []) if img.get('id') not in missing_ids]
+        changes += len(config.get('images', [])) - len(kept)
+        config['images'] = kept
+    return changes
+
+
+def remove_orphans(project_path, report):
+    """Delete the orphaned files of a report. Returns ``(removed paths, freed bytes, errors)``."""
+    images_folder = os.path.join(project_path, utils.PROJECT_IMAGES_DIRNAME)
+    removed, freed, errors = [], 0, []
+    for rel in report["orphaned"]:
+        path = os.path.join(images_folder, rel)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError as e:
+            errors.append(f"{rel}: {e}")
+            continue
+        removed.append(rel)
+        freed += size
+    return removed, freed, errors
+
+
+def clear_export_cache(project_path):
+    """Delete a project's cache of resampled export images. Returns ``(freed bytes, errors)``."""
+    folder = os.path.join(project_path, utils.EXPORT_CACHE_DIRNAME)
+    before = _folder_bytes(folder)
+    errors = []
+    shutil.rmtree(folder, onerror=lambda _, path, exc_info: errors.append(f"{path}: {exc_info[1]}"))
+    return before - _folder_bytes(folder), errors
+
+
+def clean_project(project_path, report, remove_orphaned=False, drop_missing=False, fix_dimensions=False,
+                  clear_cache=False):
+    """Apply the selected cleanups to a project on disk and return a summary."""
+    summary = {"removed": [], "freed_bytes": 0, "config_changes": 0, "errors": []}
+    if drop_missing or fix_dimensions:
+        config_path = os.path.join(project_path, utils.PROJECT_CONFIG_FILENAME)
+        config, fmt = config_format.load_with_format(config_path)
+        summary["config_changes"] = clean_config(config, report, drop_missing, fix_dimensions)
+        if summary["config_changes"]:
+            config_format.dump(config, config_path, fmt)
+    if remove_orphaned:
+        summary["removed"], summary["freed_bytes"], summary["errors"] = remove_orphans(project_path, report)
+    if clear_cache and report.get("export_cache_bytes"):
+        freed, errors = clear_export_cache(project_path)
+        summary["freed_bytes"] += freed
+        summary["errors"] += errors
+    return summary
+
+
+class BackgroundScanner(QObject):
+    """Runs :func:`scan_projects` on a worker thread and delivers the reports on the GUI thread."""
+
+    finished = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="integrity-scan")
+
+    def start(self, project_paths):
+        return self._executor.submit(self._run, list(project_paths))
+
+    def _run(self, project_paths):
+        try:
+            reports = scan_projects(project_paths)
+        except Exception as e:
+            print(f"Error scanning project images: {e}")
+            reports = []
+        self.finished.emit(reports)
+        return reports
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def add_arguments(parser):
+    parser.add_argument("projects", nargs="*", help="Project names under the projects folder.")
+    parser.add_argument("--all", action="store_true", help="Scan every project.")
+    parser.add_argument("--projects-dir", default=utils.PROJECTS_BASE_DIR, help="Folder containing the projects.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Projects scanned at once.")
+    parser.add_argument("--remove-orphans", action="store_true", help="Delete files no image entry refers to.")
+    parser.add_argument("--drop-missing", action="store_true", help="Remove image entries whose file is missing.")
+    parser.add_argument("--fix-dimensions", action="store_true", help="Store the real size of mismatched images.")
+    parser.add_argument("--clear-export-cache", action="store_true",
+                        help="Delete the cached resampled images of exports; they are rebuilt when needed.")
+    parser.add_argument("--report", help="Write the JSON report here instead of to stdout.")
+
+
+def run(args):
+    """Run a parsed ``scan`` command. Exits 1 while issues remain, 2 for bad project names."""
+    from .batch_export import list_projects
+
+    available = list_projects(args.projects_dir)
+    names = available if args.all else list(dict.fromkeys(args.projects))
+    if not names:
+        print("Error: No projects to scan. Name some projects or pass --all.", file=sys.stderr)
+        return 2
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        print(f"Error: Unknown project(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    paths = [os.path.join(args.projects_dir, name) for name in names]
+    reports = scan_projects(paths, max_workers=args.jobs)
+    remaining = 0
+    for i, (path, report) in enumerate(zip(paths, reports)):
+        if "error" not in report and (args.remove_orphans or args.drop_missing or args.fix_dimensions
+                                      or args.clear_export_cache):
+            cleanup = clean_project(path, report, args.remove_orphans, args.drop_missing, args.fix_dimensions,
+                                    args.clear_export_cache)
+            reports[i] = report = scan_project(path) # What is still wrong afterwards
+            report["cleanup"] = cleanup
+        remaining += has_issues(report)
+    report_json = json.dumps({"projects": reports, "projects_with_issues": remaining}, indent=2)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            f.write(report_json)
+    else:
+        print(report_json)
+    return 1 if remaining else 0
@@ -3,13 +3,63 @@ import os
 import shutil
 import copy
 
+from PyQt5.QtCore import QEvent, QObject, QTimer
 from PyQt5.QtWidgets import QFileDialog, QMessageBox, QApplication
-from PyQt5.QtGui import QImageReader, QPixmap, QTransform
+from PyQt5.QtGui import QImageReader, QTransform
 
+from src import operation_trace
+from src import profiling
 from src import utils
 from src.draggable_image_item import DraggableImageItem
+from src.file_copier import qt_progress_callback
+from src.image_importer import ImageImporter, collect_image_files, grid_layout
+from src.image_store import ImageStore
 from src.info_area_item import InfoAreaItem
 
+class ImageDropFilter(QObject):
+    """Passes local files and folders dropped on a graphics view to ``on_drop(paths)``.
+
+    Drag events arrive at the view's viewport, so the filter follows the view
+    onto each new viewport, e.g. when the render profile switches to OpenGL.
+    """
+
+    DRAG_EVENTS = (QEvent.DragEnter, QEvent.DragMove, QEvent.Drop)
+
+    def __init__(self, view, on_drop):
+        super().__init__(view)
+        self.view = view
+        self.on_drop = on_drop
+        view.installEventFilter(self)
+        self._watch_viewport()
+
+    def _watch_viewport(self):
+        viewport = self.view.viewport()
+        viewport.removeEventFilter(self)
+        viewport.installEventFilter(self) # Filters installed last run first, ahead of the view's own
+
+    @staticmethod
+    def _local_paths(event):
+        mime = event.mimeData()
+        if not mime.hasUrls():
+            return []
+        return [url.toLocalFile() for url in mime.urls() if url.isLocalFile()]
+
+    def eventFilter(self, obj, event):
+        if obj is self.view:
+            if event.type() == QEvent.ChildAdded and event.child() is self.view.viewport():
+                QTimer.singleShot(0, self._watch_viewport) # Once the view has finished setting it up
+            return False
+        if event.type() not in self.DRAG_EVENTS:
+            return False
+        paths = self._local_paths(event)
+        if not paths:
+            return False # Leave other drags to the scene
+        event.acceptProposedAction()
+        if event.type() == QEvent.Drop:
+            self.on_drop(paths)
+        return True
+
+
 class ItemOperations:
     def __init__(self, app):
         self.app = app
@@ -25,6 +75,14 @@ class ItemOperations:
             return None
         return self.app.project_io.get_project_images_folder(self.app.current_project_path)
 
+    def _image_store(self):
+        """Return the shared ImageStore when the project has opted in, else None."""
+        return ImageStore() if self.config.get('use_image_store') else None
+
+    def _stored_image_paths(self):
+        """Map each blob already in the project to the image file that holds it."""
+        return {img['blob']: img['path'] for img in self.config.get('images', []) if img.get('blob')}
+
     def _get_next_z_index(self):
          if hasattr(self, 'scene') and self.scene and self.scene.items(): # self.scene is app.scene
              return max(item.zValue() for item in self.scene.items()) + 1
@@ -65,6 +123,20 @@ class ItemOperations:
             QMessageBox.critical(self.app, "Upload Error", f"Could not copy image to '{target_path}': {e}") # parent is self.app
             return
 
+        blob = None
+        store = self._image_store()
+        if store is not None:
+            try:
+                blob = store.add_file(target_path, link=True)
+                existing_path = self._stored_image_paths().get(blob)
+                if existing_path and os.path.exists(os.path.join(current_project_images_folder, existing_path)):
+                    os.remove(target_path) # Same bytes as an image the project already has
+                    unique_filename = existing_path
+                    target_path = os.path.join(current_project_images_folder, unique_filename)
+            except OSError as e:
+                print(f"Warning: Could not add '{target_path}' to the image store: {e}")
+                blob = None
+
         img_id = f"img_{datetime.datetime.now().timestamp()}"
         reader = QImageReader(target_path)
         original_size = reader.size()
@@ -85,12 +157,14 @@ class ItemOperations:
             "original_height": original_height,
             "z_index": self._get_next_z_index(), # Local method
         }
+        if blob:
+            new_image_config["blob"] = blob
 
         if 'images' not in self.config: self.config['images'] = [] # self.config is app.config
         self.config['images'].append(new_image_config)
 
-        pixmap = QPixmap(target_path)
-        item = DraggableImageItem(pixmap, new_image_config) # Z-value set in item's __init__
+        # Z-value set in item's __init__; very large images start building their tile pyramid here
+        item = DraggableImageItem.from_file(new_image_config, target_path, self.app.current_project_path)
         item.setTransform(QTransform().scale(new_image_config['scale'], new_image_config['scale']))
         item.setPos(
             new_image_config['center_x'] - (original_width * new_image_config['scale']) / 2,
@@ -110,6 +184,109 @@ class ItemOperations:
         self.scene.clearSelection()
         item.setSelected(True)
 
+    def upload_images(self):
+        """Import several images picked in one dialog."""
+        if not self.app.current_project_path:
+            QMessageBox.critical(self.app, "Upload Error", "No project loaded. Cannot upload images.")
+            return
+        filepaths, _ = QFileDialog.getOpenFileNames(
+            self.app, "Upload Images", os.path.expanduser("~"),
+            f"Images ({' '.join(['*.' + ext for ext in utils.ALLOWED_EXTENSIONS])})"
+        )
+        if filepaths:
+            self.import_images(filepaths)
+
+    def import_image_folder(self):
+        """Import every image in a folder and its sub-folders."""
+        if not self.app.current_project_path:
+            QMessageBox.critical(self.app, "Upload Error", "No project loaded. Cannot import images.")
+            return
+        folder = QFileDialog.getExistingDirectory(self.app, "Import Image Folder", os.path.expanduser("~"))
+        if folder:
+            self.import_images([folder])
+
+    @operation_trace.recorded()
+    @profiling.profiled("bulk_import")
+    def import_images(self, paths):
+        """Import image files and folders as one grid of new images.
+
+        Copying, measuring and decoding run on a thread pool behind a progress
+        dialog. The whole batch is saved once, so it is also undone in one step.
+        Returns the ids of the images that were added.
+        """
+        images_folder = self._get_project_images_folder()
+        if not self.app.current_project_path or not images_folder:
+            QMessageBox.critical(self.app, "Upload Error", "No project loaded. Cannot import images.")
+            return []
+        source_paths = collect_image_files(paths)
+        if not source_paths:
+            QMessageBox.warning(self.app, "Upload Error", "No supported image files were found.")
+            return []
+
+        progress_dialog, on_progress = qt_progress_callback(self.app, f"Importing {len(source_paths)} images...")
+        try:
+            results = ImageImporter(store=self._image_store()).import_files(
+                source_paths, images_folder, progress_callback=on_progress)
+        finally:
+            progress_dialog.close()
+
+        imported = [result for result in results if result.error is None]
+        failed = [result for result in results if result.error is not None]
+        placements = grid_layout([(r.width, r.height) for r in imported], self.scene.width(), self.scene.height())
+
+        if 'images' not in self.config: self.config['images'] = []
+        existing_ids = {img.get('id') for img in self.config['images']}
+        stored_paths = self._stored_image_paths()
+        next_z = self._get_next_z_index()
+        new_items = []
+        for result, (center_x, center_y, scale) in zip(imported, placements):
+            img_id = utils.unique_item_id("img", existing_ids)
+            existing_ids.add(img_id)
+            if result.blob:
+                # Identical images share one file in the project
+                if stored_paths.get(result.blob, result.filename) != result.filename:
+                    os.remove(result.target_path)
+                    result.filename = stored_paths[result.blob]
+                    result.target_path = os.path.join(images_folder, result.filename)
+                stored_paths.setdefault(result.blob, result.filename)
+            image_config = {
+                "id": img_id,
+                "path": result.filename,
+                "center_x": center_x,
+                "center_y": center_y,
+                "scale": scale,
+                "original_width": result.width,
+                "original_height": result.height,
+                "z_index": next_z,
+            }
+            if result.blob:
+                image_config["blob"] = result.blob
+            next_z += 1
+            self.config['images'].append(image_config)
+            item = DraggableImageItem.from_file(image_config, result.target_path, self.app.current_project_path,
+                                                decoded_image=result.image)
+            result.image = None # The pixmap holds its own copy
+            item.setTransform(QTransform().scale(scale, scale))
+            item.setPos(center_x - result.width * scale / 2, center_y - result.height * scale / 2)
+            item.item_selected.connect(self.app.canvas_manager.on_graphics_item_selected)
+            item.item_moved.connect(self.app.canvas_manager.on_graphics_item_moved)
+            self.scene.addItem(item)
+            self.item_map[img_id] = item
+            new_items.append(item)
+
+        if new_items:
+            self.app.save_config()
+            self.scene.clearSelection()
+            for item in new_items:
+                item.setSelected(True)
+            self.app.statusBar().showMessage(
+                f"Imported {len(new_items)} images into project '{self.app.current_project_name}'.", 3000)
+        if failed:
+            details = "\n".join(result.error for result in failed[:10])
+            QMessageBox.warning(self.app, "Upload Error", f"{len(failed)} images could not be imported:\n{details}")
+        return [item.config_data['id'] for item in new_items]
+
+    @operation_trace.recorded(inputs=("img_scale_input",))
     def update_selected_image_scale(self):
         if isinstance(self.app.selected_item, DraggableImageItem): # Access via self.app
             new_scale = self.app.img_scale_input.value() # Access via self.app
@@ -154,6 +331,8 @@ class ItemOperations:
 
             self.app.selected_item.setPos(new_top_left_x, new_top_left_y)
 
+            # Paint transformed while the value changes; the resampled copy follows once it settles
+            self.app.selected_item.begin_interactive_scaling()
             transform = QTransform()
             transform.scale(new_scale, new_scale)
             self.app.selected_item.setTransform(transform)
@@ -161,6 +340,7 @@ class ItemOperations:
             self.app.save_config() # Call app's save_config
             self.scene.update() # self.scene is app.scene
 
+    @operation_trace.recorded()
     def delete_selected_image(self):
         if not isinstance(self.app.selected_item, DraggableImageItem): # Access via self.app
             QMessageBox.information(self.app, "Delete Image", "No image selected to delete.") # parent is self.app
@@ -177,6 +357,9 @@ class ItemOperations:
                 QMessageBox.warning(self.app, "Delete Error", "Cannot determine project images folder. Cannot delete image file.")
                 # Decide if we should still proceed to remove from config. For now, let's be consistent with original:
                 # it would proceed to remove from config.
+            elif any(other is not img_conf and other.get('path') == img_conf['path']
+                     for other in self.config.get('images', [])):
+                pass # Deduplicated images share the file; keep it for the others
             else:
                 image_file_path = os.path.join(current_project_images_folder, img_conf['path'])
                 try:
@@ -197,6 +380,7 @@ class ItemOperations:
             self.app.update_properties_panel() # Call app's method
             self.app.statusBar().showMessage(f"Image '{img_conf['path']}' deleted.", 3000) # app's statusBar
 
+    @operation_trace.recorded()
     def add_info_area(self):
         rect_id = f"rect_{datetime.datetime.now().timestamp()}"
         # Access app's config for defaults, then utils if not found
@@ -236,6 +420,7 @@ class ItemOperations:
         self.scene.clearSelection() # self.scene is app.scene
         item.setSelected(True)
 
+    @operation_trace.recorded()
     def delete_selected_info_rect(self):
         if not isinstance(self.app.selected_item, InfoAreaItem): # Access app's selected_item
             QMessageBox.information(self.app, "Delete Info Area", "No info area selected.") # parent is self.app
@@ -322,6 +507,7 @@ class ItemOperations:
 
         return connections_changed
 
+    @operation_trace.recorded()
     def paste_item_from_clipboard(self): # Renamed and refactored
         """Pastes an item from the app's clipboard."""
         if self.app.clipboard_data is None:
@@ -362,6 +548,7 @@ class ItemOperations:
         item.setSelected(True)
         return True # Indicate success
 
+    @operation_trace.recorded()
     def connect_selected_info_areas(self):
         selected = [i for i in self.scene.selectedItems() if isinstance(i, InfoAreaItem)]
         if len(selected) != 2:
@@ -396,6 +583,7 @@ class ItemOperations:
         self.app.selected_item = line_item
         self.app.update_properties_panel()
 
+    @operation_trace.recorded()
     def disconnect_selected_info_areas(self):
         selected = [i for i in self.scene.selectedItems() if isinstance(i, InfoAreaItem)]
         if len(selected) != 2:
@@ -466,6 +654,7 @@ class ItemOperations:
 
         return False
 
+    @operation_trace.recorded()
     def copy_selected_item_to_clipboard(self):
         if self.app.selected_item and isinstance(self.app.selected_item, InfoAreaItem) and \
            self.app.current_mode == "edit": # Check app's current_mode
@@ -474,6 +663,7 @@ class ItemOperations:
             return True
         return False
 
+    @operation_trace.recorded()
     def delete_selected_item_on_canvas(self):
         if self.app.selected_item and self.app.current_mode == "edit": # Check app's selected_item and current_mode
             if isinstance(self.app.selected_item, DraggableImageItem):
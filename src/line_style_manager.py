@@ -3,6 +3,8 @@
 from PyQt5.QtWidgets import QColorDialog, QInputDialog, QMessageBox
 from PyQt5.QtGui import QColor
 
+from src import operation_trace
+from src import profiling
 from src.connection_line_item import ConnectionLineItem
 
 class LineStyleManager:
@@ -21,6 +23,7 @@ class LineStyleManager:
                 self.app.line_style_combo.addItem(style['name'])
         self.app.line_style_combo.blockSignals(False)
 
+    @operation_trace.recorded()
     def handle_style_selection(self, style_name):
         if not isinstance(self.app.selected_item, ConnectionLineItem) or not style_name:
             return
@@ -50,6 +53,7 @@ class LineStyleManager:
         if hasattr(self.app, 'update_properties_panel'):
             self.app.update_properties_panel()
 
+    @profiling.profiled("style_save")
     def save_current_item_style(self):
         if not isinstance(self.app.selected_item, ConnectionLineItem):
             QMessageBox.warning(
@@ -0,0 +1,238 @@
+import os
+import sys
+
+from . import image_tiles
+from . import scaled_pixmap_cache
+from .draggable_image_item import DraggableImageItem
+from .info_area_item import InfoAreaItem
+
+TEXT_BLOCK_OVERHEAD_BYTES = 256 # Rough layout and format cost of one QTextDocument block
+
+
+def deep_sizeof(obj, seen=None):
+    """Bytes held by ``obj`` and the dicts, lists, tuples, sets and strings inside it.
+
+    Objects reachable more than once are counted once.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(element, seen) for element in obj)
+    return size
+
+
+def pixmap_bytes(pixmap):
+    """Bytes of decoded pixel data in a QPixmap."""
+    if pixmap is None or pixmap.isNull():
+        return 0
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+def process_rss_bytes():
+    """Resident memory of this process, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss # Peak, not current; in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _image_entries(app):
+    entries, seen_pixmaps = [], set()
+    for item in getattr(app, "item_map", {}).values():
+        if not isinstance(item, DraggableImageItem):
+            continue
+        pixmap = item.pixmap()
+        shared = pixmap.cacheKey() in seen_pixmaps
+        seen_pixmaps.add(pixmap.cacheKey())
+        entries.append({
+            "id": item.config_data.get("id"),
+            "path": item.config_data.get("path"),
+            "width": pixmap.width(),
+            "height": pixmap.height(),
+            "tiled": item.tile_source is not None,
+            "bytes": 0 if shared else pixmap_bytes(pixmap),
+        })
+    entries.sort(key=lambda entry: entry["bytes"], reverse=True)
+    return entries
+
+
+def _text_entries(app):
+    entries = []
+    for item in getattr(app, "item_map", {}).values():
+        if not isinstance(item, InfoAreaItem) or item._text_item is None:
+            continue # Text documents are only created once an area's text is drawn
+        document = item._text_item.document()
+        characters = document.characterCount()
+        blocks = document.blockCount()
+        entries.append({
+            "id": item.config_data.get("id"),
+            "characters": characters,
+            "blocks": blocks,
+            "bytes": characters * 2 + blocks * TEXT_BLOCK_OVERHEAD_BYTES,
+        })
+    entries.sort(key=lambda entry: entry["bytes"], reverse=True)
+    return entries
+
+
+def _web_view_state(app):
+    web_view = getattr(app, "web_view", None)
+    if web_view is None or not hasattr(web_view, "page"):
+        return {"available": False}
+    return {
+        "available": True,
+        "url": web_view.url().toString(),
+        "history_items": web_view.history().count(),
+        "visible": web_view.isVisible(),
+    }
+
+
+def build_report(app):
+    """Break down the memory held by the open project.
+
+    Pixmap bytes are exact; text document bytes are estimates (two bytes per
+    character plus :data:`TEXT_BLOCK_OVERHEAD_BYTES` per block); Python data
+    is measured with :func:`deep_sizeof`. The web view renders in a separate
+    process, so only its state is reported.
+
+    Returns:
+        dict: ``{"process_rss_bytes", "sections": {name: bytes}, "images", "text_documents",
+        "undo_history_entries", "caches", "web_view", "total_bytes"}``.
+    """
+    images = _image_entries(app)
+    texts = _text_entries(app)
+    project_io = getattr(app, "project_io", None)
+    pixmaps = scaled_pixmap_cache._cache
+    tiles = image_tiles._shared_cache
+    caches = {
+        "scaled_pixmaps": {"entries": len(pixmaps) if pixmaps else 0, "bytes": pixmaps.total_bytes if pixmaps else 0},
+        "tiles": {"entries": len(tiles) if tiles else 0, "bytes": tiles.current_bytes if tiles else 0},
+    }
+    sections = {
+        "image_pixmaps": sum(entry["bytes"] for entry in images),
+        "text_documents": sum(entry["bytes"] for entry in texts),
+        "config": deep_sizeof(getattr(app, "config", None)),
+        "undo_history": deep_sizeof(getattr(app, "config_snapshot_stack", None)),
+        "last_saved_config": deep_sizeof(getattr(project_io, "last_saved_config", None)),
+        "clipboard": deep_sizeof(getattr(app, "clipboard_data", None)),
+        "scaled_pixmap_cache": caches["scaled_pixmaps"]["bytes"],
+        "tile_cache": caches["tiles"]["bytes"],
+    }
+    return {
+        "process_rss_bytes": process_rss_bytes(),
+        "sections": sections,
+        "images": images,
+        "text_documents": texts,
+        "undo_history_entries": len(getattr(app, "config_snapshot_stack", [])),
+        "caches": caches,
+        "web_view": _web_view_state(app),
+        "total_bytes": sum(sections.values()),
+    }
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GB"
+
+
+def format_report(report, limit=10):
+    """Lay out a report as text, largest sections first, with the top ``limit`` images and texts."""
+    lines = []
+    if report["process_rss_bytes"] is not None:
+        lines.append(f"Process resident memory: {format_bytes(report['process_rss_bytes'])}")
+    lines.append(f"Accounted for: {format_bytes(report['total_bytes'])}")
+    lines.append("")
+    width = max(len(name) for name in report["sections"])
+    for name, size in sorted(report["sections"].items(), key=lambda item: item[1], reverse=True):
+        lines.append(f"{name:<{width}}  {format_bytes(size):>10}")
+    lines.append(f"{'':<{width}}  ({report['undo_history_entries']} undo snapshots)")
+    if report["images"]:
+        lines.append("")
+        lines.append(f"Largest images ({len(report['images'])} total):")
+        for entry in report["images"][:limit]:
+            kind = "tiled preview" if entry["tiled"] else f"{entry['width']}x{entry['height']}"
+            lines.append(f"  {format_bytes(entry['bytes']):>10}  {entry['path']} ({kind})")
+    if report["text_documents"]:
+        lines.append("")
+        lines.append(f"Largest text documents ({len(report['text_documents'])} created):")
+        for entry in report["text_documents"][:limit]:
+            lines.append(f"  {format_bytes(entry['bytes']):>10}  {entry['id']} ({entry['characters']} characters)")
+    web_view = report["web_view"]
+    lines.append("")
+    if web_view["available"]:
+        lines.append(f"Web view: {'shown' if web_view['visible'] else 'hidden'}, "
+                     f"{web_view['history_items']} history items (rendered in a separate process)")
+    else:
+        lines.append("Web view: not available")
+    return "\n".join(lines)
+
+
+# --- Trim actions: each frees one kind of memory and is safe while editing ---
+
+def trim_undo_history(app, keep=1):
+    """Keep only the newest ``keep`` undo snapshots (the current state counts as one)."""
+    stack = getattr(app, "config_snapshot_stack", None)
+    if stack and len(stack) > keep:
+        del stack[:len(stack) - keep]
+
+
+def clear_scaled_pixmaps(app=None):
+    if scaled_pixmap_cache._cache is not None:
+        scaled_pixmap_cache._cache.clear()
+
+
+def clear_tile_cache(app=None):
+    if image_tiles._shared_cache is not None:
+        image_tiles._shared_cache.clear()
+
+
+def clear_clipboard(app):
+    app.clipboard_data = None
+
+
+def forget_last_saved_config(app):
+    """Drop the copy used to skip unchanged saves; the next save writes unconditionally."""
+    if getattr(app, "project_io", None) is not None:
+        app.project_io.last_saved_config = None
+
+
+def reset_web_view(app):
+    """Unload the view-mode page and its history while in edit mode."""
+    web_view = getattr(app, "web_view", None)
+    if web_view is None or not hasattr(web_view, "page") or getattr(app, "current_mode", "edit") == "view":
+        return
+    web_view.setHtml("")
+    web_view.history().clear()
+
+
+TRIM_ACTIONS = {
+    "undo_history": ("Trim Undo History", trim_undo_history),
+    "scaled_pixmaps": ("Clear Scaled Images", clear_scaled_pixmaps),
+    "tiles": ("Clear Tile Cache", clear_tile_cache),
+    "clipboard": ("Clear Clipboard", clear_clipboard),
+    "last_saved_config": ("Forget Last Saved Copy", forget_last_saved_config),
+    "web_view": ("Unload Web View", reset_web_view),
+}
+
+
+def trim(app, actions=tuple(TRIM_ACTIONS)):
+    """Run the named trim actions. Returns the accounted bytes freed."""
+    before = build_report(app)["total_bytes"]
+    for name in actions:
+        TRIM_ACTIONS[name][1](app)
+    return max(0, before - build_report(app)["total_bytes"])
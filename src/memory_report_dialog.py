@@ -0,0 +1,76 @@
+import json
+
+from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtWidgets import (
+    QDialog, QFileDialog, QGridLayout, QHBoxLayout, QMessageBox, QPlainTextEdit, QPushButton, QVBoxLayout
+)
+
+from . import memory_report
+
+
+class MemoryReportDialog(QDialog):
+    """Shows where the open project's memory goes and offers actions to trim it."""
+
+    def __init__(self, app, parent=None):
+        super().__init__(parent or app)
+        self.app = app
+        self.report = None
+        self.setWindowTitle("Memory Report")
+        self.setMinimumSize(560, 460)
+
+        layout = QVBoxLayout(self)
+        self.report_text = QPlainTextEdit()
+        self.report_text.setReadOnly(True)
+        self.report_text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        layout.addWidget(self.report_text)
+
+        trim_layout = QGridLayout()
+        self.trim_buttons = {}
+        for index, (name, (label, _)) in enumerate(memory_report.TRIM_ACTIONS.items()):
+            button = QPushButton(label)
+            button.clicked.connect(lambda _checked=False, name=name: self.trim([name]))
+            trim_layout.addWidget(button, index // 3, index % 3)
+            self.trim_buttons[name] = button
+        layout.addLayout(trim_layout)
+
+        buttons_layout = QHBoxLayout()
+        trim_all_button = QPushButton("Trim All")
+        trim_all_button.clicked.connect(lambda: self.trim(list(memory_report.TRIM_ACTIONS)))
+        buttons_layout.addWidget(trim_all_button)
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        buttons_layout.addWidget(refresh_button)
+        save_button = QPushButton("Save JSON...")
+        save_button.clicked.connect(lambda: self.save_report())
+        buttons_layout.addWidget(save_button)
+        buttons_layout.addStretch()
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        buttons_layout.addWidget(close_button)
+        layout.addLayout(buttons_layout)
+
+        self.refresh()
+
+    def refresh(self):
+        self.report = memory_report.build_report(self.app)
+        self.report_text.setPlainText(memory_report.format_report(self.report))
+
+    def trim(self, actions):
+        freed = memory_report.trim(self.app, actions)
+        self.refresh()
+        if hasattr(self.app, '_show_temporary_message'):
+            self.app._show_temporary_message(f"Freed {memory_report.format_bytes(freed)}.", 3000)
+        return freed
+
+    def save_report(self, path=None):
+        if path is None:
+            path, _ = QFileDialog.getSaveFileName(self, "Save Memory Report", "memory_report.json", "JSON (*.json)")
+            if not path:
+                return False
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.report, f, indent=2)
+        except OSError as e:
+            QMessageBox.critical(self, "Save Error", f"Could not write the report to '{path}': {e}")
+            return False
+        return True
@@ -0,0 +1,443 @@
+import contextlib
+import copy
+import inspect
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import wraps
+
+from . import instrumentation
+from . import utils
+
+ENV_VAR = "INFOCANVAS_TRACE" # Path of a trace file to record from startup
+TRACE_VERSION = 1
+TRACE_FILENAME_PREFIX = "trace_" # Traces started from the menu go to <project>/.diagnostics/
+
+_recorder = None
+
+
+def _owner_app(instance):
+    """The main window an operation's ``self`` belongs to (components keep it as ``.app``)."""
+    return getattr(instance, "app", instance)
+
+
+def _widget_value(widget):
+    from PyQt5.QtWidgets import QAbstractButton, QComboBox, QLineEdit, QPlainTextEdit, QTextEdit
+    if isinstance(widget, (QTextEdit, QPlainTextEdit)):
+        return widget.toPlainText()
+    if isinstance(widget, QLineEdit):
+        return widget.text()
+    if isinstance(widget, QComboBox):
+        return widget.currentText()
+    if isinstance(widget, QAbstractButton):
+        return widget.isChecked()
+    return widget.value() # Spin boxes
+
+
+def _set_widget_value(widget, value):
+    from PyQt5.QtWidgets import QAbstractButton, QComboBox, QLineEdit, QPlainTextEdit, QTextEdit
+    widget.blockSignals(True) # The replayer calls the operation itself
+    try:
+        if isinstance(widget, (QTextEdit, QPlainTextEdit)):
+            widget.setPlainText(value)
+        elif isinstance(widget, QLineEdit):
+            widget.setText(value)
+        elif isinstance(widget, QComboBox):
+            widget.setCurrentText(value)
+        elif isinstance(widget, QAbstractButton):
+            widget.setChecked(value)
+        else:
+            widget.setValue(value)
+    finally:
+        widget.blockSignals(False)
+
+
+def _encode(value):
+    """Make an operation argument JSON-safe; canvas items are stored by id with their config."""
+    from PyQt5.QtGui import QKeyEvent
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_encode(element) for element in value]
+    config_data = getattr(value, "config_data", None)
+    if isinstance(config_data, dict):
+        return {"item": config_data.get("id"), "config": copy.deepcopy(config_data)}
+    if isinstance(value, QKeyEvent):
+        return {"key_event": {"key": value.key(), "modifiers": int(value.modifiers()), "text": value.text()}}
+    return {"repr": repr(value)}
+
+
+def _item_ids(app):
+    """Ids of every image, info area and connection, in config order."""
+    config = getattr(app, "config", None) or {}
+    return [entry.get("id") for key in ("images", "info_areas", "connections") for entry in config.get(key, [])]
+
+
+def _apply_item_config(item, config):
+    """Put an image or info area back where it was when the operation was recorded."""
+    from PyQt5.QtGui import QTransform
+    from .draggable_image_item import DraggableImageItem
+    from .info_area_item import InfoAreaItem
+    if not isinstance(item, (InfoAreaItem, DraggableImageItem)):
+        return
+    item.config_data.update({key: copy.deepcopy(value) for key, value in config.items() if key != "id"})
+    if isinstance(item, InfoAreaItem):
+        item.update_geometry_from_config()
+    else:
+        scale = item.config_data.get('scale', 1.0)
+        item.setTransform(QTransform().scale(scale, scale))
+        width = item.config_data.get('original_width', 0) * scale
+        height = item.config_data.get('original_height', 0) * scale
+        item.setPos(item.config_data.get('center_x', 0) - width / 2, item.config_data.get('center_y', 0) - height / 2)
+
+
+def _decode(value, app, id_map):
+    from PyQt5.QtCore import QEvent, Qt
+    from PyQt5.QtGui import QKeyEvent
+    if isinstance(value, list):
+        return [_decode(element, app, id_map) for element in value]
+    if not isinstance(value, dict):
+        return value
+    if "item" in value:
+        item = app.item_map.get(id_map.get(value["item"], value["item"]))
+        if item is not None and value.get("config"):
+            _apply_item_config(item, value["config"])
+        return item
+    if "key_event" in value:
+        key_event = value["key_event"]
+        return QKeyEvent(QEvent.KeyPress, key_event["key"], Qt.KeyboardModifiers(key_event["modifiers"]),
+                         key_event["text"])
+    return None # Arguments recorded only by their repr cannot be rebuilt
+
+
+def _selection_state(app):
+    scene = getattr(app, "scene", None)
+    selected = scene.selectedItems() if scene is not None else []
+    selected_item = getattr(app, "selected_item", None)
+    return ([item.config_data.get("id") for item in selected if hasattr(item, "config_data")],
+            selected_item.config_data.get("id") if hasattr(selected_item, "config_data") else None)
+
+
+def _restore_selection(app, selection, selected_id, id_map):
+    selection = [id_map.get(item_id, item_id) for item_id in selection]
+    selected_id = id_map.get(selected_id, selected_id)
+    scene = app.scene
+    scene.blockSignals(True) # Selection changes are replayed as operations of their own
+    try:
+        for item in scene.selectedItems():
+            item.setSelected(False)
+        for item_id in selection:
+            item = app.item_map.get(item_id)
+            if item is not None:
+                item.setSelected(True)
+    finally:
+        scene.blockSignals(False)
+    app.selected_item = app.item_map.get(selected_id) if selected_id else None
+
+
+class TraceRecorder:
+    """Appends each top-level recorded operation to a JSON Lines trace file.
+
+    The first line holds the project name and its config when recording
+    started; each further line holds one operation with its arguments, the
+    selection, the values of the panel widgets it reads, the ids of the items
+    it created and how long it took.
+    Operations called from inside another recorded operation are not written,
+    since replaying the outer one repeats them.
+    """
+
+    def __init__(self, path, project_name, config):
+        self.path = path
+        self.operations = 0
+        self._busy = False
+        self._started = time.perf_counter()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8', buffering=1) # Line-buffered: a crash keeps the trace
+        self._write({
+            "version": TRACE_VERSION,
+            "project": project_name,
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "config": copy.deepcopy(config),
+        })
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + "\n")
+
+    def is_busy(self):
+        return self._busy
+
+    def record(self, operation, inputs, func, args, kwargs):
+        """Run ``func`` as a recorded call of ``operation`` and return its result."""
+        instance = args[0]
+        app = _owner_app(instance)
+        selection, selected_id = _selection_state(app)
+        record = {
+            "t": round(time.perf_counter() - self._started, 4),
+            "op": operation,
+            "args": _encode(list(args[1:])),
+            "kwargs": {name: _encode(value) for name, value in kwargs.items()},
+            "selection": selection,
+            "selected": selected_id,
+            "inputs": {name: _widget_value(getattr(app, name)) for name in inputs if hasattr(app, name)},
+        }
+        existing_ids = set(_item_ids(app))
+        self._busy = True
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._busy = False
+            record["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            created = [item_id for item_id in _item_ids(app) if item_id not in existing_ids]
+            if created:
+                record["created"] = created
+            if not self._file.closed:
+                self._write(record)
+                self.operations += 1
+
+    def close(self):
+        self._file.close()
+
+
+def start_recording(path, project_name, config):
+    """Record operations into ``path``, replacing any recording in progress. Returns the recorder."""
+    global _recorder
+    stop_recording()
+    _recorder = TraceRecorder(path, project_name, config)
+    return _recorder
+
+
+def stop_recording():
+    """Finish the recording in progress. Returns its recorder, or None."""
+    global _recorder
+    active, _recorder = _recorder, None
+    if active is not None:
+        active.close()
+    return active
+
+
+def recorder():
+    """The active :class:`TraceRecorder`, or None while not recording."""
+    return _recorder
+
+
+def default_trace_path(project_path):
+    return os.path.join(project_path, utils.DIAGNOSTICS_DIRNAME,
+                        f"{TRACE_FILENAME_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+
+
+def recorded(inputs=()):
+    """Decorator recording calls of a method as operation ``<Class>.<method>``.
+
+    ``inputs`` names the widgets on the main window whose values the method
+    reads; they are stored with each call and set again before it is replayed.
+    Extra positional arguments beyond the method's own are dropped, as PyQt
+    does for slots, so decorated methods can stay connected to signals.
+    While not recording, the cost is one global lookup per call.
+    """
+    def decorate(func):
+        operation = func.__qualname__
+        parameters = inspect.signature(func).parameters.values()
+        max_positional = None
+        if not any(p.kind == p.VAR_POSITIONAL for p in parameters):
+            max_positional = sum(1 for p in parameters if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if max_positional is not None:
+                args = args[:max_positional]
+            active = _recorder
+            if active is None or active.is_busy():
+                return func(*args, **kwargs)
+            return active.record(operation, inputs, func, args, kwargs)
+        return wrapper
+    return decorate
+
+
+def load_trace(path):
+    """Return ``(header, operations)`` from a trace file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get("version") != TRACE_VERSION:
+        raise ValueError(f"'{path}' is not an InfoCanvas operation trace (version {TRACE_VERSION}).")
+    return lines[0], lines[1:]
+
+
+def _operation_targets(app):
+    return {
+        "InfoCanvasApp": app,
+        "ItemOperations": app.item_operations,
+        "CanvasManager": app.canvas_manager,
+        "TextStyleManager": app.text_style_manager,
+        "LineStyleManager": app.line_style_manager,
+        "InputHandler": app.input_handler,
+    }
+
+
+@contextlib.contextmanager
+def _answering_dialogs():
+    """Answer confirmation dialogs with Yes and skip message boxes while replaying."""
+    from PyQt5.QtWidgets import QMessageBox
+    originals = {name: getattr(QMessageBox, name) for name in ("question", "warning", "information", "critical")}
+    QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+    for name in ("warning", "information", "critical"):
+        setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: QMessageBox.Ok))
+    try:
+        yield
+    finally:
+        for name, original in originals.items():
+            setattr(QMessageBox, name, original)
+
+
+def replay_operations(app, operations, timings):
+    """Replay recorded operations on an open main window, timing each into ``timings``.
+
+    ``timings`` is an :class:`instrumentation.Recorder`. New items get fresh
+    ids, so the ids an operation created while recording are mapped to the
+    ones it creates now. Returns the number of operations that could not be
+    replayed.
+    """
+    from PyQt5.QtWidgets import QApplication
+    targets = _operation_targets(app)
+    id_map = {}
+    skipped = 0
+    with _answering_dialogs():
+        for entry in operations:
+            class_name, _, method_name = entry["op"].rpartition(".")
+            method = getattr(targets.get(class_name), method_name, None)
+            if method is None:
+                skipped += 1
+                continue
+            _restore_selection(app, entry.get("selection", []), entry.get("selected"), id_map)
+            if entry.get("inputs"):
+                app.update_properties_panel() # Builds the panel holding the inputs, as selecting does
+            for name, value in entry.get("inputs", {}).items():
+                if hasattr(app, name):
+                    _set_widget_value(getattr(app, name), value)
+            args = _decode(entry.get("args", []), app, id_map)
+            kwargs = {name: _decode(value, app, id_map) for name, value in entry.get("kwargs", {}).items()}
+            existing_ids = set(_item_ids(app))
+            started = timings.begin(entry["op"])
+            try:
+                method(*args, **kwargs)
+                QApplication.processEvents() # Deferred work the operation queued belongs to it
+            finally:
+                timings.end(entry["op"], started)
+            created = [item_id for item_id in _item_ids(app) if item_id not in existing_ids]
+            id_map.update(zip(entry.get("created", []), created))
+    return skipped
+
+
+def replay_trace(trace_path, projects_dir=None, repeat=1, work_dir=None):
+    """Replay a trace headlessly against a copy of its project.
+
+    Each repetition starts from a fresh copy of the project folder in
+    ``projects_dir`` (by default the projects folder), with the config the
+    trace started from, so the original project is never modified.
+
+    Returns:
+        dict: ``{"trace", "project", "operations", "skipped", "results"}``; the results use the
+        ``bench`` format (one entry per operation, its runs being the total seconds per
+        repetition) plus the call count and per-call percentiles of the last repetition.
+    """
+    import statistics
+    from . import benchmark
+    header, operations = load_trace(trace_path)
+    project_name = header["project"]
+    source_path = os.path.join(projects_dir or utils.PROJECTS_BASE_DIR, project_name)
+    benchmark._ensure_application()
+    totals = {}
+    summary = {}
+    skipped = 0
+    original_base_dir = utils.PROJECTS_BASE_DIR
+    with tempfile.TemporaryDirectory(prefix="infocanvas-replay-", dir=work_dir) as base_dir:
+        utils.PROJECTS_BASE_DIR = base_dir
+        try:
+            for repetition in range(repeat):
+                project_path = os.path.join(base_dir, project_name)
+                shutil.rmtree(project_path, ignore_errors=True)
+                if os.path.isdir(source_path):
+                    shutil.copytree(source_path, project_path, ignore=shutil.ignore_patterns(utils.DIAGNOSTICS_DIRNAME))
+                os.makedirs(os.path.join(project_path, utils.PROJECT_IMAGES_DIRNAME), exist_ok=True)
+                with open(os.path.join(project_path, utils.PROJECT_CONFIG_FILENAME), 'w', encoding='utf-8') as f:
+                    json.dump(header["config"], f, indent=2)
+                timings = instrumentation.Recorder()
+                with contextlib.redirect_stdout(io.StringIO()): # Status and warning prints
+                    app = benchmark._open_app(project_name)
+                    stop_recording() # Never record the replay itself
+                    try:
+                        skipped = replay_operations(app, operations, timings)
+                    finally:
+                        app.close()
+                        app.deleteLater()
+                summary = timings.summary()
+                for name, stats in summary.items():
+                    totals.setdefault(name, []).append(stats["total_ms"] / 1000)
+        finally:
+            utils.PROJECTS_BASE_DIR = original_base_dir
+    info_areas = len(header["config"].get("info_areas", []))
+    results = []
+    for name, runs in sorted(totals.items()):
+        results.append({
+            "scenario": name,
+            "info_areas": info_areas,
+            "calls": summary.get(name, {}).get("count", 0),
+            "p50_ms": summary.get(name, {}).get("p50_ms", 0.0),
+            "p95_ms": summary.get(name, {}).get("p95_ms", 0.0),
+            "max_ms": summary.get(name, {}).get("max_ms", 0.0),
+            "runs": [round(run, 6) for run in runs],
+            "min": round(min(runs), 6),
+            "median": round(statistics.median(runs), 6),
+            "mean": round(statistics.mean(runs), 6),
+        })
+    return {"trace": trace_path, "project": project_name, "operations": len(operations), "skipped": skipped,
+            "results": results}
+
+
+def add_arguments(parser):
+    parser.add_argument("trace", help="Trace file recorded with File > Record Operation Trace or INFOCANVAS_TRACE.")
+    parser.add_argument("--projects-dir", default=utils.PROJECTS_BASE_DIR, help="Folder containing the traced project.")
+    parser.add_argument("--repeat", type=int, default=1, help="Times to replay the whole trace.")
+    parser.add_argument("--output", help="Write the JSON results here instead of to stdout.")
+    parser.add_argument("--baseline", help="Results file to compare with; exits 1 on regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline, as a fraction.")
+    parser.add_argument("--work-dir", default=None, help="Folder for the temporary project copies.")
+
+
+def run(args):
+    """Run a parsed ``replay`` command. Returns the process exit code."""
+    from . import benchmark
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot read baseline '{args.baseline}': {e}", file=sys.stderr)
+            return 2
+    try:
+        result = replay_trace(args.trace, args.projects_dir, max(1, args.repeat), args.work_dir)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: Cannot replay '{args.trace}': {e}", file=sys.stderr)
+        return 2
+    exit_code = 0
+    if baseline is not None:
+        result["comparison"] = benchmark.compare_to_baseline(result, baseline, args.tolerance)
+        for entry in result["comparison"]["regressions"]:
+            print(f"Regression: {entry['scenario']} took {entry['current']:.4f}s in total "
+                  f"(baseline {entry['baseline']:.4f}s)", file=sys.stderr)
+        exit_code = 1 if result["comparison"]["regressions"] else 0
+    result_json = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(result_json)
+    else:
+        print(result_json)
+    return exit_code
@@ -0,0 +1,87 @@
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QFileDialog, QFrame, QHBoxLayout, QLabel, QMessageBox, QPushButton, QVBoxLayout
+
+from . import instrumentation
+
+
+def format_summary(summary, limit=20):
+    """Lay out a recorder summary as a fixed-width table, slowest total first."""
+    if not summary:
+        return "No operations recorded yet."
+    rows = sorted(summary.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:limit]
+    width = max(len("operation"), *(len(name) for name, _ in rows))
+    lines = [f"{'operation':<{width}}  {'count':>7}  {'p50 ms':>8}  {'p95 ms':>8}  {'max ms':>8}"]
+    for name, stats in rows:
+        lines.append(f"{name:<{width}}  {stats['count']:>7}  {stats['p50_ms']:>8.2f}  "
+                     f"{stats['p95_ms']:>8.2f}  {stats['max_ms']:>8.2f}")
+    return "\n".join(lines)
+
+
+class PerformanceHud(QFrame):
+    """Overlay on the canvas with rolling latencies and counts per instrumented operation."""
+
+    REFRESH_MS = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("performance_hud")
+        self.setStyleSheet(
+            "#performance_hud { background-color: rgba(0, 0, 0, 190); border-radius: 4px; }"
+            "QLabel { color: #E0E0E0; font-family: monospace; font-size: 11px; }"
+        )
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 6, 8, 6)
+        self.table_label = QLabel()
+        self.table_label.setTextFormat(Qt.PlainText)
+        layout.addWidget(self.table_label)
+
+        buttons_layout = QHBoxLayout()
+        self.export_button = QPushButton("Export Trace...")
+        self.export_button.clicked.connect(lambda: self.export_trace())
+        buttons_layout.addWidget(self.export_button)
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.clicked.connect(self.reset)
+        buttons_layout.addWidget(self.reset_button)
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start(self.REFRESH_MS)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        active = instrumentation.recorder()
+        self.table_label.setText(format_summary(active.summary()) if active else "Instrumentation is off.")
+        self.adjustSize()
+
+    def reset(self):
+        active = instrumentation.recorder()
+        if active:
+            active.reset()
+        self.refresh()
+
+    def export_trace(self, path=None):
+        """Write the recorded trace as Chrome trace JSON or, for a ``.csv`` path, CSV."""
+        active = instrumentation.recorder()
+        if active is None:
+            return False
+        if path is None:
+            path, _ = QFileDialog.getSaveFileName(self, "Export Trace", "infocanvas_trace.json",
+                                                  "Chrome Trace (*.json);;CSV (*.csv)")
+            if not path:
+                return False
+        try:
+            active.export_trace(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Export Error", f"Could not write the trace to '{path}': {e}")
+            return False
+        return True
@@ -0,0 +1,177 @@
+import cProfile
+import os
+import tracemalloc
+from datetime import datetime
+from functools import wraps
+
+from . import utils
+
+ENV_VAR = "INFOCANVAS_PROFILE" # Comma-separated operations to profile, or "all"
+COUNT_ENV_VAR = "INFOCANVAS_PROFILE_COUNT" # Invocations to capture per operation (default 1)
+MODE_ENV_VAR = "INFOCANVAS_PROFILE_MODE" # cpu, memory or both (default cpu)
+OPERATIONS = ("switch_to_project", "render", "export", "undo", "bulk_import", "style_save")
+MODES = ("cpu", "memory", "both")
+PROFILES_DIRNAME = "profiles" # Under DIAGNOSTICS_DIRNAME in PROJECTS_BASE_DIR
+TRACEMALLOC_FRAMES = 25
+TOP_ALLOCATIONS = 30 # Lines listed in each allocation summary
+
+_profiler = None
+
+
+def default_output_dir():
+    return os.path.join(utils.PROJECTS_BASE_DIR, utils.DIAGNOSTICS_DIRNAME, PROFILES_DIRNAME)
+
+
+def parse_operations(text):
+    """Turn ``"render, export"`` or ``"all"`` into a tuple of operation names."""
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    if "all" in names:
+        return OPERATIONS
+    unknown = [name for name in names if name not in OPERATIONS]
+    if unknown:
+        raise ValueError(f"Unknown operation(s) {', '.join(unknown)}; choose from {', '.join(OPERATIONS)} or all.")
+    return tuple(names)
+
+
+class Profiler:
+    """Captures the next ``count`` invocations of each chosen operation.
+
+    With ``cpu`` each capture is written as a ``.prof`` file (open it with
+    ``pstats`` or snakeviz). With ``memory`` the tracemalloc snapshot taken when
+    the operation returns is written as ``.tracemalloc`` (``Snapshot.load``),
+    next to a text file listing the lines that allocated most during it.
+    Captures do not nest: an operation started inside another capture runs
+    unprofiled.
+    """
+
+    def __init__(self, operations, count=1, mode="cpu", output_dir=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode '{mode}'; choose from {', '.join(MODES)}.")
+        unknown = [name for name in operations if name not in OPERATIONS]
+        if unknown:
+            raise ValueError(f"Unknown operation(s) {', '.join(unknown)}; choose from {', '.join(OPERATIONS)}.")
+        self.count = max(1, count)
+        self.remaining = {name: self.count for name in operations}
+        self.mode = mode
+        self.output_dir = output_dir or default_output_dir()
+        self.files = [] # Every file written so far
+        self._active = False
+
+    def wants(self, operation):
+        return not self._active and self.remaining.get(operation, 0) > 0
+
+    def is_finished(self):
+        return not any(self.remaining.values())
+
+    def capture(self, operation, func, args, kwargs):
+        """Run ``func(*args, **kwargs)`` as one capture of ``operation`` and return its result."""
+        self.remaining[operation] -= 1
+        index = self.count - self.remaining[operation]
+        name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{operation}_{index}"
+        cpu = cProfile.Profile() if self.mode in ("cpu", "both") else None
+        memory = self.mode in ("memory", "both")
+        started_tracing = memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        before = tracemalloc.take_snapshot() if memory else None
+        self._active = True
+        try:
+            if cpu is not None:
+                cpu.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if cpu is not None:
+                    cpu.disable()
+        finally:
+            self._active = False
+            after = tracemalloc.take_snapshot() if memory else None
+            if started_tracing:
+                tracemalloc.stop()
+            self._write(name, operation, cpu, before, after)
+
+    def _write(self, name, operation, cpu, before, after):
+        base = os.path.join(self.output_dir, name)
+        written = []
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            if cpu is not None:
+                cpu.dump_stats(base + ".prof")
+                written.append(base + ".prof")
+            if after is not None:
+                own_frames = (tracemalloc.Filter(False, tracemalloc.__file__),)
+                after = after.filter_traces(own_frames)
+                after.dump(base + ".tracemalloc")
+                written.append(base + ".tracemalloc")
+                with open(base + "_allocations.txt", 'w', encoding='utf-8') as f:
+                    f.write(f"Allocations during {operation}, largest growth first:\n")
+                    for stat in after.compare_to(before.filter_traces(own_frames), "lineno")[:TOP_ALLOCATIONS]:
+                        f.write(f"{stat}\n")
+                written.append(base + "_allocations.txt")
+        except OSError as e:
+            print(f"Warning: Could not save the profile of {operation} to '{self.output_dir}': {e}")
+        self.files.extend(written)
+        if written:
+            print(f"Profile of {operation} saved to {', '.join(written)}")
+
+
+def enable(operations=OPERATIONS, count=1, mode="cpu", output_dir=None):
+    """Profile the next ``count`` invocations of each of ``operations``. Returns the profiler."""
+    global _profiler
+    _profiler = Profiler(operations, count, mode, output_dir)
+    return _profiler
+
+
+def disable():
+    global _profiler
+    _profiler = None
+
+
+def profiler():
+    """The active :class:`Profiler`, or None while profiling is off."""
+    return _profiler
+
+
+def enable_from_environment():
+    """Enable profiling as requested by :data:`ENV_VAR` and friends. Returns the profiler or None."""
+    operations = os.environ.get(ENV_VAR, "").strip()
+    if not operations:
+        return None
+    try:
+        count = int(os.environ.get(COUNT_ENV_VAR, "1"))
+        return enable(parse_operations(operations), count, os.environ.get(MODE_ENV_VAR, "cpu").strip().lower())
+    except ValueError as e:
+        print(f"Warning: Profiling not enabled: {e}")
+        return None
+
+
+def profiled(operation):
+    """Decorator letting the active profiler capture calls of the function as ``operation``.
+
+    While profiling is off, the cost is one global lookup per call.
+    """
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            active = _profiler
+            if active is None or not active.wants(operation):
+                return func(*args, **kwargs)
+            return active.capture(operation, func, args, kwargs)
+        return wrapper
+    return decorate
+
+
+def add_arguments(parser):
+    parser.add_argument("--profile", metavar="OPERATIONS",
+                        help=f"Profile these comma-separated operations ({', '.join(OPERATIONS)}) or all.")
+    parser.add_argument("--profile-count", type=int, default=1, help="Invocations to capture per operation.")
+    parser.add_argument("--profile-mode", choices=MODES, default="cpu",
+                        help="cpu writes .prof files, memory writes tracemalloc snapshots, both writes both.")
+    parser.add_argument("--profile-dir", default=None, help="Folder for the captures (default: static/.diagnostics/profiles).")
+
+
+def enable_from_arguments(args):
+    """Enable profiling from parsed :func:`add_arguments` options. Returns the profiler or None."""
+    if not args.profile:
+        return None
+    return enable(parse_operations(args.profile), args.profile_count, args.profile_mode, args.profile_dir)
@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from . import config_format
+from . import utils
+
+INDEX_VERSION = 1
+_write_lock = threading.RLock()
+
+
+def index_path(base_dir=None):
+    return os.path.join(base_dir or utils.PROJECTS_BASE_DIR, utils.CACHE_DIRNAME, utils.PROJECT_INDEX_FILENAME)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _images_key(config):
+    paths = sorted(img.get('path', '') for img in config.get('images', []))
+    return hashlib.sha1("\n".join(paths).encode('utf-8')).hexdigest()
+
+
+def build_entry(project_path, config, previous=None):
+    """Summarize one project for the index.
+
+    Image sizes are only re-measured when the set of image files has changed.
+    """
+    name = os.path.basename(os.path.normpath(project_path))
+    images_key = _images_key(config)
+    if previous and previous.get("images_key") == images_key:
+        image_bytes = previous.get("image_bytes", 0)
+    else:
+        images_folder = os.path.join(project_path, utils.PROJECT_IMAGES_DIRNAME)
+        image_bytes = 0
+        for rel in {img.get('path') for img in config.get('images', []) if img.get('path')}:
+            try:
+                image_bytes += os.path.getsize(os.path.join(images_folder, rel))
+            except OSError:
+                pass
+    thumbnail_mtime = _mtime(os.path.join(project_path, utils.PROJECT_THUMBNAIL_FILENAME))
+    return {
+        "name": name,
+        "last_modified": config.get("last_modified", ""),
+        "images": len(config.get('images', [])),
+        "info_areas": len(config.get('info_areas', [])),
+        "connections": len(config.get('connections', [])),
+        "image_bytes": image_bytes,
+        "images_key": images_key,
+        "thumbnail": utils.PROJECT_THUMBNAIL_FILENAME if thumbnail_mtime else None,
+        "thumbnail_mtime": thumbnail_mtime,
+        "config_mtime": _mtime(os.path.join(project_path, utils.PROJECT_CONFIG_FILENAME)),
+    }
+
+
+class ProjectIndex:
+    """A cached summary of every project, kept in ``static/.cache/project_index.json``.
+
+    Reading the index touches one file, so the project manager can list
+    hundreds of projects instantly. :meth:`refresh` brings it up to date by
+    directory and config mtimes, re-reading only the projects that changed.
+    The file lives in a subfolder so that rewriting it leaves the mtime of the
+    projects folder, which tells when projects were added or removed, alone.
+    """
+
+    def __init__(self, base_dir=None):
+        self.base_dir = base_dir or utils.PROJECTS_BASE_DIR
+        self.path = index_path(self.base_dir)
+        self.base_mtime = None
+        self.projects = {}
+        self.loaded = False
+
+    def load(self):
+        """Read the index file; returns False when there is none (or it is unusable)."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION:
+            return False
+        self.base_mtime = data.get("base_mtime")
+        self.projects = data.get("projects", {})
+        self.loaded = True
+        return True
+
+    def save(self):
+        data = {"version": INDEX_VERSION, "base_mtime": self.base_mtime, "projects": self.projects}
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with _write_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Warning: Could not write project index '{self.path}': {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def entries(self):
+        return list(self.projects.values())
+
+    def refresh(self):
+        """Re-validate the index against the disk. Returns True if anything changed."""
+        changed = False
+        if os.path.isdir(self.base_dir):
+            # Create the cache folder first, so saving below does not touch the base mtime
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        base_mtime = _mtime(self.base_dir)
+        if base_mtime is None:
+            changed = bool(self.projects)
+            self.projects = {}
+        else:
+            if base_mtime != self.base_mtime or not self.loaded:
+                names = {
+                    name for name in os.listdir(self.base_dir)
+                    if os.path.isfile(os.path.join(self.base_dir, name, utils.PROJECT_CONFIG_FILENAME))
+                }
+                for name in set(self.projects) - names:
+                    del self.projects[name]
+                    changed = True
+                for name in names - set(self.projects):
+                    self.projects[name] = {"name": name}
+                self.base_mtime = base_mtime
+            for name in list(self.projects):
+                changed |= self._refresh_project(name)
+        self.loaded = True
+        if changed:
+            self.save()
+        return changed
+
+    def _refresh_project(self, name):
+        project_path = os.path.join(self.base_dir, name)
+        previous = self.projects.get(name, {})
+        config_mtime = _mtime(os.path.join(project_path, utils.PROJECT_CONFIG_FILENAME))
+        if config_mtime is None:
+            del self.projects[name]
+            return True
+        if previous.get("config_mtime") == config_mtime:
+            return self._refresh_thumbnail(name)
+        try:
+            config = config_format.load(os.path.join(project_path, utils.PROJECT_CONFIG_FILENAME))
+        except (OSError, ValueError):
+            config = {}
+        self.projects[name] = build_entry(project_path, config, previous)
+        return True
+
+    def _refresh_thumbnail(self, name):
+        entry = self.projects[name]
+        thumbnail_mtime = _mtime(os.path.join(self.base_dir, name, utils.PROJECT_THUMBNAIL_FILENAME))
+        if entry.get("thumbnail_mtime") == thumbnail_mtime:
+            return False
+        entry["thumbnail"] = utils.PROJECT_THUMBNAIL_FILENAME if thumbnail_mtime else None
+        entry["thumbnail_mtime"] = thumbnail_mtime
+        return True
+
+    # Single-project updates re-read the file under the lock, so that writers
+    # on different threads do not drop each other's entries.
+
+    def update_project(self, project_path, config):
+        """Record a project that was just saved, without rescanning the others."""
+        name = os.path.basename(os.path.normpath(project_path))
+        with _write_lock:
+            self.load()
+            self.projects[name] = build_entry(project_path, config, self.projects.get(name))
+            self.save()
+
+    def update_thumbnail(self, name):
+        """Record that a project's thumbnail was (re)written."""
+        with _write_lock:
+            self.load()
+            if name in self.projects and self._refresh_thumbnail(name):
+                self.save()
+
+    def remove_project(self, name):
+        with _write_lock:
+            self.load()
+            if self.projects.pop(name, None) is not None:
+                self.save()
+
+
+def filter_and_sort(entries, text="", sort_key="name", descending=False):
+    """Filter entries by a case-insensitive name substring and sort them, all in memory."""
+    text = text.strip().lower()
+    matching = [entry for entry in entries if text in entry.get("name", "").lower()]
+    if sort_key == "size":
+        key = lambda entry: entry.get("image_bytes", 0)
+    elif sort_key == "items":
+        key = lambda entry: entry.get("info_areas", 0) + entry.get("images", 0)
+    elif sort_key == "last_modified":
+        key = lambda entry: entry.get("last_modified") or ""
+    else:
+        key = lambda entry: entry.get("name", "").lower()
+    return sorted(matching, key=key, reverse=descending)
+
+
+class ProjectIndexRefresher(QObject):
+    """Refreshes the project index on a worker thread.
+
+    The worker uses its own :class:`ProjectIndex`, so the GUI never shares
+    state with it; :attr:`refreshed` carries the up-to-date entries to the GUI
+    thread when anything changed.
+    """
+
+    refreshed = pyqtSignal(list)
+
+    def __init__(self, base_dir=None, parent=None):
+        super().__init__(parent)
+        self.base_dir = base_dir
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="project-index")
+
+    def start(self):
+        return self._executor.submit(self._run)
+
+    def _run(self):
+        index = ProjectIndex(self.base_dir)
+        index.load()
+        try:
+            changed = index.refresh()
+        except OSError as e:
+            print(f"Warning: Could not refresh the project index: {e}")
+            return False
+        if changed:
+            try:
+                self.refreshed.emit(index.entries())
+            except RuntimeError:
+                pass # The dialog was closed and deleted meanwhile
+        return changed
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -1,13 +1,15 @@
 import os
-import json
 import datetime
 import shutil
 import copy
 from PyQt5.QtWidgets import QMessageBox
 from PyQt5.QtGui import QImageReader
 
+from . import config_format
 from . import utils
 from .draggable_image_item import DraggableImageItem
+from .file_copier import FileCopier
+from .project_index import ProjectIndex
 
 class ProjectIO:
     """Handles filesystem operations for project configuration."""
@@ -16,6 +18,7 @@ class ProjectIO:
         self.current_project_path = None
         self.config = {}
         self.last_saved_config = None  # Initialize last saved config
+        self.config_format = config_format.default_format()  # On-disk format of the current project's config
 
     def get_project_config_path(self, project_name_or_path):
         if os.path.isabs(project_name_or_path) and os.path.isdir(project_name_or_path):
@@ -51,13 +54,12 @@ class ProjectIO:
             QMessageBox.warning(None, "Load Error", f"Config file for '{self.current_project_name}' not found.")
             return None
         try:
-            with open(config_file_path, 'r') as f:
-                loaded_data = json.load(f)
-                if not loaded_data:
-                    QMessageBox.warning(None, "Load Error", "Config file is empty.")
-                    return None
-                return loaded_data
-        except (IOError, json.JSONDecodeError) as e:
+            loaded_data, self.config_format = config_format.load_with_format(config_file_path)
+            if not loaded_data:
+                QMessageBox.warning(None, "Load Error", "Config file is empty.")
+                return None
+            return loaded_data
+        except (IOError, ValueError) as e:
             QMessageBox.warning(None, "Load Error", f"Error loading config file{config_file_path}: {e}.")
             return None
 
@@ -117,8 +119,7 @@ class ProjectIO:
                             img_conf['original_height'] = size.height()
 
         try:
-            with open(config_file_path, 'w') as f:
-                json.dump(config_to_save, f, indent=2)
+            config_format.dump(config_to_save, config_file_path, self.config_format)
             
             # Store the saved config
             self.last_saved_config = copy.deepcopy(config_to_save)
@@ -142,6 +143,20 @@ class ProjectIO:
             QMessageBox.critical(None, "Save Error", f"An unexpected error occurred while saving: {e}.")
             return False
 
+    def set_config_format(self, fmt):
+        """Store the current project's config in ``fmt`` from now on; the next save rewrites the file."""
+        if fmt not in config_format.FORMATS:
+            raise ValueError(f"Unknown config format '{fmt}'")
+        self.config_format = fmt
+        self.last_saved_config = None
+
+    def update_project_index(self, project_path, config):
+        """Keep the project manager's cached index in step with a saved config."""
+        try:
+            ProjectIndex(os.path.dirname(os.path.normpath(project_path))).update_project(project_path, config)
+        except OSError as e:
+            print(f"Warning: Could not update the project index: {e}")
+
     def switch_to_project(self, project_name, is_new_project=False):
         self.current_project_name = project_name
         self.current_project_path = os.path.join(utils.PROJECTS_BASE_DIR, project_name)
@@ -150,6 +165,7 @@ class ProjectIO:
             self.current_project_path = None
             return False
         if is_new_project:
+            self.config_format = config_format.default_format()
             self.config = utils.get_default_config()
             self.config["project_name"] = self.current_project_name
             if not self.save_config(self.current_project_path, self.config):
@@ -162,7 +178,13 @@ class ProjectIO:
             self.config = loaded_config
         return True
 
-    def copy_project_data(self, source_project_name, new_project_name):
+    def copy_project_data(self, source_project_name, new_project_name, progress_callback=None):
+        """Copy a project's config and images under a new name.
+
+        Images are copied on a thread pool and hard-linked or reflinked when the
+        filesystem allows it; ``progress_callback(copied_bytes, total_bytes)`` is
+        called on this thread while that runs.
+        """
         source_project_path = os.path.join(utils.PROJECTS_BASE_DIR, source_project_name)
         new_project_path = os.path.join(utils.PROJECTS_BASE_DIR, new_project_name)
 
@@ -178,9 +200,8 @@ class ProjectIO:
             return False
 
         try:
-            with open(source_config_file, 'r') as f:
-                config_data = json.load(f)
-        except (IOError, json.JSONDecodeError) as e:
+            config_data, source_format = config_format.load_with_format(source_config_file)
+        except (IOError, ValueError) as e:
             QMessageBox.critical(None, "Configuration Read Error", f"Error reading source project configuration '{source_config_file}': {e}")
             return False
 
@@ -199,22 +220,28 @@ class ProjectIO:
         # The lists "images" and "scene_items" should be preserved for an exact copy.
 
         try:
-            with open(new_config_file, 'w') as f:
-                json.dump(config_data, f, indent=2)
-        except (IOError, json.JSONDecodeError) as e: # json.JSONDecodeError is less likely here but good practice
+            config_format.dump(config_data, new_config_file, source_format) # The copy keeps the source's format
+        except (IOError, ValueError) as e:
             QMessageBox.critical(None, "Configuration Write Error", f"Error writing new project configuration '{new_config_file}': {e}")
             return False
 
         # Copy images
         if os.path.exists(source_images_path):
             try:
+                copy_pairs = []
                 for filename in os.listdir(source_images_path):
                     source_file_path = os.path.join(source_images_path, filename)
                     dest_file_path = os.path.join(new_images_path, filename)
                     if os.path.isfile(source_file_path): # Ensure it's a file, not a subdirectory
-                        shutil.copy2(source_file_path, dest_file_path)
+                        copy_pairs.append((source_file_path, dest_file_path))
+                errors = FileCopier().copy_files(copy_pairs, progress_callback)
             except (IOError, shutil.Error) as e:
                 QMessageBox.critical(None, "Image Copy Error", f"Error copying images to '{new_images_path}': {e}")
                 return False
+            if errors:
+                _, failed_dest, error = errors[0]
+                QMessageBox.critical(None, "Image Copy Error", f"Error copying images to '{new_images_path}': {failed_dest}: {error}")
+                return False
 
+        self.update_project_index(new_project_path, config_data)
         return True
@@ -2,11 +2,16 @@ import os
 import shutil
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QListWidget, QListWidgetItem,
-    QHBoxLayout, QPushButton, QMessageBox, QInputDialog
+    QHBoxLayout, QPushButton, QMessageBox, QInputDialog, QLineEdit, QComboBox
 )
-from PyQt5.QtCore import pyqtSignal, Qt
+from PyQt5.QtCore import pyqtSignal, Qt, QSize
+from PyQt5.QtGui import QIcon, QPixmap
+from PyQt5.sip import isdeleted
 
 from . import utils # Assuming utils.py is in the same directory (src)
+from .file_copier import qt_progress_callback
+from .project_index import ProjectIndex, ProjectIndexRefresher, filter_and_sort
+from .project_thumbnail import thumbnail_generator
 # Or from src import utils if running from parent directory
 
 # Placeholder for constants, will be replaced by utils.CONSTANT_NAME
@@ -29,10 +34,35 @@ class ProjectManagerDialog(QDialog):
 
         layout = QVBoxLayout(self)
 
+        self.project_entries = []
+        self._thumbnail_icons = {} # (project name, thumbnail mtime) -> QIcon
+        self.index_refresher = ProjectIndexRefresher(parent=self)
+        self.index_refresher.refreshed.connect(self.set_project_entries)
+        thumbnail_generator().thumbnail_ready.connect(self._on_thumbnail_ready)
+        self.finished.connect(lambda _: self._on_finished())
+
         layout.addWidget(QLabel("Existing Projects:"))
+        filter_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter projects...")
+        self.filter_edit.textChanged.connect(self.render_project_list)
+        filter_layout.addWidget(self.filter_edit)
+        self.sort_combo = QComboBox()
+        # (label, sort key, descending)
+        for label, key, descending in (("Name", "name", False), ("Last Modified", "last_modified", True),
+                                       ("Image Size", "size", True), ("Item Count", "items", True)):
+            self.sort_combo.addItem(label, (key, descending))
+        self.sort_combo.currentIndexChanged.connect(self.render_project_list)
+        filter_layout.addWidget(self.sort_combo)
+        layout.addLayout(filter_layout)
+
         self.project_list_widget = QListWidget()
+        self.project_list_widget.setIconSize(QSize(96, 72))
         self.project_list_widget.itemDoubleClicked.connect(self.load_selected_project)
+        self.project_list_widget.currentItemChanged.connect(self.show_project_details)
         layout.addWidget(self.project_list_widget)
+        self.details_label = QLabel("")
+        layout.addWidget(self.details_label)
 
         self.populate_project_list()
 
@@ -94,10 +124,15 @@ class ProjectManagerDialog(QDialog):
         if hasattr(self.parent_window, 'project_io') and \
            hasattr(self.parent_window.project_io, 'copy_project_data'):
             try:
-                success = self.parent_window.project_io.copy_project_data(
-                    self.current_project_name_on_open,
-                    new_project_name
-                )
+                progress_dialog, on_progress = qt_progress_callback(self, f"Copying images to '{new_project_name}'...")
+                try:
+                    success = self.parent_window.project_io.copy_project_data(
+                        self.current_project_name_on_open,
+                        new_project_name,
+                        progress_callback=on_progress,
+                    )
+                finally:
+                    progress_dialog.close()
                 if success:
                     self.populate_project_list()
                     QMessageBox.information(self, "Project Saved", f"Project saved as '{new_project_name}' successfully.")
@@ -113,13 +148,69 @@ class ProjectManagerDialog(QDialog):
 
 
     def populate_project_list(self):
+        """Show the projects from the cached index, then re-validate it in the background."""
+        index = ProjectIndex()
+        if not index.load():
+            index.refresh() # First run: build the index once, synchronously
+        self.set_project_entries(index.entries())
+        self.index_refresher.base_dir = index.base_dir
+        return self.index_refresher.start()
+
+    def set_project_entries(self, entries):
+        self.project_entries = entries
+        self.render_project_list()
+        missing = [os.path.join(self.index_refresher.base_dir or utils.PROJECTS_BASE_DIR, entry["name"])
+                   for entry in entries if not entry.get("thumbnail") and "last_modified" in entry]
+        if missing:
+            thumbnail_generator().generate_missing(missing)
+
+    def _on_thumbnail_ready(self, _project_path):
+        if not isdeleted(self) and self.isVisible():
+            self.index_refresher.start()
+
+    def _on_finished(self):
+        self.index_refresher.shutdown()
+        try:
+            thumbnail_generator().thumbnail_ready.disconnect(self._on_thumbnail_ready)
+        except TypeError:
+            pass # Already disconnected
+
+    def _thumbnail_icon(self, entry):
+        if not entry.get("thumbnail"):
+            return QIcon()
+        key = (entry["name"], entry.get("thumbnail_mtime"))
+        if key not in self._thumbnail_icons:
+            base_dir = self.index_refresher.base_dir or utils.PROJECTS_BASE_DIR
+            self._thumbnail_icons[key] = QIcon(QPixmap(os.path.join(base_dir, entry["name"], entry["thumbnail"])))
+        return self._thumbnail_icons[key]
+
+    def render_project_list(self):
+        """Fill the list from the cached entries; filtering and sorting never touch the disk."""
+        current_item = self.project_list_widget.currentItem()
+        current_name = current_item.text() if current_item else None
+        key, descending = self.sort_combo.currentData()
         self.project_list_widget.clear()
-        if not os.path.exists(utils.PROJECTS_BASE_DIR):
-            return
-        for item_name in os.listdir(utils.PROJECTS_BASE_DIR):
-            item_path = os.path.join(utils.PROJECTS_BASE_DIR, item_name)
-            if os.path.isdir(item_path) and os.path.exists(os.path.join(item_path, utils.PROJECT_CONFIG_FILENAME)): # Check if it's a valid project dir
-                self.project_list_widget.addItem(QListWidgetItem(item_name))
+        for entry in filter_and_sort(self.project_entries, self.filter_edit.text(), key, descending):
+            list_item = QListWidgetItem(entry["name"])
+            list_item.setData(Qt.UserRole, entry)
+            list_item.setToolTip(self._describe_entry(entry))
+            list_item.setIcon(self._thumbnail_icon(entry))
+            self.project_list_widget.addItem(list_item)
+            if entry["name"] == current_name:
+                self.project_list_widget.setCurrentItem(list_item)
+
+    @staticmethod
+    def _describe_entry(entry):
+        if "last_modified" not in entry:
+            return ""
+        modified = (entry.get("last_modified") or "unknown").replace("T", " ")[:19]
+        size_mb = entry.get("image_bytes", 0) / (1024 * 1024)
+        return (f"{entry.get('info_areas', 0)} info areas, {entry.get('images', 0)} images ({size_mb:.1f} MB), "
+                f"{entry.get('connections', 0)} connections. Modified {modified}")
+
+    def show_project_details(self, current_item, _previous=None):
+        entry = current_item.data(Qt.UserRole) if current_item else None
+        self.details_label.setText(self._describe_entry(entry) if entry else "")
 
     def load_selected_project(self):
         current_item = self.project_list_widget.currentItem()
@@ -170,6 +261,7 @@ class ProjectManagerDialog(QDialog):
         project_path_to_delete = os.path.join(utils.PROJECTS_BASE_DIR, project_name)
         try:
             shutil.rmtree(project_path_to_delete)
+            ProjectIndex().remove_project(project_name)
             QMessageBox.information(self, "Project Deleted", f"Project '{project_name}' has been deleted.")
             self.populate_project_list() # Refresh the list
 
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, QRectF, QSize, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QImageReader, QPainter, QPen
+
+from . import config_format
+from . import utils
+from . import image_tiles
+from .project_index import ProjectIndex
+
+THUMBNAIL_MAX_SIZE = 256 # Longest side of a thumbnail, in pixels
+THUMBNAIL_DIGEST_KEY = "infocanvas-config" # PNG text key holding the digest of the rendered config
+SETTLE_MS = 2000 # Quiet time after the last save before a thumbnail is rendered
+
+
+def config_digest(config):
+    """Hash everything in a config that can change its thumbnail (all of it but the save time)."""
+    content = {key: value for key, value in config.items() if key != "last_modified"}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def thumbnail_path(project_path):
+    return os.path.join(project_path, utils.PROJECT_THUMBNAIL_FILENAME)
+
+
+def thumbnail_is_current(project_path, digest):
+    """Check the digest stored in an existing thumbnail; only the PNG header is read."""
+    path = thumbnail_path(project_path)
+    return os.path.isfile(path) and QImageReader(path).text(THUMBNAIL_DIGEST_KEY) == digest
+
+
+def _load_image(project_path, img_conf, width, height):
+    """Decode an image at about ``width`` x ``height``, or return a null QImage."""
+    image_path = os.path.join(project_path, utils.PROJECT_IMAGES_DIRNAME, img_conf.get('path', ''))
+    reader = QImageReader(image_path)
+    size = reader.size()
+    if size.isValid() and image_tiles.is_tiling_candidate(size.width(), size.height()):
+        # Never decode a huge image for a thumbnail; use its pyramid's preview tile if there is one
+        dzi_path = image_tiles.pyramid_path(project_path, img_conf['path'])
+        info = image_tiles.read_dzi(dzi_path)
+        if not info or (info["width"], info["height"]) != (size.width(), size.height()):
+            return QImage()
+        level = image_tiles.max_level(info["width"], info["height"])
+        while level > 0 and max(image_tiles.level_size(info["width"], info["height"], level)) > info["tile_size"]:
+            level -= 1
+        tile_path = os.path.join(image_tiles.tiles_folder(dzi_path), str(level), f"0_0.{info['format']}")
+        return QImage(tile_path)
+    reader.setScaledSize(QSize(max(1, width), max(1, height)))
+    return reader.read()
+
+
+def render_thumbnail(project_path, config, max_size=THUMBNAIL_MAX_SIZE):
+    """Paint a project's canvas from its config into a QImage at most ``max_size`` pixels across.
+
+    Only QImage is used, so this is safe off the GUI thread. Images and info
+    areas are drawn in z order; text is left out, being illegible at this size.
+    """
+    background = config.get('background', {})
+    canvas_w = max(1, background.get('width', 800))
+    canvas_h = max(1, background.get('height', 600))
+    scale = min(1.0, max_size / max(canvas_w, canvas_h))
+    image = QImage(max(1, round(canvas_w * scale)), max(1, round(canvas_h * scale)), QImage.Format_ARGB32_Premultiplied)
+    image.fill(QColor(background.get('color', '#DDDDDD')))
+
+    items = [(conf.get('z_index', utils.Z_VALUE_IMAGE), 0, conf) for conf in config.get('images', [])]
+    items += [(conf.get('z_index', utils.Z_VALUE_INFO_RECT), 1, conf) for conf in config.get('info_areas', [])]
+    items.sort(key=lambda item: (item[0], item[1]))
+
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+    painter.scale(scale, scale)
+    for _, is_area, conf in items:
+        if is_area:
+            _draw_info_area(painter, conf)
+        else:
+            _draw_image(painter, project_path, conf, scale)
+    painter.end()
+    return image
+
+
+def _draw_image(painter, project_path, img_conf, scale):
+    width = img_conf.get('original_width', 0) * img_conf.get('scale', 1.0)
+    height = img_conf.get('original_height', 0) * img_conf.get('scale', 1.0)
+    if width <= 0 or height <= 0:
+        return
+    rect = QRectF(img_conf.get('center_x', 0) - width / 2, img_conf.get('center_y', 0) - height / 2, width, height)
+    source = _load_image(project_path, img_conf, round(width * scale), round(height * scale)) if img_conf.get('path') else QImage()
+    if source.isNull():
+        painter.fillRect(rect, QColor(0, 0, 0, 40))
+    else:
+        painter.drawImage(rect, source)
+
+
+def _draw_info_area(painter, rect_conf):
+    width, height = rect_conf.get('width', 100), rect_conf.get('height', 50)
+    color = QColor(rect_conf.get('fill_color', '#007BFF'))
+    fill = QColor(color)
+    try:
+        alpha = float(rect_conf.get('fill_alpha', 0.1))
+    except (TypeError, ValueError):
+        alpha = 0.1
+    fill.setAlphaF(max(0.0, min(alpha / 255.0 if alpha > 1 else alpha, 1.0)))
+    painter.save()
+    painter.translate(rect_conf.get('center_x', 0), rect_conf.get('center_y', 0))
+    painter.rotate(rect_conf.get('angle', 0.0))
+    pen = QPen(color)
+    pen.setCosmetic(True)
+    painter.setPen(pen)
+    painter.setBrush(fill)
+    rect = QRectF(-width / 2, -height / 2, width, height)
+    if rect_conf.get('shape', 'rectangle') == 'ellipse':
+        painter.drawEllipse(rect)
+    else:
+        painter.drawRect(rect)
+    painter.restore()
+
+
+def write_thumbnail(project_path, config, max_size=THUMBNAIL_MAX_SIZE):
+    """Render and store ``thumbnail.png`` unless it already shows this config. Returns True if written."""
+    digest = config_digest(config)
+    if thumbnail_is_current(project_path, digest):
+        return False
+    image = render_thumbnail(project_path, config, max_size)
+    image.setText(THUMBNAIL_DIGEST_KEY, digest)
+    path = thumbnail_path(project_path)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if not image.save(tmp_path, "PNG"):
+            raise OSError(f"Could not write '{tmp_path}'")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True
+
+
+def _lower_thread_priority():
+    # On Linux a thread has its own nice value; elsewhere this would renice the whole app
+    if sys.platform.startswith('linux'):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+
+
+class ThumbnailGenerator(QObject):
+    """Renders project thumbnails on one low-priority worker thread.
+
+    :meth:`schedule` is called after every save; rendering starts once saves
+    have been quiet for ``settle_ms``, renders each project once for its latest
+    config, and is skipped when the stored thumbnail already matches.
+    """
+
+    thumbnail_ready = pyqtSignal(str) # project path
+
+    def __init__(self, settle_ms=SETTLE_MS):
+        super().__init__()
+        self.settle_ms = settle_ms
+        self._pending = {}
+        self._in_flight = set() # Projects generate_missing has submitted and not finished
+        self._lock = threading.Lock()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="project-thumbnail",
+                                            initializer=_lower_thread_priority)
+
+    def schedule(self, project_path, config):
+        """Queue ``config`` for rendering; it must not be modified afterwards."""
+        self._pending[project_path] = config
+        self._timer.start(self.settle_ms)
+
+    def flush(self):
+        """Start rendering everything queued now. Returns the futures."""
+        self._timer.stop()
+        pending, self._pending = self._pending, {}
+        return [self._executor.submit(self._generate, path, config) for path, config in pending.items()]
+
+    def generate_missing(self, project_paths):
+        """Render thumbnails for saved projects that have none, reading their configs on the worker.
+
+        Projects already queued or being rendered are skipped, so refreshing a
+        list of many projects after each finished thumbnail does not resubmit them.
+        """
+        futures = []
+        for path in project_paths:
+            key = os.path.normpath(path)
+            with self._lock:
+                if key in self._in_flight or path in self._pending or os.path.isfile(thumbnail_path(path)):
+                    continue
+                self._in_flight.add(key)
+            future = self._executor.submit(self._generate, path)
+            future.add_done_callback(lambda _, key=key: self._finished(key))
+            futures.append(future)
+        return futures
+
+    def _finished(self, key):
+        with self._lock:
+            self._in_flight.discard(key)
+
+    def _generate(self, project_path, config=None):
+        try:
+            if config is None:
+                config = config_format.load(os.path.join(project_path, utils.PROJECT_CONFIG_FILENAME))
+            written = write_thumbnail(project_path, config)
+        except Exception as e:
+            print(f"Warning: Could not create a thumbnail for '{project_path}': {e}")
+            return False
+        if written:
+            project_path = os.path.normpath(project_path)
+            ProjectIndex(os.path.dirname(project_path)).update_thumbnail(os.path.basename(project_path))
+            self.thumbnail_ready.emit(project_path)
+        return written
+
+    def shutdown(self):
+        """Render what is still queued, then stop the worker."""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+
+_generator = None
+
+
+def thumbnail_generator():
+    global _generator
+    if _generator is None:
+        _generator = ThumbnailGenerator()
+    return _generator
+
+
+def shutdown_thumbnail_generator():
+    """Finish queued thumbnails, e.g. when the application closes."""
+    global _generator
+    if _generator is not None:
+        _generator.shutdown()
+        _generator = None
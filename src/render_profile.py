@@ -0,0 +1,236 @@
+import time
+from collections import deque
+
+from PyQt5.QtCore import QObject, QSettings, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsView
+
+SETTINGS_ORGANIZATION = "InfoCanvas"
+SETTINGS_APPLICATION = "InfoCanvas"
+SETTINGS_GROUP = "rendering"
+
+VIEWPORT_UPDATE_MODES = {
+    "minimal": QGraphicsView.MinimalViewportUpdate,
+    "smart": QGraphicsView.SmartViewportUpdate,
+    "bounding_rect": QGraphicsView.BoundingRectViewportUpdate,
+    "full": QGraphicsView.FullViewportUpdate,
+}
+ITEM_CACHE_MODES = {
+    "none": QGraphicsItem.NoCache,
+    "device": QGraphicsItem.DeviceCoordinateCache,
+    "item": QGraphicsItem.ItemCoordinateCache,
+}
+INDEX_METHODS = ("bsp", "none")
+
+
+class RenderProfile:
+    """Rendering settings for the canvas view, persisted per user with QSettings.
+
+    The defaults reproduce Qt's own defaults, so an unconfigured install draws
+    exactly as before. ``bsp_depth`` 0 lets Qt choose the tree depth.
+    """
+
+    DEFAULTS = {
+        "viewport_update_mode": "minimal",
+        "index_method": "bsp",
+        "bsp_depth": 0,
+        "item_cache_mode": "none",
+        "dont_save_painter_state": False,
+        "dont_adjust_for_antialiasing": False,
+        "opengl_viewport": False,
+        "text_lod_threshold_px": 6,
+        "show_frame_stats": False,
+    }
+
+    def __init__(self, **values):
+        for key, default in self.DEFAULTS.items():
+            setattr(self, key, values.get(key, default))
+        self._validate()
+
+    def _validate(self):
+        if self.viewport_update_mode not in VIEWPORT_UPDATE_MODES:
+            self.viewport_update_mode = self.DEFAULTS["viewport_update_mode"]
+        if self.index_method not in INDEX_METHODS:
+            self.index_method = self.DEFAULTS["index_method"]
+        if self.item_cache_mode not in ITEM_CACHE_MODES:
+            self.item_cache_mode = self.DEFAULTS["item_cache_mode"]
+        self.bsp_depth = max(0, int(self.bsp_depth))
+        self.text_lod_threshold_px = max(0.0, float(self.text_lod_threshold_px))
+        for key in ("dont_save_painter_state", "dont_adjust_for_antialiasing", "opengl_viewport", "show_frame_stats"):
+            setattr(self, key, _to_bool(getattr(self, key)))
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.DEFAULTS}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**{key: value for key, value in (values or {}).items() if key in cls.DEFAULTS})
+
+    def __eq__(self, other):
+        return isinstance(other, RenderProfile) and self.to_dict() == other.to_dict()
+
+
+def _to_bool(value):
+    # QSettings' INI backend hands booleans back as strings
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def opengl_available():
+    try:
+        from PyQt5.QtWidgets import QOpenGLWidget # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _settings(settings):
+    return settings if settings is not None else QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
+
+
+def load_render_profile(settings=None):
+    """Read the user's rendering profile; missing or invalid entries fall back to defaults."""
+    settings = _settings(settings)
+    settings.beginGroup(SETTINGS_GROUP)
+    try:
+        values = {key: settings.value(key) for key in settings.childKeys()}
+    finally:
+        settings.endGroup()
+    return RenderProfile.from_dict({key: value for key, value in values.items() if value is not None})
+
+
+def save_render_profile(profile, settings=None):
+    settings = _settings(settings)
+    settings.beginGroup(SETTINGS_GROUP)
+    for key, value in profile.to_dict().items():
+        settings.setValue(key, value)
+    settings.endGroup()
+    settings.sync()
+
+
+def apply_item_cache_mode(item, profile):
+    """Set the profile's cache mode on an image or info area (and its text)."""
+    mode = ITEM_CACHE_MODES[profile.item_cache_mode] if profile else QGraphicsItem.NoCache
+    if getattr(item, 'tile_source', None) is not None:
+        mode = QGraphicsItem.NoCache # Tiled images already cache decoded tiles; a full-size cache defeats them
+    item.setCacheMode(mode)
+    text_item = getattr(item, '_text_item', None)
+    if text_item is not None:
+        text_item.setCacheMode(mode)
+
+
+def apply_render_profile(view, scene, profile):
+    """Apply ``profile`` to the canvas view, its scene and the items already on it.
+
+    Items added later pick the cache mode up from ``scene.render_profile``.
+    """
+    from .info_area_item import InfoAreaItem
+
+    view.setViewportUpdateMode(VIEWPORT_UPDATE_MODES[profile.viewport_update_mode])
+    view.setOptimizationFlag(QGraphicsView.DontSavePainterState, profile.dont_save_painter_state)
+    view.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, profile.dont_adjust_for_antialiasing)
+    _apply_viewport_widget(view, profile.opengl_viewport)
+
+    if profile.index_method == "none":
+        scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+    else:
+        scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        scene.setBspTreeDepth(profile.bsp_depth)
+
+    InfoAreaItem.text_lod_threshold_px = profile.text_lod_threshold_px
+    scene.render_profile = profile
+    for item in scene.items():
+        if hasattr(item, 'config_data'):
+            apply_item_cache_mode(item, profile)
+    scene.update()
+
+
+def _apply_viewport_widget(view, use_opengl):
+    from PyQt5.QtWidgets import QWidget
+    current_is_gl = type(view.viewport()).__name__ == "QOpenGLWidget"
+    if use_opengl == current_is_gl:
+        return
+    if use_opengl and opengl_available():
+        from PyQt5.QtWidgets import QOpenGLWidget
+        view.setViewport(QOpenGLWidget())
+    elif not use_opengl:
+        view.setViewport(QWidget())
+
+
+class FrameStats(QObject):
+    """Measures how long the canvas takes to paint and how often it repaints.
+
+    :class:`CanvasView` brackets every paint event with :meth:`paint_started`
+    and :meth:`paint_finished`. Statistics cover the last ``window`` frames.
+    """
+
+    stats_changed = pyqtSignal(float, float) # frames per second, average paint milliseconds
+
+    def __init__(self, window=60, parent=None):
+        super().__init__(parent)
+        self._paint_ms = deque(maxlen=window)
+        self._frame_times = deque(maxlen=window)
+        self._paint_started = None
+
+    def paint_started(self):
+        now = time.perf_counter()
+        self._frame_times.append(now)
+        self._paint_started = now
+
+    def paint_finished(self):
+        if self._paint_started is not None:
+            self._paint_ms.append((time.perf_counter() - self._paint_started) * 1000.0)
+            self._paint_started = None
+
+    def frames_per_second(self):
+        if len(self._frame_times) < 2:
+            return 0.0
+        elapsed = self._frame_times[-1] - self._frame_times[0]
+        return (len(self._frame_times) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def average_paint_ms(self):
+        return sum(self._paint_ms) / len(self._paint_ms) if self._paint_ms else 0.0
+
+    def reset(self):
+        self._paint_ms.clear()
+        self._frame_times.clear()
+
+    def publish(self):
+        self.stats_changed.emit(self.frames_per_second(), self.average_paint_ms())
+
+
+class CanvasView(QGraphicsView):
+    """The canvas QGraphicsView, timing each paint into :attr:`frame_stats`."""
+
+    def __init__(self, scene, parent=None):
+        super().__init__(scene, parent)
+        self.frame_stats = FrameStats(parent=self)
+
+    def paintEvent(self, event):
+        self.frame_stats.paint_started()
+        super().paintEvent(event)
+        self.frame_stats.paint_finished()
+
+
+class FrameStatsReadout(QObject):
+    """Shows a view's frame rate and paint time in a label, refreshed twice a second."""
+
+    def __init__(self, frame_stats, label, interval_ms=500, parent=None):
+        super().__init__(parent)
+        self.frame_stats = frame_stats
+        self.label = label
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(frame_stats.publish)
+        frame_stats.stats_changed.connect(self._show)
+
+    def set_enabled(self, enabled):
+        self.label.setVisible(enabled)
+        if enabled:
+            self.frame_stats.reset()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _show(self, fps, paint_ms):
+        self.label.setText(f"{fps:.1f} fps | {paint_ms:.2f} ms/frame")
@@ -0,0 +1,124 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QFormLayout, QComboBox, QSpinBox, QDoubleSpinBox,
+    QCheckBox, QDialogButtonBox, QLabel
+)
+from PyQt5.QtCore import pyqtSignal
+
+from .render_profile import RenderProfile, opengl_available
+
+
+class RenderProfileDialog(QDialog):
+    """Edits a :class:`RenderProfile`, emitting every change so it can be tried out live."""
+
+    profile_changed = pyqtSignal(object)
+
+    UPDATE_MODE_LABELS = [
+        ("minimal", "Minimal (Qt default)"),
+        ("smart", "Smart"),
+        ("bounding_rect", "Bounding rectangle"),
+        ("full", "Full viewport"),
+    ]
+    CACHE_MODE_LABELS = [
+        ("none", "No cache"),
+        ("device", "Device coordinate cache"),
+        ("item", "Item coordinate cache"),
+    ]
+
+    def __init__(self, profile, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Rendering Profile")
+        self.setMinimumWidth(380)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Changes apply immediately. Turn on the frame statistics "
+                                "to compare settings on this machine."))
+        form = QFormLayout()
+
+        self.update_mode_combo = QComboBox()
+        for key, label in self.UPDATE_MODE_LABELS:
+            self.update_mode_combo.addItem(label, key)
+        form.addRow("Viewport updates:", self.update_mode_combo)
+
+        self.index_combo = QComboBox()
+        self.index_combo.addItem("BSP tree", "bsp")
+        self.index_combo.addItem("No index", "none")
+        form.addRow("Item index:", self.index_combo)
+
+        self.bsp_depth_spin = QSpinBox()
+        self.bsp_depth_spin.setRange(0, 32)
+        self.bsp_depth_spin.setSpecialValueText("Automatic")
+        form.addRow("BSP tree depth:", self.bsp_depth_spin)
+
+        self.cache_mode_combo = QComboBox()
+        for key, label in self.CACHE_MODE_LABELS:
+            self.cache_mode_combo.addItem(label, key)
+        form.addRow("Image and text cache:", self.cache_mode_combo)
+
+        self.text_lod_spin = QDoubleSpinBox()
+        self.text_lod_spin.setRange(0, 48)
+        self.text_lod_spin.setSuffix(" px")
+        form.addRow("Simplify text below:", self.text_lod_spin)
+
+        self.dont_save_state_checkbox = QCheckBox("Don't save painter state")
+        form.addRow(self.dont_save_state_checkbox)
+        self.dont_adjust_aa_checkbox = QCheckBox("Don't adjust for antialiasing")
+        form.addRow(self.dont_adjust_aa_checkbox)
+        self.opengl_checkbox = QCheckBox("OpenGL viewport")
+        self.opengl_checkbox.setEnabled(opengl_available())
+        form.addRow(self.opengl_checkbox)
+        self.frame_stats_checkbox = QCheckBox("Show frame statistics")
+        form.addRow(self.frame_stats_checkbox)
+        layout.addLayout(form)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel | QDialogButtonBox.RestoreDefaults)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        buttons.button(QDialogButtonBox.RestoreDefaults).clicked.connect(lambda: self.set_profile(RenderProfile()))
+        layout.addWidget(buttons)
+
+        self._loading = False
+        self.set_profile(profile)
+
+        self.update_mode_combo.currentIndexChanged.connect(self._emit_profile)
+        self.index_combo.currentIndexChanged.connect(self._emit_profile)
+        self.bsp_depth_spin.valueChanged.connect(self._emit_profile)
+        self.cache_mode_combo.currentIndexChanged.connect(self._emit_profile)
+        self.text_lod_spin.valueChanged.connect(self._emit_profile)
+        for checkbox in (self.dont_save_state_checkbox, self.dont_adjust_aa_checkbox,
+                         self.opengl_checkbox, self.frame_stats_checkbox):
+            checkbox.toggled.connect(self._emit_profile)
+
+    def set_profile(self, profile):
+        self._loading = True
+        try:
+            self.update_mode_combo.setCurrentIndex(self.update_mode_combo.findData(profile.viewport_update_mode))
+            self.index_combo.setCurrentIndex(self.index_combo.findData(profile.index_method))
+            self.bsp_depth_spin.setValue(profile.bsp_depth)
+            self.cache_mode_combo.setCurrentIndex(self.cache_mode_combo.findData(profile.item_cache_mode))
+            self.text_lod_spin.setValue(profile.text_lod_threshold_px)
+            self.dont_save_state_checkbox.setChecked(profile.dont_save_painter_state)
+            self.dont_adjust_aa_checkbox.setChecked(profile.dont_adjust_for_antialiasing)
+            self.opengl_checkbox.setChecked(profile.opengl_viewport and opengl_available())
+            self.frame_stats_checkbox.setChecked(profile.show_frame_stats)
+        finally:
+            self._loading = False
+        self._emit_profile()
+
+    def profile(self):
+        return RenderProfile(
+            viewport_update_mode=self.update_mode_combo.currentData(),
+            index_method=self.index_combo.currentData(),
+            bsp_depth=self.bsp_depth_spin.value(),
+            item_cache_mode=self.cache_mode_combo.currentData(),
+            text_lod_threshold_px=self.text_lod_spin.value(),
+            dont_save_painter_state=self.dont_save_state_checkbox.isChecked(),
+            dont_adjust_for_antialiasing=self.dont_adjust_aa_checkbox.isChecked(),
+            opengl_viewport=self.opengl_checkbox.isChecked(),
+            show_frame_stats=self.frame_stats_checkbox.isChecked(),
+        )
+
+    def _emit_profile(self, *args):
+        if self._loading:
+            return
+        self.bsp_depth_spin.setEnabled(self.index_combo.currentData() == "bsp")
+        self.profile_changed.emit(self.profile())
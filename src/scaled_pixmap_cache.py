@@ -0,0 +1,151 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+from . import instrumentation
+
+# Pre-scaled copies larger than this are not worth caching; they are painted transformed
+MAX_SCALED_PIXELS = 16_000_000
+
+
+@instrumentation.timed("image_scale")
+def scale_image(source, width, height):
+    """Return ``source`` (a file path or QImage) smoothly resampled to ``width`` x ``height``.
+
+    QImage is safe to use off the GUI thread, unlike QPixmap.
+    """
+    image = QImage(source) if isinstance(source, str) else source
+    if image.isNull():
+        return QImage()
+    return image.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+
+
+class ScaledPixmapCache(QObject):
+    """Resamples images to the size they are displayed at, off the GUI thread.
+
+    Entries are keyed by ``(pixmap cache key, width, height)`` in device pixels
+    and evicted least recently used once ``max_bytes`` is exceeded. Items ask for
+    a size with :meth:`get`, passing a ``waiter`` that is called when a copy of
+    their pixmap is ready, so only the items waiting on it repaint.
+    """
+
+    pixmap_ready = pyqtSignal(object) # pixmap cache key
+    _image_scaled = pyqtSignal(object, QImage)
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, max_workers=2):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self._pixmaps = OrderedDict()
+        self._bytes = 0
+        self._pending = set()
+        self._waiters = {} # pixmap cache key -> callables waiting for a copy of that pixmap
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scaled-pixmap")
+        # Queued to the GUI thread, where the QImage becomes a QPixmap
+        self._image_scaled.connect(self._store, Qt.QueuedConnection)
+
+    def get(self, pixmap, width, height, source_path=None, waiter=None):
+        """Return the cached copy of ``pixmap`` at ``width`` x ``height``, or None.
+
+        On a miss the copy is scheduled, decoded from ``source_path`` when given
+        so the GUI thread does not have to convert the pixmap to an image, and
+        ``waiter`` is called without arguments once it is ready.
+        """
+        key = (pixmap.cacheKey(), width, height)
+        scaled = self._pixmaps.get(key)
+        if scaled is not None:
+            self._pixmaps.move_to_end(key)
+            return scaled
+        if width * height <= MAX_SCALED_PIXELS:
+            if waiter is not None:
+                waiters = self._waiters.setdefault(key[0], [])
+                if waiter not in waiters:
+                    waiters.append(waiter)
+            self._schedule(key, pixmap, source_path)
+        return None
+
+    def _schedule(self, key, pixmap, source_path):
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        # Converting the pixmap copies it on the GUI thread, so only done when a job is submitted
+        source = source_path or pixmap.toImage()
+        try:
+            self._executor.submit(self._scale, key, source)
+        except RuntimeError: # Shut down
+            with self._lock:
+                self._pending.discard(key)
+
+    def _scale(self, key, source):
+        try:
+            image = scale_image(source, key[1], key[2])
+        except Exception as e:
+            print(f"Error scaling image to {key[1]}x{key[2]}: {e}")
+            image = QImage()
+        self._image_scaled.emit(key, image)
+
+    def _store(self, key, image):
+        with self._lock:
+            self._pending.discard(key)
+        if image.isNull():
+            self._waiters.pop(key[0], None)
+            return
+        pixmap = QPixmap.fromImage(image)
+        self._pixmaps[key] = pixmap
+        self._bytes += self._cost(pixmap)
+        while self._bytes > self.max_bytes and len(self._pixmaps) > 1:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self._bytes -= self._cost(evicted)
+        for waiter in self._waiters.pop(key[0], ()):
+            waiter()
+        self.pixmap_ready.emit(key[0])
+
+    def discard(self, pixmap_key):
+        """Drop every cached size of one pixmap, e.g. when its item is removed or shows another pixmap."""
+        self._waiters.pop(pixmap_key, None)
+        for key in [key for key in self._pixmaps if key[0] == pixmap_key]:
+            self._bytes -= self._cost(self._pixmaps.pop(key))
+
+    def clear(self):
+        self._pixmaps.clear()
+        self._waiters.clear()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+    @property
+    def total_bytes(self):
+        return self._bytes
+
+    @staticmethod
+    def _cost(pixmap):
+        return pixmap.width() * pixmap.height() * 4
+
+    def shutdown(self):
+        try:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        except TypeError: # Python 3.8 has no cancel_futures; queued jobs then run before the workers exit
+            self._executor.shutdown(wait=False)
+
+
+_cache = None
+
+
+def scaled_pixmap_cache():
+    global _cache
+    if _cache is None:
+        _cache = ScaledPixmapCache()
+    return _cache
+
+
+def shutdown_scaled_pixmap_cache():
+    """Stop scaling work, e.g. when the application closes."""
+    global _cache
+    if _cache is not None:
+        _cache.shutdown()
+        _cache = None
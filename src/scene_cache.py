@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+
+from . import image_tiles
+from . import utils
+
+CACHE_VERSION = 1
+SCENE_FILENAME = "scene.json"
+PROXIES_DIRNAME = "proxies"
+PROXY_MAX_SIZE = 1024 # Longest side of an image proxy; smaller images are quick enough to decode in full
+
+
+def cache_folder(project_path):
+    return os.path.join(project_path, utils.PROJECT_SCENE_CACHE_DIRNAME)
+
+
+def file_signature(path):
+    """``[mtime_ns, size]`` of a file, or None when it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def needs_proxy(width, height):
+    """Tiled images already open from their pyramid's preview, so only mid-sized images get a proxy."""
+    return max(width, height) > PROXY_MAX_SIZE and not image_tiles.is_tiling_candidate(width, height)
+
+
+def proxy_filename(image_path):
+    ext = ".jpg" if os.path.splitext(image_path)[1].lower() in ('.jpg', '.jpeg') else ".png"
+    return hashlib.sha1(image_path.encode('utf-8')).hexdigest()[:20] + ext
+
+
+def area_geometry(area_conf):
+    """The fields of an info area that decide where a connection line meets it."""
+    return [area_conf.get(key) for key in ('center_x', 'center_y', 'width', 'height', 'angle', 'shape')]
+
+
+def write_proxy(src_path, proxy_path):
+    """Decode ``src_path`` at most :data:`PROXY_MAX_SIZE` across and save it. Safe off the GUI thread."""
+    reader = QImageReader(src_path)
+    size = reader.size()
+    if not size.isValid():
+        return False
+    size.scale(PROXY_MAX_SIZE, PROXY_MAX_SIZE, Qt.KeepAspectRatio)
+    reader.setScaledSize(size)
+    image = reader.read()
+    if image.isNull():
+        return False
+    tmp_path = f"{proxy_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    image_format = "JPG" if proxy_path.endswith(".jpg") else "PNG"
+    try:
+        if not image.save(tmp_path, image_format, 85):
+            return False
+        os.replace(tmp_path, proxy_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True
+
+
+class SceneCache:
+    """What a project's canvas needs for its first frame, kept between sessions.
+
+    Stored in ``<project>/.scene_cache/scene.json`` with the image proxies
+    beside it. Each entry records what it was computed from, so an entry that
+    no longer matches the project is simply not used:
+
+    * ``images``: per image file, its ``[mtime_ns, size]``, full size and proxy file;
+    * ``text``: per info area, the boxes of its laid-out text lines and the
+      :meth:`InfoAreaItem.text_layout_key` they were laid out for;
+    * ``connections``: per connection, its end points and the geometry of the
+      two areas they were computed from.
+    """
+
+    def __init__(self, project_path, entries=None):
+        self.project_path = project_path
+        self.entries = entries or {"images": {}, "text": {}, "connections": {}}
+
+    @classmethod
+    def load(cls, project_path):
+        path = os.path.join(cache_folder(project_path), SCENE_FILENAME)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(project_path)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring the unreadable scene cache '{path}': {e}")
+            return cls(project_path)
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return cls(project_path)
+        return cls(project_path, {key: data.get(key) or {} for key in ("images", "text", "connections")})
+
+    def image_proxy(self, image_full_path, img_conf):
+        """The proxy of an image as a QPixmap, or None if there is none for this version of the file."""
+        entry = self.entries["images"].get(img_conf.get('path'))
+        if not entry or entry.get("signature") != file_signature(image_full_path):
+            return None
+        if [entry.get("width"), entry.get("height")] != [img_conf.get('original_width'), img_conf.get('original_height')]:
+            return None
+        pixmap = QPixmap(os.path.join(cache_folder(self.project_path), PROXIES_DIRNAME, entry["proxy"]))
+        return None if pixmap.isNull() else pixmap
+
+    def apply_text_layout(self, area_item):
+        """Give an info area its cached line boxes; the area ignores them if its text or size changed."""
+        entry = self.entries["text"].get(area_item.config_data.get('id'))
+        if entry:
+            area_item.set_cached_text_layout(entry["key"], entry["lines"])
+
+    def connection_points(self, line_conf, item_map):
+        """Cached ``(x1, y1, x2, y2)`` of a connection, or None if either area has moved or changed shape."""
+        entry = self.entries["connections"].get(line_conf.get('id'))
+        source = item_map.get(line_conf.get('source'))
+        destination = item_map.get(line_conf.get('destination'))
+        if not entry or source is None or destination is None:
+            return None
+        if entry["ends"] != [area_geometry(source.config_data), area_geometry(destination.config_data)]:
+            return None
+        return tuple(entry["points"])
+
+    def capture(self, item_map):
+        """Refresh the entries from the items on the canvas.
+
+        Areas whose text has not been laid out this session keep their
+        previous entry. Returns ``(changed, proxies)``, where ``proxies`` lists
+        the ``(image path, proxy path)`` pairs still to be written.
+        """
+        from .connection_line_item import ConnectionLineItem
+        from .draggable_image_item import DraggableImageItem
+        from .info_area_item import InfoAreaItem
+
+        images_folder = os.path.join(self.project_path, utils.PROJECT_IMAGES_DIRNAME)
+        proxies_folder = os.path.join(cache_folder(self.project_path), PROXIES_DIRNAME)
+        entries = {"images": {}, "text": {}, "connections": {}}
+        proxies = []
+        for item_id, item in item_map.items():
+            conf = item.config_data
+            if isinstance(item, DraggableImageItem):
+                path = conf.get('path')
+                width, height = conf.get('original_width') or 0, conf.get('original_height') or 0
+                if not path or item.tile_source is not None or not needs_proxy(width, height):
+                    continue
+                signature = file_signature(os.path.join(images_folder, path))
+                if signature is None:
+                    continue
+                entry = {"signature": signature, "width": width, "height": height, "proxy": proxy_filename(path)}
+                proxy_path = os.path.join(proxies_folder, entry["proxy"])
+                if self.entries["images"].get(path) != entry or not os.path.isfile(proxy_path):
+                    proxies.append((os.path.join(images_folder, path), proxy_path))
+                entries["images"][path] = entry
+            elif isinstance(item, InfoAreaItem):
+                lines = item.text_line_rects()
+                if lines is not None:
+                    entries["text"][item_id] = {"key": item.text_layout_key(), "lines": lines}
+                elif item_id in self.entries["text"]:
+                    entries["text"][item_id] = self.entries["text"][item_id]
+            elif isinstance(item, ConnectionLineItem):
+                source = item_map.get(conf.get('source'))
+                destination = item_map.get(conf.get('destination'))
+                if isinstance(source, InfoAreaItem) and isinstance(destination, InfoAreaItem):
+                    entries["connections"][item_id] = {
+                        "ends": [area_geometry(source.config_data), area_geometry(destination.config_data)],
+                        "points": list(item.end_points()),
+                    }
+        changed = bool(proxies) or entries != self.entries
+        self.entries = entries
+        return changed, proxies
+
+    def to_json(self):
+        return {"version": CACHE_VERSION, **self.entries}
+
+
+def _write(project_path, data, proxies):
+    folder = cache_folder(project_path)
+    proxies_folder = os.path.join(folder, PROXIES_DIRNAME)
+    try:
+        os.makedirs(proxies_folder, exist_ok=True)
+        for src_path, proxy_path in proxies:
+            if not write_proxy(src_path, proxy_path):
+                data["images"] = {path: entry for path, entry in data["images"].items()
+                                  if entry["proxy"] != os.path.basename(proxy_path)}
+        in_use = {entry["proxy"] for entry in data["images"].values()}
+        for name in os.listdir(proxies_folder):
+            if name not in in_use and not name.endswith(".tmp"):
+                os.remove(os.path.join(proxies_folder, name))
+        path = os.path.join(folder, SCENE_FILENAME)
+        with open(path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"Warning: Could not write the scene cache of '{project_path}': {e}")
+        return False
+    return True
+
+
+class SceneCacheWriter:
+    """Writes scene caches, proxies first, on one worker thread so closing a project does not wait."""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scene-cache")
+
+    def schedule(self, cache, proxies):
+        return self._executor.submit(_write, cache.project_path, cache.to_json(), proxies)
+
+    def shutdown(self):
+        """Finish the writes already queued, then stop the worker."""
+        self._executor.shutdown(wait=True)
+
+
+class FullImageLoader(QObject):
+    """Decodes full-size images off the GUI thread for items first painted from a proxy.
+
+    Each path is decoded once however many items ask for it, and only the
+    callbacks registered for that path are called with the result.
+    """
+
+    image_loaded = pyqtSignal(str, QImage) # image path, decoded image (null if unreadable)
+    _decoded = pyqtSignal(str, QImage)
+
+    def __init__(self, max_workers=2):
+        super().__init__()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="full-image")
+        self._waiters = {} # image path -> callables waiting for its decoded image
+        # Queued to the GUI thread, where the items turn the image into a QPixmap
+        self._decoded.connect(self._dispatch, Qt.QueuedConnection)
+
+    def load(self, path, callback=None):
+        """Decode ``path`` in the background and call ``callback(image)`` on the GUI thread."""
+        waiters = self._waiters.get(path)
+        if waiters is not None: # Already being decoded
+            if callback is not None:
+                waiters.append(callback)
+            return
+        self._waiters[path] = [callback] if callback is not None else []
+        try:
+            self._executor.submit(self._decode, path)
+        except RuntimeError: # Shut down
+            del self._waiters[path]
+
+    def _decode(self, path):
+        self._decoded.emit(path, QImage(path))
+
+    def _dispatch(self, path, image):
+        for callback in self._waiters.pop(path, ()):
+            callback(image)
+        self.image_loaded.emit(path, image)
+
+    def shutdown(self):
+        try:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        except TypeError: # Python 3.8 has no cancel_futures; queued jobs then run before the workers exit
+            self._executor.shutdown(wait=False)
+
+
+def save(project_path, item_map, cache=None):
+    """Capture the canvas into the project's scene cache and write it in the background.
+
+    ``cache`` is the :class:`SceneCache` loaded for the project, if any, so
+    entries for text not laid out this session are kept. Returns the write's
+    future, or None when nothing changed.
+    """
+    if cache is None or cache.project_path != project_path:
+        cache = SceneCache.load(project_path)
+    changed, proxies = cache.capture(item_map)
+    if not changed:
+        return None
+    return scene_cache_writer().schedule(cache, proxies)
+
+
+_writer = None
+_loader = None
+
+
+def scene_cache_writer():
+    global _writer
+    if _writer is None:
+        _writer = SceneCacheWriter()
+    return _writer
+
+
+def shutdown_scene_cache_writer():
+    """Finish pending scene cache writes, e.g. when the application closes."""
+    global _writer
+    if _writer is not None:
+        _writer.shutdown()
+        _writer = None
+
+
+def image_loader():
+    global _loader
+    if _loader is None:
+        _loader = FullImageLoader()
+    return _loader
+
+
+def shutdown_image_loader():
+    global _loader
+    if _loader is not None:
+        _loader.shutdown()
+        _loader = None
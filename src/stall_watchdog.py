@@ -0,0 +1,170 @@
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from . import instrumentation
+from . import utils
+
+ENV_VAR = "INFOCANVAS_STALL_WATCHDOG" # Threshold in ms, or 1 for the default
+DEFAULT_THRESHOLD_MS = 100
+STACK_DEPTH = 30 # Innermost frames kept per stall
+
+
+def threshold_from_environment():
+    """Return the threshold in ms requested by :data:`ENV_VAR`, or None when the watchdog is off."""
+    value = os.environ.get(ENV_VAR, "").strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return None
+    if value in ("1", "true", "yes", "on"):
+        return DEFAULT_THRESHOLD_MS
+    try:
+        return max(10, int(value))
+    except ValueError:
+        print(f"Warning: Ignoring {ENV_VAR}={value!r}; expected a threshold in milliseconds.")
+        return None
+
+
+def _call_site(stack):
+    """Name the innermost frame of InfoCanvas code (or the innermost frame at all)."""
+    own_code = [frame for frame in stack
+                if frame.filename.startswith(utils.BASE_SCRIPT_DIR) and frame.filename != __file__]
+    frame = (own_code or stack or [None])[-1]
+    if frame is None:
+        return "<unknown>"
+    filename = os.path.relpath(frame.filename, utils.BASE_SCRIPT_DIR) if own_code else frame.filename
+    return f"{filename.replace(os.sep, '/')}:{frame.lineno} in {frame.name}"
+
+
+class StallWatchdog(QObject):
+    """Detects when the GUI thread stops processing events and records where it was.
+
+    A timer on the GUI thread beats every ``ping_ms``; a watchdog thread checks
+    the beats and, once one is ``threshold_ms`` late, captures the GUI thread's
+    Python stack with ``sys._current_frames()`` together with the instrumented
+    operations in progress. Stalls are aggregated per call site for
+    :meth:`report`. Starting the watchdog turns instrumentation on so that
+    stalls can be attributed to operations.
+    """
+
+    stall_detected = pyqtSignal(dict) # Emitted from the watchdog thread when a stall ends
+
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, ping_ms=None, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.ping_interval = (ping_ms or max(10, threshold_ms // 4)) / 1000
+        self.session_started = datetime.datetime.now()
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._beat)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._sites = {}
+
+    def start(self):
+        if self.is_running():
+            return
+        instrumentation.enable()
+        self._stop.clear()
+        self._last_beat = time.monotonic()
+        self._timer.start(round(self.ping_interval * 1000))
+        self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._timer.stop()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _beat(self):
+        self._last_beat = time.monotonic()
+
+    def _watch(self):
+        stalled = None # (last beat before the stall, stack, operations)
+        while not self._stop.wait(self.ping_interval / 2):
+            last_beat = self._last_beat
+            if stalled is None:
+                if time.monotonic() - last_beat - self.ping_interval > self.threshold:
+                    stalled = (last_beat,) + self._capture()
+            elif last_beat != stalled[0]:
+                self._record(stalled[1], stalled[2], last_beat - stalled[0] - self.ping_interval)
+                stalled = None
+
+    def _capture(self):
+        frame = sys._current_frames().get(self._gui_thread_id)
+        stack = traceback.extract_stack(frame, limit=STACK_DEPTH) if frame is not None else []
+        active = instrumentation.recorder()
+        operations = active.current_operations(self._gui_thread_id) if active else []
+        return stack, operations
+
+    def _record(self, stack, operations, duration):
+        site = _call_site(stack)
+        operation = operations[-1] if operations else None
+        duration_ms = round(duration * 1000, 1)
+        with self._lock:
+            entry = self._sites.setdefault(site, {
+                "site": site, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "operations": Counter(),
+                "stack": [f"{frame.filename}:{frame.lineno} in {frame.name}" for frame in stack],
+            })
+            entry["count"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + duration_ms, 1)
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["operations"][operation or "<none>"] += 1
+        print(f"Warning: GUI stalled for {duration_ms:.0f} ms"
+              f"{f' in {operation}' if operation else ''} at {site}")
+        self.stall_detected.emit({"site": site, "operation": operation, "duration_ms": duration_ms})
+
+    def report(self):
+        """Return the stalls of this session, grouped by call site, worst total first."""
+        with self._lock:
+            sites = [dict(entry, operations=dict(entry["operations"])) for entry in self._sites.values()]
+        sites.sort(key=lambda entry: entry["total_ms"], reverse=True)
+        return {
+            "session_started": self.session_started.isoformat(timespec="seconds"),
+            "threshold_ms": round(self.threshold * 1000),
+            "stalls": sum(entry["count"] for entry in sites),
+            "total_stall_ms": round(sum(entry["total_ms"] for entry in sites), 1),
+            "sites": sites,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._sites.clear()
+
+    def save_report(self, project_path):
+        """Write the report to ``<project>/.diagnostics/`` if there were stalls. Returns its path.
+
+        The file is named after the time it is saved, so each project visit of
+        a session, and each session, keeps its own report.
+        """
+        report = self.report()
+        if not report["stalls"] or not project_path:
+            return None
+        saved = datetime.datetime.now()
+        report["saved"] = saved.isoformat(timespec="seconds")
+        folder = os.path.join(project_path, utils.DIAGNOSTICS_DIRNAME)
+        stem = os.path.join(folder, f"stalls_{saved.strftime('%Y%m%d_%H%M%S')}")
+        path, suffix = stem + ".json", 1
+        while os.path.exists(path): # Saved twice within a second
+            path, suffix = f"{stem}_{suffix}.json", suffix + 1
+        try:
+            os.makedirs(folder, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            print(f"Warning: Could not save the stall report to '{path}': {e}")
+            return None
+        return path
@@ -0,0 +1,115 @@
+import contextlib
+import os
+import sys
+import time
+
+_started = time.perf_counter() # Import this module first so the timeline covers the other imports
+
+ENV_VAR = "INFOCANVAS_STARTUP_TRACE"
+FIRST_FRAME_TARGET_MS = 1000
+
+
+class StartupTrace:
+    """Timeline of the startup phases, from the first import to the first painted frame.
+
+    Each mark records the time since the trace started and how many modules
+    had been imported by then. Time spent waiting on the user (the project
+    manager dialog) is left out of the timeline.
+    """
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.phases = [] # (name, ms since start, modules loaded)
+        self.waits = [] # (name, ms waited)
+        self.enabled = False
+        self._first_frame_filter = None
+
+    def _elapsed_ms(self):
+        waited = sum(ms for _, ms in self.waits)
+        return (time.perf_counter() - self.started) * 1000 - waited
+
+    def mark(self, phase):
+        self.phases.append((phase, self._elapsed_ms(), len(sys.modules)))
+
+    @contextlib.contextmanager
+    def waiting(self, name):
+        """Leave the time spent inside the block, e.g. in a modal dialog, out of the timeline."""
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.waits.append((name, (time.perf_counter() - began) * 1000))
+
+    def phase_ms(self, phase):
+        """Milliseconds from the start to the first mark of ``phase``, or None."""
+        for name, ms, _ in self.phases:
+            if name == phase:
+                return ms
+        return None
+
+    def format_timeline(self):
+        lines = ["Startup timeline (ms since the first import):"]
+        previous_ms, previous_modules = 0.0, 0
+        for name, ms, modules in self.phases:
+            lines.append(f"  {name:<16} {ms:8.1f}  (+{ms - previous_ms:7.1f})  +{modules - previous_modules} modules")
+            previous_ms, previous_modules = ms, modules
+        for name, ms in self.waits:
+            lines.append(f"  (not counted: {ms:.0f} ms waiting in {name})")
+        first_frame = self.phase_ms("first_frame")
+        if first_frame is not None:
+            verdict = "within" if first_frame <= FIRST_FRAME_TARGET_MS else "over"
+            lines.append(f"Time to first frame: {first_frame:.0f} ms ({verdict} the {FIRST_FRAME_TARGET_MS} ms target)")
+        return "\n".join(lines)
+
+    def watch_first_frame(self, widget):
+        """Mark ``first_frame`` once ``widget`` has finished its first paint, then print if enabled."""
+        from PyQt5.QtCore import QEvent, QObject, QTimer
+
+        trace = self
+
+        class FirstPaintFilter(QObject):
+            def eventFilter(self, watched, event):
+                if event.type() == QEvent.Paint:
+                    watched.removeEventFilter(self)
+                    QTimer.singleShot(0, trace._first_frame_painted) # Runs once this paint is done
+                return False
+
+        self._first_frame_filter = FirstPaintFilter(widget)
+        widget.installEventFilter(self._first_frame_filter)
+
+    def _first_frame_painted(self):
+        self._first_frame_filter = None
+        self.mark("first_frame")
+        if self.enabled:
+            print(self.format_timeline())
+
+
+_trace = StartupTrace(_started)
+
+
+def trace():
+    """The startup trace of this process. Phases are always marked; printing is opt-in."""
+    return _trace
+
+
+def mark(phase):
+    _trace.mark(phase)
+
+
+def waiting(name):
+    return _trace.waiting(name)
+
+
+def enable():
+    _trace.enabled = True
+
+
+def enable_from_environment():
+    if os.environ.get(ENV_VAR, "").strip() not in ("", "0"):
+        enable()
+    return _trace.enabled
+
+
+def add_arguments(parser):
+    parser.add_argument("--startup-trace", action="store_true",
+                        help="Print a timeline of the startup phases once the first frame is painted.")
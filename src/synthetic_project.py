@@ -0,0 +1,169 @@
+import math
+import os
+import random
+import sys
+
+from . import config_format
+from . import utils
+
+SYNTHETIC_TIMESTAMP = "2000-01-01T00:00:00Z" # Fixed, so generated configs are byte-for-byte reproducible
+_WORDS = (
+    "canvas", "area", "image", "note", "detail", "region", "label", "marker", "sample", "figure",
+    "lorem", "ipsum", "dolor", "sit", "amet", "overview", "section", "layer", "legend", "source",
+)
+_COLORS = ("#007BFF", "#28A745", "#DC3545", "#FFC107", "#17A2B8", "#6F42C1", "#FD7E14", "#20C997")
+
+
+def _text(rng, length):
+    """Words up to ``length`` characters, with an occasional line break."""
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    text = " ".join(words)[:length]
+    return text.replace(" ", "\n", 1) if length > 60 else text
+
+
+def generate_config(info_areas=100, images=10, connections=None, styles=5, text_length=80, seed=0,
+                    canvas_width=None, canvas_height=None, project_name="synthetic"):
+    """Build a project config in the ``config.json`` schema with the given item counts.
+
+    The same arguments always give the same config. ``connections`` defaults to
+    half the number of info areas; the canvas grows with the item count unless
+    its size is given.
+
+    Returns:
+        dict: The config. Its ``images`` refer to files named by :func:`write_project`.
+    """
+    rng = random.Random(seed)
+    if connections is None:
+        connections = info_areas // 2
+    side = math.ceil(math.sqrt(max(info_areas + images, 1)))
+    canvas_width = canvas_width or max(800, side * 220)
+    canvas_height = canvas_height or max(600, side * 120)
+
+    config = utils.get_default_config()
+    config["last_modified"] = SYNTHETIC_TIMESTAMP
+    config["project_name"] = project_name
+    config["background"] = {"width": canvas_width, "height": canvas_height, "color": "#DDDDDD"}
+    config["info_area_styles"] = [
+        {
+            "name": f"Style {index + 1}",
+            "font_color": rng.choice(("#000000", "#FFFFFF", "#333333")),
+            "font_size": f"{rng.choice((12, 14, 16, 20))}px",
+            "horizontal_alignment": rng.choice(("left", "center", "right")),
+            "vertical_alignment": rng.choice(("top", "middle", "bottom")),
+            "padding": "5px",
+            "fill_color": rng.choice(_COLORS),
+            "fill_alpha": round(rng.uniform(0.05, 0.5), 2),
+        }
+        for index in range(styles)
+    ]
+    config["line_styles"] = [
+        {"name": f"Line {index + 1}", "line_color": rng.choice(_COLORS), "thickness": rng.choice((1, 2, 3)), "opacity": 1.0}
+        for index in range(max(1, styles // 2) if styles else 0)
+    ]
+
+    z_index = 0
+    for index in range(images):
+        width, height = rng.choice(((64, 64), (128, 96), (96, 128), (256, 192)))
+        config["images"].append({
+            "id": f"img_{index}",
+            "path": f"synthetic_{index:05d}.png",
+            "center_x": round(rng.uniform(0, canvas_width), 1),
+            "center_y": round(rng.uniform(0, canvas_height), 1),
+            "scale": round(rng.uniform(0.5, 1.5), 2),
+            "original_width": width,
+            "original_height": height,
+            "z_index": z_index,
+        })
+        z_index += 1
+
+    for index in range(info_areas):
+        area = {
+            "id": f"rect_{index}",
+            "center_x": round(rng.uniform(0, canvas_width), 1),
+            "center_y": round(rng.uniform(0, canvas_height), 1),
+            "width": rng.randint(80, 240),
+            "height": rng.randint(30, 120),
+            "text": _text(rng, text_length),
+            "show_on_hover": rng.random() < 0.7,
+            "shape": "ellipse" if rng.random() < 0.2 else "rectangle",
+            "z_index": z_index,
+            "fill_color": rng.choice(_COLORS),
+            "fill_alpha": 0.1,
+        }
+        z_index += 1
+        if config["info_area_styles"] and rng.random() < 0.5:
+            style = rng.choice(config["info_area_styles"])
+            area.update({key: value for key, value in style.items() if key != "name"})
+            area["style_ref"] = style["name"]
+        config["info_areas"].append(area)
+
+    seen = set()
+    for index in range(connections if info_areas > 1 else 0):
+        source, destination = rng.sample(range(info_areas), 2)
+        if (source, destination) in seen or (destination, source) in seen:
+            continue
+        seen.add((source, destination))
+        line = {
+            "id": f"conn_{index}",
+            "source": f"rect_{source}",
+            "destination": f"rect_{destination}",
+            "thickness": 2,
+            "z_index": z_index,
+            "line_color": "#00ffff",
+            "opacity": 1.0,
+        }
+        z_index += 1
+        if config["line_styles"] and rng.random() < 0.3:
+            style = rng.choice(config["line_styles"])
+            line.update({key: value for key, value in style.items() if key != "name"})
+            line["line_style_ref"] = style["name"]
+        config["connections"].append(line)
+    return config
+
+
+def write_project(project_path, config):
+    """Write ``config`` and a small solid-colour PNG for each of its images into ``project_path``."""
+    from PyQt5.QtGui import QColor, QImage
+
+    images_folder = os.path.join(project_path, utils.PROJECT_IMAGES_DIRNAME)
+    os.makedirs(images_folder, exist_ok=True)
+    for index, img_conf in enumerate(config.get("images", [])):
+        image_path = os.path.join(images_folder, img_conf["path"])
+        if os.path.exists(image_path):
+            continue
+        image = QImage(img_conf["original_width"], img_conf["original_height"], QImage.Format_RGB32)
+        image.fill(QColor(_COLORS[index % len(_COLORS)]))
+        image.save(image_path, "PNG")
+    # In the format new projects get, so INFOCANVAS_CONFIG_FORMAT also applies to benchmarks
+    config_format.dump(config, os.path.join(project_path, utils.PROJECT_CONFIG_FILENAME), config_format.default_format())
+    return project_path
+
+
+def add_arguments(parser):
+    parser.add_argument("name", help="Name of the project folder to create.")
+    parser.add_argument("--areas", type=int, default=1000, help="Number of info areas.")
+    parser.add_argument("--images", type=int, default=20, help="Number of images.")
+    parser.add_argument("--connections", type=int, default=None, help="Number of connections (default: half the areas).")
+    parser.add_argument("--styles", type=int, default=5, help="Number of info area styles.")
+    parser.add_argument("--text-length", type=int, default=80, help="Characters of text per info area.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed; the same arguments always give the same project.")
+    parser.add_argument("--projects-dir", default=utils.PROJECTS_BASE_DIR, help="Folder containing the projects.")
+
+
+def run(args):
+    """Run a parsed ``generate`` command. Returns the process exit code."""
+    project_path = os.path.join(args.projects_dir, args.name)
+    if os.path.exists(project_path):
+        print(f"Error: '{project_path}' already exists.", file=sys.stderr)
+        return 2
+    config = generate_config(args.areas, args.images, args.connections, args.styles, args.text_length, args.seed,
+                             project_name=args.name)
+    write_project(project_path, config)
+    print(f"Generated '{project_path}': {len(config['info_areas'])} info areas, {len(config['images'])} images, "
+          f"{len(config['connections'])} connections.")
+    return 0
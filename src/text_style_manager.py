@@ -3,6 +3,8 @@
 from PyQt5.QtWidgets import QColorDialog, QInputDialog, QMessageBox
 from PyQt5.QtGui import QColor
 
+from src import operation_trace
+from src import profiling
 from src import utils
 from src.info_area_item import InfoAreaItem
 
@@ -84,6 +86,7 @@ class TextStyleManager:
                  self.app.rect_style_combo.addItem(style['name'])
         self.app.rect_style_combo.blockSignals(False)
 
+    @profiling.profiled("style_save")
     def save_current_item_style(self):
         if not isinstance(self.app.selected_item, InfoAreaItem):
             QMessageBox.warning(self.app.main_window if hasattr(self.app, 'main_window') else None, "Save Style", "Please select an Info Area to save its style.")
@@ -161,6 +164,7 @@ class TextStyleManager:
         if hasattr(self.app, 'statusBar'):
             self.app.statusBar().showMessage(f"Area style '{style_name}' saved and applied.", 2000)
 
+    @operation_trace.recorded()
     def handle_style_selection(self, style_name):
         if not isinstance(self.app.selected_item, InfoAreaItem) or not style_name :
             return
@@ -216,6 +220,7 @@ class TextStyleManager:
                 self.app.update_properties_panel()
 
 
+    @operation_trace.recorded(inputs=("rect_h_align_combo", "rect_v_align_combo", "rect_font_size_combo"))
     def handle_format_change(self, value=None):
         if isinstance(self.app.selected_item, InfoAreaItem):
             config = self.app.selected_item.config_data
@@ -1,18 +1,25 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QComboBox, QSpinBox, QTextEdit, QGraphicsScene,
-    QGraphicsView, QDoubleSpinBox, QMessageBox, QStackedLayout, QCheckBox,
+    QDoubleSpinBox, QMessageBox, QStackedLayout, QCheckBox,
     QScrollArea, QStatusBar
 )
-try:
-    from PyQt5.QtWebEngineWidgets import QWebEngineView
-except Exception:  # pragma: no cover - optional dependency
-    class QWebEngineView(QWidget):
-        def setHtml(self, *args, **kwargs):
-            pass
 from PyQt5.QtGui import QColor, QBrush, QPainter
 from PyQt5.QtCore import Qt
 
+from .item_operations import ImageDropFilter
+from .render_profile import CanvasView, FrameStatsReadout, apply_render_profile, load_render_profile
+
+QWebEngineView = None # Imported by UIBuilder.build_web_view on first use
+
+
+class _BlankWebView(QWidget):
+    """Stands in for QWebEngineView where QtWebEngine is not installed."""
+
+    def setHtml(self, *args, **kwargs):
+        pass
+
+
 class UIBuilder:
     """Builds the main UI for :class:`InfoCanvasApp`."""
 
@@ -107,9 +114,168 @@ class UIBuilder:
         app.upload_image_button = QPushButton("Upload Image")
         app.upload_image_button.clicked.connect(app.upload_image)
         img_layout.addWidget(app.upload_image_button)
+        bulk_import_layout = QHBoxLayout()
+        app.upload_images_button = QPushButton("Upload Images...")
+        app.upload_images_button.clicked.connect(app.upload_images)
+        bulk_import_layout.addWidget(app.upload_images_button)
+        app.import_image_folder_button = QPushButton("Import Folder...")
+        app.import_image_folder_button.clicked.connect(app.import_image_folder)
+        bulk_import_layout.addWidget(app.import_image_folder_button)
+        img_layout.addLayout(bulk_import_layout)
+        app.use_image_store_checkbox = QCheckBox("Deduplicate images in the shared store")
+        app.use_image_store_checkbox.setToolTip(
+            "Keep one copy of identical images across all projects; project copies then take almost no space.")
+        app.use_image_store_checkbox.toggled.connect(app.set_use_image_store)
+        img_layout.addWidget(app.use_image_store_checkbox)
 
         app.image_properties_widget = QWidget()
-        img_props_layout = QVBoxLayout(app.image_properties_widget)
+        QVBoxLayout(app.image_properties_widget) # Filled in by _build_image_properties
+        app.image_properties_widget.setVisible(False)
+        img_layout.addWidget(app.image_properties_widget)
+        edit_mode_layout.addWidget(img_group)
+
+        rect_group = QWidget()
+        rect_layout = QVBoxLayout(rect_group)
+        rect_layout.addWidget(QLabel("<b>Info Areas:</b>"))
+        app.add_info_rect_button = QPushButton("Add Info Area")
+        app.add_info_rect_button.clicked.connect(app.add_info_rectangle)
+        rect_layout.addWidget(app.add_info_rect_button)
+
+        app.info_rect_properties_widget = QWidget()
+        rect_props_layout = QVBoxLayout(app.info_rect_properties_widget)
+
+        app.align_horizontal_button = QPushButton("Align Items Horizontally")
+        app.align_horizontal_button.clicked.connect(app.align_selected_rects_horizontally)
+        app.align_horizontal_button.setVisible(False)
+        rect_props_layout.addWidget(app.align_horizontal_button)
+
+        app.align_vertical_button = QPushButton("Align Items Vertically")
+        app.align_vertical_button.clicked.connect(app.align_selected_rects_vertically)
+        app.align_vertical_button.setVisible(False)
+        rect_props_layout.addWidget(app.align_vertical_button)
+
+        app.connect_rects_button = QPushButton("Connect Selected Areas")
+        app.connect_rects_button.clicked.connect(app.on_connect_disconnect_clicked)
+        app.connect_rects_button.setVisible(False)
+        rect_props_layout.addWidget(app.connect_rects_button)
+
+        # Container for individual info area controls so it can be hidden when multiple items are selected
+        app.info_rect_detail_widget = QWidget()
+        QVBoxLayout(app.info_rect_detail_widget) # Filled in by _build_area_properties
+        rect_props_layout.addWidget(app.info_rect_detail_widget)
+
+        app.line_properties_widget = QWidget()
+        QVBoxLayout(app.line_properties_widget) # Filled in by _build_line_properties
+
+        rect_props_layout.addWidget(app.line_properties_widget)
+        app.info_rect_properties_widget.setVisible(False)
+        app.line_properties_widget.setVisible(False)
+        rect_layout.addWidget(app.info_rect_properties_widget)
+        rect_layout.addWidget(app.line_properties_widget)
+        edit_mode_layout.addWidget(rect_group)
+
+        app.controls_layout.addWidget(app.edit_mode_controls_widget)
+
+        app.view_mode_message_label = QLabel("<i>Hover over areas on the image to see information.</i>")
+        app.view_mode_message_label.setWordWrap(True)
+        app.controls_layout.addWidget(app.view_mode_message_label)
+
+        app.export_html_button = QPushButton("Export to HTML")
+        app.export_html_button.clicked.connect(lambda checked=False: app.export_to_html())
+        app.controls_layout.addWidget(app.export_html_button) # This is the one shown in view mode
+
+        # QStatusBar (modern status bar, replaces status_label)
+        from PyQt5.QtWidgets import QStatusBar
+        app.status_bar = QStatusBar()
+        app.status_bar.setObjectName("StatusBar")
+        app.status_bar.setFixedHeight(25)
+        app.status_bar.setStyleSheet("""
+            QStatusBar#StatusBar {
+                background-color: #222;
+                color: white;
+                padding-left: 10px;
+                font-size: 9pt;
+                border-top: 1px solid #444;
+            }
+        """)
+        app.status_bar.showMessage(f"Project '{app.current_project_name}' loaded. Ready.")
+        # Add status_bar to the outer_controls_layout, after the scroll_area
+        outer_controls_layout.addWidget(app.status_bar)
+        app.frame_stats_label = QLabel()
+        app.frame_stats_label.setObjectName("frame_stats_label")
+        app.frame_stats_label.setVisible(False)
+        app.status_bar.addPermanentWidget(app.frame_stats_label)
+
+        # Central widget (canvas area)
+        central_widget = QWidget()
+        app.central_layout = QStackedLayout(central_widget)
+        app.central_layout.setContentsMargins(0,0,0,0)
+
+        app.scene = QGraphicsScene(app)
+        app.scene.setBackgroundBrush(QBrush(QColor(app.config['background']['color'])))
+        app.scene.setSceneRect(0, 0,
+                               app.config['background']['width'],
+                               app.config['background']['height'])
+        app.scene.selectionChanged.connect(app.on_scene_selection_changed)
+        app.scene.parent_window = app # For item context menu
+
+        app.view = CanvasView(app.scene)
+        app.view.setRenderHint(QPainter.SmoothPixmapTransform)
+        app.view.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        app.central_layout.addWidget(app.view)
+        app.image_drop_filter = ImageDropFilter(app.view, app.import_dropped_files)
+        app.frame_stats_readout = FrameStatsReadout(app.view.frame_stats, app.frame_stats_label, parent=app)
+        if getattr(app, 'render_profile', None) is None:
+            app.render_profile = load_render_profile()
+        apply_render_profile(app.view, app.scene, app.render_profile)
+        app.frame_stats_readout.set_enabled(app.render_profile.show_frame_stats)
+
+        app.web_view = None # Created by build_web_view when view mode is first opened
+        app.built_properties_panels = set()
+
+        main_content_layout.addWidget(central_widget, 1) # Add central_widget with stretch factor
+
+        # Add the main_content_area_widget to the FramelessWindow's content_layout
+        app.content_layout.addWidget(main_content_area_widget)
+
+    def build_web_view(self):
+        """Add the view mode web view to the central layout.
+
+        QtWebEngine is imported here rather than at startup because loading it
+        takes longer than building the rest of the window.
+        """
+        global QWebEngineView
+        if QWebEngineView is None:
+            try:
+                from PyQt5.QtWebEngineWidgets import QWebEngineView
+            except Exception:  # pragma: no cover - optional dependency
+                QWebEngineView = _BlankWebView
+        app = self.app
+        app.web_view = QWebEngineView()
+        app.central_layout.addWidget(app.web_view)
+        app.central_layout.setCurrentWidget(app.view)
+        return app.web_view
+
+    def build_properties_panel(self, kind):
+        """Fill in the ``"image"``, ``"area"`` or ``"line"`` properties panel unless it is already built.
+
+        :meth:`build` only creates the empty panels; each is filled in when an
+        item of its kind is first selected.
+        """
+        app = self.app
+        if kind in app.built_properties_panels:
+            return
+        builders = {
+            "image": self._build_image_properties,
+            "area": self._build_area_properties,
+            "line": self._build_line_properties,
+        }
+        builders[kind]()
+        app.built_properties_panels.add(kind)
+
+    def _build_image_properties(self):
+        app = self.app
+        img_props_layout = app.image_properties_widget.layout()
         img_props_layout.addWidget(QLabel("<u>Selected Image Properties:</u>"))
 
         img_scale_layout = QHBoxLayout()
@@ -149,38 +315,10 @@ class UIBuilder:
         img_layer_layout_vertical.addLayout(img_layer_layout_line1)
         img_layer_layout_vertical.addLayout(img_layer_layout_line2)
         img_props_layout.addLayout(img_layer_layout_vertical)
-        app.image_properties_widget.setVisible(False)
-        img_layout.addWidget(app.image_properties_widget)
-        edit_mode_layout.addWidget(img_group)
-
-        rect_group = QWidget()
-        rect_layout = QVBoxLayout(rect_group)
-        rect_layout.addWidget(QLabel("<b>Info Areas:</b>"))
-        app.add_info_rect_button = QPushButton("Add Info Area")
-        app.add_info_rect_button.clicked.connect(app.add_info_rectangle)
-        rect_layout.addWidget(app.add_info_rect_button)
 
-        app.info_rect_properties_widget = QWidget()
-        rect_props_layout = QVBoxLayout(app.info_rect_properties_widget)
-
-        app.align_horizontal_button = QPushButton("Align Items Horizontally")
-        app.align_horizontal_button.clicked.connect(app.align_selected_rects_horizontally)
-        app.align_horizontal_button.setVisible(False)
-        rect_props_layout.addWidget(app.align_horizontal_button)
-
-        app.align_vertical_button = QPushButton("Align Items Vertically")
-        app.align_vertical_button.clicked.connect(app.align_selected_rects_vertically)
-        app.align_vertical_button.setVisible(False)
-        rect_props_layout.addWidget(app.align_vertical_button)
-
-        app.connect_rects_button = QPushButton("Connect Selected Areas")
-        app.connect_rects_button.clicked.connect(app.on_connect_disconnect_clicked)
-        app.connect_rects_button.setVisible(False)
-        rect_props_layout.addWidget(app.connect_rects_button)
-
-        # Container for individual info area controls so it can be hidden when multiple items are selected
-        app.info_rect_detail_widget = QWidget()
-        detail_layout = QVBoxLayout(app.info_rect_detail_widget)
+    def _build_area_properties(self):
+        app = self.app
+        detail_layout = app.info_rect_detail_widget.layout()
 
         app.info_rect_text_input = QTextEdit()
         app.info_rect_text_input.setPlaceholderText("Enter information here...")
@@ -244,7 +382,7 @@ class UIBuilder:
         )
         style_selection_layout.addWidget(app.rect_style_combo)
         app.rect_save_style_button = QPushButton("Save Current as Style")
-        app.rect_save_style_button.clicked.connect(app.text_style_manager.save_current_item_style)
+        app.rect_save_style_button.clicked.connect(lambda: app.text_style_manager.save_current_item_style())
 
         detail_layout.addWidget(text_format_group)
 
@@ -289,7 +427,9 @@ class UIBuilder:
         detail_layout.addWidget(app.rect_show_on_hover_checkbox)
 
         app.rect_show_on_hover_connected_checkbox = QCheckBox("Show info area on hover on connected")
-        # We will connect its stateChanged signal later in app.py
+        app.rect_show_on_hover_connected_checkbox.stateChanged.connect(
+            app.update_selected_rect_show_on_hover_connected_state
+        )
         detail_layout.addWidget(app.rect_show_on_hover_connected_checkbox)
         app.rect_show_on_hover_connected_checkbox.setVisible(False) # Initially hidden
 
@@ -341,10 +481,11 @@ class UIBuilder:
         rect_layer_layout_vertical.addLayout(rect_layer_layout_line2)
         detail_layout.addLayout(rect_layer_layout_vertical)
 
-        rect_props_layout.addWidget(app.info_rect_detail_widget)
+        app.text_style_manager.load_styles_into_dropdown()
 
-        app.line_properties_widget = QWidget()
-        line_props_layout = QVBoxLayout(app.line_properties_widget)
+    def _build_line_properties(self):
+        app = self.app
+        line_props_layout = app.line_properties_widget.layout()
         thickness_layout = QHBoxLayout()
         thickness_layout.addWidget(QLabel("Thickness:"))
         app.line_thickness_spin = QSpinBox()
@@ -388,67 +529,7 @@ class UIBuilder:
         line_props_layout.addLayout(style_layout)
 
         app.line_save_style_button = QPushButton("Save Current as Style")
-        app.line_save_style_button.clicked.connect(app.line_style_manager.save_current_item_style)
+        app.line_save_style_button.clicked.connect(lambda: app.line_style_manager.save_current_item_style())
         line_props_layout.addWidget(app.line_save_style_button)
 
-        rect_props_layout.addWidget(app.line_properties_widget)
-        app.info_rect_properties_widget.setVisible(False)
-        app.line_properties_widget.setVisible(False)
-        rect_layout.addWidget(app.info_rect_properties_widget)
-        rect_layout.addWidget(app.line_properties_widget)
-        edit_mode_layout.addWidget(rect_group)
-
-        app.controls_layout.addWidget(app.edit_mode_controls_widget)
-
-        app.view_mode_message_label = QLabel("<i>Hover over areas on the image to see information.</i>")
-        app.view_mode_message_label.setWordWrap(True)
-        app.controls_layout.addWidget(app.view_mode_message_label)
-
-        app.export_html_button = QPushButton("Export to HTML")
-        app.export_html_button.clicked.connect(lambda checked=False: app.export_to_html())
-        app.controls_layout.addWidget(app.export_html_button) # This is the one shown in view mode
-
-        # QStatusBar (modern status bar, replaces status_label)
-        from PyQt5.QtWidgets import QStatusBar
-        app.status_bar = QStatusBar()
-        app.status_bar.setObjectName("StatusBar")
-        app.status_bar.setFixedHeight(25)
-        app.status_bar.setStyleSheet("""
-            QStatusBar#StatusBar {
-                background-color: #222;
-                color: white;
-                padding-left: 10px;
-                font-size: 9pt;
-                border-top: 1px solid #444;
-            }
-        """)
-        app.status_bar.showMessage(f"Project '{app.current_project_name}' loaded. Ready.")
-        # Add status_bar to the outer_controls_layout, after the scroll_area
-        outer_controls_layout.addWidget(app.status_bar)
-
-        # Central widget (canvas area)
-        central_widget = QWidget()
-        app.central_layout = QStackedLayout(central_widget)
-        app.central_layout.setContentsMargins(0,0,0,0)
-
-        app.scene = QGraphicsScene(app)
-        app.scene.setBackgroundBrush(QBrush(QColor(app.config['background']['color'])))
-        app.scene.setSceneRect(0, 0,
-                               app.config['background']['width'],
-                               app.config['background']['height'])
-        app.scene.selectionChanged.connect(app.on_scene_selection_changed)
-        app.scene.parent_window = app # For item context menu
-
-        app.view = QGraphicsView(app.scene)
-        app.view.setRenderHint(QPainter.SmoothPixmapTransform)
-        app.view.setAlignment(Qt.AlignLeft | Qt.AlignTop)
-        app.central_layout.addWidget(app.view)
-
-        app.web_view = QWebEngineView()
-        app.central_layout.addWidget(app.web_view)
-        app.central_layout.setCurrentWidget(app.view)
-
-        main_content_layout.addWidget(central_widget, 1) # Add central_widget with stretch factor
-
-        # Add the main_content_area_widget to the FramelessWindow's content_layout
-        app.content_layout.addWidget(main_content_area_widget)
+        app.line_style_manager.load_styles_into_dropdown()
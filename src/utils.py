@@ -1,5 +1,7 @@
 import os
 import json
+import hashlib
+import mmap
 from datetime import datetime
 from PyQt5.QtCore import Qt
 
@@ -9,6 +11,17 @@ PROJECTS_ROOT_DIR_NAME = "static"  # Main directory for all projects
 PROJECTS_BASE_DIR = os.path.join(BASE_SCRIPT_DIR, PROJECTS_ROOT_DIR_NAME)
 PROJECT_CONFIG_FILENAME = "config.json"
 PROJECT_IMAGES_DIRNAME = "images"
+PROJECT_TILES_DIRNAME = "tiles"  # Deep Zoom pyramids of very large images
+TILED_IMAGE_MIN_PIXELS = 36_000_000  # Images at least this large are displayed from tiles
+EXPORT_MANIFEST_FILENAME = ".infocanvas_export.json"  # Written next to incrementally exported HTML
+EXPORT_CACHE_DIRNAME = ".export_cache"  # Per-project cache of resampled export images
+IMAGE_STORE_DIRNAME = ".image_store"  # Content-addressed image blobs shared by projects, under PROJECTS_BASE_DIR
+CACHE_DIRNAME = ".cache"  # Caches shared by all projects, under PROJECTS_BASE_DIR
+PROJECT_INDEX_FILENAME = "project_index.json"  # Summary of every project, in CACHE_DIRNAME
+PROJECT_THUMBNAIL_FILENAME = "thumbnail.png"  # Preview of the canvas, next to a project's config
+PROJECT_SCENE_CACHE_DIRNAME = ".scene_cache"  # Image proxies and layout reused when a project is reopened
+DIAGNOSTICS_DIRNAME = ".diagnostics"  # Stall reports in each project; profiles under PROJECTS_BASE_DIR
+MMAP_HASH_MIN_BYTES = 8 * 1024 * 1024  # Larger files are hashed through a memory map
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 # Z-values used for stacking graphics items
 Z_VALUE_INFO_RECT = 1  # Default z for info rectangles
@@ -20,10 +33,40 @@ def allowed_file(filename):
     """Checks if the uploaded file has an allowed extension."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def unique_item_id(prefix, existing_ids):
+    """Returns a timestamp-based id such as ``img_1700000000.123456`` that is not in ``existing_ids``.
+
+    A counter suffix is added when items are created faster than the clock ticks.
+    """
+    base = f"{prefix}_{datetime.now().timestamp()}"
+    candidate = base
+    counter = 1
+    while candidate in existing_ids:
+        candidate = f"{base}_{counter}"
+        counter += 1
+    return candidate
+
 def ensure_base_projects_directory_exists():
     """Creates the base directory for all projects if it doesn't exist."""
     os.makedirs(PROJECTS_BASE_DIR, exist_ok=True)
 
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Returns the hex SHA-256 digest of a file.
+
+    Large files are hashed straight from a memory map, avoiding a copy of every
+    chunk into Python; smaller ones are read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_HASH_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        else:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
 def get_default_config():
     """Returns the default configuration structure for a new project."""
     return {
@@ -125,7 +125,6 @@ def base_app_fixture(qtbot, mock_project_manager_dialog, monkeypatch, tmp_path_f
         # Ensure UIBuilder is called to initialize scene and other UI elements
         # This is critical as ItemOperations now depends on self.scene
         UIBuilder(self_app).build()
-        self_app.web_view = created_web_view[0]
         # Initialize item_operations after UI build and scene creation
         from src.item_operations import ItemOperations # Local import
         self_app.item_operations = ItemOperations(self_app)
@@ -184,8 +183,8 @@ def app_for_initial_setup_test_environment(monkeypatch, tmp_path):
     # Patch managers for the app module so that InfoCanvasApp instances get mocks.
     from src.text_style_manager import TextStyleManager
     from src.line_style_manager import LineStyleManager
-    monkeypatch.setattr('app.TextStyleManager', lambda app_arg: MagicMock())
-    monkeypatch.setattr('app.LineStyleManager', lambda app_arg: MagicMock())
+    monkeypatch.setattr('src.text_style_manager.TextStyleManager', lambda app_arg: MagicMock())
+    monkeypatch.setattr('src.line_style_manager.LineStyleManager', lambda app_arg: MagicMock())
 
     # Ensure scene is at least a MagicMock before ItemOperations is initialized
     monkeypatch.setattr(InfoCanvasApp, 'scene', MagicMock(spec=QGraphicsScene), raising=False)
@@ -265,6 +264,10 @@ def test_initial_setup_load_project(app_for_initial_setup_test_environment, monk
     assert test_app_load_project.current_project_path == existing_project_path
     assert test_app_load_project.config["background"]["color"] == "#123456"
     assert closed_flags['closed'] is False
+    # The style managers are created with the panels that use them, not at startup
+    assert getattr(test_app_load_project, '_text_style_manager', None) is None
+    assert getattr(test_app_load_project, '_line_style_manager', None) is None
+    assert test_app_load_project.text_style_manager is test_app_load_project.text_style_manager
 
 
 def test_initial_setup_cancel(app_for_initial_setup_test_environment, monkeypatch, qtbot):
@@ -311,7 +314,9 @@ def test_on_mode_changed(base_app_fixture, monkeypatch):
     mock_exporter_instance = MagicMock()
     mock_exporter_instance._generate_html_content.return_value = html_content
     mock_exporter_cls = MagicMock(return_value=mock_exporter_instance)
-    monkeypatch.setattr('app.HtmlExporter', mock_exporter_cls)
+    monkeypatch.setattr('src.exporter.HtmlExporter', mock_exporter_cls)
+    assert app.web_view is None # Created when view mode is first opened
+    app.ensure_web_view()
     app.web_view.show = MagicMock()
     app.web_view.hide = MagicMock()
     app.web_view.setHtml = MagicMock()
@@ -0,0 +1,68 @@
+import json
+import os
+
+import infocanvas
+from src import utils
+from src.batch_export import list_projects
+
+
+def _make_project(base_dir, name, image_bytes=b'png-bytes'):
+    project_dir = base_dir / name
+    images_dir = project_dir / utils.PROJECT_IMAGES_DIRNAME
+    os.makedirs(images_dir)
+    (images_dir / "pic.png").write_bytes(image_bytes)
+    config = utils.get_default_config()
+    config['project_name'] = name
+    config['images'] = [{'id': 'img1', 'path': 'pic.png', 'center_x': 10, 'center_y': 10,
+                         'scale': 1.0, 'original_width': 1, 'original_height': 1}]
+    config['info_areas'] = [{'id': 'r1', 'center_x': 5, 'center_y': 5, 'width': 10, 'height': 10, 'text': name}]
+    (project_dir / utils.PROJECT_CONFIG_FILENAME).write_text(json.dumps(config))
+    return project_dir
+
+
+def test_export_all_projects_in_pool_writes_report(tmp_path):
+    base_dir = tmp_path / "projects"
+    for name in ("beta", "alpha", "gamma"):
+        _make_project(base_dir, name)
+    os.makedirs(base_dir / "not_a_project")
+    report_path = tmp_path / "report.json"
+
+    exit_code = infocanvas.main([
+        "export", "--all", "-o", str(tmp_path / "out"), "--projects-dir", str(base_dir),
+        "-j", "2", "--report", str(report_path),
+    ])
+
+    assert exit_code == 0
+    report = json.loads(report_path.read_text())
+    assert report['workers'] == 2
+    assert [p['project'] for p in report['projects']] == ["alpha", "beta", "gamma"]
+    for project in report['projects']:
+        assert project['ok'] is True
+        assert project['html_bytes'] == os.path.getsize(project['output'])
+        assert project['output_bytes'] > project['html_bytes']
+        assert project['seconds'] >= 0
+        assert (tmp_path / "out" / project['project'] / "images" / "pic.png").exists()
+    assert list_projects(str(base_dir)) == ["alpha", "beta", "gamma"]
+
+
+def test_export_reports_broken_project(tmp_path, capsys):
+    base_dir = tmp_path / "projects"
+    _make_project(base_dir, "good")
+    broken = _make_project(base_dir, "broken")
+    (broken / utils.PROJECT_CONFIG_FILENAME).write_text("{not json")
+
+    exit_code = infocanvas.main(["export", "good", "broken", "-o", str(tmp_path / "out"),
+                                 "--projects-dir", str(base_dir), "-j", "1", "--single-file"])
+
+    assert exit_code == 1
+    report = json.loads(capsys.readouterr().out)
+    good, bad = report['projects']
+    assert good['ok'] is True and not (tmp_path / "out" / "good" / "images").exists()
+    assert bad['ok'] is False and bad['error'].startswith("JSONDecodeError")
+
+
+def test_export_rejects_unknown_project(tmp_path, capsys):
+    base_dir = tmp_path / "projects"
+    _make_project(base_dir, "good")
+    assert infocanvas.main(["export", "missing", "-o", str(tmp_path), "--projects-dir", str(base_dir)]) == 2
+    assert "missing" in capsys.readouterr().err
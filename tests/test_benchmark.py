@@ -0,0 +1,22 @@
+from src import benchmark
+
+
+def test_run_benchmarks_times_every_scenario(tmp_path, qapp):
+    result = benchmark.run_benchmarks(area_counts=(5,), repeat=2, generator_options={"images": 1},
+                                      work_dir=str(tmp_path))
+    assert [r["scenario"] for r in result["results"]] == list(benchmark.SCENARIOS)
+    for entry in result["results"]:
+        assert entry["info_areas"] == 5 and len(entry["runs"]) == 2
+        assert 0 <= entry["min"] <= entry["median"]
+    assert "python" in result["environment"]
+
+
+def test_compare_to_baseline_flags_only_real_slowdowns():
+    def results(*medians):
+        return {"results": [{"scenario": name, "info_areas": 100, "median": median}
+                            for name, median in zip(("load", "render", "undo"), medians)]}
+    comparison = benchmark.compare_to_baseline(results(0.200, 0.0020, 0.52), results(0.100, 0.0010, 0.5), tolerance=0.25)
+    assert len(comparison["compared"]) == 3
+    # The render slowdown doubles but stays under the noise floor
+    assert [entry["scenario"] for entry in comparison["regressions"]] == ["load"]
+    assert comparison["regressions"][0]["ratio"] == 2.0
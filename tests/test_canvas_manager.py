@@ -77,3 +77,27 @@ class TestCanvasManagerAlignment:
         manager.align_selected_rects_vertically()
         for item in items:
             assert item.config_data['center_y'] == pytest.approx(target_y)
+
+
+def test_rendering_styled_items_does_not_save(base_app_fixture, monkeypatch):
+    from unittest.mock import MagicMock
+    app_window = base_app_fixture
+    app_window.config['info_area_styles'] = [{"name": "Warning", "font_color": "#ff0000"}]
+    app_window.config['info_areas'] = [
+        {"id": f"styled_{i}", "text": "Styled", "center_x": 50 + i * 100, "center_y": 50,
+         "width": 80, "height": 40, "z_index": i, "shape": "rectangle", "style_ref": "Warning"}
+        for i in range(2)
+    ]
+    app_window.config['line_styles'] = [{"name": "Thick", "thickness": 6}]
+    app_window.config['connections'] = [
+        {"id": "conn_1", "source": "styled_0", "destination": "styled_1", "line_style_ref": "Thick"}
+    ]
+    monkeypatch.setattr(app_window, 'save_config', MagicMock())
+    app_window.canvas_manager.render_canvas_from_config()
+
+    app_window.save_config.assert_not_called()
+    area = app_window.item_map["styled_0"]
+    assert area.config_data['font_color'] == "#ff0000"
+    assert app_window.item_map["conn_1"].config_data['thickness'] == 6
+    area.properties_changed.emit(area) # Edits after rendering are still saved
+    app_window.save_config.assert_called_once()
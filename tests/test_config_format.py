@@ -0,0 +1,60 @@
+import gzip
+import json
+
+import pytest
+
+from src import config_format
+
+
+CONFIG = {"project_name": "demo", "info_areas": [{"id": "a1", "text": "Line one\nLine two é"}]}
+
+
+@pytest.mark.parametrize("fmt", config_format.FORMATS)
+def test_each_format_round_trips_and_is_detected(tmp_path, fmt):
+    path = str(tmp_path / "config.json")
+    config_format.dump(CONFIG, path, fmt)
+    assert config_format.load_with_format(path) == (CONFIG, fmt)
+
+
+def test_compact_and_gzip_are_smaller_than_pretty():
+    config = {"info_areas": [{"id": f"a{i}", "center_x": i, "text": "Some text " * 5} for i in range(200)]}
+    sizes = {fmt: len(config_format.encode(config, fmt)) for fmt in config_format.FORMATS}
+    assert sizes[config_format.GZIP] < sizes[config_format.COMPACT] < sizes[config_format.PRETTY]
+
+
+def test_files_written_by_earlier_versions_still_load(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(CONFIG, indent=2))
+    assert config_format.load_with_format(str(path)) == (CONFIG, config_format.PRETTY)
+
+
+def test_standard_encoder_is_used_without_orjson(monkeypatch):
+    monkeypatch.setattr(config_format, "orjson", None)
+    assert config_format.encode(CONFIG, config_format.PRETTY) == json.dumps(CONFIG, indent=2).encode('utf-8')
+    assert config_format.decode(config_format.encode(CONFIG, config_format.COMPACT)) == (CONFIG, config_format.COMPACT)
+
+
+def test_values_orjson_cannot_write_fall_back_to_standard_encoder():
+    config = {"info_areas": [{"id": "a1", "center_x": float("nan"), "width": float("inf"), "text": None}],
+              "seed": 2 ** 70}
+    data = config_format.encode(config, config_format.COMPACT)
+    assert b"NaN" in data and b"Infinity" in data and str(2 ** 70).encode() in data
+    decoded = config_format.decode(data)[0]["info_areas"][0]
+    assert decoded["center_x"] != decoded["center_x"] and decoded["width"] == float("inf")
+    assert config_format.encode({"text": None}, config_format.COMPACT) == b'{"text":null}'
+
+
+def test_corrupt_data_raises_value_error():
+    with pytest.raises(ValueError):
+        config_format.decode(gzip.compress(b'{"a": 1}')[:12])
+    with pytest.raises(ValueError):
+        config_format.decode(b'{"a": }')
+    with pytest.raises(ValueError):
+        config_format.encode(CONFIG, "yaml")
+
+
+def test_default_format_comes_from_environment(monkeypatch):
+    monkeypatch.setenv(config_format.ENV_VAR, "gzip")
+    assert config_format.default_format() == config_format.GZIP
+    monkeypatch.setenv(config_format.ENV_VAR, "unknown")
+    assert config_format.default_format() == config_format.PRETTY
@@ -1,11 +1,15 @@
 import os
+import json
+import base64
 import re # For more flexible style checking
 from unittest.mock import MagicMock, patch # Keep patch if other tests use it
 from PyQt5.QtWidgets import QMessageBox # Keep if other tests use it
+from PyQt5.QtGui import QColor, QImage, QImageReader
 # Import base_app_fixture if any test still needs it.
 # from tests.test_app import base_app_fixture # Not used in these new tests
 from src import utils
 from src.exporter import HtmlExporter
+from src import image_tiles
 from bs4 import BeautifulSoup # <--- NEW IMPORT
 
 # (pytest fixtures tmp_path, tmp_path_factory are function-scoped by default)
@@ -34,7 +38,7 @@ def test_export_to_html_writes_file(tmp_path_factory, tmp_path): # No base_app_f
     assert 'hello' in content
     assert 'hotspot' in content
     assert "class='text-content'" in content
-    hotspot_start_str = "<div class='hotspot info-rectangle-export'"
+    hotspot_start_str = "<div class='hotspot info-rectangle-export area-style-1'"
     start_index = content.find(hotspot_start_str)
     assert start_index != -1
     style_attr_start = content.find("style='", start_index)
@@ -77,18 +81,20 @@ def test_export_html_rich_text_formatting(tmp_path_factory, tmp_path): # No base
     assert 'display:flex;' in content
     assert 'align-items:center;' in content
     expected_inner_style_parts = [
-        'color:#FF0000;', 'font-size:20px;', 'background-color:transparent;',
+        'color:#FF0000;', 'font-size:20px;',
         'padding:10px;', 'text-align:center;'
     ]
-    text_content_div_start_str = "<div class='text-content' style='"
-    start_index = content.find(text_content_div_start_str)
-    assert start_index != -1, "Could not find start of .text-content div"
-    style_end = content.find("'>", start_index)
+    assert '.text-content{' in content and 'background-color:transparent;' in content
+    text_rule_start_str = ".area-style-1>.text-content{"
+    start_index = content.find(text_rule_start_str)
+    assert start_index != -1, "Could not find the generated .text-content rule"
+    style_end = content.find("}", start_index)
     assert style_end != -1
-    style_attribute_content = content[start_index + len(text_content_div_start_str):style_end]
+    style_attribute_content = content[start_index + len(text_rule_start_str):style_end]
     for part in expected_inner_style_parts:
         assert part in style_attribute_content, f"Expected style part '{part}' not found in '{style_attribute_content}'"
-    hotspot_start_str = "<div class='hotspot info-rectangle-export'"
+    assert "<div class='text-content'>" in content
+    hotspot_start_str = "<div class='hotspot info-rectangle-export area-style-1'"
     start_index = content.find(hotspot_start_str)
     assert start_index != -1
     style_attr_start = content.find("style='", start_index)
@@ -147,6 +153,47 @@ def test_export_html_heading_font_sizes(tmp_path_factory, tmp_path):
     assert 'font-size:xx-large' not in content
     assert 'font-size:28px' in content
 
+def test_export_html_deduplicates_area_styles(tmp_path_factory):
+    project_path = tmp_path_factory.mktemp("project_style_classes")
+    sample_config = utils.get_default_config()
+    sample_config['info_areas'] = [
+        {'id': 'a1', 'center_x': 10, 'center_y': 10, 'width': 20, 'height': 20, 'text': 'a',
+         'font_color': '#FF0000', 'style_ref': 'Red Title'},
+        {'id': 'a2', 'center_x': 50, 'center_y': 10, 'width': 30, 'height': 20, 'text': 'b',
+         'font_color': '#FF0000', 'style_ref': 'Red Title'},
+        {'id': 'a3', 'center_x': 90, 'center_y': 10, 'width': 20, 'height': 20, 'text': 'c'},
+        {'id': 'a4', 'center_x': 90, 'center_y': 50, 'width': 20, 'height': 40, 'text': 'd'},
+    ]
+    exporter = HtmlExporter(config=sample_config, project_path=str(project_path))
+    soup = BeautifulSoup(exporter._generate_html_content(), 'html.parser')
+
+    classes = {div['data-id']: div['class'][-1] for div in soup.find_all('div', class_='hotspot')}
+    assert classes == {
+        'a1': 'area-style-Red-Title', 'a2': 'area-style-Red-Title',
+        'a3': 'area-style-1', 'a4': 'area-style-1',
+    }
+    stylesheet = soup.find('style').string
+    assert stylesheet.count('.area-style-Red-Title{') == 1
+    assert stylesheet.count('.area-style-1{') == 1
+    a2_style = soup.find('div', attrs={'data-id': 'a2'})['style']
+    assert a2_style == 'left:35.0px;top:0.0px;width:30px;height:20px;z-index:1;opacity:0;'
+    assert soup.find('div', attrs={'data-id': 'a2'}).find('div', class_='text-content').get('style') is None
+
+
+def test_export_html_style_ref_with_overrides_gets_own_class(tmp_path_factory):
+    project_path = tmp_path_factory.mktemp("project_style_override")
+    sample_config = utils.get_default_config()
+    sample_config['info_areas'] = [
+        {'id': 'a1', 'center_x': 10, 'center_y': 10, 'width': 20, 'height': 20, 'text': 'a', 'style_ref': 'S'},
+        {'id': 'a2', 'center_x': 50, 'center_y': 10, 'width': 20, 'height': 20, 'text': 'b', 'style_ref': 'S',
+         'font_size': '30px'},
+    ]
+    exporter = HtmlExporter(config=sample_config, project_path=str(project_path))
+    soup = BeautifulSoup(exporter._generate_html_content(), 'html.parser')
+    assert soup.find('div', attrs={'data-id': 'a1'})['class'][-1] == 'area-style-S'
+    assert soup.find('div', attrs={'data-id': 'a2'})['class'][-1] == 'area-style-S-2'
+
+
 def test_export_html_always_visible(tmp_path_factory, tmp_path):
     project_path = tmp_path_factory.mktemp("project_always")
     os.makedirs(project_path / utils.PROJECT_IMAGES_DIRNAME, exist_ok=True)
@@ -208,6 +255,18 @@ def test_export_to_html_ignores_bool(mock_get_save, base_app_fixture, tmp_path,
     info_mock.assert_called_once_with(app, "Export Complete", f"Exported to {str(out_file)}")
 
 
+@patch('app.QFileDialog.getSaveFileName')
+def test_export_to_html_single_file(mock_get_save, base_app_fixture, tmp_path, monkeypatch):
+    app = base_app_fixture
+    out_file = tmp_path / "single_export.html"
+    mock_get_save.return_value = (str(out_file), 'HTML Files (*.html)')
+    monkeypatch.setattr(QMessageBox, 'information', MagicMock())
+    app.export_to_html(single_file=True)
+    assert mock_get_save.call_args[0][1] == "Export to Single HTML File"
+    assert out_file.exists()
+    assert not (tmp_path / "images").exists()
+
+
 def test_export_button_visibility_changes(base_app_fixture):
     app = base_app_fixture
     assert not app.export_html_button.isVisible()
@@ -247,6 +306,177 @@ def test_export_to_html_copies_images(tmp_path_factory, tmp_path): # No base_app
     # Optionally, check content if important:
     # assert copied_image_path.read_bytes() == b'dummy image data'
 
+def _incremental_export_project(tmp_path_factory, name):
+    project_path = tmp_path_factory.mktemp(name)
+    images_dir = project_path / utils.PROJECT_IMAGES_DIRNAME
+    os.makedirs(images_dir, exist_ok=True)
+    (images_dir / "pic.png").write_bytes(b'first image data')
+    config = utils.get_default_config()
+    config['images'] = [{
+        'id': 'img1', 'path': 'pic.png', 'center_x': 10, 'center_y': 10,
+        'scale': 1.0, 'original_width': 1, 'original_height': 1
+    }]
+    config['info_areas'] = [{'id': 'r1', 'center_x': 5, 'center_y': 5, 'width': 10, 'height': 10, 'text': 'one'}]
+    return project_path, config
+
+
+def test_incremental_export_uses_hashed_names_and_manifest(tmp_path_factory, tmp_path):
+    project_path, config = _incremental_export_project(tmp_path_factory, "project_incremental")
+    out_file = tmp_path / "out" / "index.html"
+
+    exporter = HtmlExporter(config=config, project_path=str(project_path))
+    assert exporter.export(str(out_file), incremental=True) is True
+    assert exporter.last_export_stats['images_copied'] == 1
+    assert exporter.last_export_stats['html_written'] is True
+
+    digest = utils.file_sha256(str(project_path / utils.PROJECT_IMAGES_DIRNAME / "pic.png"))
+    hashed_name = f"pic.{digest[:12]}.png"
+    assert (tmp_path / "out" / "images" / hashed_name).exists()
+    assert f"images/{hashed_name}" in out_file.read_text()
+    manifest = json.loads((tmp_path / "out" / utils.EXPORT_MANIFEST_FILENAME).read_text())
+    assert manifest['images']['pic.png']['output'] == f"images/{hashed_name}"
+
+
+def test_incremental_export_skips_unchanged_work(tmp_path_factory, tmp_path, monkeypatch):
+    project_path, config = _incremental_export_project(tmp_path_factory, "project_incremental_skip")
+    out_file = tmp_path / "index.html"
+    assert HtmlExporter(config=config, project_path=str(project_path)).export(str(out_file), incremental=True)
+
+    hash_calls = []
+    original_hash = utils.file_sha256
+    monkeypatch.setattr(utils, 'file_sha256', lambda *a, **k: hash_calls.append(a) or original_hash(*a, **k))
+    exporter = HtmlExporter(config=config, project_path=str(project_path))
+    assert exporter.export(str(out_file), incremental=True) is True
+    assert hash_calls == []
+    assert exporter.last_export_stats['images_copied'] == 0
+    assert exporter.last_export_stats['images_reused'] == 1
+    assert exporter.last_export_stats['html_written'] is False
+
+    config['info_areas'][0]['text'] = 'two'
+    exporter = HtmlExporter(config=config, project_path=str(project_path))
+    assert exporter.export(str(out_file), incremental=True) is True
+    assert exporter.last_export_stats['images_copied'] == 0
+    assert exporter.last_export_stats['html_written'] is True
+    assert 'two' in out_file.read_text()
+
+
+def test_incremental_export_replaces_changed_image(tmp_path_factory, tmp_path):
+    project_path, config = _incremental_export_project(tmp_path_factory, "project_incremental_change")
+    out_file = tmp_path / "index.html"
+    assert HtmlExporter(config=config, project_path=str(project_path)).export(str(out_file), incremental=True)
+    old_files = set(os.listdir(tmp_path / "images"))
+
+    (project_path / utils.PROJECT_IMAGES_DIRNAME / "pic.png").write_bytes(b'second, longer image data')
+    exporter = HtmlExporter(config=config, project_path=str(project_path))
+    assert exporter.export(str(out_file), incremental=True) is True
+    assert exporter.last_export_stats['images_copied'] == 1
+    assert exporter.last_export_stats['images_removed'] == 1
+    new_files = set(os.listdir(tmp_path / "images"))
+    assert len(new_files) == 1 and new_files != old_files
+
+
+def _optimized_export_project(tmp_path_factory, name, scale):
+    project_path = tmp_path_factory.mktemp(name)
+    images_dir = project_path / utils.PROJECT_IMAGES_DIRNAME
+    os.makedirs(images_dir, exist_ok=True)
+    image = QImage(400, 200, QImage.Format_RGB32)
+    image.fill(QColor('darkGreen'))
+    assert image.save(str(images_dir / "photo.png"))
+    config = utils.get_default_config()
+    config['images'] = [{
+        'id': 'img1', 'path': 'photo.png', 'center_x': 200, 'center_y': 100,
+        'scale': scale, 'original_width': 400, 'original_height': 200
+    }]
+    return project_path, config
+
+
+def test_export_optimized_images_uses_resampled_srcset(tmp_path_factory, tmp_path):
+    project_path, config = _optimized_export_project(tmp_path_factory, "project_optimized", 0.25)
+    out_file = tmp_path / "index.html"
+    exporter = HtmlExporter(config=config, project_path=str(project_path))
+    assert exporter.export(str(out_file), optimize_images=True) is True
+    assert exporter.last_export_stats['images_resampled'] == 2
+
+    img = BeautifulSoup(out_file.read_text(), 'html.parser').find('img')
+    srcset = [entry.rsplit(' ', 1) for entry in img['srcset'].split(', ')]
+    assert [density for _, density in srcset] == ['1x', '2x']
+    assert img['src'] == srcset[0][0]
+    sizes = [QImageReader(str(tmp_path / src)).size() for src, _ in srcset]
+    assert [(size.width(), size.height()) for size in sizes] == [(100, 50), (200, 100)]
+    assert not (tmp_path / "images" / "photo.png").exists()
+
+    exporter = HtmlExporter(config=config, project_path=str(project_path))
+    assert exporter.export(str(tmp_path / "again.html"), optimize_images=True) is True
+    assert exporter.last_export_stats['images_resampled'] == 0
+    assert exporter.last_export_stats['variants_cached'] == 2
+
+
+def test_export_optimized_images_falls_back_to_original_when_needed(tmp_path_factory, tmp_path):
+    project_path, config = _optimized_export_project(tmp_path_factory, "project_optimized_partial", 0.75)
+    out_file = tmp_path / "index.html"
+    assert HtmlExporter(config=config, project_path=str(project_path)).export(
+        str(out_file), incremental=True, optimize_images=True) is True
+
+    manifest = json.loads((tmp_path / utils.EXPORT_MANIFEST_FILENAME).read_text())
+    entry = manifest['images']['photo.png']
+    assert len(entry['variants']) == 1
+    img = BeautifulSoup(out_file.read_text(), 'html.parser').find('img')
+    assert img['srcset'] == f"{entry['variants'][0]} 1x, {entry['output']} 2x"
+
+    config['images'][0]['scale'] = 1.0
+    exporter = HtmlExporter(config=config, project_path=str(project_path))
+    assert exporter.export(str(out_file), incremental=True, optimize_images=True) is True
+    assert exporter.last_export_stats['images_removed'] == 1
+    assert not (tmp_path / entry['variants'][0]).exists()
+    assert not BeautifulSoup(out_file.read_text(), 'html.parser').find('img').has_attr('srcset')
+
+
+def test_export_uses_tile_pyramid_for_tiled_images(tmp_path_factory, tmp_path):
+    project_path, config = _optimized_export_project(tmp_path_factory, "project_tiled", 0.5)
+    src = str(project_path / utils.PROJECT_IMAGES_DIRNAME / "photo.png")
+    dzi_path = image_tiles.pyramid_path(str(project_path), "photo.png")
+    assert image_tiles.build_pyramid(src, dzi_path, tile_size=128)
+    name = os.path.splitext(os.path.basename(dzi_path))[0]
+    out_file = tmp_path / "index.html"
+
+    assert HtmlExporter(config=config, project_path=str(project_path)).export(str(out_file)) is True
+    soup = BeautifulSoup(out_file.read_text(), 'html.parser')
+    assert soup.find('img') is None
+    zoom = soup.find('div', class_='deepzoom')
+    assert zoom['data-tiles'] == f'tiles/{name}_files'
+    assert (zoom['data-full-width'], zoom['data-tile-size']) == ('400', '128')
+    assert 'width:200.0px' in zoom['style']
+    assert (tmp_path / "tiles" / f"{name}.dzi").exists()
+    assert (tmp_path / "tiles" / f"{name}_files" / "9" / "3_1.png").exists()
+    assert not (tmp_path / "images" / "photo.png").exists()
+    assert "querySelectorAll('.deepzoom')" in out_file.read_text()
+
+
+def test_single_file_export_embeds_images_in_chunks(tmp_path_factory, tmp_path, monkeypatch):
+    project_path, config = _incremental_export_project(tmp_path_factory, "project_single_file")
+    image_bytes = bytes(range(256)) * 7 + b'tail'
+    (project_path / utils.PROJECT_IMAGES_DIRNAME / "pic.png").write_bytes(image_bytes)
+    monkeypatch.setattr('src.exporter._InlineImage.CHUNK_SIZE', 30)
+    out_file = tmp_path / "single.html"
+
+    assert HtmlExporter(config=config, project_path=str(project_path)).export(str(out_file), single_file=True) is True
+    assert not (tmp_path / "images").exists()
+    img = BeautifulSoup(out_file.read_text(), 'html.parser').find('img')
+    prefix = "data:image/png;base64,"
+    assert img['src'].startswith(prefix)
+    assert base64.b64decode(img['src'][len(prefix):]) == image_bytes
+    assert 'left:9.5px' in img['style']
+    assert out_file.read_text().count("<div class='hotspot") == 1
+
+
+def test_single_file_export_missing_image_keeps_document(tmp_path_factory, tmp_path):
+    project_path, config = _incremental_export_project(tmp_path_factory, "project_single_file_missing")
+    os.remove(project_path / utils.PROJECT_IMAGES_DIRNAME / "pic.png")
+    out_file = tmp_path / "single.html"
+    assert HtmlExporter(config=config, project_path=str(project_path)).export(str(out_file), single_file=True) is True
+    assert BeautifulSoup(out_file.read_text(), 'html.parser').find('img')['src'] == ''
+
+
 def test_export_html_contains_drag_script(tmp_path_factory, tmp_path):
     project_path = tmp_path_factory.mktemp("project_drag")
     os.makedirs(project_path / utils.PROJECT_IMAGES_DIRNAME, exist_ok=True)
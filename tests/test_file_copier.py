@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from src.file_copier import FileCopier
+
+
+def _make_sources(tmp_path, count=5, size=3000):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    pairs = []
+    for i in range(count):
+        src = src_dir / f"img_{i}.png"
+        src.write_bytes(bytes([i % 256]) * size)
+        pairs.append((str(src), str(tmp_path / "dst" / "nested" / f"img_{i}.png")))
+    return pairs
+
+
+def test_copy_files_chunked_copy_and_progress(tmp_path):
+    pairs = _make_sources(tmp_path)
+    progress = []
+    copier = FileCopier(link_mode="copy", chunk_size=1024)
+    errors = copier.copy_files(pairs, progress_callback=lambda done, total: progress.append((done, total)))
+
+    assert errors == []
+    for src, dst in pairs:
+        assert open(src, 'rb').read() == open(dst, 'rb').read()
+        assert not os.path.samefile(src, dst)
+    assert progress[-1] == (5 * 3000, 5 * 3000)
+    assert copier.method_counts["copy"] == 5
+
+
+def test_copy_files_links_on_same_filesystem(tmp_path):
+    pairs = _make_sources(tmp_path, count=2)
+    copier = FileCopier(link_mode="auto")
+    assert copier.copy_files(pairs) == []
+    for src, dst in pairs:
+        assert open(src, 'rb').read() == open(dst, 'rb').read()
+    assert copier.method_counts["reflink"] + copier.method_counts["hardlink"] == 2
+
+
+def test_copy_files_does_not_write_through_existing_link(tmp_path):
+    pairs = _make_sources(tmp_path, count=2)
+    (src_a, dst_a), (src_b, _) = pairs
+    os.makedirs(os.path.dirname(dst_a))
+    os.link(src_b, dst_a)  # destination currently shares an inode with another file
+
+    assert FileCopier(link_mode="copy").copy_files([(src_a, dst_a)]) == []
+    assert open(dst_a, 'rb').read() == open(src_a, 'rb').read()
+    assert open(src_b, 'rb').read() == bytes([1]) * 3000
+
+
+def test_copy_files_reports_missing_sources(tmp_path):
+    missing = str(tmp_path / "missing.png")
+    errors = FileCopier().copy_files([(missing, str(tmp_path / "out.png"))])
+    assert len(errors) == 1
+    assert errors[0][0] == missing
+
+
+def test_unknown_link_mode_rejected():
+    with pytest.raises(ValueError):
+        FileCopier(link_mode="symlink")
@@ -0,0 +1,57 @@
+import os
+
+from PyQt5.QtGui import QColor, QImage
+
+from src import image_importer
+from src.image_importer import ImageImporter, allocate_filenames, collect_image_files, grid_layout
+
+
+def _write_image(path, width=40, height=20):
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor("orange"))
+    assert image.save(path)
+    return path
+
+
+def test_collect_and_allocate_filenames(tmp_path):
+    folder = tmp_path / "pics"
+    (folder / "nested").mkdir(parents=True)
+    a = _write_image(str(folder / "a.png"))
+    b = _write_image(str(folder / "nested" / "a.png"))
+    (folder / "notes.txt").write_text("not an image")
+    assert collect_image_files([str(folder), a]) == [a, b]
+
+    images = tmp_path / "images"
+    images.mkdir()
+    (images / "a.png").write_bytes(b"existing")
+    assert allocate_filenames([a, b], str(images)) == ["a_1.png", "a_2.png"]
+
+
+def test_grid_layout_fits_images_in_area():
+    placements = grid_layout([(400, 200), (100, 100), (50, 50)], 800, 600, spacing=10)
+    assert len(placements) == 3
+    # Two columns, two rows: cells are 385 x 285
+    assert placements[0] == (202.5, 152.5, 0.96)
+    assert placements[1][2] == 1.0 and placements[1][0] > placements[0][0]
+    assert placements[2][1] > placements[0][1]
+    assert grid_layout([], 800, 600) == []
+
+
+def test_import_files_copies_measures_and_decodes(tmp_path, qapp):
+    sources = [_write_image(str(tmp_path / f"src{i}.png"), 30 + i, 10) for i in range(5)]
+    broken = str(tmp_path / "broken.png")
+    with open(broken, "wb") as f:
+        f.write(b"not really a png")
+    missing = str(tmp_path / "missing.png")
+    progress = []
+    results = ImageImporter(max_workers=3).import_files(
+        sources + [broken, missing], str(tmp_path / "images"), progress_callback=lambda d, t: progress.append((d, t)))
+
+    assert [r.filename for r in results[:5]] == [f"src{i}.png" for i in range(5)]
+    assert all(os.path.exists(r.target_path) for r in results[:6])
+    assert [(r.width, r.height) for r in results[:5]] == [(30 + i, 10) for i in range(5)]
+    assert all(r.image is not None and r.image.width() == r.width for r in results[:5])
+    assert (results[5].width, results[5].height) == image_importer.FALLBACK_SIZE
+    assert results[5].image is None and results[5].error is None
+    assert results[6].error and "Could not copy" in results[6].error
+    assert progress[-1] == (7, 7)
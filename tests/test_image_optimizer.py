@@ -0,0 +1,55 @@
+import os
+
+from PyQt5.QtGui import QColor, QImage, QImageReader
+
+from src.image_optimizer import ImageOptimizer
+
+
+def _write_image(path, width=300, height=150):
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor('navy'))
+    assert image.save(str(path))
+    return str(path)
+
+
+def test_target_sizes_skip_ratios_needing_full_resolution(tmp_path):
+    optimizer = ImageOptimizer(str(tmp_path), device_pixel_ratios=(2, 1, 3))
+    assert optimizer.target_sizes(1000, 500, 0.2) == [(1.0, 200, 100), (2.0, 400, 200), (3.0, 600, 300)]
+    assert optimizer.target_sizes(1000, 500, 0.5) == [(1.0, 500, 250), (2.0, None, None), (3.0, None, None)]
+
+
+def test_build_encodes_once_and_reuses_cache(tmp_path):
+    src = _write_image(tmp_path / "photo.jpg")
+    optimizer = ImageOptimizer(str(tmp_path / "cache"), quality=70)
+    assert optimizer.build([(src, "abc", 60, 30), (src, "abc", 60, 30)]) == []
+    assert optimizer.encoded_count == 1
+    cached = optimizer.cache_path("abc", 60, 30, ".jpg")
+    size = QImageReader(cached).size()
+    assert (size.width(), size.height()) == (60, 30)
+    assert os.listdir(tmp_path / "cache") == [os.path.basename(cached)]
+
+    assert optimizer.build([(src, "abc", 60, 30)]) == []
+    assert (optimizer.encoded_count, optimizer.cached_count) == (0, 1)
+
+
+def test_build_reports_unreadable_sources(tmp_path):
+    bad = tmp_path / "broken.png"
+    bad.write_bytes(b'not an image')
+    optimizer = ImageOptimizer(str(tmp_path / "cache"))
+    errors = optimizer.build([(str(bad), "def", 10, 10)])
+    assert len(errors) == 1 and errors[0][0] == str(bad)
+    assert not os.path.exists(optimizer.cache_path("def", 10, 10, ".png"))
+
+
+def test_prune_removes_variants_no_job_needs(tmp_path):
+    src = _write_image(tmp_path / "photo.jpg")
+    optimizer = ImageOptimizer(str(tmp_path / "cache"))
+    old_jobs = [(src, "old", 60, 30), (src, "old", 120, 60)]
+    new_jobs = [(src, "new", 60, 30)]
+    assert optimizer.build(old_jobs + new_jobs) == []
+    (tmp_path / "cache" / "running.jpg.123.tmp").write_bytes(b'partial')
+    removed, freed = optimizer.prune(new_jobs)
+    assert removed == 2 and freed > 0
+    assert sorted(os.listdir(tmp_path / "cache")) == [os.path.basename(optimizer.job_path(new_jobs[0])),
+                                                      "running.jpg.123.tmp"]
+    assert optimizer.prune(new_jobs) == (0, 0)
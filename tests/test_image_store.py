@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+
+import infocanvas
+from src import utils
+from src.image_store import ImageStore
+
+
+def _project(base_dir, name, images):
+    project_dir = base_dir / name
+    images_dir = project_dir / utils.PROJECT_IMAGES_DIRNAME
+    os.makedirs(images_dir)
+    config = utils.get_default_config()
+    config['images'] = []
+    for index, (filename, data) in enumerate(images.items()):
+        (images_dir / filename).write_bytes(data)
+        config['images'].append({'id': f'img{index}', 'path': filename})
+    (project_dir / utils.PROJECT_CONFIG_FILENAME).write_text(json.dumps(config))
+    return project_dir, config
+
+
+def _save(project_dir, config):
+    (project_dir / utils.PROJECT_CONFIG_FILENAME).write_text(json.dumps(config))
+
+
+def test_add_file_deduplicates_and_materializes_links(tmp_path):
+    store = ImageStore(base_dir=str(tmp_path))
+    first = tmp_path / "logo.PNG"
+    second = tmp_path / "copy_of_logo.png"
+    first.write_bytes(b"logo-bytes")
+    second.write_bytes(b"logo-bytes")
+
+    blob = store.add_file(str(first))
+    assert blob == hashlib.sha256(b"logo-bytes").hexdigest() + ".png"
+    assert store.add_file(str(second)) == blob
+    assert store.blob_path(blob).startswith(os.path.join(str(tmp_path), utils.IMAGE_STORE_DIRNAME, blob[:2]))
+    assert not os.path.samefile(store.blob_path(blob), first) # User files are copied, not linked
+
+    dest = tmp_path / "proj" / "images" / "logo.png"
+    store.materialize(blob, str(dest))
+    assert os.path.samefile(store.blob_path(blob), dest)
+
+
+def test_adopt_project_merges_identical_images(tmp_path):
+    project_dir, config = _project(tmp_path, "demo", {"a.png": b"same", "b.png": b"same", "c.png": b"other"})
+    store = ImageStore(base_dir=str(tmp_path))
+    assert store.adopt_project(str(project_dir), config) == 3
+    images = project_dir / utils.PROJECT_IMAGES_DIRNAME
+    assert config['images'][0]['blob'] == config['images'][1]['blob'] != config['images'][2]['blob']
+    assert os.path.samefile(images / "a.png", images / "b.png")
+    assert store.stats()["blobs"] == 2
+
+    # A deleted file comes back from its blob
+    os.remove(images / "c.png")
+    assert store.restore_missing(str(images), config['images'][2])
+    assert (images / "c.png").read_bytes() == b"other"
+
+
+def test_garbage_collection_keeps_referenced_blobs(tmp_path, capsys):
+    project_dir, config = _project(tmp_path, "demo", {"a.png": b"keep", "b.png": b"drop"})
+    store = ImageStore(base_dir=str(tmp_path))
+    store.adopt_project(str(project_dir), config)
+    dropped = config['images'].pop(1)['blob']
+    _save(project_dir, config)
+    kept = config['images'][0]['blob']
+
+    assert store.reference_counts() == {kept: 1}
+    assert store.collect_garbage()["removed"] == [] # Still within the grace period
+    assert store.collect_garbage(dry_run=True, grace_seconds=0)["removed"] == [dropped]
+    assert store.has(dropped)
+
+    assert infocanvas.main(["store", "gc", "--projects-dir", str(tmp_path), "--grace", "0"]) == 0
+    assert json.loads(capsys.readouterr().out)["removed"] == [dropped]
+    assert not store.has(dropped) and store.has(kept)
+
+
+def test_file_sha256_memory_mapped_matches_chunked(tmp_path, monkeypatch):
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(100_000))
+    expected = hashlib.sha256(path.read_bytes()).hexdigest()
+    assert utils.file_sha256(str(path)) == expected
+    monkeypatch.setattr(utils, 'MMAP_HASH_MIN_BYTES', 1)
+    assert utils.file_sha256(str(path)) == expected
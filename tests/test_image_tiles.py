@@ -0,0 +1,170 @@
+import os
+
+import pytest
+
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QImage, QPainter, QPixmap
+from PyQt5.QtWidgets import QStyleOptionGraphicsItem
+
+from src import image_tiles, utils
+from src.draggable_image_item import DraggableImageItem
+
+
+def _write_split_image(path, width=600, height=300):
+    """Left half red, right half blue."""
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor('red'))
+    painter = QPainter(image)
+    painter.fillRect(width // 2, 0, width - width // 2, height, QColor('blue'))
+    painter.end()
+    assert image.save(str(path))
+    return str(path)
+
+
+def test_build_pyramid_writes_deep_zoom_layout(tmp_path):
+    for ext in ("png", "jpg"):  # PNG is sliced from one decode, JPEG read band by band
+        src = _write_split_image(tmp_path / f"scan.{ext}")
+        dzi = str(tmp_path / f"scan_{ext}.dzi")
+        assert image_tiles.build_pyramid(src, dzi, tile_size=128) is True
+
+        info = image_tiles.read_dzi(dzi)
+        assert (info["width"], info["height"], info["tile_size"], info["format"]) == (600, 300, 128, ext)
+        files_dir = image_tiles.tiles_folder(dzi)
+        assert sorted(int(level) for level in os.listdir(files_dir)) == list(range(11))
+        assert len(os.listdir(os.path.join(files_dir, "10"))) == 5 * 3
+        assert sorted(os.listdir(os.path.join(files_dir, "9"))) == ["0_0.%s" % ext, "0_1.%s" % ext, "1_0.%s" % ext,
+                                                                    "1_1.%s" % ext, "2_0.%s" % ext, "2_1.%s" % ext]
+        corner = QImage(os.path.join(files_dir, "10", f"4_2.{ext}"))
+        assert (corner.width(), corner.height()) == (600 - 4 * 128, 300 - 2 * 128)
+        assert QColor(corner.pixel(10, 10)).blue() > 200
+        assert QColor(QImage(os.path.join(files_dir, "10", f"0_1.{ext}")).pixel(10, 10)).red() > 200
+        assert QImage(os.path.join(files_dir, "0", f"0_0.{ext}")).size().width() == 1
+        assert not os.path.exists(files_dir + ".partial")
+
+
+def test_tiled_source_paints_only_visible_tiles(tmp_path, qapp):
+    src = _write_split_image(tmp_path / "scan.png")
+    dzi = str(tmp_path / "scan_png.dzi")
+    assert image_tiles.build_pyramid(src, dzi, tile_size=128)
+    source = image_tiles.TiledImageSource(dzi, 600, 300, cache=image_tiles.TileCache())
+    assert source.level_for_scale(1.0) == 10
+    assert source.level_for_scale(4.0) == 10
+    assert source.level_for_scale(0.25) == 8
+    assert source.preview_pixmap().width() == 75  # Level 7 (75x38) is the largest single-tile level
+
+    target = QImage(600, 300, QImage.Format_RGB32)
+    painter = QPainter(target)
+    assert source.paint(painter, QRectF(0, 0, 200, 100), 1.0) == 2
+    assert source.paint(painter, QRectF(0, 0, 600, 300), 0.25) == 2
+    painter.end()
+    assert QColor(target.pixel(50, 50)).red() > 200
+
+
+def test_tile_cache_evicts_least_recently_used(tmp_path, qapp):
+    paths = []
+    for i in range(3):
+        pixmap_image = QImage(16, 16, QImage.Format_RGB32)
+        pixmap_image.fill(QColor('green'))
+        path = str(tmp_path / f"{i}.png")
+        pixmap_image.save(path)
+        paths.append(path)
+    cache = image_tiles.TileCache(max_bytes=2 * 16 * 16 * 4)
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+    assert len(cache) == 2 and paths[1] not in cache._tiles
+    assert cache.get(str(tmp_path / "missing.png")) is None
+
+
+def test_large_image_item_builds_pyramid_in_background(tmp_path, monkeypatch, qapp):
+    monkeypatch.setattr(utils, 'TILED_IMAGE_MIN_PIXELS', 1000)
+    images_dir = tmp_path / utils.PROJECT_IMAGES_DIRNAME
+    images_dir.mkdir()
+    src = _write_split_image(images_dir / "scan.png")
+    item = DraggableImageItem.from_file({'path': 'scan.png'}, src, str(tmp_path))
+    assert item.tile_source is not None
+    assert item.boundingRect() == QRectF(0, 0, 600, 300)
+
+    dzi = image_tiles.pyramid_path(str(tmp_path), "scan.png")
+    assert image_tiles.tile_builder().schedule(src, dzi).result(timeout=30) is True
+    qapp.processEvents()
+    assert item.tile_source.is_ready()
+    assert not item.pixmap().isNull()
+
+    small = DraggableImageItem.from_file({'path': 'scan.png'}, src, None)
+    assert small.tile_source is None and isinstance(small.pixmap(), QPixmap)
+
+
+def test_build_pyramid_refuses_whole_decode_of_huge_unclippable_image(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_tiles, 'FULL_DECODE_MAX_PIXELS', 1000)
+    src = _write_split_image(tmp_path / "scan.png")
+    dzi = str(tmp_path / "scan_png.dzi")
+    with pytest.raises(ValueError, match="too large"):
+        image_tiles.build_pyramid(src, dzi, tile_size=128)
+    assert not os.path.exists(dzi)
+    jpg = _write_split_image(tmp_path / "scan.jpg")  # Read in bands, so no limit applies
+    assert image_tiles.build_pyramid(jpg, str(tmp_path / "scan_jpg.dzi"), tile_size=128)
+
+
+
+def test_build_pyramid_reads_jpeg_in_few_large_strips(tmp_path, monkeypatch):
+    clips = []
+
+    class CountingReader(image_tiles.QImageReader):
+        def setClipRect(self, rect):
+            clips.append((rect.top(), rect.height()))
+            super().setClipRect(rect)
+
+    monkeypatch.setattr(image_tiles, 'QImageReader', CountingReader)
+    monkeypatch.setattr(image_tiles, 'FULL_DECODE_MAX_PIXELS', 600 * 256)
+    src = _write_split_image(tmp_path / "scan.jpg")
+    dzi = str(tmp_path / "scan_jpg.dzi")
+    assert image_tiles.build_pyramid(src, dzi, tile_size=128)
+    assert clips == [(0, 256), (256, 44)]
+    files_dir = image_tiles.tiles_folder(dzi)
+    assert len(os.listdir(os.path.join(files_dir, "10"))) == 5 * 3
+    assert QColor(QImage(os.path.join(files_dir, "10", "4_2.jpg")).pixel(10, 10)).blue() > 200
+
+
+def test_failed_pyramid_is_shown_and_not_rebuilt_until_the_file_changes(tmp_path, monkeypatch, qapp):
+    monkeypatch.setattr(utils, 'TILED_IMAGE_MIN_PIXELS', 1000)
+    monkeypatch.setattr(image_tiles, 'FULL_DECODE_MAX_PIXELS', 1000)
+    builds = []
+    build_pyramid = image_tiles.build_pyramid
+
+    def counting_build(src_path, *args, **kwargs):
+        builds.append(src_path)
+        return build_pyramid(src_path, *args, **kwargs)
+
+    monkeypatch.setattr(image_tiles, 'build_pyramid', counting_build)
+    images_dir = tmp_path / utils.PROJECT_IMAGES_DIRNAME
+    images_dir.mkdir()
+    src = _write_split_image(images_dir / "scan.png")
+    dzi = image_tiles.pyramid_path(str(tmp_path), "scan.png")
+    builder = image_tiles.tile_builder()
+
+    item = DraggableImageItem.from_file({'path': 'scan.png'}, src, str(tmp_path))
+    assert builder.schedule(src, dzi).result(timeout=30) is False
+    qapp.processEvents()
+    assert "too large" in item.tile_error and "too large" in item.toolTip()
+    target = QImage(600, 300, QImage.Format_RGB32)
+    painter = QPainter(target)
+    item.paint(painter, QStyleOptionGraphicsItem())  # Grey box with the reason written on it
+    painter.end()
+    assert QColor(target.pixel(2, 2)) == QColor(Qt.lightGray)
+
+    again = DraggableImageItem.from_file({'path': 'scan.png'}, src, str(tmp_path))  # E.g. the canvas re-rendered
+    assert "too large" in again.tile_error
+    assert builds == [src]
+
+    os.utime(src, (0, 0))  # A changed file is tried again
+    assert builder.schedule(src, dzi).result(timeout=30) is False
+    assert builds == [src, src]
+
+def test_pyramid_path_keeps_similar_file_names_apart(tmp_path):
+    paths = {image_tiles.pyramid_path(str(tmp_path), name) for name in ("a.b.png", "a_b.png", "a.b_png", "a.B.png")}
+    assert len(paths) == 4
+    assert image_tiles.pyramid_path(str(tmp_path), "a.b.png") == image_tiles.pyramid_path(
+        str(tmp_path), os.path.join(str(tmp_path), utils.PROJECT_IMAGES_DIRNAME, "a.b.png"))
+    assert os.path.basename(image_tiles.pyramid_path(str(tmp_path), "scan.png")).startswith("scan_png_")
@@ -1054,3 +1054,48 @@ def test_info_area_item_default_show_on_hover_connected(qtbot):
     item = InfoAreaItem(rect_config)
     assert item.config_data.get('show_on_hover_connected') == False, \
         "InfoAreaItem should have 'show_on_hover_connected' as False by default."
+
+
+def _render_scene(scene, scale):
+    from PyQt5.QtGui import QImage, QPainter
+    source = scene.itemsBoundingRect()
+    image = QImage(max(1, int(source.width() * scale)), max(1, int(source.height() * scale)), QImage.Format_ARGB32)
+    image.fill(Qt.white)
+    painter = QPainter(image)
+    scene.render(painter, QRectF(image.rect()), source)
+    painter.end()
+    return image
+
+
+def test_text_legibility_threshold(qapp):
+    item = InfoAreaItem({'id': 'lod1', 'text': 'Hello', 'width': 100, 'height': 50,
+                         'font_size': '12px'})
+    assert item.is_text_legible(1.0)
+    assert not item.is_text_legible(6 / 12 - 0.01)
+    assert item.is_text_legible(6 / 12)
+
+
+def test_text_item_created_lazily_and_greeked_when_zoomed_out(qapp):
+    scene = QGraphicsScene()
+    item = InfoAreaItem({'id': 'lod2', 'text': 'Some fairly long explanatory text ' * 4,
+                         'width': 300, 'height': 200, 'font_size': '14px'})
+    scene.addItem(item)
+    assert item._text_item is None
+
+    _render_scene(scene, 0.1)
+    QApplication.processEvents()
+    assert item._text_item is None # Far too small to read: no document is laid out
+    assert item._greek_path is not None and not item._greek_path.isEmpty()
+
+    _render_scene(scene, 1.0)
+    QApplication.processEvents()
+    assert item._text_item is not None
+    assert item.text_item.document().toPlainText().startswith('Some fairly long')
+
+
+def test_greek_path_invalidated_on_text_change(qapp):
+    item = InfoAreaItem({'id': 'lod3', 'text': 'Short', 'width': 200, 'height': 100})
+    item._greek_path = item._build_greek_path()
+    item.set_display_text('Now a different text')
+    assert item._greek_path is None
+    assert item._text_item is None
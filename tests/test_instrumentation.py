@@ -0,0 +1,109 @@
+import csv
+import json
+import threading
+
+import pytest
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QKeyEvent
+
+from src import instrumentation
+from src.performance_hud import format_summary
+
+
+@pytest.fixture(autouse=True)
+def instrumentation_off():
+    instrumentation.disable()
+    yield
+    instrumentation.disable()
+
+
+@instrumentation.timed("double")
+def double(value):
+    return value * 2
+
+
+def test_disabled_instrumentation_records_nothing():
+    assert double(2) == 4
+    with instrumentation.span("block"):
+        pass
+    instrumentation.count("hits")
+    assert instrumentation.recorder() is None
+
+
+def test_timed_span_and_count_are_summarized():
+    recorder = instrumentation.enable()
+    for value in range(10):
+        double(value)
+    with instrumentation.span("block"):
+        assert recorder.current_operations() == ["block"]
+        double(1)
+    instrumentation.count("hits", 3)
+    summary = recorder.summary()
+    assert summary["double"]["count"] == 11
+    assert summary["block"]["count"] == 1
+    assert summary["hits"] == {"count": 3, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0, "total_ms": 0.0}
+    assert 0 <= summary["double"]["p50_ms"] <= summary["double"]["p95_ms"] <= summary["double"]["max_ms"]
+    assert recorder.current_operations() == []
+
+
+def test_operations_are_tracked_per_thread():
+    recorder = instrumentation.enable()
+    inside = threading.Event()
+    release = threading.Event()
+
+    @instrumentation.timed("worker_job")
+    def job():
+        inside.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=job)
+    worker.start()
+    inside.wait(5)
+    assert recorder.current_operations(worker.ident) == ["worker_job"]
+    assert recorder.current_operations() == []
+    release.set()
+    worker.join()
+    assert recorder.summary()["worker_job"]["count"] == 1
+
+
+def test_export_trace_as_json_and_csv(tmp_path):
+    recorder = instrumentation.enable()
+    double(1)
+    with instrumentation.span("block"):
+        pass
+    assert recorder.export_trace(str(tmp_path / "trace.json")) == 2
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert [event["name"] for event in trace["traceEvents"]] == ["double", "block"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace["traceEvents"])
+    recorder.export_trace(str(tmp_path / "trace.csv"))
+    with open(tmp_path / "trace.csv", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["name", "start_ms", "duration_ms", "thread"]
+    assert [row[0] for row in rows[1:]] == ["double", "block"]
+
+
+def test_format_summary_orders_by_total_time():
+    text = format_summary({
+        "fast": {"count": 5, "p50_ms": 1.0, "p95_ms": 1.0, "max_ms": 1.0, "total_ms": 5.0},
+        "slow": {"count": 1, "p50_ms": 50.0, "p95_ms": 50.0, "max_ms": 50.0, "total_ms": 50.0},
+    })
+    lines = text.splitlines()
+    assert lines[1].startswith("slow") and lines[2].startswith("fast")
+    assert format_summary({}) == "No operations recorded yet."
+
+
+def test_hud_shortcut_toggles_recording_of_app_operations(base_app_fixture):
+    app = base_app_fixture
+    event = QKeyEvent(QKeyEvent.KeyPress, Qt.Key_P, Qt.ControlModifier | Qt.ShiftModifier)
+    assert app.input_handler.handle_key_press(event)
+    assert app.performance_hud.isVisible() and instrumentation.is_enabled()
+    app.config["background"]["width"] += 1
+    app.save_config()
+    app.render_canvas_from_config()
+    summary = instrumentation.recorder().summary()
+    assert summary["save_config"]["count"] == 1
+    assert summary["render_canvas_from_config"]["count"] == 1
+    app.performance_hud.refresh()
+    assert "save_config" in app.performance_hud.table_label.text()
+    app.toggle_performance_hud()
+    assert not app.performance_hud.isVisible() and not instrumentation.is_enabled()
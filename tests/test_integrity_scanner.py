@@ -0,0 +1,96 @@
+import json
+import os
+
+from PyQt5.QtGui import QColor, QImage
+
+import infocanvas
+from src import utils
+from src.integrity_scanner import clean_project, has_issues, scan_project, scan_projects
+
+
+def _project(base_dir, name):
+    project_dir = base_dir / name
+    images_dir = project_dir / utils.PROJECT_IMAGES_DIRNAME
+    os.makedirs(images_dir)
+    image = QImage(30, 20, QImage.Format_RGB32)
+    image.fill(QColor("navy"))
+    image.save(str(images_dir / "ok.png"))
+    image.save(str(images_dir / "resized.png"))
+    (images_dir / "orphan.png").write_bytes(b"leftover")
+    (images_dir / "broken.png").write_bytes(b"not an image")
+    config = utils.get_default_config()
+    config['images'] = [
+        {'id': 'ok', 'path': 'ok.png', 'original_width': 30, 'original_height': 20},
+        {'id': 'resized', 'path': 'resized.png', 'original_width': 60, 'original_height': 40},
+        {'id': 'gone', 'path': 'gone.png', 'original_width': 10, 'original_height': 10},
+        {'id': 'broken', 'path': 'broken.png'},
+    ]
+    (project_dir / utils.PROJECT_CONFIG_FILENAME).write_text(json.dumps(config))
+    return project_dir
+
+
+def test_scan_project_reports_each_kind_of_issue(tmp_path, qapp):
+    report = scan_project(str(_project(tmp_path, "demo")))
+    assert [e["id"] for e in report["missing"]] == ["gone"]
+    assert [e["id"] for e in report["unreadable"]] == ["broken"]
+    assert report["mismatched"] == [{"id": "resized", "path": "resized.png", "expected": [60, 40], "actual": [30, 20]}]
+    assert report["orphaned"] == ["orphan.png"]
+    assert report["orphaned_bytes"] == len(b"leftover")
+
+    (tmp_path / "bad").mkdir()
+    (tmp_path / "bad" / utils.PROJECT_CONFIG_FILENAME).write_text("{not json")
+    reports = scan_projects([str(tmp_path / "demo"), str(tmp_path / "bad")])
+    assert [r["project"] for r in reports] == ["demo", "bad"]
+    assert "error" in reports[1] and has_issues(reports[1])
+
+
+def test_clean_project_applies_selected_fixes(tmp_path, qapp):
+    project_dir = _project(tmp_path, "demo")
+    report = scan_project(str(project_dir))
+    summary = clean_project(str(project_dir), report, remove_orphaned=True, drop_missing=True, fix_dimensions=True)
+    assert summary["removed"] == ["orphan.png"] and summary["config_changes"] == 2
+    config = json.loads((project_dir / utils.PROJECT_CONFIG_FILENAME).read_text())
+    assert [img['id'] for img in config['images']] == ['ok', 'resized', 'broken']
+    assert (config['images'][1]['original_width'], config['images'][1]['original_height']) == (30, 20)
+
+    after = scan_project(str(project_dir))
+    assert not after["missing"] and not after["mismatched"] and not after["orphaned"]
+
+
+def test_scan_command_cleans_and_exits_with_remaining_issues(tmp_path, qapp, capsys):
+    _project(tmp_path, "demo")
+    assert infocanvas.main(["scan", "--all", "--projects-dir", str(tmp_path), "--remove-orphans"]) == 1
+    output = json.loads(capsys.readouterr().out)
+    assert output["projects"][0]["cleanup"]["removed"] == ["orphan.png"]
+    assert output["projects"][0]["orphaned"] == [] # The report shows the project after the cleanup
+    assert output["projects_with_issues"] == 1 # Missing, broken and mis-sized images remain
+    assert infocanvas.main(["scan", "nope", "--projects-dir", str(tmp_path)]) == 2
+
+
+def test_scan_reports_and_clears_export_cache(tmp_path, qapp, capsys):
+    project_dir = _project(tmp_path, "demo")
+    cache_dir = project_dir / utils.EXPORT_CACHE_DIRNAME
+    cache_dir.mkdir()
+    (cache_dir / "abc_10x10_q85.png").write_bytes(b'x' * 100)
+    assert scan_project(str(project_dir))["export_cache_bytes"] == 100
+    infocanvas.main(["scan", "demo", "--projects-dir", str(tmp_path), "--clear-export-cache"])
+    output = json.loads(capsys.readouterr().out)
+    assert output["projects"][0]["cleanup"]["freed_bytes"] == 100
+    assert not cache_dir.exists()
+
+
+def test_integrity_dialog_scans_in_background_and_deletes_orphans(tmp_path, qtbot, monkeypatch):
+    from PyQt5.QtWidgets import QMessageBox
+    from src.integrity_dialog import ImageIntegrityDialog
+    project_dir = _project(tmp_path, "demo")
+    dialog = ImageIntegrityDialog(base_dir=str(tmp_path))
+    qtbot.addWidget(dialog)
+    qtbot.waitUntil(lambda: bool(dialog.reports), timeout=5000)
+    assert dialog.tree.topLevelItemCount() == 1
+    assert dialog.remove_orphans_button.isEnabled()
+
+    monkeypatch.setattr(QMessageBox, 'question', lambda *a, **k: QMessageBox.Yes)
+    dialog.clean(remove_orphaned=True).result(timeout=5)
+    qtbot.waitUntil(lambda: not dialog.reports[0]["orphaned"], timeout=5000)
+    assert not (project_dir / utils.PROJECT_IMAGES_DIRNAME / "orphan.png").exists()
+    assert not dialog.remove_orphans_button.isEnabled()
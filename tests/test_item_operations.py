@@ -542,3 +542,73 @@ def test_connect_selected_info_areas_disallows(mock_cli, item_ops, monkeypatch):
     mock_cli.assert_not_called()
 
 # End of tests
+
+
+def test_import_images_is_one_save_and_one_undo_step(base_app_fixture, tmp_path):
+    from PyQt5.QtGui import QColor, QImage
+    app = base_app_fixture
+    folder = tmp_path / "bulk"
+    folder.mkdir()
+    for i in range(4):
+        image = QImage(60, 40, QImage.Format_RGB32)
+        image.fill(QColor("teal"))
+        image.save(str(folder / f"same.png" if i == 0 else folder / f"pic{i}.png"))
+    app.save_config() # Baseline undo snapshot
+    images_before = len(app.config.get('images', []))
+    undo_depth = len(app.config_snapshot_stack)
+
+    with patch.object(app, 'save_config', wraps=app.save_config) as save:
+        new_ids = app.item_operations.import_images([str(folder)])
+    save.assert_called_once()
+    assert len(new_ids) == 4 and len(set(new_ids)) == 4
+    assert len(app.config['images']) == images_before + 4
+    assert all(app.item_map[i].isSelected() for i in new_ids)
+    assert len(app.config_snapshot_stack) == undo_depth + 1
+
+    app.undo_last_action()
+    assert len(app.config['images']) == images_before
+
+
+def test_import_images_with_image_store_shares_identical_files(base_app_fixture, tmp_path, monkeypatch):
+    from PyQt5.QtGui import QColor, QImage
+    app = base_app_fixture
+    app.config['use_image_store'] = True
+    sources = []
+    for name in ("one.png", "two.png"):
+        image = QImage(30, 30, QImage.Format_RGB32)
+        image.fill(QColor("purple"))
+        image.save(str(tmp_path / name))
+        sources.append(str(tmp_path / name))
+
+    new_ids = app.item_operations.import_images(sources)
+    entries = [app.item_map[i].config_data for i in new_ids]
+    assert entries[0]['blob'] == entries[1]['blob']
+    assert entries[0]['path'] == entries[1]['path'] == "one.png"
+    images_folder = app._get_project_images_folder(app.current_project_path)
+    assert sorted(os.listdir(images_folder)) == ["one.png"]
+
+
+def test_image_drop_filter_passes_local_files_and_follows_new_viewport(qapp, tmp_path):
+    from PyQt5.QtCore import QMimeData, QPoint, QUrl
+    from PyQt5.QtGui import QDragEnterEvent, QDropEvent
+    from PyQt5.QtWidgets import QGraphicsView, QWidget
+    from src.item_operations import ImageDropFilter
+
+    view = QGraphicsView(QGraphicsScene())
+    dropped = []
+    ImageDropFilter(view, dropped.append)
+
+    def drop(urls):
+        mime = QMimeData()
+        mime.setUrls(urls)
+        enter = QDragEnterEvent(QPoint(5, 5), Qt.CopyAction, mime, Qt.LeftButton, Qt.NoModifier)
+        QApplication.sendEvent(view.viewport(), enter)
+        QApplication.sendEvent(view.viewport(), QDropEvent(QPoint(5, 5), Qt.CopyAction, mime, Qt.LeftButton, Qt.NoModifier))
+
+    drop([QUrl.fromLocalFile(str(tmp_path / "a.png"))])
+    assert dropped == [[str(tmp_path / "a.png")]]
+    view.setViewport(QWidget())
+    qapp.processEvents()
+    drop([QUrl("https://example.com/a.png")]) # Not a local file: left to the scene
+    drop([QUrl.fromLocalFile(str(tmp_path))])
+    assert dropped == [[str(tmp_path / "a.png")], [str(tmp_path)]]
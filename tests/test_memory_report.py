@@ -0,0 +1,58 @@
+import json
+
+from PyQt5.QtGui import QPixmap
+
+from src import memory_report
+from src import scaled_pixmap_cache
+from src.draggable_image_item import DraggableImageItem
+from src.memory_report_dialog import MemoryReportDialog
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    text = "x" * 1000
+    single = memory_report.deep_sizeof({"a": text})
+    assert single > 1000
+    assert memory_report.deep_sizeof({"a": text, "b": text}) < single + 200
+    assert memory_report.deep_sizeof([[1, 2], [3]]) > memory_report.deep_sizeof([])
+
+
+def test_report_breaks_down_project_memory(base_app_fixture):
+    app = base_app_fixture
+    pixmap = QPixmap(200, 100)
+    pixmap.fill()
+    item = DraggableImageItem(pixmap, {"id": "img_1", "path": "photo.png"})
+    app.scene.addItem(item)
+    app.item_map["img_1"] = item
+    app.item_operations.add_info_area()
+    area = next(i for i in app.item_map.values() if i is not item)
+    area.text_item # Lay out its document
+    app.clipboard_data = {"type": "info_rectangle", "text": "y" * 5000}
+
+    report = memory_report.build_report(app)
+    assert report["images"][0]["path"] == "photo.png"
+    assert report["images"][0]["bytes"] == 200 * 100 * pixmap.depth() // 8
+    assert report["text_documents"][0]["id"] == area.config_data["id"]
+    assert report["sections"]["clipboard"] > 5000
+    assert report["undo_history_entries"] == len(app.config_snapshot_stack)
+    assert report["total_bytes"] == sum(report["sections"].values())
+    text = memory_report.format_report(report)
+    assert "photo.png" in text and "undo_history" in text
+    json.dumps(report)
+
+
+def test_trim_actions_free_memory(base_app_fixture, tmp_path):
+    app = base_app_fixture
+    for _ in range(3):
+        app.item_operations.add_info_area()
+    assert len(app.config_snapshot_stack) > 1
+    app.clipboard_data = {"text": "z" * 10000}
+    scaled_pixmap_cache.scaled_pixmap_cache()._store(("key", 10, 10), QPixmap(10, 10).toImage())
+
+    dialog = MemoryReportDialog(app)
+    freed = dialog.trim(["undo_history", "clipboard", "scaled_pixmaps"])
+    assert freed > 10000
+    assert len(app.config_snapshot_stack) == 1 and app.clipboard_data is None
+    assert len(scaled_pixmap_cache.scaled_pixmap_cache()) == 0
+    assert "undo_history" in dialog.report_text.toPlainText()
+    assert dialog.save_report(str(tmp_path / "memory.json"))
+    dialog.deleteLater()
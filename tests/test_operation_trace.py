@@ -0,0 +1,91 @@
+import copy
+import json
+import os
+
+import pytest
+
+import infocanvas
+from src import instrumentation
+from src import operation_trace
+from src import synthetic_project
+from src.info_area_item import InfoAreaItem
+
+
+@pytest.fixture(autouse=True)
+def not_recording():
+    operation_trace.stop_recording()
+    yield
+    operation_trace.stop_recording()
+
+
+def test_recorded_session_replays_to_the_same_state(base_app_fixture, tmp_path):
+    app = base_app_fixture
+    trace_path = str(tmp_path / "trace.jsonl")
+    assert app.toggle_operation_trace(trace_path)
+    assert app.title_bar.operation_trace_action.isChecked()
+    app.item_operations.add_info_area()
+    app.item_operations.add_info_area()
+    first, second = sorted((item for item in app.item_map.values() if isinstance(item, InfoAreaItem)),
+                           key=lambda item: item.config_data['id'])
+    app.scene.clearSelection()
+    first.setSelected(True)
+    app.info_rect_text_input.setPlainText("Typed text")
+    first.config_data['center_x'] += 40
+    first.item_moved.emit(first)
+    second.setSelected(True)
+    app.canvas_manager.align_selected_rects_horizontally()
+    assert not app.toggle_operation_trace()
+    expected = copy.deepcopy(app.config["info_areas"])
+
+    header, operations = operation_trace.load_trace(trace_path)
+    names = [operation["op"] for operation in operations]
+    assert names.count("ItemOperations.add_info_area") == 2
+    assert "CanvasManager.on_scene_selection_changed" in names
+    assert "CanvasManager.align_selected_rects_horizontally" in names
+    assert "InfoCanvasApp.save_config" not in names
+    text_change = next(op for op in operations if op["op"] == "InfoCanvasApp.update_selected_rect_text")
+    assert text_change["inputs"] == {"info_rect_text_input": "Typed text"}
+    move = next(op for op in operations if op["op"] == "CanvasManager.on_graphics_item_moved")
+    assert move["args"][0]["item"] == first.config_data['id']
+    assert header["config"]["info_areas"] == []
+    assert [op["created"] for op in operations if op["op"] == "ItemOperations.add_info_area"] == \
+        [[area["id"]] for area in sorted(app.config["info_areas"], key=lambda area: area["id"])]
+
+    app.config.clear()
+    app.config.update(copy.deepcopy(header["config"]))
+    app.render_canvas_from_config()
+    timings = instrumentation.Recorder()
+    assert operation_trace.replay_operations(app, operations, timings) == 0
+    recorded_ids = [area["id"] for area in expected]
+    replayed = [dict(area, id=recorded_id) for area, recorded_id in zip(app.config["info_areas"], recorded_ids)]
+    assert replayed == expected
+    assert timings.summary()["ItemOperations.add_info_area"]["count"] == 2
+
+
+def test_replay_command_reports_latency_without_touching_the_project(qapp, tmp_path):
+    projects_dir = tmp_path / "projects"
+    config = synthetic_project.generate_config(info_areas=3, images=0, connections=0, project_name="demo")
+    project_path = synthetic_project.write_project(str(projects_dir / "demo"), config)
+    trace_path = tmp_path / "trace.jsonl"
+    operations = [
+        {"op": "InfoCanvasApp.update_selected_rect_text", "args": [], "kwargs": {}, "selection": ["rect_0"],
+         "selected": "rect_0", "inputs": {"info_rect_text_input": "Replayed"}},
+        {"op": "CanvasManager.on_scene_selection_changed", "args": [], "kwargs": {}, "selection": ["rect_1"],
+         "selected": "rect_1", "inputs": {}},
+        {"op": "Nowhere.unknown", "args": [], "kwargs": {}, "selection": [], "selected": None, "inputs": {}},
+    ]
+    with open(trace_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"version": operation_trace.TRACE_VERSION, "project": "demo", "config": config}) + "\n")
+        for operation in operations:
+            f.write(json.dumps(operation) + "\n")
+    output = tmp_path / "replay.json"
+
+    assert infocanvas.main(["replay", str(trace_path), "--projects-dir", str(projects_dir),
+                            "--repeat", "2", "--output", str(output)]) == 0
+    with open(output, encoding="utf-8") as f:
+        result = json.load(f)
+    assert result["operations"] == 3 and result["skipped"] == 1
+    text_result = next(r for r in result["results"] if r["scenario"] == "InfoCanvasApp.update_selected_rect_text")
+    assert text_result["calls"] == 1 and len(text_result["runs"]) == 2
+    with open(os.path.join(project_path, "config.json"), encoding="utf-8") as f:
+        assert json.load(f)["info_areas"][0]["text"] == config["info_areas"][0]["text"]
@@ -0,0 +1,81 @@
+import argparse
+import os
+import pstats
+import tracemalloc
+
+import pytest
+
+from src import profiling
+
+
+@pytest.fixture(autouse=True)
+def profiling_off():
+    profiling.disable()
+    yield
+    profiling.disable()
+
+
+@profiling.profiled("render")
+def build_list(size):
+    return [str(value) for value in range(size)]
+
+
+@profiling.profiled("export")
+def nested_export():
+    return build_list(10)
+
+
+def test_parse_operations():
+    assert profiling.parse_operations("render, export") == ("render", "export")
+    assert profiling.parse_operations("all") == profiling.OPERATIONS
+    with pytest.raises(ValueError):
+        profiling.parse_operations("render,paint")
+
+
+def test_next_invocations_are_captured_as_prof_files(tmp_path):
+    profiler = profiling.enable(["render"], count=2, output_dir=str(tmp_path))
+    for _ in range(3):
+        assert len(build_list(100)) == 100
+    prof_files = sorted(name for name in os.listdir(tmp_path) if name.endswith(".prof"))
+    assert len(prof_files) == 2 and prof_files[0].endswith("_render_1.prof")
+    assert profiler.is_finished()
+    stats = pstats.Stats(str(tmp_path / prof_files[0]))
+    assert any(func_name == "build_list" for _, _, func_name in stats.stats)
+
+
+def test_memory_mode_writes_snapshot_and_allocation_summary(tmp_path):
+    profiling.enable(["export", "render"], mode="memory", output_dir=str(tmp_path))
+    nested_export()
+    names = sorted(os.listdir(tmp_path))
+    # The nested render ran inside the export capture, so it was not captured on its own
+    assert [name.split("_", 2)[2] for name in names] == ["export_1.tracemalloc", "export_1_allocations.txt"]
+    assert not tracemalloc.is_tracing()
+    snapshot = tracemalloc.Snapshot.load(str(tmp_path / names[0]))
+    assert snapshot.traces
+    assert profiling.profiler().remaining == {"export": 0, "render": 1}
+
+
+def test_enable_from_arguments_and_environment(monkeypatch, tmp_path):
+    parser = argparse.ArgumentParser()
+    profiling.add_arguments(parser)
+    assert profiling.enable_from_arguments(parser.parse_args([])) is None
+    args = parser.parse_args(["--profile", "undo,style_save", "--profile-count", "3", "--profile-dir", str(tmp_path)])
+    profiler = profiling.enable_from_arguments(args)
+    assert profiler.remaining == {"undo": 3, "style_save": 3} and profiler.output_dir == str(tmp_path)
+
+    profiling.disable()
+    monkeypatch.setenv(profiling.ENV_VAR, "all")
+    monkeypatch.setenv(profiling.MODE_ENV_VAR, "both")
+    profiler = profiling.enable_from_environment()
+    assert set(profiler.remaining) == set(profiling.OPERATIONS) and profiler.mode == "both"
+    monkeypatch.setenv(profiling.MODE_ENV_VAR, "disk")
+    assert profiling.enable_from_environment() is None
+
+
+def test_undo_in_app_is_profiled(base_app_fixture, tmp_path):
+    app = base_app_fixture
+    app.config["background"]["width"] += 1
+    app.save_config()
+    profiling.enable(["undo"], output_dir=str(tmp_path))
+    app.undo_last_action()
+    assert [name for name in os.listdir(tmp_path) if name.endswith("_undo_1.prof")]
@@ -0,0 +1,101 @@
+import json
+import os
+
+from src import utils
+from src.project_index import ProjectIndex, ProjectIndexRefresher, filter_and_sort, index_path
+
+
+def make_project(base, name, images=(), info_areas=0, last_modified="2024-01-01T00:00:00Z"):
+    project = base / name
+    (project / utils.PROJECT_IMAGES_DIRNAME).mkdir(parents=True)
+    config = {
+        "project_name": name,
+        "last_modified": last_modified,
+        "images": [{"id": f"img{i}", "path": filename} for i, (filename, _) in enumerate(images)],
+        "info_areas": [{"id": f"r{i}"} for i in range(info_areas)],
+        "connections": [],
+    }
+    for filename, data in images:
+        (project / utils.PROJECT_IMAGES_DIRNAME / filename).write_bytes(data)
+    (project / utils.PROJECT_CONFIG_FILENAME).write_text(json.dumps(config))
+    return project, config
+
+
+def test_refresh_builds_entries_and_writes_index(tmp_path):
+    make_project(tmp_path, "alpha", images=[("a.png", b"x" * 10)], info_areas=2)
+    (tmp_path / "not_a_project").mkdir()
+    index = ProjectIndex(str(tmp_path))
+    assert index.refresh()
+    entry = index.projects["alpha"]
+    assert (entry["images"], entry["info_areas"], entry["image_bytes"]) == (1, 2, 10)
+    assert set(index.projects) == {"alpha"}
+    reloaded = ProjectIndex(str(tmp_path))
+    assert reloaded.load() and reloaded.projects["alpha"]["image_bytes"] == 10
+    assert os.path.isfile(index_path(str(tmp_path)))
+
+
+def test_refresh_rereads_only_changed_projects(tmp_path, monkeypatch):
+    make_project(tmp_path, "alpha")
+    beta, config = make_project(tmp_path, "beta")
+    index = ProjectIndex(str(tmp_path))
+    index.refresh()
+    assert not index.refresh() # Nothing changed on disk
+
+    config["info_areas"] = [{"id": "r1"}]
+    (beta / utils.PROJECT_CONFIG_FILENAME).write_text(json.dumps(config))
+    os.utime(beta / utils.PROJECT_CONFIG_FILENAME, (1, 1))
+    rebuilt = []
+    import src.project_index as project_index
+    original = project_index.build_entry
+    monkeypatch.setattr(project_index, "build_entry", lambda path, *a: rebuilt.append(os.path.basename(path)) or original(path, *a))
+    assert index.refresh()
+    assert rebuilt == ["beta"] and index.projects["beta"]["info_areas"] == 1
+
+
+def test_refresh_notices_added_and_removed_projects(tmp_path):
+    make_project(tmp_path, "alpha")
+    index = ProjectIndex(str(tmp_path))
+    index.refresh()
+    gamma, _ = make_project(tmp_path, "gamma")
+    os.remove(tmp_path / "alpha" / utils.PROJECT_CONFIG_FILENAME)
+    os.rmdir(tmp_path / "alpha" / utils.PROJECT_IMAGES_DIRNAME)
+    os.rmdir(tmp_path / "alpha")
+    assert index.refresh()
+    assert set(index.projects) == {"gamma"}
+
+
+def test_update_and_remove_project(tmp_path):
+    project, config = make_project(tmp_path, "alpha", images=[("a.png", b"xyz")])
+    index = ProjectIndex(str(tmp_path))
+    index.update_project(str(project), config)
+    assert ProjectIndex(str(tmp_path)).load()
+    index.remove_project("alpha")
+    reloaded = ProjectIndex(str(tmp_path))
+    reloaded.load()
+    assert reloaded.projects == {}
+
+
+def test_filter_and_sort():
+    entries = [
+        {"name": "Beta", "last_modified": "2024-02", "image_bytes": 5, "images": 1, "info_areas": 0},
+        {"name": "alpha", "last_modified": "2024-03", "image_bytes": 1, "images": 0, "info_areas": 4},
+        {"name": "gamma", "last_modified": "2024-01", "image_bytes": 9, "images": 0, "info_areas": 0},
+    ]
+    assert [e["name"] for e in filter_and_sort(entries)] == ["alpha", "Beta", "gamma"]
+    assert [e["name"] for e in filter_and_sort(entries, "A")] == ["alpha", "Beta", "gamma"]
+    assert [e["name"] for e in filter_and_sort(entries, "mm")] == ["gamma"]
+    assert [e["name"] for e in filter_and_sort(entries, sort_key="last_modified", descending=True)] == ["alpha", "Beta", "gamma"]
+    assert [e["name"] for e in filter_and_sort(entries, sort_key="size", descending=True)] == ["gamma", "Beta", "alpha"]
+    assert [e["name"] for e in filter_and_sort(entries, sort_key="items", descending=True)][0] == "alpha"
+
+
+def test_refresher_emits_entries_when_index_changed(tmp_path, qtbot):
+    make_project(tmp_path, "alpha")
+    refresher = ProjectIndexRefresher(str(tmp_path))
+    received = []
+    refresher.refreshed.connect(received.append)
+    assert refresher.start().result(timeout=5)
+    qtbot.waitUntil(lambda: bool(received))
+    assert [entry["name"] for entry in received[0]] == ["alpha"]
+    assert not refresher.start().result(timeout=5) # Up to date now
+    refresher.shutdown()
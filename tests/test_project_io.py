@@ -4,7 +4,7 @@ from unittest.mock import mock_open, patch, MagicMock
 
 import pytest
 
-from src import utils
+from src import config_format, utils
 from src.project_io import ProjectIO
 
 @pytest.fixture
@@ -104,9 +104,9 @@ def test_save_config_success(mock_file_open, mock_os_exists, project_io_fixture,
     cfg = {"project_name": pio.current_project_name, "setting1": "value1"}
     result = pio.save_config(pio.current_project_path, cfg, item_map={}, status_bar=status, current_project_name=pio.current_project_name)
     assert result is True
-    mock_file_open.assert_called_once_with(pio.get_project_config_path(pio.current_project_path), 'w')
+    mock_file_open.assert_called_once_with(pio.get_project_config_path(pio.current_project_path), 'wb')
     handle = mock_file_open()
-    written = "".join(c[0][0] for c in handle.write.call_args_list if c[0])
+    written = b"".join(c[0][0] for c in handle.write.call_args_list if c[0])
     data = json.loads(written)
     assert data["setting1"] == "value1"
     assert "last_modified" in data
@@ -126,7 +126,7 @@ def test_save_config_io_error(mock_file_open_error, mock_os_exists, project_io_f
     cfg = {"project_name": pio.current_project_name, "data": "some"}
     result = pio.save_config(pio.current_project_path, cfg, item_map={}, status_bar=None, current_project_name=pio.current_project_name)
     assert result is False
-    mock_file_open_error.assert_called_once_with(pio.get_project_config_path(pio.current_project_path), 'w')
+    mock_file_open_error.assert_called_once_with(pio.get_project_config_path(pio.current_project_path), 'wb')
     mock_crit.assert_called_once()
     assert mock_crit.call_args[0][1] == "Save Error"
 
@@ -150,10 +150,10 @@ def test_load_config_for_current_project_success(mock_file_open, mock_os_exists,
     pio.current_project_path = os.path.join(utils.PROJECTS_BASE_DIR, pio.current_project_name)
     mock_os_exists.return_value = True
     expected = {"project_name": pio.current_project_name, "data": "loaded"}
-    mock_file_open.return_value.read.return_value = json.dumps(expected)
+    mock_file_open.return_value.read.return_value = json.dumps(expected).encode('utf-8')
     loaded = pio.load_config_for_current_project()
     assert loaded == expected
-    mock_file_open.assert_called_once_with(pio.get_project_config_path(pio.current_project_path), 'r')
+    mock_file_open.assert_called_once_with(pio.get_project_config_path(pio.current_project_path), 'rb')
 
 @patch('os.path.exists')
 def test_load_config_file_not_found(mock_os_exists, project_io_fixture, monkeypatch):
@@ -177,7 +177,7 @@ def test_load_config_json_decode_error(mock_file_open, mock_os_exists, project_i
     warn = MagicMock()
     monkeypatch.setattr('src.project_io.QMessageBox.warning', warn)
     mock_os_exists.return_value = True
-    mock_file_open.return_value.read.return_value = "not json"
+    mock_file_open.return_value.read.return_value = b"not json"
     loaded = pio.load_config_for_current_project()
     assert loaded is None
     warn.assert_called_once()
@@ -218,7 +218,7 @@ def test_save_config_populates_missing_image_dimensions(mock_reader_cls, mock_fi
 
     pio.config = {"project_name": pio.current_project_name, "images": [{"id": "img1", "path": filename}]}
     pio.save_config(pio.current_project_path, pio.config, item_map={}, status_bar=status, current_project_name=pio.current_project_name)
-    written = "".join(c[0][0] for c in mock_file_open.return_value.write.call_args_list if c[0])
+    written = b"".join(c[0][0] for c in mock_file_open.return_value.write.call_args_list if c[0])
     data = json.loads(written)
     img_conf = data["images"][0]
     assert img_conf["original_width"] == 800
@@ -348,3 +348,48 @@ def test_copy_project_data_empty_images_directory(project_io_fixture, monkeypatc
     assert new_config_data["project_name"] == target_project_name
     assert new_config_data["images"] == [] # Preserved empty images list
     assert new_config_data["scene_items"] == [] # Preserved empty scene_items list
+
+
+def test_saves_and_copies_keep_the_config_format(project_io_fixture):
+    pio = project_io_fixture
+    project_path = os.path.join(utils.PROJECTS_BASE_DIR, "packed")
+    os.makedirs(project_path)
+    config_path = pio.get_project_config_path(project_path)
+    config_format.dump({"project_name": "packed", "background": {"color": "#000"}}, config_path, config_format.GZIP)
+
+    assert pio.switch_to_project("packed")
+    assert pio.config_format == config_format.GZIP
+    pio.config["background"]["color"] = "#FFF"
+    assert pio.save_config(project_path, pio.config)
+    assert config_format.load_with_format(config_path)[1] == config_format.GZIP
+
+    assert pio.copy_project_data("packed", "packed_copy")
+    copy_config, copy_format = config_format.load_with_format(pio.get_project_config_path("packed_copy"))
+    assert (copy_config["project_name"], copy_format) == ("packed_copy", config_format.GZIP)
+
+    pio.set_config_format(config_format.PRETTY)
+    assert pio.save_config(project_path, pio.config) # Rewritten although the config is unchanged
+    assert config_format.load_with_format(config_path)[1] == config_format.PRETTY
+
+
+def test_save_then_digest_then_save_keeps_a_large_config_intact(project_io_fixture):
+    from src.project_thumbnail import config_digest
+    pio = project_io_fixture
+    project_path = os.path.join(utils.PROJECTS_BASE_DIR, "large")
+    os.makedirs(project_path)
+    config_path = pio.get_project_config_path(project_path)
+    notes = ["note %d " % i * 2000 for i in range(50)]
+    config_format.dump({"project_name": "large", "background": {"color": "#000"},
+                        "info_areas": [{"id": str(i), "text": text} for i, text in enumerate(notes)]},
+                       config_path, config_format.COMPACT)
+
+    assert pio.switch_to_project("large")
+    pio.config["background"]["color"] = "#FFF"
+    assert pio.save_config(project_path, pio.config)
+    digest = config_digest(pio.last_saved_config)
+    assert not pio.save_config(project_path, pio.config) # Unchanged, so not rewritten
+    assert config_digest(pio.last_saved_config) == digest
+
+    saved = config_format.load(config_path)
+    assert [area["text"] for area in saved["info_areas"]] == notes
+    assert config_digest(saved) == digest
@@ -71,3 +71,33 @@ def test_delete_project_removes_dir_and_emits_signal(monkeypatch, tmp_path, qtbo
     dlg.delete_project("proj")
     assert not proj.exists() and signals == ["proj"]
     teardown_dialog(dlg, orig)
+
+
+def test_project_list_is_filtered_and_sorted_from_the_index(tmp_path, qtbot):
+    for name, modified in (("alpha", "2024-01-01T00:00:00Z"), ("beta", "2024-05-01T00:00:00Z")):
+        project = tmp_path / name
+        project.mkdir()
+        (project / utils.PROJECT_CONFIG_FILENAME).write_text('{"last_modified": "%s"}' % modified)
+    dlg, orig = create_dialog(tmp_path)
+    qtbot.addWidget(dlg)
+    names = lambda: [dlg.project_list_widget.item(i).text() for i in range(dlg.project_list_widget.count())]
+    assert names() == ["alpha", "beta"]
+    dlg.sort_combo.setCurrentIndex(dlg.sort_combo.findText("Last Modified"))
+    assert names() == ["beta", "alpha"]
+    dlg.filter_edit.setText("alp")
+    assert names() == ["alpha"]
+    teardown_dialog(dlg, orig)
+
+
+def test_project_list_shows_thumbnails(tmp_path, qtbot):
+    from PyQt5.QtGui import QImage
+    project = tmp_path / "pic"
+    project.mkdir()
+    (project / utils.PROJECT_CONFIG_FILENAME).write_text('{"last_modified": "2024-01-01T00:00:00Z"}')
+    thumbnail = QImage(32, 24, QImage.Format_RGB32)
+    thumbnail.fill(0)
+    thumbnail.save(str(project / utils.PROJECT_THUMBNAIL_FILENAME))
+    dlg, orig = create_dialog(tmp_path)
+    qtbot.addWidget(dlg)
+    assert not dlg.project_list_widget.item(0).icon().isNull()
+    teardown_dialog(dlg, orig)
@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+
+from PyQt5.QtGui import QColor, QImage, QImageReader
+
+from src import utils
+from src.project_index import ProjectIndex
+from src.project_thumbnail import (
+    THUMBNAIL_DIGEST_KEY, ThumbnailGenerator, config_digest, render_thumbnail, thumbnail_path, write_thumbnail
+)
+
+
+def make_project(tmp_path, name="proj"):
+    project = tmp_path / name
+    (project / utils.PROJECT_IMAGES_DIRNAME).mkdir(parents=True)
+    image = QImage(40, 40, QImage.Format_RGB32)
+    image.fill(QColor("#FF0000"))
+    image.save(str(project / utils.PROJECT_IMAGES_DIRNAME / "red.png"))
+    config = {
+        "last_modified": "2024-01-01T00:00:00Z",
+        "background": {"width": 800, "height": 400, "color": "#FFFFFF"},
+        "images": [{"id": "img1", "path": "red.png", "original_width": 40, "original_height": 40,
+                    "scale": 5.0, "center_x": 200, "center_y": 200}],
+        "info_areas": [{"id": "r1", "center_x": 600, "center_y": 200, "width": 200, "height": 200,
+                        "fill_color": "#0000FF", "fill_alpha": 1.0}],
+    }
+    (project / utils.PROJECT_CONFIG_FILENAME).write_text(json.dumps(config))
+    return project, config
+
+
+def test_render_thumbnail_scales_canvas_and_draws_items(tmp_path, qapp):
+    project, config = make_project(tmp_path)
+    image = render_thumbnail(str(project), config, max_size=200)
+    assert (image.width(), image.height()) == (200, 100)
+    assert QColor(image.pixel(50, 50)).name() == "#ff0000" # Image, decoded at thumbnail size
+    assert QColor(image.pixel(150, 50)).name() == "#0000ff" # Info area
+    assert QColor(image.pixel(100, 5)).name() == "#ffffff" # Background
+
+
+def test_write_thumbnail_is_skipped_while_config_is_unchanged(tmp_path, qapp):
+    project, config = make_project(tmp_path)
+    assert write_thumbnail(str(project), config)
+    assert QImageReader(thumbnail_path(str(project))).text(THUMBNAIL_DIGEST_KEY) == config_digest(config)
+    assert not write_thumbnail(str(project), dict(config, last_modified="2025-01-01T00:00:00Z"))
+    config["info_areas"][0]["center_x"] = 500
+    assert write_thumbnail(str(project), config)
+
+
+def test_generator_renders_after_saves_settle_and_updates_index(tmp_path, qtbot):
+    project, config = make_project(tmp_path)
+    ProjectIndex(str(tmp_path)).refresh()
+    generator = ThumbnailGenerator(settle_ms=10)
+    ready = []
+    generator.thumbnail_ready.connect(ready.append)
+    generator.schedule(str(project), dict(config, info_areas=[]))
+    generator.schedule(str(project), config) # Only the latest config is rendered
+    qtbot.waitUntil(lambda: bool(ready))
+    assert ready == [os.path.normpath(str(project))]
+    assert QImageReader(thumbnail_path(str(project))).text(THUMBNAIL_DIGEST_KEY) == config_digest(config)
+    index = ProjectIndex(str(tmp_path))
+    index.load()
+    assert index.projects["proj"]["thumbnail"] == utils.PROJECT_THUMBNAIL_FILENAME
+    generator.shutdown()
+
+
+def test_generate_missing_reads_config_from_disk(tmp_path, qapp):
+    project, config = make_project(tmp_path)
+    generator = ThumbnailGenerator()
+    futures = generator.generate_missing([str(project)])
+    assert [future.result(timeout=5) for future in futures] == [True]
+    assert generator.generate_missing([str(project)]) == [] # Already has one
+    generator.shutdown()
+
+
+def test_generate_missing_skips_projects_already_submitted(tmp_path, qapp):
+    project, config = make_project(tmp_path)
+    generator = ThumbnailGenerator()
+    release = threading.Event()
+    generator._executor.submit(release.wait) # Hold the worker so the job stays queued
+    futures = generator.generate_missing([str(project)])
+    assert len(futures) == 1
+    assert generator.generate_missing([str(project), str(project) + os.sep]) == []
+    release.set()
+    assert futures[0].result(timeout=5) is True
+    generator.shutdown()
@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+from PyQt5.QtCore import QSettings
+from PyQt5.QtWidgets import QDialog, QGraphicsItem, QGraphicsScene, QGraphicsView
+
+from src import render_profile
+from src.render_profile import RenderProfile, CanvasView, FrameStats
+from src.info_area_item import InfoAreaItem
+
+
+def _ini_settings(tmp_path):
+    return QSettings(str(tmp_path / "settings.ini"), QSettings.IniFormat)
+
+
+def test_render_profile_round_trips_through_settings(tmp_path):
+    assert render_profile.load_render_profile(_ini_settings(tmp_path)) == RenderProfile()
+
+    profile = RenderProfile(viewport_update_mode="smart", index_method="none", bsp_depth=4,
+                            item_cache_mode="device", dont_save_painter_state=True,
+                            text_lod_threshold_px=8, show_frame_stats=True)
+    render_profile.save_render_profile(profile, _ini_settings(tmp_path))
+    assert render_profile.load_render_profile(_ini_settings(tmp_path)) == profile
+
+    # Unknown choices fall back to the defaults
+    assert RenderProfile(viewport_update_mode="bogus", item_cache_mode="x").to_dict() == RenderProfile().to_dict()
+
+
+def test_apply_render_profile_configures_view_scene_and_items(qapp):
+    scene = QGraphicsScene()
+    view = CanvasView(scene)
+    existing = InfoAreaItem({'id': 'a1', 'text': 'x', 'width': 50, 'height': 20})
+    scene.addItem(existing)
+    profile = RenderProfile(viewport_update_mode="full", index_method="none", item_cache_mode="device",
+                            dont_adjust_for_antialiasing=True, text_lod_threshold_px=9)
+    original_threshold = InfoAreaItem.text_lod_threshold_px
+    try:
+        render_profile.apply_render_profile(view, scene, profile)
+        assert view.viewportUpdateMode() == QGraphicsView.FullViewportUpdate
+        assert view.optimizationFlags() & QGraphicsView.DontAdjustForAntialiasing
+        assert scene.itemIndexMethod() == QGraphicsScene.NoIndex
+        assert existing.cacheMode() == QGraphicsItem.DeviceCoordinateCache
+        assert InfoAreaItem.text_lod_threshold_px == 9
+
+        added = InfoAreaItem({'id': 'a2', 'text': 'y', 'width': 50, 'height': 20})
+        scene.addItem(added)
+        assert added.cacheMode() == QGraphicsItem.DeviceCoordinateCache
+        assert added.text_item.cacheMode() == QGraphicsItem.DeviceCoordinateCache
+    finally:
+        InfoAreaItem.text_lod_threshold_px = original_threshold
+
+
+def test_frame_stats_average_paint_time_and_rate():
+    stats = FrameStats()
+    times = iter([0.0, 0.004, 0.1, 0.102, 0.2, 0.206])
+    with patch('src.render_profile.time.perf_counter', lambda: next(times)):
+        for _ in range(3):
+            stats.paint_started()
+            stats.paint_finished()
+    assert abs(stats.average_paint_ms() - 4.0) < 1e-6
+    assert abs(stats.frames_per_second() - 10.0) < 1e-6
+
+
+def test_app_render_profile_dialog_applies_and_saves(base_app_fixture, tmp_path, monkeypatch):
+    app = base_app_fixture
+    settings_path = str(tmp_path / "settings.ini")
+    monkeypatch.setattr(render_profile, '_settings',
+                        lambda settings: QSettings(settings_path, QSettings.IniFormat))
+
+    def accept_with_smart_updates(dialog):
+        dialog.update_mode_combo.setCurrentIndex(dialog.update_mode_combo.findData("smart"))
+        dialog.frame_stats_checkbox.setChecked(True)
+        return QDialog.Accepted
+
+    with patch('src.render_profile_dialog.RenderProfileDialog.exec_', accept_with_smart_updates):
+        app.show_render_profile_dialog()
+
+    assert app.view.viewportUpdateMode() == QGraphicsView.SmartViewportUpdate
+    assert not app.frame_stats_label.isHidden()
+    assert render_profile.load_render_profile().viewport_update_mode == "smart"
@@ -0,0 +1,144 @@
+import time
+
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QColor, QImage, QPainter, QPixmap, QTransform
+from PyQt5.QtWidgets import QApplication, QGraphicsScene
+
+from src.scaled_pixmap_cache import ScaledPixmapCache, scale_image
+from src.draggable_image_item import DraggableImageItem
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def test_scale_image_from_path(tmp_path, qapp):
+    path = str(tmp_path / "red.png")
+    image = QImage(40, 20, QImage.Format_RGB32)
+    image.fill(QColor("red"))
+    image.save(path)
+    scaled = scale_image(path, 10, 5)
+    assert (scaled.width(), scaled.height()) == (10, 5)
+    assert scale_image(str(tmp_path / "missing.png"), 10, 5).isNull()
+
+
+def test_cache_scales_off_thread_and_evicts(qapp):
+    cache = ScaledPixmapCache(max_bytes=30 * 15 * 4 + 10 * 5 * 4)
+    pixmap = QPixmap(40, 20)
+    pixmap.fill(Qt.blue)
+    ready = []
+    cache.pixmap_ready.connect(ready.append)
+    try:
+        assert cache.get(pixmap, 20, 10) is None
+        assert _wait_for(lambda: cache.get(pixmap, 20, 10) is not None)
+        assert ready == [pixmap.cacheKey()]
+        assert cache.get(pixmap, 20, 10).size().width() == 20
+
+        cache.get(pixmap, 10, 5)
+        assert _wait_for(lambda: len(cache) == 2)
+        cache.get(pixmap, 30, 15)
+        assert _wait_for(lambda: cache.get(pixmap, 30, 15) is not None)
+        assert cache.total_bytes <= cache.max_bytes
+        assert len(cache) == 2 and (pixmap.cacheKey(), 20, 10) not in cache._pixmaps # Least recently used
+
+        cache.discard(pixmap.cacheKey())
+        assert len(cache) == 0 and cache.total_bytes == 0
+    finally:
+        cache.shutdown()
+
+
+
+def test_only_waiters_on_a_pixmap_are_notified(qapp):
+    cache = ScaledPixmapCache()
+    first, second = QPixmap(40, 20), QPixmap(40, 20)
+    first.fill(Qt.blue)
+    second.fill(Qt.red)
+    notified = []
+    first_waiter = lambda: notified.append("first")
+    try:
+        cache.get(first, 20, 10, waiter=first_waiter)
+        cache.get(first, 20, 10, waiter=first_waiter) # Painted again before the copy is ready
+        cache.get(second, 400, 200, waiter=lambda: notified.append("second"))
+        assert _wait_for(lambda: len(cache) == 2)
+        assert sorted(notified) == ["first", "second"]
+
+        cache.get(second, 200, 100, waiter=lambda: notified.append("dropped"))
+        cache.discard(second.cacheKey()) # E.g. the item was removed before the copy arrived
+        assert _wait_for(lambda: len(cache) == 2)
+        assert sorted(notified) == ["first", "second"] and not cache._waiters
+    finally:
+        cache.shutdown()
+
+def test_scaled_item_paints_prescaled_copy_after_interactive_scaling(qapp, monkeypatch):
+    cache = ScaledPixmapCache()
+    monkeypatch.setattr('src.draggable_image_item.scaled_pixmap_cache', lambda: cache)
+    pixmap = QPixmap(200, 100)
+    pixmap.fill(Qt.green)
+    item = DraggableImageItem(pixmap, {'id': 'img1', 'scale': 0.5})
+    item.setTransform(QTransform.fromScale(0.5, 0.5))
+    scene = QGraphicsScene()
+    scene.addItem(item)
+    requested = []
+    original_get = cache.get
+    monkeypatch.setattr(cache, 'get', lambda *args: requested.append(args[1:3]) or original_get(*args))
+
+    def render():
+        image = QImage(100, 50, QImage.Format_ARGB32)
+        painter = QPainter(image)
+        scene.render(painter, QRectF(0, 0, 100, 50), QRectF(0, 0, 100, 50))
+        painter.end()
+        return image
+
+    try:
+        item.begin_interactive_scaling()
+        render()
+        assert requested == [] # Transformed painting while the scale changes
+
+        item._end_interactive_scaling()
+        render()
+        assert requested == [(100, 50)]
+        assert _wait_for(lambda: original_get(pixmap, 100, 50) is not None)
+        assert QColor(render().pixel(50, 25)) == QColor(Qt.green)
+    finally:
+        cache.shutdown()
+
+
+def test_pending_size_does_not_convert_pixmap_again(qapp, monkeypatch):
+    cache = ScaledPixmapCache()
+    pixmap = QPixmap(40, 20)
+    pixmap.fill(Qt.blue)
+    monkeypatch.setattr(cache._executor, 'submit', lambda *args: None) # Keep the job pending
+    conversions = []
+    monkeypatch.setattr(QPixmap, 'toImage', lambda self: conversions.append(1) or QImage())
+    try:
+        cache.get(pixmap, 20, 10)
+        cache.get(pixmap, 20, 10)
+        assert conversions == [1]
+    finally:
+        cache.shutdown()
+
+
+def test_item_drops_scaled_copies_of_replaced_or_removed_pixmap(qapp, monkeypatch):
+    cache = ScaledPixmapCache()
+    monkeypatch.setattr('src.draggable_image_item.scaled_pixmap_cache', lambda: cache)
+    first, second = QPixmap(40, 20), QPixmap(40, 20)
+    first.fill(Qt.blue)
+    second.fill(Qt.red)
+    item = DraggableImageItem(first, {'id': 'img1'})
+    scene = QGraphicsScene()
+    scene.addItem(item)
+    try:
+        cache.get(first, 20, 10)
+        assert _wait_for(lambda: len(cache) == 1)
+        item.setPixmap(second)
+        assert len(cache) == 0
+        cache.get(second, 20, 10)
+        assert _wait_for(lambda: len(cache) == 1)
+        scene.removeItem(item)
+        assert len(cache) == 0 and cache.total_bytes == 0
+    finally:
+        cache.shutdown()
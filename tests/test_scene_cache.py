@@ -0,0 +1,104 @@
+import os
+
+from PyQt5.QtGui import QColor, QImage, QPixmap
+
+from src import scene_cache, utils
+from src.connection_line_item import ConnectionLineItem
+from src.draggable_image_item import DraggableImageItem
+from src.info_area_item import InfoAreaItem
+
+
+def make_image(project, name="big.png", width=2000, height=1000):
+    folder = project / utils.PROJECT_IMAGES_DIRNAME
+    folder.mkdir(parents=True, exist_ok=True)
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor("#00FF00"))
+    image.save(str(folder / name))
+    return str(folder / name), {"id": "img1", "path": name, "original_width": width, "original_height": height}
+
+
+def make_areas():
+    source = {"id": "a1", "center_x": 100, "center_y": 100, "width": 120, "height": 60,
+              "text": "Some text that wraps over more than one line"}
+    destination = {"id": "a2", "center_x": 400, "center_y": 300, "width": 80, "height": 80}
+    item_map = {"a1": InfoAreaItem(source), "a2": InfoAreaItem(destination)}
+    line_conf = {"id": "c1", "source": "a1", "destination": "a2"}
+    item_map["c1"] = ConnectionLineItem(line_conf, item_map)
+    return item_map, line_conf
+
+
+def test_image_proxy_is_written_and_invalidated_when_the_file_changes(tmp_path, qapp):
+    project = tmp_path / "proj"
+    image_path, img_conf = make_image(project)
+    item_map = {"img1": DraggableImageItem.from_file(img_conf, image_path, str(project))}
+    scene_cache.save(str(project), item_map).result()
+
+    cache = scene_cache.SceneCache.load(str(project))
+    proxy = cache.image_proxy(image_path, img_conf)
+    assert (proxy.width(), proxy.height()) == (scene_cache.PROXY_MAX_SIZE, scene_cache.PROXY_MAX_SIZE // 2)
+    assert scene_cache.save(str(project), item_map, cache) is None # Nothing changed
+
+    stat = os.stat(image_path)
+    os.utime(image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.image_proxy(image_path, img_conf) is None
+
+
+def test_proxy_item_shows_full_size_until_full_image_loads(tmp_path, qtbot):
+    project = tmp_path / "proj"
+    image_path, img_conf = make_image(project)
+    proxy = QImage(1024, 512, QImage.Format_RGB32)
+    item = DraggableImageItem.from_file(img_conf, image_path, str(project), proxy=QPixmap.fromImage(proxy))
+    assert item.is_proxy()
+    assert (item.boundingRect().width(), item.boundingRect().height()) == (2000, 1000)
+    qtbot.waitUntil(lambda: not item.is_proxy())
+    assert (item.pixmap().width(), item.pixmap().height()) == (2000, 1000)
+
+
+
+def test_items_sharing_an_image_decode_it_once(tmp_path, qtbot, monkeypatch):
+    project = tmp_path / "proj"
+    image_path, img_conf = make_image(project)
+    loader = scene_cache.FullImageLoader()
+    monkeypatch.setattr(scene_cache, 'image_loader', lambda: loader)
+    decodes = []
+    decode = loader._decode
+    monkeypatch.setattr(loader, '_decode', lambda path: decodes.append(path) or decode(path))
+    proxy = QPixmap.fromImage(QImage(1024, 512, QImage.Format_RGB32))
+    try:
+        first = DraggableImageItem.from_file(dict(img_conf), image_path, str(project), proxy=proxy)
+        second = DraggableImageItem.from_file(dict(img_conf), image_path, str(project), proxy=proxy)
+        qtbot.waitUntil(lambda: not first.is_proxy() and not second.is_proxy())
+        assert decodes == [image_path]
+        assert not loader._waiters
+    finally:
+        loader.shutdown()
+
+def test_text_layout_and_connection_points_are_reused_while_unchanged(tmp_path, qapp):
+    project = tmp_path / "proj"
+    item_map, line_conf = make_areas()
+    item_map["a1"].text_item # Lay the text out, as painting it legibly would
+    scene_cache.save(str(project), item_map).result()
+    cache = scene_cache.SceneCache.load(str(project))
+
+    reopened_map, _ = make_areas()
+    area = reopened_map["a1"]
+    cache.apply_text_layout(area)
+    assert area._build_greek_path().elementCount() == 5 * len(cache.entries["text"]["a1"]["lines"])
+    assert len(cache.entries["text"]["a1"]["lines"]) > 1
+    assert cache.connection_points(line_conf, reopened_map) == item_map["c1"].end_points()
+
+    area.set_display_text("Changed")
+    assert area._cached_text_layout is not None
+    area._build_greek_path()
+    assert area._cached_text_layout is None # Stale layout dropped
+    reopened_map["a2"].config_data["center_x"] = 500
+    assert cache.connection_points(line_conf, reopened_map) is None
+
+
+def test_unreadable_cache_is_ignored(tmp_path, qapp, capsys):
+    folder = tmp_path / "proj" / utils.PROJECT_SCENE_CACHE_DIRNAME
+    folder.mkdir(parents=True)
+    (folder / scene_cache.SCENE_FILENAME).write_text("{not json")
+    cache = scene_cache.SceneCache.load(str(tmp_path / "proj"))
+    assert cache.entries == {"images": {}, "text": {}, "connections": {}}
+    assert "unreadable scene cache" in capsys.readouterr().out
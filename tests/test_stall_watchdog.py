@@ -0,0 +1,96 @@
+import json
+import os
+import time
+
+import pytest
+
+from src import instrumentation
+from src import stall_watchdog
+
+
+@pytest.fixture(autouse=True)
+def instrumentation_off():
+    instrumentation.disable()
+    yield
+    instrumentation.disable()
+
+
+@pytest.fixture
+def watchdog(qapp):
+    dog = stall_watchdog.StallWatchdog(threshold_ms=50, ping_ms=10)
+    yield dog
+    dog.stop()
+
+
+def block_gui_thread(seconds):
+    with instrumentation.span("slow_operation"):
+        time.sleep(seconds)
+
+
+def test_threshold_from_environment(monkeypatch):
+    monkeypatch.delenv(stall_watchdog.ENV_VAR, raising=False)
+    assert stall_watchdog.threshold_from_environment() is None
+    monkeypatch.setenv(stall_watchdog.ENV_VAR, "1")
+    assert stall_watchdog.threshold_from_environment() == stall_watchdog.DEFAULT_THRESHOLD_MS
+    monkeypatch.setenv(stall_watchdog.ENV_VAR, "250")
+    assert stall_watchdog.threshold_from_environment() == 250
+    monkeypatch.setenv(stall_watchdog.ENV_VAR, "soon")
+    assert stall_watchdog.threshold_from_environment() is None
+
+
+def test_stall_is_attributed_to_call_site_and_operation(watchdog, qtbot, tmp_path):
+    watchdog.start()
+    assert instrumentation.is_enabled()
+    qtbot.wait(50)
+    block_gui_thread(0.3)
+    qtbot.waitUntil(lambda: watchdog.report()["stalls"] > 0, timeout=2000)
+
+    report = watchdog.report()
+    site = report["sites"][0]
+    assert site["site"].startswith("tests/test_stall_watchdog.py:")
+    assert site["site"].endswith("in block_gui_thread")
+    assert site["operations"] == {"slow_operation": 1}
+    assert 200 <= site["max_ms"] < 1000
+
+    path = watchdog.save_report(str(tmp_path))
+    assert os.path.dirname(path) == os.path.join(str(tmp_path), ".diagnostics")
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["stalls"] == 1
+    later = watchdog.save_report(str(tmp_path)) # E.g. after returning to the project in the same session
+    assert later != path and os.path.isfile(path) and os.path.isfile(later)
+
+
+def test_responsive_gui_reports_nothing(watchdog, qtbot, tmp_path):
+    watchdog.start()
+    qtbot.wait(200)
+    assert watchdog.report()["stalls"] == 0
+    assert watchdog.save_report(str(tmp_path)) is None
+    assert not os.path.exists(os.path.join(str(tmp_path), ".diagnostics"))
+
+
+def test_app_saves_stall_report_into_project_when_watchdog_is_turned_off(base_app_fixture, qtbot):
+    app = base_app_fixture
+    assert app.toggle_stall_watchdog(threshold_ms=50)
+    assert app.title_bar.stall_watchdog_action.isChecked()
+    qtbot.wait(50)
+    block_gui_thread(0.3)
+    qtbot.waitUntil(lambda: app.stall_watchdog.report()["stalls"] > 0, timeout=2000)
+    assert not app.toggle_stall_watchdog()
+    assert not app.title_bar.stall_watchdog_action.isChecked()
+    diagnostics = os.path.join(app.current_project_path, ".diagnostics")
+    assert [name for name in os.listdir(diagnostics) if name.startswith("stalls_")]
+
+
+def test_turning_the_watchdog_off_stops_the_recording_it_started(base_app_fixture):
+    app = base_app_fixture
+    instrumentation.disable()
+    assert app.toggle_stall_watchdog(threshold_ms=50) and instrumentation.is_enabled()
+    assert not app.toggle_stall_watchdog()
+    assert not instrumentation.is_enabled()
+
+    app.toggle_stall_watchdog(threshold_ms=50)
+    app.toggle_performance_hud() # The HUD still needs recording after the watchdog stops
+    app.toggle_stall_watchdog()
+    assert instrumentation.is_enabled()
+    app.toggle_performance_hud()
+    assert not instrumentation.is_enabled()
@@ -0,0 +1,55 @@
+import time
+
+from PyQt5.QtWidgets import QWidget
+
+from src import startup_trace
+from src.info_area_item import InfoAreaItem
+
+
+def test_waits_are_left_out_of_the_timeline(capsys):
+    trace = startup_trace.StartupTrace()
+    trace.mark("imports")
+    with trace.waiting("project_manager_dialog"):
+        time.sleep(0.3)
+    trace.mark("render")
+    assert trace.phase_ms("render") - trace.phase_ms("imports") < 150
+    assert trace.phase_ms("first_frame") is None
+
+    trace.enabled = True
+    trace._first_frame_painted()
+    timeline = capsys.readouterr().out
+    assert "imports" in timeline and "render" in timeline
+    assert "waiting in project_manager_dialog" in timeline
+    assert "Time to first frame:" in timeline and "within the 1000 ms target" in timeline
+
+
+def test_first_frame_is_marked_after_the_first_paint(qtbot):
+    trace = startup_trace.StartupTrace()
+    widget = QWidget()
+    qtbot.addWidget(widget)
+    trace.watch_first_frame(widget)
+    widget.show()
+    qtbot.waitUntil(lambda: trace.phase_ms("first_frame") is not None, timeout=2000)
+    widget.update()
+    qtbot.wait(50)
+    assert [name for name, _, _ in trace.phases] == ["first_frame"]
+
+
+def test_property_panels_and_web_view_are_built_on_first_use(base_app_fixture):
+    app = base_app_fixture
+    assert app.built_properties_panels == set()
+    assert not hasattr(app, 'info_rect_text_input')
+    assert not hasattr(app, 'line_thickness_spin')
+    assert app.web_view is None
+
+    app.item_operations.add_info_area()
+    area = next(item for item in app.item_map.values() if isinstance(item, InfoAreaItem))
+    app.scene.clearSelection()
+    area.setSelected(True)
+    assert app.built_properties_panels == {"area"}
+    assert app.info_rect_text_input.toPlainText() == area.config_data.get('text', '')
+    assert app.rect_style_combo.findText("Default") != -1
+    assert not hasattr(app, 'line_thickness_spin')
+
+    app.on_mode_changed("View Mode")
+    assert app.web_view is not None
@@ -0,0 +1,35 @@
+import json
+import os
+
+from src import utils
+from src.synthetic_project import generate_config, write_project
+
+
+def test_generate_config_is_deterministic_and_sized():
+    config = generate_config(info_areas=50, images=4, connections=20, styles=3, text_length=30, seed=7)
+    assert config == generate_config(info_areas=50, images=4, connections=20, styles=3, text_length=30, seed=7)
+    assert config != generate_config(info_areas=50, images=4, connections=20, styles=3, text_length=30, seed=8)
+    assert (len(config["info_areas"]), len(config["images"]), len(config["info_area_styles"])) == (50, 4, 3)
+    assert 0 < len(config["connections"]) <= 20
+    assert all(len(area["text"]) <= 30 for area in config["info_areas"])
+
+
+def test_generated_references_are_consistent():
+    config = generate_config(info_areas=30, images=2, seed=1)
+    area_ids = {area["id"] for area in config["info_areas"]}
+    style_names = {style["name"] for style in config["info_area_styles"]}
+    assert len(area_ids) == 30
+    assert all(conn["source"] in area_ids and conn["destination"] in area_ids for conn in config["connections"])
+    assert all(area["style_ref"] in style_names for area in config["info_areas"] if "style_ref" in area)
+    z_values = [item["z_index"] for key in ("images", "info_areas", "connections") for item in config[key]]
+    assert len(set(z_values)) == len(z_values)
+
+
+def test_write_project_creates_config_and_images(tmp_path, qapp):
+    config = generate_config(info_areas=3, images=2, seed=2)
+    project = tmp_path / "synthetic"
+    write_project(str(project), config)
+    with open(project / utils.PROJECT_CONFIG_FILENAME, encoding="utf-8") as f:
+        assert json.load(f) == config
+    for img_conf in config["images"]:
+        assert os.path.getsize(project / utils.PROJECT_IMAGES_DIRNAME / img_conf["path"]) > 0